@@ -0,0 +1,98 @@
+from typing import Optional, Union
+
+import numpy as np
+from sc2.unit import Unit
+from sc2.units import Units
+
+def cy_fight_outcome(
+    own_units: Union[Units, list[Unit]], enemy_units: Union[Units, list[Unit]]
+) -> tuple[int, float, float, float]:
+    """Predict who wins a fight, what is left, and how long it takes.
+
+    Both armies are packed into arrays. Weapon, armor, speed and attribute
+    tables come from the game data, read once per unit type. The fight is
+    then simulated without the GIL, Lanchester style: every unit walks into
+    range of the closest enemy it can shoot, then all units shoot the
+    frontmost enemy their weapons reach. Between two events (a unit dying,
+    losing its shield or arriving) damage rates are constant, so the
+    simulation jumps from event to event instead of stepping through time.
+
+    Damage takes armor, shield and weapon upgrade levels, shields and bonus
+    damage against attributes into account. Weapon upgrades are counted as
+    +1 damage per attack and level. Units without a weapon in the game data,
+    e.g. banelings and carriers, only take damage. Spells are ignored.
+
+    Example:
+    ```py
+    from cython_extensions import cy_fight_outcome
+
+    enemies = self.enemy_units.closer_than(15.0, self.army.center)
+    winner, value_left, enemy_value_left, duration = cy_fight_outcome(
+        self.army, enemies
+    )
+    if winner < 0:
+        self.army.move(self.start_location)
+    ```
+
+    ```
+    100 vs 100 units: 0.42 ms
+    ```
+
+    Args:
+        own_units: Our units in the fight.
+        enemy_units: Enemy units in the fight.
+
+    Returns:
+        The winner (1 for us, -1 for the enemy, 0 if both armies die or
+        neither can finish the other), the `UNIT_DATA` army value of our and
+        the enemy survivors, and when the fight is over in seconds on faster
+        speed, infinity if it never is.
+    """
+    ...
+
+def cy_assign_targets(
+    attackers: Union[Units, list[Unit]],
+    enemies: Union[Units, list[Unit]],
+    in_range: Optional[tuple[np.ndarray, np.ndarray]] = None,
+) -> np.ndarray:
+    """Pick a target for every attacker so one volley kills the most value.
+
+    Picking the weakest enemy per unit, like `cy_pick_enemy_target`, sends
+    the whole army at one enemy. Here enemies are taken in order of
+    `UNIT_DATA` army value per hit point. Each one gets just enough
+    attackers to kill it in one volley: the largest shots first, and as the
+    final shot the smallest one that still kills. Enemies that the free
+    attackers in range can't kill are skipped. Attackers left over shoot
+    the most valuable enemy in range that isn't already dead, or else the
+    one with the least overkill.
+
+    Damage per shot uses the same weapon tables and damage model as
+    `cy_fight_outcome`.
+
+    Example:
+    ```py
+    from cython_extensions import cy_assign_targets
+
+    enemies = self.enemy_units
+    targets = cy_assign_targets(self.army, enemies)
+    for unit, target in zip(self.army, targets):
+        if target >= 0:
+            unit.attack(enemies[target])
+    ```
+
+    ```
+    100 attackers, each with 30 of 100 enemies in range: 0.67 ms
+    ```
+
+    Args:
+        attackers: Units that shoot.
+        enemies: Units that can be shot.
+        in_range: (offsets, indices) of the enemies each attacker can shoot,
+            as returned by `cy_attack_range_matrix`, each enemy at most once
+            per attacker. Computed from the units if not given.
+
+    Returns:
+        Index into `enemies` of the target of each attacker, -1 if it has no
+        enemy in range.
+    """
+    ...
@@ -0,0 +1,637 @@
+from cython cimport boundscheck, wraparound
+from libc.math cimport INFINITY, sqrt
+from cpython.mem cimport PyMem_RawFree, PyMem_RawMalloc
+from libc.stdlib cimport calloc, qsort
+
+import numpy as np
+
+cimport numpy as cnp
+
+from sc2.ids.unit_typeid import UnitTypeId
+
+from cython_extensions.unit_data import UNIT_DATA
+from cython_extensions.units_utils import cy_attack_range_matrix
+
+UNIT_DATA_INT_KEYS = {k.value: v for k, v in UNIT_DATA.items()}
+
+# type_id_int == 4 is colossus, which can be shot by air weapons
+cdef unsigned int COLOSSUS = 4
+# weapon slots, python-sc2 TargetType values are 1 (ground), 2 (air) and 3 (any)
+cdef enum:
+    GROUND = 0
+    AIR = 1
+    MAX_BONUSES = 2
+# game data times and speeds are in normal game speed, results in faster like `cy_attack_ready`
+cdef double FASTER = 1.4
+# damage left after armor, as in the game
+cdef double MIN_DAMAGE = 0.5
+# health left over from rounding, the unit is dead
+cdef double KILL_EPSILON = 1e-9
+
+# -----------------------------------------------------------------------------
+# Type tables
+# -----------------------------------------------------------------------------
+# UNIT_DATA has no weapon or armor values, so they come from the game data
+# python-sc2 attaches to every unit, read once per type id when the type is first seen
+
+
+cdef struct Weapon:
+    double damage
+    double attacks
+    double cooldown
+    double range
+    int bonus_attributes[MAX_BONUSES]
+    double bonus[MAX_BONUSES]
+
+
+cdef struct TypeStats:
+    bint known
+    Weapon weapons[2]
+    double armor
+    double speed
+    # bit 1 << attribute for each python-sc2 Attribute of the type
+    unsigned int attributes
+    double army_value
+
+
+cdef Py_ssize_t NUM_TYPE_IDS = max(u.value for u in UnitTypeId) + 1
+cdef TypeStats* TYPE_STATS = <TypeStats*>calloc(NUM_TYPE_IDS, sizeof(TypeStats))
+# for type ids newer than the installed python-sc2
+cdef TypeStats NO_STATS
+
+
+cdef void _read_type_stats(object unit, TypeStats* stats) except *:
+    cdef Py_ssize_t w, b
+    cdef Weapon* weapon
+    type_proto = unit._type_data._proto
+    stats.armor = type_proto.armor
+    stats.speed = type_proto.movement_speed
+    stats.attributes = 0
+    for attribute in type_proto.attributes:
+        stats.attributes |= <unsigned int>1 << attribute
+    unit_data = UNIT_DATA_INT_KEYS.get(unit._proto.unit_type, None)
+    stats.army_value = unit_data["army_value"] if unit_data else 0.0
+    for w in range(2):
+        stats.weapons[w].attacks = 0.0
+    for weapon_proto in type_proto.weapons:
+        for w in range(2):
+            # TargetType.Any covers both slots
+            if not weapon_proto.type & (1 << w):
+                continue
+            weapon = &stats.weapons[w]
+            weapon.damage = weapon_proto.damage
+            weapon.attacks = weapon_proto.attacks
+            weapon.cooldown = weapon_proto.speed
+            weapon.range = weapon_proto.range
+            for b in range(MAX_BONUSES):
+                weapon.bonus_attributes[b] = 0
+                weapon.bonus[b] = 0.0
+            for b, bonus in enumerate(weapon_proto.damage_bonus[:MAX_BONUSES]):
+                weapon.bonus_attributes[b] = bonus.attribute
+                weapon.bonus[b] = bonus.bonus
+    stats.known = True
+
+
+cdef TypeStats* _type_stats(object unit, unsigned int type_id) except NULL:
+    cdef TypeStats* stats
+    if type_id >= NUM_TYPE_IDS or not TYPE_STATS:
+        return &NO_STATS
+    stats = &TYPE_STATS[type_id]
+    if not stats.known:
+        _read_type_stats(unit, stats)
+    return stats
+
+
+# -----------------------------------------------------------------------------
+# Packed armies
+# -----------------------------------------------------------------------------
+
+
+cdef struct Fighter:
+    TypeStats* stats
+    double health
+    double shield
+    double x
+    double y
+    double radius
+    double attack_level
+    double armor_level
+    double shield_level
+    bint flying
+    bint colossus
+    # when the unit reaches something it can shoot, in normal game seconds
+    double join_time
+
+
+cdef void _pack_army(object units, Fighter* fighters) except *:
+    cdef Py_ssize_t i
+    cdef Fighter* fighter
+    for i in range(len(units)):
+        proto = units[i]._proto
+        fighter = &fighters[i]
+        fighter.stats = _type_stats(units[i], proto.unit_type)
+        fighter.health = proto.health
+        fighter.shield = proto.shield
+        fighter.x = proto.pos.x
+        fighter.y = proto.pos.y
+        fighter.radius = proto.radius
+        fighter.attack_level = proto.attack_upgrade_level
+        fighter.armor_level = proto.armor_upgrade_level
+        fighter.shield_level = proto.shield_upgrade_level
+        fighter.flying = proto.is_flying
+        fighter.colossus = proto.unit_type == COLOSSUS
+
+
+cdef inline int _weapon_slot(Fighter* attacker, Fighter* target) noexcept nogil:
+    # the weapon used against `target`, -1 if it can't be shot
+    if (not target.flying) and attacker.stats.weapons[GROUND].attacks > 0:
+        return GROUND
+    if (target.flying or target.colossus) and attacker.stats.weapons[AIR].attacks > 0:
+        return AIR
+    return -1
+
+
+cdef double _shot_damage(Fighter* attacker, Fighter* target, int slot) noexcept nogil:
+    # damage of one shot with all its attacks, against shields while the target has some.
+    # Weapon upgrades are taken as +1 damage per attack and level, true for most weapons
+    cdef Weapon* weapon = &attacker.stats.weapons[slot]
+    cdef double damage = weapon.damage + attacker.attack_level
+    cdef Py_ssize_t b
+    for b in range(MAX_BONUSES):
+        if weapon.bonus[b] and target.stats.attributes & (<unsigned int>1 << weapon.bonus_attributes[b]):
+            damage += weapon.bonus[b]
+    if target.shield > 0:
+        damage -= target.shield_level
+    else:
+        damage -= target.stats.armor + target.armor_level
+    return weapon.attacks * max(damage, MIN_DAMAGE)
+
+
+cdef inline double _dps(Fighter* attacker, Fighter* target, int slot) noexcept nogil:
+    # damage per normal game second
+    return _shot_damage(attacker, target, slot) / attacker.stats.weapons[slot].cooldown
+
+
+cdef void _join_times(
+    Fighter* army, Py_ssize_t num_army, Fighter* enemies, Py_ssize_t num_enemies, double* front, double* joins
+) noexcept nogil:
+    # units walk straight into range of the closest enemy they can shoot. `front` gets the
+    # edge distance to the closest enemy, which orders the units from the front line back
+    cdef Py_ssize_t i, j
+    cdef int slot
+    cdef double distance, gap, best_gap
+    for i in range(num_army):
+        front[i] = INFINITY
+        best_gap = INFINITY
+        for j in range(num_enemies):
+            distance = sqrt((army[i].x - enemies[j].x) ** 2 + (army[i].y - enemies[j].y) ** 2)
+            distance -= army[i].radius + enemies[j].radius
+            front[i] = min(front[i], distance)
+            slot = _weapon_slot(&army[i], &enemies[j])
+            if slot >= 0:
+                gap = distance - army[i].stats.weapons[slot].range
+                best_gap = min(best_gap, gap)
+        if best_gap <= 0:
+            army[i].join_time = 0.0
+        elif army[i].stats.speed > 0:
+            army[i].join_time = best_gap / army[i].stats.speed
+        else:
+            army[i].join_time = INFINITY
+        joins[i] = army[i].join_time
+
+
+# -----------------------------------------------------------------------------
+# Simulation
+# -----------------------------------------------------------------------------
+# Event driven Lanchester style fight. Every unit that arrived shoots the frontmost enemy
+# its weapons reach, so each side damages at most two enemies at a time, and between two
+# events each of them loses health at a constant rate. The state is advanced straight to
+# the next event: a target losing its shield or dying, or another unit arriving
+
+
+cdef struct Side:
+    Fighter* units
+    Py_ssize_t size
+    # units front line first, and by arrival time
+    Py_ssize_t* order
+    Py_ssize_t* join_order
+    # units join_order[:joined] are fighting
+    Py_ssize_t joined
+    # positions in `order` of the first living unit ground and air weapons can shoot
+    Py_ssize_t fronts[2]
+    # enemy units shot at and the damage per second they take, -1 if none
+    Py_ssize_t targets[2]
+    double rates[2]
+
+
+cdef Py_ssize_t _first_alive(Side* side, Py_ssize_t start, bint air) noexcept nogil:
+    cdef Fighter* fighter
+    while start < side.size:
+        fighter = &side.units[side.order[start]]
+        if fighter.health > 0 and ((fighter.flying or fighter.colossus) if air else not fighter.flying):
+            return start
+        start += 1
+    return side.size
+
+
+cdef void _add_attacker(Side* side, Side* enemy, Py_ssize_t i) noexcept nogil:
+    # unit i shoots the frontmost of the enemy targets its weapons can reach
+    cdef Fighter* attacker = &side.units[i]
+    cdef Py_ssize_t rank = enemy.size
+    cdef Py_ssize_t target, slot
+    if attacker.stats.weapons[GROUND].attacks > 0:
+        rank = enemy.fronts[GROUND]
+    if attacker.stats.weapons[AIR].attacks > 0:
+        rank = min(rank, enemy.fronts[AIR])
+    if rank == enemy.size:
+        return
+    target = enemy.order[rank]
+    # a colossus can be both targets, its damage then goes to the first slot
+    slot = 0 if target == side.targets[0] else 1
+    side.rates[slot] += _dps(attacker, &enemy.units[target], _weapon_slot(attacker, &enemy.units[target]))
+
+
+cdef void _retarget(Side* side, Side* enemy) noexcept nogil:
+    cdef Py_ssize_t k, i
+    for k in range(2):
+        side.targets[k] = enemy.order[enemy.fronts[k]] if enemy.fronts[k] < enemy.size else -1
+        side.rates[k] = 0.0
+    for k in range(side.joined):
+        i = side.join_order[k]
+        if side.units[i].health > 0:
+            _add_attacker(side, enemy, i)
+
+
+cdef double _simulate(Side* sides) noexcept nogil:
+    # returns when the fight ends in normal game seconds, infinity if neither side can finish the other
+    cdef Py_ssize_t s, k, i
+    cdef Fighter* hit
+    cdef bint dirty[2]
+    cdef double t = 0.0
+    cdef double dt
+    dirty[0] = dirty[1] = True
+    while True:
+        for s in range(2):
+            sides[s].fronts[GROUND] = _first_alive(&sides[s], sides[s].fronts[GROUND], False)
+            sides[s].fronts[AIR] = _first_alive(&sides[s], sides[s].fronts[AIR], True)
+            if sides[s].fronts[GROUND] == sides[s].size and sides[s].fronts[AIR] == sides[s].size:
+                return t
+        dt = INFINITY
+        for s in range(2):
+            if dirty[s]:
+                _retarget(&sides[s], &sides[1 - s])
+                dirty[s] = False
+            for k in range(2):
+                if sides[s].rates[k] > 0:
+                    hit = &sides[1 - s].units[sides[s].targets[k]]
+                    dt = min(dt, (hit.shield if hit.shield > 0 else hit.health) / sides[s].rates[k])
+            if sides[s].joined < sides[s].size:
+                dt = min(dt, max(sides[s].units[sides[s].join_order[sides[s].joined]].join_time - t, 0.0))
+        if dt == INFINITY:
+            return INFINITY
+
+        for s in range(2):
+            for k in range(2):
+                if sides[s].rates[k] == 0:
+                    continue
+                hit = &sides[1 - s].units[sides[s].targets[k]]
+                # leftovers of less than a millionth are rounding, not health
+                if hit.shield > 0:
+                    hit.shield -= sides[s].rates[k] * dt
+                    if hit.shield <= 1e-6:
+                        hit.shield = 0.0
+                        dirty[s] = True
+                else:
+                    hit.health -= sides[s].rates[k] * dt
+                    if hit.health <= 1e-6:
+                        hit.health = 0.0
+                        # new targets for this side, one attacker less for the other
+                        dirty[0] = dirty[1] = True
+        t += dt
+        for s in range(2):
+            while (
+                sides[s].joined < sides[s].size
+                and sides[s].units[sides[s].join_order[sides[s].joined]].join_time <= t + 1e-9
+            ):
+                i = sides[s].join_order[sides[s].joined]
+                sides[s].joined += 1
+                if sides[s].units[i].health > 0 and not dirty[s]:
+                    _add_attacker(&sides[s], &sides[1 - s], i)
+
+cdef bint _any_alive(Fighter* army, Py_ssize_t num_army) noexcept nogil:
+    cdef Py_ssize_t i
+    for i in range(num_army):
+        if army[i].health > 0:
+            return True
+    return False
+
+
+@boundscheck(False)
+@wraparound(False)
+cpdef tuple cy_fight_outcome(object own_units, object enemy_units):
+    """
+
+    Predict the outcome of a fight between two armies.
+
+    Parameters
+    ----------
+    own_units :
+        Our units in the fight.
+    enemy_units :
+        Enemy units in the fight.
+
+    Returns
+    -------
+    tuple :
+        Winner (1 for us, -1 for the enemy, 0 if both die or neither can win),
+        army value of our and the enemy survivors, and when the fight is over
+        in seconds, infinity if neither can win.
+
+    """
+    cdef:
+        Side sides[2]
+        double value_left[2]
+        double duration
+        Py_ssize_t s, i
+        Py_ssize_t num_own = len(own_units)
+        Py_ssize_t num_units = num_own + len(enemy_units)
+        int winner
+        # both armies share each buffer, the enemy part starts after our units.
+        # Fighters live in a numpy owned byte buffer, so nothing leaks if packing raises
+        unsigned char[::1] fighter_view = np.empty((num_units + 1) * sizeof(Fighter), dtype=np.uint8)
+        cnp.ndarray fronts = np.empty(num_units + 1, dtype=np.float64)
+        cnp.ndarray join_times = np.empty(num_units + 1, dtype=np.float64)
+        double[::1] front_view = fronts
+        double[::1] join_view = join_times
+        Py_ssize_t[::1] order_view
+        Py_ssize_t[::1] join_order_view
+
+    sides[0].units = <Fighter*>&fighter_view[0]
+    sides[0].size = num_own
+    sides[1].units = sides[0].units + num_own
+    sides[1].size = num_units - num_own
+    _pack_army(own_units, sides[0].units)
+    _pack_army(enemy_units, sides[1].units)
+
+    with nogil:
+        _join_times(sides[0].units, sides[0].size, sides[1].units, sides[1].size, &front_view[0], &join_view[0])
+        _join_times(
+            sides[1].units, sides[1].size, sides[0].units, sides[0].size, &front_view[num_own], &join_view[num_own]
+        )
+    # stable sorts, so ties keep the unit order and the result is deterministic
+    order_view = np.concatenate(
+        (
+            np.argsort(fronts[:num_own], kind="stable"),
+            np.argsort(fronts[num_own:num_units], kind="stable"),
+            np.zeros(1, dtype=np.intp),
+        )
+    ).astype(np.intp)
+    join_order_view = np.concatenate(
+        (
+            np.argsort(join_times[:num_own], kind="stable"),
+            np.argsort(join_times[num_own:num_units], kind="stable"),
+            np.zeros(1, dtype=np.intp),
+        )
+    ).astype(np.intp)
+    for s in range(2):
+        i = 0 if s == 0 else num_own
+        sides[s].order = &order_view[i]
+        sides[s].join_order = &join_order_view[i]
+        sides[s].joined = 0
+        sides[s].fronts[GROUND] = sides[s].fronts[AIR] = 0
+
+    with nogil:
+        duration = _simulate(sides)
+
+    for s in range(2):
+        value_left[s] = 0.0
+        for i in range(sides[s].size):
+            if sides[s].units[i].health > 0:
+                value_left[s] += sides[s].units[i].stats.army_value
+    # a finished fight has at most one side left
+    if duration == INFINITY:
+        winner = 0
+    elif _any_alive(sides[0].units, sides[0].size):
+        winner = 1
+    elif _any_alive(sides[1].units, sides[1].size):
+        winner = -1
+    else:
+        winner = 0
+    return winner, value_left[0], value_left[1], duration / FASTER
+
+
+# -----------------------------------------------------------------------------
+# Focus fire
+# -----------------------------------------------------------------------------
+# One volley at a time: enemies are taken in order of army value per hit point, and an
+# enemy gets just enough attackers to kill it, largest shots first and the last shot the
+# smallest one that still finishes it. Enemies the free attackers can't kill are skipped,
+# attackers left over chip in on whatever they reach that isn't already dead
+
+
+cdef struct Shot:
+    double damage
+    Py_ssize_t attacker
+
+
+cdef int _larger_shot_first(const void* a, const void* b) noexcept nogil:
+    cdef const Shot* x = <const Shot*>a
+    cdef const Shot* y = <const Shot*>b
+    if x.damage != y.damage:
+        return -1 if x.damage > y.damage else 1
+    return -1 if x.attacker < y.attacker else (1 if x.attacker > y.attacker else 0)
+
+
+@boundscheck(False)
+@wraparound(False)
+cdef void _assign_kills(
+    const Py_ssize_t[::1] enemy_offsets,
+    const Py_ssize_t[::1] edge_order,
+    const Py_ssize_t[::1] edge_attackers,
+    const double[::1] edge_damage,
+    const Py_ssize_t[::1] priority,
+    double[::1] remaining,
+    Py_ssize_t[::1] assignment,
+    Shot* shots,
+) noexcept nogil:
+    cdef Py_ssize_t p, j, k, e, num_shots, first, last
+    cdef double total
+    for p in range(priority.shape[0]):
+        j = priority[p]
+        if remaining[j] <= KILL_EPSILON:
+            continue
+        num_shots = 0
+        total = 0.0
+        for k in range(enemy_offsets[j], enemy_offsets[j + 1]):
+            e = edge_order[k]
+            if assignment[edge_attackers[e]] < 0 and edge_damage[e] > 0:
+                shots[num_shots].damage = edge_damage[e]
+                shots[num_shots].attacker = edge_attackers[e]
+                total += edge_damage[e]
+                num_shots += 1
+        if total < remaining[j]:
+            continue
+        qsort(shots, num_shots, sizeof(Shot), _larger_shot_first)
+        first = 0
+        # shots taken off one by one can leave a rounding sliver of the health they sum to
+        while first < num_shots and remaining[j] > KILL_EPSILON:
+            if shots[first].damage >= remaining[j]:
+                # the smallest shot that still kills, the earliest attacker among equal ones
+                last = num_shots - 1
+                while shots[last].damage < remaining[j]:
+                    last -= 1
+                while last > first and shots[last - 1].damage == shots[last].damage:
+                    last -= 1
+                assignment[shots[last].attacker] = j
+                remaining[j] -= shots[last].damage
+            else:
+                assignment[shots[first].attacker] = j
+                remaining[j] -= shots[first].damage
+                first += 1
+
+
+@boundscheck(False)
+@wraparound(False)
+cdef void _assign_leftovers(
+    const Py_ssize_t[::1] offsets,
+    const Py_ssize_t[::1] indices,
+    const double[::1] edge_damage,
+    const double[::1] priority_value,
+    double[::1] remaining,
+    Py_ssize_t[::1] assignment,
+) noexcept nogil:
+    cdef Py_ssize_t i, e, j, best, best_edge
+    for i in range(assignment.shape[0]):
+        if assignment[i] >= 0:
+            continue
+        best = -1
+        best_edge = -1
+        for e in range(offsets[i], offsets[i + 1]):
+            j = indices[e]
+            # enemies still alive by value per hit point, otherwise the least overkill
+            if best < 0 or (
+                remaining[j] > KILL_EPSILON
+                and (remaining[best] <= KILL_EPSILON or priority_value[j] > priority_value[best])
+            ) or (
+                remaining[j] <= KILL_EPSILON and remaining[best] <= KILL_EPSILON and remaining[j] > remaining[best]
+            ):
+                best = j
+                best_edge = e
+        if best >= 0:
+            assignment[i] = best
+            remaining[best] -= edge_damage[best_edge]
+
+
+@boundscheck(False)
+@wraparound(False)
+cpdef cnp.ndarray cy_assign_targets(object attackers, object enemies, object in_range = None):
+    """
+
+    Spread attackers over enemies so one volley kills the most value with the least overkill.
+
+    Parameters
+    ----------
+    attackers :
+        Units that shoot.
+    enemies :
+        Units that can be shot.
+    in_range : tuple, optional
+        (offsets, indices) of the enemies each attacker can shoot, as returned by
+        `cy_attack_range_matrix`, each enemy at most once per attacker. Defaults to
+        None indicating it is computed here.
+
+    Returns
+    -------
+    np.ndarray :
+        Index into `enemies` of each attacker's target, -1 if it has none.
+
+    """
+    cdef:
+        Py_ssize_t num_attackers = len(attackers)
+        Py_ssize_t num_enemies = len(enemies)
+        Py_ssize_t num_units = num_attackers + num_enemies
+        Py_ssize_t i, j, e
+        int slot
+        unsigned char[::1] fighter_view = np.empty((num_units + 1) * sizeof(Fighter), dtype=np.uint8)
+        Fighter* army = <Fighter*>&fighter_view[0]
+        Fighter* targets = army + num_attackers
+        const Py_ssize_t[::1] offsets
+        const Py_ssize_t[::1] indices
+        cnp.ndarray edge_attackers
+        cnp.ndarray health = np.empty(num_enemies, dtype=np.float64)
+        cnp.ndarray values = np.empty(num_enemies, dtype=np.float64)
+        double[::1] health_view = health
+        double[::1] value_view = values
+        double[::1] edge_damage
+        cnp.ndarray assignment = np.full(num_attackers, -1, dtype=np.intp)
+        const Py_ssize_t[::1] edge_order_view
+        const Py_ssize_t[::1] enemy_offset_view
+        const Py_ssize_t[::1] edge_attacker_view
+        const Py_ssize_t[::1] priority_view
+        const double[::1] priority_value_view
+        Py_ssize_t[::1] assignment_view
+        Shot* shots
+
+    if in_range is None:
+        in_range = cy_attack_range_matrix(attackers, enemies)[0]
+    offsets = np.asarray(in_range[0], dtype=np.intp)
+    indices = np.asarray(in_range[1], dtype=np.intp)
+    if (
+        offsets.shape[0] != num_attackers + 1
+        or offsets[0] != 0
+        or offsets[num_attackers] != indices.shape[0]
+        or np.any(np.diff(offsets) < 0)
+    ):
+        raise ValueError(f"in_range must hold increasing offsets for {num_attackers} attackers and their indices")
+    if indices.shape[0] and (np.min(indices) < 0 or np.max(indices) >= num_enemies):
+        raise ValueError(f"in_range indices must be in [0, {num_enemies})")
+    if indices.shape[0] == 0:
+        return assignment
+    edge_attackers = np.repeat(np.arange(num_attackers, dtype=np.intp), np.diff(offsets))
+    # an enemy at most once per attacker, so no enemy has more shots than there are attackers
+    sorted_edges = np.lexsort((indices, edge_attackers))
+    if np.any(
+        (np.diff(edge_attackers[sorted_edges]) == 0) & (np.diff(np.asarray(indices)[sorted_edges]) == 0)
+    ):
+        raise ValueError("in_range must not list an enemy twice for the same attacker")
+
+    _pack_army(attackers, army)
+    _pack_army(enemies, targets)
+    edge_damage = np.zeros(indices.shape[0], dtype=np.float64)
+    with nogil:
+        for i in range(num_attackers):
+            for e in range(offsets[i], offsets[i + 1]):
+                slot = _weapon_slot(&army[i], &targets[indices[e]])
+                if slot >= 0:
+                    edge_damage[e] = _shot_damage(&army[i], &targets[indices[e]], slot)
+        for j in range(num_enemies):
+            health_view[j] = targets[j].health + targets[j].shield
+            value_view[j] = targets[j].stats.army_value
+
+    # the attackers of each enemy, as offsets into the edges sorted by enemy
+    edge_order = np.argsort(indices, kind="stable").astype(np.intp)
+    enemy_offsets = np.zeros(num_enemies + 1, dtype=np.intp)
+    np.cumsum(np.bincount(indices, minlength=num_enemies), out=enemy_offsets[1:])
+    priority_value = values / np.maximum(health, 1.0)
+    # ties go to the weaker, then the earlier enemy
+    priority = np.lexsort((np.arange(num_enemies), health, -priority_value)).astype(np.intp)
+    edge_order_view = edge_order
+    enemy_offset_view = enemy_offsets
+    edge_attacker_view = edge_attackers
+    priority_view = priority
+    priority_value_view = priority_value
+    assignment_view = assignment
+
+    shots = <Shot*>PyMem_RawMalloc(max(num_attackers, 1) * sizeof(Shot))
+    if not shots:
+        raise MemoryError("Could not allocate target assignment memory")
+    try:
+        with nogil:
+            _assign_kills(
+                enemy_offset_view, edge_order_view, edge_attacker_view, edge_damage,
+                priority_view, health_view, assignment_view, shots
+            )
+            _assign_leftovers(offsets, indices, edge_damage, priority_value_view, health_view, assignment_view)
+    finally:
+        PyMem_RawFree(shots)
+    return assignment
@@ -6,6 +6,8 @@ from sc2.position import Point2
 from sc2.unit import Unit
 from sc2.units import Units
 
+from cython_extensions.unit_snapshot import UnitSnapshot
+
 def cy_attack_ready(ai: BotAI, unit: Unit, target: Unit) -> bool:
     """Check if the unit is ready to attack the target.
 
@@ -38,6 +40,50 @@ def cy_attack_ready(ai: BotAI, unit: Unit, target: Unit) -> bool:
     """
     ...
 
+def cy_attack_ready_many(
+    ai: BotAI,
+    units: Union[Units, list[Unit]],
+    targets: Union[Units, list[Unit], np.ndarray],
+    snapshot: Optional[UnitSnapshot] = None,
+) -> np.ndarray:
+    """Check which units are ready to attack their target, like `cy_attack_ready`.
+
+    One call covers the whole army. The game step is read once, and turn
+    rates come from an array indexed by type id instead of a dict. Targets
+    can be units or indices into a `UnitSnapshot`; with indices, no target
+    attributes are read at all.
+
+    Example:
+    ```py
+    from cython_extensions import cy_attack_ready_many, cy_unit_snapshot
+
+    snapshot = cy_unit_snapshot(self)
+    ready = cy_attack_ready_many(self, units, target_indices, snapshot)
+    for unit, target_index, unit_ready in zip(units, target_indices, ready):
+        if unit_ready:
+            unit.attack(snapshot.units[target_index])
+    ```
+
+    ```
+    100 units:
+    cy_attack_ready_many with target units: 90 µs
+    cy_attack_ready_many with snapshot indices: 71 µs
+    cy_attack_ready in a loop: 141 µs
+    ```
+
+    Args:
+        ai: Bot object that will be running the game.
+        units: The units we want to check.
+        targets: The target of each unit, or with `snapshot`, the index of
+            each target in the snapshot.
+        snapshot: Snapshot the target indices refer to. Targets count as flying
+            when their snapshot flags say so.
+
+    Returns:
+        Boolean mask of the units ready to attack their target.
+    """
+    ...
+
 def cy_is_facing(unit: Unit, other_unit: int, angle_error: float) -> bool:
     """Get turn speed of unit in radians
 
@@ -97,15 +143,21 @@ def cy_pick_enemy_target(enemies: Union[Units, list[Unit]]) -> Unit:
     ...
 
 def cy_find_aoe_position(
-    effect_radius: float, targets: Union[Units, list[Unit]], bonus_tags: set[int] = None
+    effect_radius: float,
+    targets: Union[Units, list[Unit]],
+    min_units: int = 1,
+    bonus_tags: set[int] = None,
+    use_differential_evolution: bool = False,
 ) -> Optional[np.ndarray]:
     """Find best splash target given a group of enemies.
 
     Big thanks to idontcodethisgame for the original code in Eris
 
-    WARNING: Please don't spam this function, it's fine to use as required
-    but is costly. For example: only use this if unit ability is ready,
-    only if enemy are in combat range etc.
+    The best spot is found exactly and deterministically: every target
+    position and every intersection of the circles targets can be hit from
+    is scored, see `cy_find_aoe_center`. The previous SciPy
+    differential evolution search is still available with
+    `use_differential_evolution=True`.
 
     Example:
     ```py
@@ -131,10 +183,23 @@ def cy_find_aoe_position(
                     unit(AbilityId.EFFECT_CORROSIVEBILE, Point2(pos))
     ```
 
+    ```
+    100 targets:
+    cy_find_aoe_position: 0.43 ms
+    cy_find_aoe_position with differential evolution: 77 ms
+    ```
+
     Args:
         effect_radius: The radius of the effect (range).
         targets: All enemy units we would like to check.
-        bonus_tags: If provided, give more value to these enemy tags.
+        min_units: Only positions hitting at least this many units are
+            considered, None if there are none. Ignored by the differential
+            evolution search.
+        bonus_tags: If provided, hitting one of these enemies is worth two
+            units, so the position moves towards them. `min_units` still
+            counts units. The differential evolution search adds the same
+            flat bonus wherever the effect lands, so it doesn't move.
+        use_differential_evolution: Use the previous SciPy search instead.
 
     Returns:
         A 1D numpy array containing x and y coordinates of aoe position,
@@ -142,6 +207,147 @@ def cy_find_aoe_position(
     """
     ...
 
+def cy_find_aoe_center(
+    effect_radius: float,
+    positions: np.ndarray,
+    radii: Optional[np.ndarray] = None,
+    weights: Optional[np.ndarray] = None,
+) -> tuple[Optional[tuple[float, float]], int]:
+    """Find where an AoE effect hits the most targets, and how many it hits.
+
+    Array version of `cy_find_aoe_position`. An effect hits a target when
+    it touches the target circle, so the best spot is a target position or
+    an intersection of two of the circles the targets can be hit from.
+    All of these are scored in C, and the first best one wins, so the same
+    input always gives the same result. The center is then moved to the
+    middle of the targets it hits if it still hits as much, to leave room
+    for them to move.
+
+    Example:
+    ```py
+    import numpy as np
+    from cython_extensions import cy_find_aoe_center
+
+    enemies = self.enemy_units
+    positions = np.array([u.position for u in enemies], dtype=np.float64)
+    radii = np.array([u.radius for u in enemies], dtype=np.float64)
+    center, num_hits = cy_find_aoe_center(1.375, positions, radii)
+    if num_hits >= 3:
+        ravager(AbilityId.EFFECT_CORROSIVEBILE, Point2(center))
+    ```
+
+    ```
+    100 targets: 0.39 ms
+    ```
+
+    Args:
+        effect_radius: The radius of the effect.
+        positions: (N, 2) float64 array of target positions.
+        radii: Target radii, defaults to point targets.
+        weights: How much hitting each target is worth. Targets with weight
+            0 are ignored. Defaults to 1 for every target.
+
+    Returns:
+        The best center or None when there is nothing to hit, and the number
+        of targets it hits.
+    """
+    ...
+
+def cy_find_aoe_positions(
+    effect_radius: float,
+    targets: Union[Units, list[Unit]],
+    k: int,
+    min_units: int = 1,
+    bonus_tags: set[int] = None,
+) -> list[np.ndarray]:
+    """Find AoE positions for several casters without overlapping targets.
+
+    Calling `cy_find_aoe_position` once per caster gives every caster the
+    same spot. Here each position only counts units that no earlier
+    position hits, and all positions come from one shared set of
+    candidates, see `cy_find_aoe_centers`.
+
+    Example:
+    ```py
+    from cython_extensions import cy_find_aoe_positions
+    from sc2.ids.ability_id import AbilityId
+    from sc2.ids.unit_typeid import UnitTypeId
+    from sc2.position import Point2
+
+    templars = self.units(UnitTypeId.HIGHTEMPLAR).filter(lambda u: u.energy >= 75)
+    positions = cy_find_aoe_positions(
+        1.5, self.enemy_units, len(templars), min_units=4
+    )
+    for templar, pos in zip(templars, positions):
+        templar(AbilityId.PSISTORM_PSISTORM, Point2(pos))
+    ```
+
+    ```
+    100 targets, 4 positions: 0.52 ms
+    ```
+
+    Args:
+        effect_radius: The radius of the effect (range).
+        targets: All enemy units we would like to check.
+        k: The most positions to return, for example one per caster.
+        min_units: Only return positions that hit at least this many
+            units not already hit by an earlier position.
+        bonus_tags: If provided, hitting one of these enemies is worth two
+            units, as in `cy_find_aoe_position`, so positions move towards
+            them. `min_units` still counts units.
+
+    Returns:
+        Up to `k` 1D numpy arrays of x and y coordinates, best first.
+    """
+    ...
+
+def cy_find_aoe_centers(
+    effect_radius: float,
+    positions: np.ndarray,
+    k: int,
+    radii: Optional[np.ndarray] = None,
+    weights: Optional[np.ndarray] = None,
+    min_hits: int = 1,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Find up to `k` AoE centers that together hit the most targets.
+
+    Array version of `cy_find_aoe_positions`. The candidates of
+    `cy_find_aoe_center` are generated once and picked greedily. After each
+    pick, the targets it hits stop counting. Gains only shrink, so a heap of
+    possibly stale gains is enough: a candidate is only rescored when it
+    reaches the top (lazy greedy).
+
+    Example:
+    ```py
+    import numpy as np
+    from cython_extensions import cy_find_aoe_centers
+
+    enemies = self.enemy_units
+    positions = np.array([u.position for u in enemies], dtype=np.float64)
+    radii = np.array([u.radius for u in enemies], dtype=np.float64)
+    centers, num_hits = cy_find_aoe_centers(2.0, positions, 3, radii, min_hits=3)
+    ```
+
+    ```
+    100 targets, 4 centers: 0.52 ms
+    ```
+
+    Args:
+        effect_radius: The radius of each effect.
+        positions: (N, 2) float64 array of target positions.
+        k: The most centers to return.
+        radii: Target radii, defaults to point targets.
+        weights: How much hitting each target is worth. Targets with weight
+            0 are ignored. Defaults to 1 for every target.
+        min_hits: Only place effects hitting at least this many targets not
+            already hit by an earlier effect.
+
+    Returns:
+        (M, 2) float64 array of centers, best first, and the number of new
+        targets each of them hits, with M <= k.
+    """
+    ...
+
 def cy_adjust_moving_formation(
     our_units: Union[Units, list[Unit]],
     target: Union[Point2, tuple[float, float]],
@@ -12,9 +12,25 @@ from cython_extensions.turn_rate import TURN_RATE
 from cython_extensions.unit_data import UNIT_DATA
 from cython_extensions.units_utils import cy_center, cy_find_units_center_mass
 
+from cpython.mem cimport PyMem_RawFree, PyMem_RawMalloc, PyMem_RawRealloc
+
+from cython_extensions.spatial_grid cimport SpatialGrid
+from cython_extensions.unit_snapshot cimport FLAG_FLYING, UnitSnapshot
+
 UNIT_DATA_INT_KEYS = {k.value: v for k, v in UNIT_DATA.items()}
 TURN_RATE_INT_KEYS = {k.value: v for k, v in TURN_RATE.items()}
 
+
+cdef double[::1] _turn_speeds_by_type():
+    # cy_get_turn_speed for every type id, so batches index an array instead of a dict
+    cdef double[::1] speeds = np.full(max(TURN_RATE_INT_KEYS) + 1, 500.0 * 1.4 * pi / 180)
+    for type_id_int, turn_rate in TURN_RATE_INT_KEYS.items():
+        speeds[type_id_int] = turn_rate * 1.4 * pi / 180
+    return speeds
+
+cdef double[::1] TURN_SPEED_BY_TYPE = _turn_speeds_by_type()
+cdef double DEFAULT_TURN_SPEED = 500.0 * 1.4 * pi / 180
+
 cpdef double cy_get_turn_speed(unit, unsigned int unit_type_int):
     """Returns turn speed of unit in radians"""
     cdef double turn_rate
@@ -93,6 +109,91 @@ cpdef bint cy_attack_ready(bot, unit, target):
 
     return step_time + turn_time + move_time >= weapon_cooldown / 22.4
 
+cpdef np.ndarray cy_attack_ready_many(bot, object units, object targets, UnitSnapshot snapshot = None):
+    """
+    `cy_attack_ready` for many units at once.
+
+    Parameters
+    ----------
+    bot :
+        The bot, for the game step.
+    units :
+        Units that want to attack.
+    targets :
+        The target of each unit, or with `snapshot`, the index of each target in it.
+    snapshot :
+        Snapshot the target indices refer to. Targets count as flying when their
+        snapshot flags say so. Defaults to None indicating `targets` are units.
+
+    Returns
+    -------
+    np.ndarray :
+        Boolean mask of the units that are ready to attack their target.
+
+    """
+    cdef:
+        Py_ssize_t num_units = len(units)
+        Py_ssize_t i, j
+        unsigned int unit_type_int
+        int weapon_cooldown
+        double step_time = bot.client.game_step / 22.4
+        double angle, distance, facing, move_time, turn_time, turn_speed, unit_speed
+        double target_radius, unit_range
+        bint target_flying
+        # positions are floats, as in cy_attack_ready
+        float unit_x, unit_y, target_x, target_y
+        const Py_ssize_t[::1] target_indices
+        np.ndarray ready = np.zeros(num_units, dtype=np.bool_)
+        unsigned char[::1] ready_view = ready.view(np.uint8)
+
+    if len(targets) != num_units:
+        raise ValueError(f"targets must have one entry per unit, got {len(targets)} for {num_units} units")
+    if snapshot is not None:
+        target_indices = np.asarray(targets, dtype=np.intp)
+        if num_units and (np.min(target_indices) < 0 or np.max(target_indices) >= snapshot.num_units):
+            raise ValueError(f"target indices must be in [0, {snapshot.num_units})")
+
+    # fields with a plain python-sc2 property are read from the proto directly
+    for i in range(num_units):
+        unit = units[i]
+        proto = unit._proto
+        unit_type_int = proto.unit_type
+        if unit_type_int == 503:  # 503 == UnitID.LURKERMPBURROWED
+            ready_view[i] = True
+            continue
+        if not unit.can_attack:
+            continue
+        if snapshot is not None:
+            j = target_indices[i]
+            target_x = snapshot.xs[j]
+            target_y = snapshot.ys[j]
+            target_radius = snapshot.radii[j]
+            target_flying = snapshot.flag_bits[j] & FLAG_FLYING
+        else:
+            target = targets[i]
+            target_x, target_y = target.position
+            target_radius = target._proto.radius
+            target_flying = target.is_flying
+        unit_x, unit_y = unit.position
+        unit_range = unit.air_range if unit.can_attack_air and target_flying else unit.ground_range
+        weapon_cooldown = proto.weapon_cooldown
+
+        turn_speed = TURN_SPEED_BY_TYPE[unit_type_int] if unit_type_int < TURN_SPEED_BY_TYPE.shape[0] else DEFAULT_TURN_SPEED
+        # cy_angle_diff(unit.facing, cy_angle_to(unit_pos, target_pos)) without the Python calls
+        facing = proto.facing
+        angle = atan2(target_x - unit_x, target_y - unit_y)
+        if facing < 0:
+            facing += pi * 2
+        if angle < 0:
+            angle += pi * 2
+        turn_time = fabs(facing - angle) / turn_speed
+        distance = ((<double>unit_x - <double>target_x) ** 2 + (<double>unit_y - <double>target_y) ** 2) ** 0.5
+        distance = max(0, distance - proto.radius - target_radius - unit_range)
+        unit_speed = (unit.real_speed + 1e-16) * 1.4
+        move_time = distance / unit_speed
+        ready_view[i] = step_time + turn_time + move_time >= weapon_cooldown / 22.4
+    return ready
+
 cpdef object cy_pick_enemy_target(object enemies):
     """For best enemy target from the provided enemies
     TODO: If there are multiple units that can be killed, pick the highest value one
@@ -118,8 +219,8 @@ cpdef object cy_pick_enemy_target(object enemies):
     return returned_unit
 
 cdef (double, double) rotate_by_angle((double, double) vec, double angle):
-    cdef double cos_angle = np.cos(angle)
-    cdef double sin_angle = np.sin(angle)
+    cdef double cos_angle = cos(angle)
+    cdef double sin_angle = sin(angle)
     cdef double new_x = vec[0] * cos_angle - vec[1] * sin_angle
     cdef double new_y = vec[0] * sin_angle + vec[1] * cos_angle
     return (new_x, new_y)
@@ -142,6 +243,7 @@ cpdef dict cy_adjust_moving_formation(
         double c_distance = 0.0
         list core_units = []
         list fodder_units = []
+        set fodder_tag_set
 
     len_fodder_tags = len(fodder_tags)
 
@@ -156,10 +258,10 @@ cpdef dict cy_adjust_moving_formation(
     our_adjusted_position = (our_center[0] - target[0], our_center[1] - target[1])
 
     # use atan2 to get the angle
-    angle_to_origin = np.arctan2(our_adjusted_position[1], our_adjusted_position[0])
+    angle_to_origin = atan2(our_adjusted_position[1], our_adjusted_position[0])
 
     # We need sine and cosine so that we can give the correct retreat position
-    sincos = (np.sin(angle_to_origin), np.cos(angle_to_origin))
+    sincos = (sin(angle_to_origin), cos(angle_to_origin))
 
     # Rotate offsets by +/- retreat angle degrees so that core units move diagonally backwards
     core_left_rotate = rotate_by_angle((sincos[1], sincos[0]), retreat_angle)
@@ -170,8 +272,9 @@ cpdef dict cy_adjust_moving_formation(
     core_right_x_offset = core_right_rotate[1] * unit_multiplier
     core_right_y_offset = core_right_rotate[0] * unit_multiplier
 
+    fodder_tag_set = set(fodder_tags)
     for unit in our_units:
-        if unit.tag in fodder_tags:
+        if unit.tag in fodder_tag_set:
             fodder_units.append(unit)
         else:
             core_units.append(unit)
@@ -250,21 +353,502 @@ cdef double f_wrapper(
 ):
     return optimization_function(params, targets, effect_radius, bonus_tags)
 
+# slack for centers on the edge of the effect, circle intersections land there
+cdef double AOE_EPSILON = 1e-6
+
+
+cdef int _circle_intersections(
+    double x1, double y1, double r1, double x2, double y2, double r2, double* out
+) noexcept nogil:
+    # writes the points where the two circles cross to `out` as x, y pairs, returns their number.
+    # Circles inside each other don't cross, their centers are candidates of their own
+    cdef double dx = x2 - x1
+    cdef double dy = y2 - y1
+    cdef double d = sqrt(dx * dx + dy * dy)
+    cdef double a, h
+    if d == 0 or d > r1 + r2 or d < fabs(r1 - r2):
+        return 0
+    a = (r1 * r1 - r2 * r2 + d * d) / (2 * d)
+    h = sqrt(max(r1 * r1 - a * a, 0.0))
+    out[0] = x1 + (a * dx + h * dy) / d
+    out[1] = y1 + (a * dy - h * dx) / d
+    out[2] = x1 + (a * dx - h * dy) / d
+    out[3] = y1 + (a * dy + h * dx) / d
+    return 2
+
+
+cdef double _aoe_score(
+    SpatialGrid grid,
+    const double[::1] weights,
+    double x,
+    double y,
+    double effect_radius,
+    Py_ssize_t* hits,
+    Py_ssize_t* num_hits,
+) noexcept nogil:
+    # weighted number of targets an effect at (x, y) hits, targets without weight don't count
+    cdef Py_ssize_t count = grid._radius_nogil(x, y, effect_radius + AOE_EPSILON, hits)
+    cdef Py_ssize_t m
+    cdef double score = 0.0
+    num_hits[0] = 0
+    for m in range(count):
+        if weights[hits[m]] > 0:
+            score += weights[hits[m]]
+            num_hits[0] += 1
+    return score
+
+
+cdef (double, double) _middle_of_hits(
+    SpatialGrid grid,
+    const double[:, ::1] positions,
+    const double[::1] weights,
+    double x,
+    double y,
+    double effect_radius,
+    Py_ssize_t* hits,
+) noexcept nogil:
+    # intersections sit on the edge of the effect, the middle of the targets it hits
+    # gives some room for them to move. Callers keep it when it hits at least as much
+    cdef Py_ssize_t count = grid._radius_nogil(x, y, effect_radius + AOE_EPSILON, hits)
+    cdef Py_ssize_t m
+    cdef Py_ssize_t num_hits = 0
+    cdef double sum_x = 0.0, sum_y = 0.0
+    for m in range(count):
+        if weights[hits[m]] > 0:
+            sum_x += positions[hits[m], 0]
+            sum_y += positions[hits[m], 1]
+            num_hits += 1
+    if num_hits == 0:
+        return x, y
+    return sum_x / num_hits, sum_y / num_hits
+
+
+cdef (double, double, double, Py_ssize_t) _best_aoe_center(
+    SpatialGrid grid,
+    const double[:, ::1] positions,
+    const double[::1] radii,
+    const double[::1] weights,
+    double effect_radius,
+    Py_ssize_t* neighbours,
+    Py_ssize_t* hits,
+) noexcept nogil:
+    # An effect at c hits target i when c lies in the circle of radius effect_radius + radii[i]
+    # around it. The best spot is a corner of the area where most of these circles overlap,
+    # so either a target position or an intersection of two circle boundaries. Both are
+    # tried for every pair of targets close enough to be hit together
+    cdef:
+        Py_ssize_t num_targets = positions.shape[0]
+        Py_ssize_t i, j, m, side, count, num_hits
+        int num_points
+        Py_ssize_t best_hits = 0
+        double best_x = 0.0, best_y = 0.0, best_score = 0.0
+        double x, y, ri, score
+        double points[4]
+
+    for i in range(num_targets):
+        if weights[i] <= 0:
+            continue
+        x = positions[i, 0]
+        y = positions[i, 1]
+        score = _aoe_score(grid, weights, x, y, effect_radius, hits, &num_hits)
+        if score > best_score:
+            best_score, best_x, best_y, best_hits = score, x, y, num_hits
+
+        ri = effect_radius + radii[i]
+        count = grid._radius_nogil(x, y, 2 * effect_radius + radii[i] + AOE_EPSILON, neighbours)
+        for m in range(count):
+            j = neighbours[m]
+            if j <= i or weights[j] <= 0:
+                continue
+            num_points = _circle_intersections(
+                x, y, ri, positions[j, 0], positions[j, 1], effect_radius + radii[j], points
+            )
+            for side in range(num_points):
+                score = _aoe_score(
+                    grid, weights, points[2 * side], points[2 * side + 1], effect_radius, hits, &num_hits
+                )
+                if score > best_score:
+                    best_score, best_x, best_y, best_hits = score, points[2 * side], points[2 * side + 1], num_hits
+
+    if best_hits > 1:
+        x, y = _middle_of_hits(grid, positions, weights, best_x, best_y, effect_radius, hits)
+        score = _aoe_score(grid, weights, x, y, effect_radius, hits, &num_hits)
+        if score >= best_score:
+            best_score, best_x, best_y, best_hits = score, x, y, num_hits
+    return best_x, best_y, best_score, best_hits
+
+
+cpdef tuple cy_find_aoe_center(
+    double effect_radius,
+    const double[:, ::1] positions,
+    object radii = None,
+    object weights = None,
+):
+    """
+    Find where an AoE effect hits the most targets, deterministically.
+
+    Parameters
+    ----------
+    effect_radius : double
+        The radius of the effect.
+    positions : const double[:, ::1]
+        (N, 2) float64 buffer of target positions.
+    radii : np.ndarray, optional
+        Target radii, an effect touching the edge of a target hits it.
+        Defaults to None indicating point targets.
+    weights : np.ndarray, optional
+        How much hitting each target is worth, targets with weight 0 are ignored.
+        Defaults to None indicating 1 for every target.
+
+    Returns
+    -------
+    tuple :
+        The best center as (x, y) or None when nothing can be hit, and the number
+        of targets hit.
+
+    """
+    cdef:
+        Py_ssize_t num_targets = positions.shape[0]
+        const double[::1] radius_view
+        const double[::1] weight_view
+        Py_ssize_t* neighbours
+        Py_ssize_t* hits
+        double x, y, score
+        Py_ssize_t num_hits
+
+    if radii is None:
+        radius_view = np.zeros(num_targets, dtype=np.float64)
+    else:
+        radius_view = radii
+    if weights is None:
+        weight_view = np.ones(num_targets, dtype=np.float64)
+    else:
+        weight_view = weights
+    if radius_view.shape[0] != num_targets or weight_view.shape[0] != num_targets:
+        raise ValueError(f"radii and weights must have one entry per position, expected {num_targets}")
+    if num_targets == 0:
+        return None, 0
+
+    grid = SpatialGrid(positions, radius_view, 0.0)
+    neighbours = <Py_ssize_t*>PyMem_RawMalloc(num_targets * sizeof(Py_ssize_t))
+    hits = <Py_ssize_t*>PyMem_RawMalloc(num_targets * sizeof(Py_ssize_t))
+    try:
+        if not neighbours or not hits:
+            raise MemoryError("Could not allocate AoE memory")
+        with nogil:
+            x, y, score, num_hits = _best_aoe_center(
+                grid, positions, radius_view, weight_view, effect_radius, neighbours, hits
+            )
+    finally:
+        PyMem_RawFree(neighbours)
+        PyMem_RawFree(hits)
+    if num_hits == 0:
+        return None, 0
+    return (x, y), num_hits
+
+
+cdef struct AoeCandidates:
+    double* xy
+    Py_ssize_t size
+    Py_ssize_t capacity
+
+
+cdef int _push_candidate(AoeCandidates* candidates, double x, double y) noexcept nogil:
+    cdef Py_ssize_t new_capacity
+    cdef double* new_xy
+    if candidates.size == candidates.capacity:
+        new_capacity = max(2 * candidates.capacity, 64)
+        new_xy = <double*>PyMem_RawRealloc(candidates.xy, 2 * new_capacity * sizeof(double))
+        if not new_xy:
+            return -1
+        candidates.xy = new_xy
+        candidates.capacity = new_capacity
+    candidates.xy[2 * candidates.size] = x
+    candidates.xy[2 * candidates.size + 1] = y
+    candidates.size += 1
+    return 0
+
+
+cdef inline bint _gain_before(
+    double* gains, Py_ssize_t* ids, Py_ssize_t a, Py_ssize_t b
+) noexcept nogil:
+    # max heap on gain, ties go to the earlier candidate
+    return gains[a] > gains[b] or (gains[a] == gains[b] and ids[a] < ids[b])
+
+
+cdef void _gain_sift_down(double* gains, Py_ssize_t* ids, Py_ssize_t i, Py_ssize_t size) noexcept nogil:
+    cdef Py_ssize_t child
+    cdef double move_gain
+    cdef Py_ssize_t move_id
+    while 2 * i + 1 < size:
+        child = 2 * i + 1
+        if child + 1 < size and _gain_before(gains, ids, child + 1, child):
+            child += 1
+        if not _gain_before(gains, ids, child, i):
+            break
+        move_gain = gains[i]
+        move_id = ids[i]
+        gains[i] = gains[child]
+        ids[i] = ids[child]
+        gains[child] = move_gain
+        ids[child] = move_id
+        i = child
+
+
+cdef Py_ssize_t _greedy_aoe_centers(
+    SpatialGrid grid,
+    const double[:, ::1] positions,
+    const double[::1] radii,
+    double[::1] weights,
+    double effect_radius,
+    Py_ssize_t k,
+    Py_ssize_t min_hits,
+    Py_ssize_t* neighbours,
+    Py_ssize_t* hits,
+    double[:, ::1] centers,
+    Py_ssize_t[::1] hit_counts,
+) noexcept nogil:
+    # Lazy greedy over the candidates of `_best_aoe_center`. Targets that are hit get their
+    # weight set to 0, so gains only shrink and a candidate whose gain is up to date after
+    # the last pick and still on top of the heap is the best next pick.
+    # Returns the number of centers written, or -1 when out of memory
+    cdef:
+        Py_ssize_t num_targets = positions.shape[0]
+        Py_ssize_t i, j, m, c, side, count, num_hits, size
+        Py_ssize_t picked = 0
+        int num_points
+        double x, y, gain, middle_gain
+        double points[4]
+        AoeCandidates candidates
+        double* gains = NULL
+        Py_ssize_t* ids = NULL
+        Py_ssize_t* counts = NULL
+        Py_ssize_t* stamps = NULL
+
+    candidates.xy = NULL
+    candidates.size = 0
+    candidates.capacity = 0
+    for i in range(num_targets):
+        if weights[i] <= 0:
+            continue
+        x = positions[i, 0]
+        y = positions[i, 1]
+        if _push_candidate(&candidates, x, y) != 0:
+            PyMem_RawFree(candidates.xy)
+            return -1
+        count = grid._radius_nogil(x, y, 2 * effect_radius + radii[i] + AOE_EPSILON, neighbours)
+        for m in range(count):
+            j = neighbours[m]
+            if j <= i or weights[j] <= 0:
+                continue
+            num_points = _circle_intersections(
+                x, y, effect_radius + radii[i], positions[j, 0], positions[j, 1], effect_radius + radii[j], points
+            )
+            for side in range(num_points):
+                if _push_candidate(&candidates, points[2 * side], points[2 * side + 1]) != 0:
+                    PyMem_RawFree(candidates.xy)
+                    return -1
+
+    size = candidates.size
+    gains = <double*>PyMem_RawMalloc(max(size, 1) * sizeof(double))
+    ids = <Py_ssize_t*>PyMem_RawMalloc(max(size, 1) * sizeof(Py_ssize_t))
+    counts = <Py_ssize_t*>PyMem_RawMalloc(max(size, 1) * sizeof(Py_ssize_t))
+    stamps = <Py_ssize_t*>PyMem_RawMalloc(max(size, 1) * sizeof(Py_ssize_t))
+    if not gains or not ids or not counts or not stamps:
+        picked = -1
+    else:
+        for c in range(size):
+            gains[c] = _aoe_score(
+                grid, weights, candidates.xy[2 * c], candidates.xy[2 * c + 1], effect_radius, hits, &counts[c]
+            )
+            ids[c] = c
+            stamps[c] = 0
+        # counts are indexed by candidate, gains and ids by heap position
+        c = size // 2
+        while c > 0:
+            c -= 1
+            _gain_sift_down(gains, ids, c, size)
+
+        while picked < k and size > 0:
+            c = ids[0]
+            if stamps[c] != picked:
+                gains[0] = _aoe_score(
+                    grid, weights, candidates.xy[2 * c], candidates.xy[2 * c + 1], effect_radius, hits, &counts[c]
+                )
+                stamps[c] = picked
+                _gain_sift_down(gains, ids, 0, size)
+                continue
+            if gains[0] <= 0 or counts[c] < min_hits:
+                # hit counts only shrink as well, this candidate is done for good
+                size -= 1
+                gains[0] = gains[size]
+                ids[0] = ids[size]
+                _gain_sift_down(gains, ids, 0, size)
+                continue
+
+            x = candidates.xy[2 * c]
+            y = candidates.xy[2 * c + 1]
+            num_hits = counts[c]
+            if num_hits > 1:
+                x, y = _middle_of_hits(grid, positions, weights, x, y, effect_radius, hits)
+                middle_gain = _aoe_score(grid, weights, x, y, effect_radius, hits, &num_hits)
+                if middle_gain < gains[0]:
+                    x = candidates.xy[2 * c]
+                    y = candidates.xy[2 * c + 1]
+                    num_hits = counts[c]
+            count = grid._radius_nogil(x, y, effect_radius + AOE_EPSILON, hits)
+            for m in range(count):
+                weights[hits[m]] = 0.0
+            centers[picked, 0] = x
+            centers[picked, 1] = y
+            hit_counts[picked] = num_hits
+            picked += 1
+
+    PyMem_RawFree(candidates.xy)
+    PyMem_RawFree(gains)
+    PyMem_RawFree(ids)
+    PyMem_RawFree(counts)
+    PyMem_RawFree(stamps)
+    return picked
+
+
+cpdef tuple cy_find_aoe_centers(
+    double effect_radius,
+    const double[:, ::1] positions,
+    Py_ssize_t k,
+    object radii = None,
+    object weights = None,
+    Py_ssize_t min_hits = 1,
+):
+    """
+    Find up to `k` places for AoE effects that together hit the most targets.
+
+    Parameters
+    ----------
+    effect_radius : double
+        The radius of each effect.
+    positions : const double[:, ::1]
+        (N, 2) float64 buffer of target positions.
+    k : Py_ssize_t
+        The number of effects, for example one per caster.
+    radii : np.ndarray, optional
+        Target radii, an effect touching the edge of a target hits it.
+        Defaults to None indicating point targets.
+    weights : np.ndarray, optional
+        How much hitting each target is worth, targets with weight 0 are ignored.
+        Defaults to None indicating 1 for every target.
+    min_hits : Py_ssize_t, optional
+        Only place effects hitting at least this many targets not hit by an
+        earlier effect. Defaults to 1.
+
+    Returns
+    -------
+    tuple :
+        (M, 2) float64 array of centers, best first, and the number of targets
+        each of them adds, with M <= k.
+
+    """
+    cdef:
+        Py_ssize_t num_targets = positions.shape[0]
+        const double[::1] radius_view
+        double[::1] weight_view
+        np.ndarray centers = np.empty((max(k, 0), 2), dtype=np.float64)
+        np.ndarray hit_counts = np.empty(max(k, 0), dtype=np.intp)
+        double[:, ::1] center_view = centers
+        Py_ssize_t[::1] hit_count_view = hit_counts
+        Py_ssize_t* neighbours
+        Py_ssize_t* hits
+        Py_ssize_t picked = 0
+
+    if radii is None:
+        radius_view = np.zeros(num_targets, dtype=np.float64)
+    else:
+        radius_view = radii
+    # a copy, weights of hit targets are cleared as effects are placed
+    if weights is None:
+        weight_view = np.ones(num_targets, dtype=np.float64)
+    else:
+        weight_view = np.array(weights, dtype=np.float64)
+    if radius_view.shape[0] != num_targets or weight_view.shape[0] != num_targets:
+        raise ValueError(f"radii and weights must have one entry per position, expected {num_targets}")
+    if k < 0:
+        raise ValueError(f"k must not be negative, got {k}")
+    if num_targets == 0 or k == 0:
+        return centers[:0], hit_counts[:0]
+
+    grid = SpatialGrid(positions, radius_view, 0.0)
+    neighbours = <Py_ssize_t*>PyMem_RawMalloc(num_targets * sizeof(Py_ssize_t))
+    hits = <Py_ssize_t*>PyMem_RawMalloc(num_targets * sizeof(Py_ssize_t))
+    try:
+        if not neighbours or not hits:
+            raise MemoryError("Could not allocate AoE memory")
+        with nogil:
+            picked = _greedy_aoe_centers(
+                grid, positions, radius_view, weight_view, effect_radius, k, min_hits,
+                neighbours, hits, center_view, hit_count_view
+            )
+        if picked < 0:
+            raise MemoryError("Could not allocate AoE memory")
+    finally:
+        PyMem_RawFree(neighbours)
+        PyMem_RawFree(hits)
+    return centers[:picked], hit_counts[:picked]
+
+
+cdef tuple _pack_aoe_targets(object targets, object bonus_tags):
+    # positions, radii and weights of the targets, each bonus target weighs two so it
+    # pulls the center towards it. The differential evolution objective instead adds
+    # a flat 2.0 per bonus target wherever the center is
+    cdef Py_ssize_t num_targets = len(targets)
+    cdef np.ndarray positions = np.empty((num_targets, 2), dtype=np.float64)
+    cdef np.ndarray radii = np.empty(num_targets, dtype=np.float64)
+    cdef np.ndarray weights = np.ones(num_targets, dtype=np.float64)
+    cdef double[:, ::1] position_view = positions
+    cdef double[::1] radius_view = radii
+    cdef double[::1] weight_view = weights
+    cdef Py_ssize_t i
+    for i in range(num_targets):
+        unit = targets[i]
+        position_view[i, 0], position_view[i, 1] = unit.position
+        radius_view[i] = unit.radius
+        if bonus_tags and unit.tag in bonus_tags:
+            weight_view[i] = 2.0
+    return positions, radii, weights
+
+
 cpdef cy_find_aoe_position(
     double effect_radius,
     object targets,
     unsigned int min_units = 1,
     bonus_tags = None,
+    bint use_differential_evolution = False,
 ):
     """
     Find the best place to put an AoE effect so that it hits the most units.
+
+    Candidates are the target positions and the intersections of the circles
+    each target can be hit from, scored over packed arrays. Hitting a target in
+    `bonus_tags` is worth two targets, so the position moves towards them;
+    `min_units` still counts targets, and only spots hitting that many compete. With `use_differential_evolution` the
+    previous SciPy search is used instead, it ignores `min_units` and scores
+    bonus targets the same wherever the effect lands.
     """
     cdef unsigned int len_targets = len(targets)
     if not bonus_tags:
         bonus_tags = set()
     if len_targets == 0:
         return None
-    elif len_targets == 1:
+
+    if not use_differential_evolution:
+        positions, radii, weights = _pack_aoe_targets(targets, bonus_tags)
+        # skip spots hitting too few units before comparing weights, a heavier spot
+        # that fails `min_units` must not hide one that meets it
+        centers, _ = cy_find_aoe_centers(effect_radius, positions, 1, radii, weights, max(min_units, 1))
+        if len(centers) == 0:
+            return None
+        return centers[0]
+
+    if len_targets == 1:
         return targets[0].position
 
     (x_min, x_max), (y_min, y_max) = cy_get_bounding_box({u.position_tuple for u in targets})
@@ -280,3 +864,24 @@ cpdef cy_find_aoe_position(
         return result.x
     else:
         return None
+
+
+cpdef list cy_find_aoe_positions(
+    double effect_radius,
+    object targets,
+    Py_ssize_t k,
+    unsigned int min_units = 1,
+    bonus_tags = None,
+):
+    """
+    Find up to `k` places for AoE effects, each hitting units the others don't.
+
+    Units hit by one position count for nothing in the next, so casters given
+    these positions don't stack their effects on the same units. As in
+    `cy_find_aoe_position`, targets in `bonus_tags` are worth two.
+    """
+    if len(targets) == 0:
+        return []
+    positions, radii, weights = _pack_aoe_targets(targets, bonus_tags)
+    centers, _ = cy_find_aoe_centers(effect_radius, positions, k, radii, weights, min_units)
+    return list(centers)
@@ -3,6 +3,110 @@ import numpy as np
 class DijkstraPathing:
     """Result of Dijkstras algorithm containing distance and forward pointer grids."""
 
+    allocations: int
+    """Number of buffer allocations made so far (grids, target list and heap growth)."""
+
+    @property
+    def nbytes(self) -> int:
+        """Total number of bytes held by the grids and the heap."""
+        ...
+
+    @property
+    def distance_field(self) -> np.ndarray:
+        """Read-only view of the settled distance grid.
+
+        The heap is settled first, so every reachable cell holds its lowest cost to
+        any of the targets and unreachable cells hold infinity. The view shares
+        memory with this object and follows later `update_cost` calls.
+
+        """
+        ...
+
+    @property
+    def direction_field(self) -> np.ndarray:
+        """Read-only view of the settled pointer grid as int8 direction indices.
+
+        Each entry indexes the neighbour offsets `(-1, 0), (1, 0), (0, -1), (0, 1),
+        (-1, -1), (-1, 1), (1, -1), (1, 1)` of the step that reached the cell, so the
+        next cell towards the target is `cell - offset`. Targets and unreachable
+        cells are -1.
+
+        Example:
+        ```py
+        offsets = np.array([(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1)])
+        field = pathing.direction_field
+        flow = np.where((field >= 0)[..., None], -offsets[field], 0)
+        ```
+
+        """
+        ...
+
+    def settle(self) -> None:
+        """Advance the heap until the distance and pointer grids are complete.
+
+        Queries only settle as much of the grid as they need. Call this to pay the
+        whole cost up front, e.g. once per frame before moving many units.
+
+        """
+        ...
+
+    def next_waypoints(
+        self, positions: np.ndarray, lookahead: int = 1, max_distance: int = 1
+    ) -> np.ndarray:
+        """Step many positions along the pointer grid at once.
+
+        Much cheaper than calling `get_path` for every unit when only the next
+        waypoint is needed, e.g. to drive a large group of zerglings off one field.
+
+        Example:
+        ```py
+        lings = bot.units(UnitTypeId.ZERGLING)
+        waypoints = pathing.next_waypoints(np.array([u.position for u in lings]), lookahead=4)
+        for ling, waypoint in zip(lings, waypoints):
+            ling.move(Point2(waypoint))
+        ```
+
+        Args:
+            positions: Array of shape (*, 2) containing x and y coordinates of the start points.
+            lookahead: Number of cells to move along the path. Defaults to 1.
+            max_distance: Size of the search region for a valid starting point. Defaults to 1.
+
+        Returns:
+            Int array of shape (*, 2) with the cell `lookahead` steps along the path of
+            each position, or the target if it is closer. Positions without a valid
+            start cell are returned snapped to the grid like in `get_path`.
+
+        """
+        ...
+
+    def reset(
+        self, cost: np.ndarray, targets: np.ndarray, checks_enabled: bool = True
+    ) -> None:
+        """Reuse this object for a new cost grid and new targets.
+
+        The distance, pointer and heap buffers are kept, so a bot that rebuilds its
+        pathing every step with a grid of the same shape does not allocate any
+        memory after the first frame. A differently shaped grid reallocates.
+
+        Example:
+        ```py
+        # once
+        self.pathing = cy_dijkstra(cost, targets)
+
+        # every step
+        self.pathing.reset(cost, targets)
+        path = self.pathing.get_path(unit.position.rounded)
+        ```
+
+        Args:
+            cost: Cost grid. Entries must be positive. Set unpathable cells to infinity.
+            targets: Target array of shape (*, 2) containing x and y coordinates of the target points.
+            checks_enabled: Pass False to deactivate grid value and target coordinates checks.
+                Defaults to True.
+
+        """
+        ...
+
     def get_distance(
         self, source: tuple[float, float], upper_bound: bool = False
     ) -> float:
@@ -20,14 +124,34 @@ class DijkstraPathing:
         ...
 
     def get_path(
-        self, source: tuple[float, float], limit: int = 0, max_distance: int = 1
+        self,
+        source: tuple[float, float],
+        limit: int = 0,
+        max_distance: int = 1,
+        smooth: bool = False,
     ) -> list[tuple[int, int]]:
         """Follow the path from a given source using the forward pointer grids.
 
+        With `smooth=True` only the turning points of the path are returned, so a
+        long path turns into a handful of move commands. A corner is dropped when
+        the straight line past it only crosses cells that are no more expensive than
+        the part of the path it replaces, so smoothing never cuts through walls or
+        through more dangerous cells of an influence grid.
+
+        Example:
+        ```py
+        waypoints = pathing.get_path(unit.position, smooth=True)
+        unit.move(Point2(waypoints[1]))
+        for waypoint in waypoints[2:]:
+            unit.move(Point2(waypoint), queue=True)
+        ```
+
         Args:
             source: Start point.
             limit: Maximum length of the returned path. Defaults to 0 indicating no limit.
-                    max_distance: Size of the search region for a valid starting point. Defaults to 1.
+                When smoothing, the limit applies to the path before it is smoothed.
+            max_distance: Size of the search region for a valid starting point. Defaults to 1.
+            smooth: Return only the turning points of the path. Defaults to False.
 
         Returns:
             The lowest cost path from source to any of the targets.
@@ -35,8 +159,93 @@ class DijkstraPathing:
         """
         ...
 
+    def get_distances(
+        self, sources: np.ndarray, upper_bound: bool = False
+    ) -> np.ndarray:
+        """Get the pathing distances from many sources to the nearest target at once.
+
+        All sources are settled in a single pass over the heap with the GIL released,
+        which is much cheaper than calling `get_distance` once per unit.
+
+        Example:
+        ```py
+        sources = np.array([u.position for u in bot.units])
+        distances = pathing.get_distances(sources)
+        ```
+
+        Args:
+            sources: Array of shape (*, 2) containing x and y coordinates of the start points.
+            upper_bound: If `True`, return the current distance estimates without
+                advancing the heap. Defaults to `False`.
+
+        Returns:
+            Float array of shape (*,) with the lowest cost from each source to any of
+            the targets. Invalid sources get infinity.
+
+        """
+        ...
+
+    def get_paths(
+        self, sources: np.ndarray, limit: int = 0, max_distance: int = 1
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Follow the paths from many sources at once using the forward pointer grids.
+
+        Example:
+        ```py
+        units = bot.units
+        cells, offsets = pathing.get_paths(np.array([u.position for u in units]), limit=7)
+        for k, unit in enumerate(units):
+            path = cells[offsets[k] : offsets[k + 1]]
+            unit.move(Point2(path[-1]))
+        ```
+
+        Args:
+            sources: Array of shape (*, 2) containing x and y coordinates of the start points.
+            limit: Maximum length of each returned path. Defaults to 0 indicating no limit.
+            max_distance: Size of the search region for a valid starting point. Defaults to 1.
+
+        Returns:
+            Int array of shape (*, 2) with the path cells of all sources concatenated,
+            and offsets of shape (len(sources) + 1,) so that the path of source `k` is
+            `cells[offsets[k]:offsets[k + 1]]`.
+
+        """
+        ...
+
+    def update_cost(
+        self, cells: np.ndarray, values: np.ndarray | float, checks_enabled: bool = True
+    ) -> None:
+        """Change the cost of some cells in place and repair the distance and pointer grids.
+
+        Only the part of the grids affected by the change is recomputed, so small
+        updates (e.g. a few moving enemy units in an influence grid) are much cheaper
+        than building a new `DijkstraPathing` with `cy_dijkstra`.
+
+        Example:
+        ```py
+        pathing = cy_dijkstra(cost, targets)
+
+        # an enemy siege tank moved in, make the area around it more expensive
+        cells = np.array([(x, y) for x in range(40, 45) for y in range(60, 65)])
+        pathing.update_cost(cells, 10.0)
+        path = pathing.get_path(unit.position.rounded)
+        ```
+
+        Args:
+            cells: Array of shape (*, 2) containing x and y coordinates of the changed cells.
+            values: New cost for each cell, or a single cost for all of them.
+                Set unpathable cells to infinity.
+            checks_enabled: Pass False to deactivate cost value and cell coordinates checks.
+                Defaults to True.
+
+        """
+        ...
+
 def cy_dijkstra(
-    cost_grid: np.ndarray, targets: np.ndarray, checks_enabled: bool = True
+    cost_grid: np.ndarray,
+    targets: np.ndarray,
+    checks_enabled: bool = True,
+    queue: str = "heap",
 ) -> DijkstraPathing:
     """Run Dijkstras algorithm on a grid, yielding many-target-shortest paths for each position.
 
@@ -57,9 +266,94 @@ def cy_dijkstra(
         cost_grid: Cost grid. Entries must be positive. Set unpathable cells to infinity.
         targets: Target array of shape (*, 2) containing x and y coordinates of the target points.
         checks_enabled: Pass False to deactivate grid value and target coordinates checks. Defaults to True.
+        queue: Priority queue ordering the search, "heap" or "bucket". The bucket queue
+            groups cells by distance in steps of the cheapest cell cost and skips the
+            heap's sift operations. It pays off when costs span a small range, such as
+            plain pathing grids or mild influence. Costs spanning a range too wide for
+            its ring of buckets are searched with the heap instead. Defaults to "heap".
 
     Returns:
         Pathfinding object containing distances and pointer grids.
 
     """
     ...
+
+def cy_dijkstra_many(
+    costs: list[np.ndarray],
+    targets_list: list[np.ndarray],
+    num_threads: int = 0,
+    checks_enabled: bool = True,
+) -> list[DijkstraPathing]:
+    """Run Dijkstras algorithm on several grids at once, settling them on parallel threads.
+
+    The heap of each field is drained with the GIL released, so building e.g. a
+    ground, a worker and an air field every frame scales with the number of cores.
+    The returned fields are fully settled, see `DijkstraPathing.settle`.
+
+    Example:
+    ```py
+    from cython_extensions import cy_dijkstra_many
+
+    ground, air = cy_dijkstra_many(
+        [ground_cost, air_cost],
+        [ground_targets, air_targets],
+    )
+    ```
+
+    Args:
+        costs: Cost grids. Entries must be positive. Set unpathable cells to infinity.
+        targets_list: Target arrays of shape (*, 2), one for each cost grid.
+        num_threads: Number of threads to use. Defaults to 0 indicating one per CPU core.
+        checks_enabled: Pass False to deactivate grid value and target coordinates checks. Defaults to True.
+
+    Returns:
+        Pathfinding objects in the order of the cost grids.
+
+    """
+    ...
+
+def cy_astar(
+    cost_grid: np.ndarray,
+    source: tuple[float, float],
+    target: tuple[int, int],
+    limit: int = 0,
+    max_distance: int = 1,
+    checks_enabled: bool = True,
+    workspace: DijkstraPathing | None = None,
+) -> list[tuple[int, int]]:
+    """Run A* on a grid, yielding the shortest path from a single source to a single target.
+
+    Uses an octile distance heuristic, so for long single-target queries only a
+    fraction of the cells expanded by `cy_dijkstra` are visited. Prefer `cy_dijkstra`
+    when many units path towards the same targets.
+
+    If every pathable cell has the same cost (e.g. the plain pathing grid with
+    walls set to infinity), jump point search is selected automatically. It only
+    queues the cells where the path may turn, and returns a path of the same cost.
+
+    Example:
+    ```py
+    from cython_extensions import cy_astar
+
+    cost = np.where(bot.game_info.pathing_grid.data_numpy.T == 1, 1.0, np.inf)
+    path = cy_astar(cost, unit.position, bot.enemy_start_locations[0].rounded)
+    unit.move(Point2(path[min(7, len(path) - 1)]))
+    ```
+
+    Args:
+        cost_grid: Cost grid. Entries must be positive. Set unpathable cells to infinity.
+        source: Start point.
+        target: x and y coordinates of the target point.
+        limit: Maximum length of the returned path. Defaults to 0 indicating no limit.
+        max_distance: Size of the search region for a valid starting point. Defaults to 1.
+        checks_enabled: Pass False to deactivate grid value and target coordinates checks. Defaults to True.
+        workspace: Optional `DijkstraPathing` whose buffers are reused for the search
+            instead of allocating new ones. It is reset, so its previous results are lost.
+            Later queries on it recompute the dijkstra fields for the new target.
+
+    Returns:
+        The lowest cost path from source to the target, in the same format as
+        `DijkstraPathing.get_path`.
+
+    """
+    ...
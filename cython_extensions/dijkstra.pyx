@@ -5,11 +5,16 @@
 # cython: initializedcheck=False
 # cython: nonecheck=False
 
+from concurrent.futures import ThreadPoolExecutor
+import os
+
 import numpy as np
 cimport numpy as cnp
 from cpython.mem cimport PyMem_Malloc, PyMem_Realloc, PyMem_Free
+from cpython.mem cimport PyMem_RawMalloc, PyMem_RawRealloc, PyMem_RawFree
 from numpy.math cimport INFINITY
 from libc.math cimport sqrt, round, M_SQRT2
+from libc.stdlib cimport abs
 from libc.stdint cimport int8_t
 
 # -----------------------------------------------------------------------------
@@ -36,7 +41,7 @@ cdef inline void bubble_up(
     DTYPE_t* priority,
     INDEX_t* indirection,
     INDEX_t i
-):
+) noexcept nogil:
     cdef INDEX_t parent
     cdef INDEX_t move_index = index[i]
     cdef DTYPE_t move_priority = priority[i]
@@ -59,7 +64,7 @@ cdef inline void bubble_down(
     INDEX_t* indirection,
     INDEX_t i,
     INDEX_t size,
-):
+) noexcept nogil:
     cdef INDEX_t child
     cdef INDEX_t move_index = index[i]
     cdef DTYPE_t move_priority = priority[i]
@@ -78,48 +83,311 @@ cdef inline void bubble_down(
     priority[i] = move_priority
     indirection[move_index] = i
 
-cdef inline void grow_heap(
+cdef inline int grow_heap(
     INDEX_t** index_ptr,
     DTYPE_t** priority_ptr,
     INDEX_t* capacity_ptr
-) except *:
+) noexcept nogil:
+    # raw allocator, so the heap can grow while the GIL is released
     cdef INDEX_t new_capacity = capacity_ptr[0] * 2
-    cdef INDEX_t* new_index = <INDEX_t*>PyMem_Realloc(index_ptr[0], new_capacity * sizeof(INDEX_t))
+    cdef INDEX_t* new_index = <INDEX_t*>PyMem_RawRealloc(index_ptr[0], new_capacity * sizeof(INDEX_t))
     if not new_index:
-        raise MemoryError("Heap allocation failed in cy_dijkstra.")
+        return -1
     index_ptr[0] = new_index
-    cdef DTYPE_t* new_priority = <DTYPE_t*>PyMem_Realloc(priority_ptr[0], new_capacity * sizeof(DTYPE_t))
+    cdef DTYPE_t* new_priority = <DTYPE_t*>PyMem_RawRealloc(priority_ptr[0], new_capacity * sizeof(DTYPE_t))
     if not new_priority:
-        raise MemoryError("Heap allocation failed in cy_dijkstra.")
+        return -1
     priority_ptr[0] = new_priority
     capacity_ptr[0] = new_capacity
+    return 0
+
+cdef inline void heap_remove(
+    INDEX_t* index,
+    DTYPE_t* priority,
+    INDEX_t* indirection,
+    INDEX_t i,
+    INDEX_t size,
+) noexcept nogil:
+    # `size` is the heap size before removal
+    cdef INDEX_t last = size - 1
+    indirection[index[i]] = NO_INDEX
+    if i == last:
+        return
+    index[i] = index[last]
+    priority[i] = priority[last]
+    indirection[index[i]] = i
+    cdef INDEX_t moved = index[i]
+    bubble_up(index, priority, indirection, i)
+    bubble_down(index, priority, indirection, indirection[moved], last)
+
+# -----------------------------------------------------------------------------
+# Bucket Queue Operations
+# -----------------------------------------------------------------------------
+
+# Cells are kept in buckets of `width` distance, linked lists over a shared entry pool.
+# With `width` at most the cheapest step, every cell in the lowest bucket is already final,
+# so cells are popped in any order within a bucket. Instead of a decrease-key, a cell is
+# pushed again and `indirection` holds the ring slot of its valid entry, older entries are
+# skipped when popped.
+#
+# The buckets form a ring starting at bucket `current`. A search step is at most `max_step`
+# long, so with `max_step / width + 1` buckets (up to RING_LIMIT) every push lands within
+# the ring. Anything further, e.g. cells requeued by `update_cost`, waits in an overflow
+# list marked IN_OVERFLOW and moves into the ring once it gets close enough.
+cdef struct BucketQueue:
+    DTYPE_t width
+    DTYPE_t max_step
+    long long current
+    INDEX_t num_buckets
+    INDEX_t ring_entries
+    INDEX_t* head
+    INDEX_t overflow
+    long long overflow_min
+    INDEX_t* cell
+    INDEX_t* next
+    INDEX_t pool_capacity
+    INDEX_t pool_size
+    INDEX_t free
+    Py_ssize_t allocations
+
+cdef INDEX_t IN_OVERFLOW = -2
+cdef INDEX_t RING_LIMIT = 1 << 16
+cdef long long NO_BUCKET = 1LL << 62
+
+cdef int bucket_init(BucketQueue* q, DTYPE_t width) noexcept nogil:
+    q.num_buckets = MIN_CAPACITY
+    q.pool_capacity = MIN_CAPACITY
+    q.head = <INDEX_t*>PyMem_RawMalloc(q.num_buckets * sizeof(INDEX_t))
+    q.cell = <INDEX_t*>PyMem_RawMalloc(q.pool_capacity * sizeof(INDEX_t))
+    q.next = <INDEX_t*>PyMem_RawMalloc(q.pool_capacity * sizeof(INDEX_t))
+    if not q.head or not q.cell or not q.next:
+        return -1
+    q.allocations += 3
+    bucket_clear(q, width)
+    return 0
+
+cdef void bucket_clear(BucketQueue* q, DTYPE_t width) noexcept nogil:
+    cdef INDEX_t b
+    for b in range(q.num_buckets):
+        q.head[b] = NO_INDEX
+    q.width = width
+    q.max_step = 0
+    q.current = 0
+    q.ring_entries = 0
+    q.overflow = NO_INDEX
+    q.overflow_min = NO_BUCKET
+    q.pool_size = 0
+    q.free = NO_INDEX
+
+cdef inline DTYPE_t bucket_width(DTYPE_t min_cost) noexcept nogil:
+    # the cheapest step, falling back to 1 on grids without pathable cells
+    if min_cost > 0 and min_cost < INFINITY:
+        return min_cost
+    return 1.0
+
+cdef void bucket_free(BucketQueue* q) noexcept nogil:
+    PyMem_RawFree(q.head)
+    PyMem_RawFree(q.cell)
+    PyMem_RawFree(q.next)
+
+cdef inline long long bucket_of(BucketQueue* q, DTYPE_t d) noexcept nogil:
+    return <long long>(d / q.width)
+
+cdef inline void bucket_release(BucketQueue* q, INDEX_t slot) noexcept nogil:
+    q.next[slot] = q.free
+    q.free = slot
+
+cdef INDEX_t bucket_entry(BucketQueue* q, INDEX_t i) noexcept nogil:
+    # a pool entry holding cell `i`, NO_INDEX if the pool could not grow
+    cdef INDEX_t slot
+    cdef INDEX_t* new_cell
+    cdef INDEX_t* new_next
+    if q.free != NO_INDEX:
+        slot = q.free
+        q.free = q.next[slot]
+    else:
+        if q.pool_size >= q.pool_capacity:
+            new_cell = <INDEX_t*>PyMem_RawRealloc(q.cell, 2 * q.pool_capacity * sizeof(INDEX_t))
+            if not new_cell:
+                return NO_INDEX
+            q.cell = new_cell
+            new_next = <INDEX_t*>PyMem_RawRealloc(q.next, 2 * q.pool_capacity * sizeof(INDEX_t))
+            if not new_next:
+                return NO_INDEX
+            q.next = new_next
+            q.pool_capacity *= 2
+            q.allocations += 2
+        slot = q.pool_size
+        q.pool_size += 1
+    q.cell[slot] = i
+    return slot
+
+cdef void bucket_evict(BucketQueue* q, INDEX_t* indirection, DTYPE_t* distance) noexcept nogil:
+    # move the valid ring entries to the overflow list and drop the stale ones
+    cdef INDEX_t r, slot, i
+    for r in range(q.num_buckets):
+        while q.head[r] != NO_INDEX:
+            slot = q.head[r]
+            q.head[r] = q.next[slot]
+            i = q.cell[slot]
+            if indirection[i] == r:
+                indirection[i] = IN_OVERFLOW
+                q.next[slot] = q.overflow
+                q.overflow = slot
+                q.overflow_min = min(q.overflow_min, bucket_of(q, distance[i]))
+            else:
+                bucket_release(q, slot)
+    q.ring_entries = 0
+
+cdef void bucket_refill(BucketQueue* q, INDEX_t* indirection, DTYPE_t* distance) noexcept nogil:
+    # move the overflow entries that fit into the ring, keep the others
+    cdef INDEX_t slot, i, r
+    cdef INDEX_t remaining = NO_INDEX
+    cdef long long b
+    q.overflow_min = NO_BUCKET
+    while q.overflow != NO_INDEX:
+        slot = q.overflow
+        q.overflow = q.next[slot]
+        i = q.cell[slot]
+        if indirection[i] != IN_OVERFLOW:
+            bucket_release(q, slot)
+            continue
+        b = bucket_of(q, distance[i])
+        if b < q.current + q.num_buckets:
+            r = <INDEX_t>(b % q.num_buckets)
+            q.next[slot] = q.head[r]
+            q.head[r] = slot
+            indirection[i] = r
+            q.ring_entries += 1
+        else:
+            q.next[slot] = remaining
+            remaining = slot
+            q.overflow_min = min(q.overflow_min, b)
+    q.overflow = remaining
+
+cdef int bucket_reserve(BucketQueue* q, INDEX_t* indirection, DTYPE_t* distance, DTYPE_t max_step) noexcept nogil:
+    # grow the ring so a step of `max_step` stays within it
+    cdef INDEX_t num_buckets, r
+    cdef INDEX_t* new_head
+    q.max_step = max(q.max_step, max_step)
+    if q.max_step == INFINITY:
+        return 0
+    num_buckets = <INDEX_t>min(<double>RING_LIMIT, q.max_step / q.width + 2)
+    if num_buckets <= q.num_buckets:
+        return 0
+    bucket_evict(q, indirection, distance)
+    new_head = <INDEX_t*>PyMem_RawRealloc(q.head, num_buckets * sizeof(INDEX_t))
+    if not new_head:
+        return -1
+    for r in range(num_buckets):
+        new_head[r] = NO_INDEX
+    q.head = new_head
+    q.num_buckets = num_buckets
+    q.allocations += 1
+    return 0
+
+cdef int bucket_rebuild(BucketQueue* q, INDEX_t* indirection, DTYPE_t* distance, DTYPE_t width) noexcept nogil:
+    # requeue everything with a new bucket width, only the queued entries are visited
+    cdef INDEX_t slot
+    bucket_evict(q, indirection, distance)
+    q.width = width
+    q.overflow_min = NO_BUCKET
+    slot = q.overflow
+    while slot != NO_INDEX:
+        if indirection[q.cell[slot]] == IN_OVERFLOW:
+            q.overflow_min = min(q.overflow_min, bucket_of(q, distance[q.cell[slot]]))
+        slot = q.next[slot]
+    q.current = q.overflow_min if q.overflow != NO_INDEX else 0
+    return bucket_reserve(q, indirection, distance, q.max_step)
+
+cdef int bucket_push(BucketQueue* q, INDEX_t* indirection, DTYPE_t* distance, INDEX_t i, DTYPE_t d) noexcept nogil:
+    cdef long long b = bucket_of(q, d)
+    cdef INDEX_t r, slot
+    if b < q.current:
+        # the ring only covers buckets from `current` on, start it over at `b`
+        if q.ring_entries > 0:
+            bucket_evict(q, indirection, distance)
+        q.current = b
+    if b >= q.current + q.num_buckets:
+        q.overflow_min = min(q.overflow_min, b)
+        if indirection[i] == IN_OVERFLOW:
+            # its bucket is read from `distance` when it moves into the ring
+            return 0
+        slot = bucket_entry(q, i)
+        if slot == NO_INDEX:
+            return -1
+        q.next[slot] = q.overflow
+        q.overflow = slot
+        indirection[i] = IN_OVERFLOW
+        return 0
+    r = <INDEX_t>(b % q.num_buckets)
+    if indirection[i] == r:
+        return 0
+    slot = bucket_entry(q, i)
+    if slot == NO_INDEX:
+        return -1
+    q.next[slot] = q.head[r]
+    q.head[r] = slot
+    q.ring_entries += 1
+    indirection[i] = r
+    return 0
+
+cdef INDEX_t bucket_pop(BucketQueue* q, INDEX_t* indirection, DTYPE_t* distance) noexcept nogil:
+    # returns a cell of the lowest bucket, or NO_INDEX if the queue is empty
+    cdef INDEX_t r, slot, i
+    while True:
+        if q.ring_entries == 0:
+            if q.overflow == NO_INDEX:
+                return NO_INDEX
+            q.current = q.overflow_min
+        if q.overflow_min < q.current + q.num_buckets:
+            bucket_refill(q, indirection, distance)
+        r = <INDEX_t>(q.current % q.num_buckets)
+        while q.head[r] != NO_INDEX:
+            slot = q.head[r]
+            q.head[r] = q.next[slot]
+            q.ring_entries -= 1
+            i = q.cell[slot]
+            bucket_release(q, slot)
+            if indirection[i] == r:
+                indirection[i] = NO_INDEX
+                return i
+        q.current += 1
 
 # -----------------------------------------------------------------------------
 # Core Algorithm
 # -----------------------------------------------------------------------------
 
-cdef void dijkstra_core(
+cdef int dijkstra_core(
     INDEX_t** index_ptr,
     DTYPE_t** priority_ptr,
     INDEX_t* capacity_ptr,
     INDEX_t* indirection,
     INDEX_t* size_ptr,
-    INDEX_t start,
+    INDEX_t* starts,
+    INDEX_t num_starts,
     DTYPE_t* distance,
     DTYPE_t* cost,
     DIR_t* direction,
     INDEX_t stride
-):
+) noexcept nogil:
 
     cdef:
         INDEX_t i, neighbour, k
+        INDEX_t j = 0
+        int status = 0
         DTYPE_t d, alternative
         INDEX_t* index = index_ptr[0]
         DTYPE_t* priority = priority_ptr[0]
         INDEX_t size = size_ptr[0]
         INDEX_t[8] offsets = [-stride, stride, -1, 1, -stride - 1, -stride + 1, stride - 1, stride + 1]
 
-    while size > 0 and priority[0] < distance[start]:
+    # popped priorities never decrease, so a settled start stays settled
+    # and all starts are handled by a single pass over the heap
+    while size > 0 and j < num_starts:
+        if priority[0] >= distance[starts[j]]:
+            j += 1
+            continue
 
         # pop minimum
         i = index[0]
@@ -148,9 +416,12 @@ cdef void dijkstra_core(
                 else:
                     # dynamic resize
                     if size >= capacity_ptr[0]:
-                        grow_heap(index_ptr, priority_ptr, capacity_ptr)
+                        status = grow_heap(index_ptr, priority_ptr, capacity_ptr)
                         index = index_ptr[0]
                         priority = priority_ptr[0]
+                        if status != 0:
+                            size_ptr[0] = size
+                            return status
                     # enqueue
                     index[size] = neighbour
                     priority[size] = alternative
@@ -159,6 +430,392 @@ cdef void dijkstra_core(
                     size += 1
 
     size_ptr[0] = size
+    return status
+
+cdef int dijkstra_core_buckets(
+    BucketQueue* q,
+    INDEX_t* indirection,
+    INDEX_t* size_ptr,
+    INDEX_t* starts,
+    INDEX_t num_starts,
+    DTYPE_t* distance,
+    DTYPE_t* cost,
+    DIR_t* direction,
+    INDEX_t stride
+) noexcept nogil:
+    # same expansion as `dijkstra_core` with a bucket queue instead of the binary heap
+
+    cdef:
+        INDEX_t i, neighbour, k
+        INDEX_t j = 0
+        int status = 0
+        DTYPE_t d, alternative
+        INDEX_t size = size_ptr[0]
+        INDEX_t[8] offsets = [-stride, stride, -1, 1, -stride - 1, -stride + 1, stride - 1, stride + 1]
+
+    while size > 0 and j < num_starts:
+        # nothing left in the queue can improve a start below the end of the lowest bucket
+        if distance[starts[j]] < (q.current + 1) * q.width:
+            j += 1
+            continue
+
+        i = bucket_pop(q, indirection, distance)
+        if i == NO_INDEX:
+            size = 0
+            break
+        size -= 1
+        d = distance[i]
+
+        # iterate neighbours
+        for k in range(8):
+            neighbour = i + offsets[k]
+            alternative = d + COST_DIRECTION[k] * cost[neighbour]
+            if alternative < distance[neighbour]:
+                distance[neighbour] = alternative
+                direction[neighbour] = <DIR_t>k
+                if indirection[neighbour] == NO_INDEX:
+                    size += 1
+                status = bucket_push(q, indirection, distance, neighbour, alternative)
+                if status != 0:
+                    size_ptr[0] = size
+                    return status
+
+    size_ptr[0] = size
+    return status
+
+cdef inline DTYPE_t octile_heuristic(INDEX_t i, INDEX_t start, INDEX_t stride, DTYPE_t min_cost) noexcept nogil:
+    # lower bound on the cost from `i` to `start`, consistent for cells costing at least `min_cost`
+    cdef INDEX_t dx = abs(i // stride - start // stride)
+    cdef INDEX_t dy = abs(i % stride - start % stride)
+    if dx < dy:
+        dx, dy = dy, dx
+    return min_cost * (dx + (M_SQRT2 - 1.0) * dy)
+
+cdef int astar_core(
+    INDEX_t** index_ptr,
+    DTYPE_t** priority_ptr,
+    INDEX_t* capacity_ptr,
+    INDEX_t* indirection,
+    INDEX_t* size_ptr,
+    INDEX_t start,
+    DTYPE_t min_cost,
+    DTYPE_t* distance,
+    DTYPE_t* cost,
+    DIR_t* direction,
+    INDEX_t stride
+) noexcept nogil:
+    # same expansion as `dijkstra_core`, but the heap is ordered by distance + heuristic
+    # so the search is pulled towards `start` and stops as soon as it is popped
+
+    cdef:
+        INDEX_t i, neighbour, k
+        int status = 0
+        DTYPE_t d, alternative, estimate
+        INDEX_t* index = index_ptr[0]
+        DTYPE_t* priority = priority_ptr[0]
+        INDEX_t size = size_ptr[0]
+        INDEX_t[8] offsets = [-stride, stride, -1, 1, -stride - 1, -stride + 1, stride - 1, stride + 1]
+
+    # reorder the seeded targets by their estimate
+    for k in range(size):
+        priority[k] = distance[index[k]] + octile_heuristic(index[k], start, stride, min_cost)
+        bubble_up(index, priority, indirection, k)
+
+    while size > 0:
+
+        # pop minimum
+        i = index[0]
+        indirection[i] = NO_INDEX
+        size -= 1
+        if size > 0:
+            index[0] = index[size]
+            priority[0] = priority[size]
+            indirection[index[0]] = 0
+            bubble_down(index, priority, indirection, 0, size)
+        if i == start:
+            break
+        d = distance[i]
+
+        # iterate neighbours
+        for k in range(8):
+            neighbour = i + offsets[k]
+            alternative = d + COST_DIRECTION[k] * cost[neighbour]
+            if alternative < distance[neighbour]:
+                distance[neighbour] = alternative
+                direction[neighbour] = <DIR_t>k
+                estimate = alternative + octile_heuristic(neighbour, start, stride, min_cost)
+
+                if indirection[neighbour] != NO_INDEX:
+                    # node already in heap, decrease key
+                    priority[indirection[neighbour]] = estimate
+                    bubble_up(index, priority, indirection, indirection[neighbour])
+
+                else:
+                    # dynamic resize
+                    if size >= capacity_ptr[0]:
+                        status = grow_heap(index_ptr, priority_ptr, capacity_ptr)
+                        index = index_ptr[0]
+                        priority = priority_ptr[0]
+                        if status != 0:
+                            size_ptr[0] = size
+                            return status
+                    # enqueue
+                    index[size] = neighbour
+                    priority[size] = estimate
+                    indirection[neighbour] = size
+                    bubble_up(index, priority, indirection, size)
+                    size += 1
+
+    size_ptr[0] = size
+    return status
+
+cdef inline DIR_t direction_index(INDEX_t dx, INDEX_t dy) noexcept nogil:
+    # inverse of OFFSET_X / OFFSET_Y
+    if dx == 0:
+        return 2 if dy < 0 else 3
+    if dy == 0:
+        return 0 if dx < 0 else 1
+    return 4 + 2 * (dx > 0) + (dy > 0)
+
+cdef inline DTYPE_t jump_distance(DTYPE_t d, INDEX_t steps, DTYPE_t step_cost) noexcept nogil:
+    # shared by the search and the path reconstruction, so both round identically
+    return d + steps * step_cost
+
+cdef inline bint is_blocked(DTYPE_t* cost, INDEX_t i) noexcept nogil:
+    return cost[i] == INFINITY
+
+cdef INDEX_t jump_straight(
+    INDEX_t i,
+    INDEX_t offset,
+    INDEX_t side,
+    INDEX_t goal,
+    DTYPE_t* cost,
+    INDEX_t* steps
+) noexcept nogil:
+    # scan from `i` along `offset` until a wall, the goal or a cell with a forced neighbour,
+    # `side` is the flat offset perpendicular to the scan direction
+    cdef INDEX_t n = i
+    steps[0] = 0
+    while True:
+        n += offset
+        steps[0] += 1
+        if is_blocked(cost, n):
+            return NO_INDEX
+        if n == goal:
+            return n
+        if (
+            (is_blocked(cost, n + side) and not is_blocked(cost, n + offset + side))
+            or (is_blocked(cost, n - side) and not is_blocked(cost, n + offset - side))
+        ):
+            return n
+
+cdef INDEX_t jump_diagonal(
+    INDEX_t i,
+    INDEX_t dx,
+    INDEX_t dy,
+    INDEX_t goal,
+    DTYPE_t* cost,
+    INDEX_t stride,
+    INDEX_t* steps
+) noexcept nogil:
+    # scan diagonally, stopping at cells from which a straight scan finds a jump point
+    cdef INDEX_t n = i
+    cdef INDEX_t straight_steps
+    cdef INDEX_t offset_x = dx * stride
+    steps[0] = 0
+    while True:
+        n += offset_x + dy
+        steps[0] += 1
+        if is_blocked(cost, n):
+            return NO_INDEX
+        if n == goal:
+            return n
+        if (
+            (is_blocked(cost, n - offset_x) and not is_blocked(cost, n - offset_x + dy))
+            or (is_blocked(cost, n - dy) and not is_blocked(cost, n + offset_x - dy))
+        ):
+            return n
+        if (
+            jump_straight(n, offset_x, 1, goal, cost, &straight_steps) != NO_INDEX
+            or jump_straight(n, dy, stride, goal, cost, &straight_steps) != NO_INDEX
+        ):
+            return n
+
+cdef inline INDEX_t successor_directions(
+    INDEX_t i,
+    DIR_t k,
+    DTYPE_t* cost,
+    INDEX_t stride,
+    DIR_t* out
+) noexcept nogil:
+    # pruned neighbour directions of jump point `i` reached by moving along `k`
+    cdef INDEX_t n = 0
+    cdef INDEX_t dx, dy
+    if k == NO_DIRECTION:
+        for n in range(8):
+            out[n] = <DIR_t>n
+        return 8
+    dx = OFFSET_X[k]
+    dy = OFFSET_Y[k]
+    out[n] = k
+    n += 1
+    if dy == 0:
+        if is_blocked(cost, i + 1):
+            out[n] = direction_index(dx, 1)
+            n += 1
+        if is_blocked(cost, i - 1):
+            out[n] = direction_index(dx, -1)
+            n += 1
+    elif dx == 0:
+        if is_blocked(cost, i + stride):
+            out[n] = direction_index(1, dy)
+            n += 1
+        if is_blocked(cost, i - stride):
+            out[n] = direction_index(-1, dy)
+            n += 1
+    else:
+        out[n] = direction_index(dx, 0)
+        out[n + 1] = direction_index(0, dy)
+        n += 2
+        if is_blocked(cost, i - dx * stride):
+            out[n] = direction_index(-dx, dy)
+            n += 1
+        if is_blocked(cost, i - dy):
+            out[n] = direction_index(dx, -dy)
+            n += 1
+    return n
+
+cdef int jps_core(
+    INDEX_t** index_ptr,
+    DTYPE_t** priority_ptr,
+    INDEX_t* capacity_ptr,
+    INDEX_t* indirection,
+    INDEX_t* size_ptr,
+    INDEX_t start,
+    DTYPE_t uniform_cost,
+    DTYPE_t* distance,
+    DTYPE_t* cost,
+    DIR_t* direction,
+    INDEX_t stride
+) noexcept nogil:
+    # jump point search for grids where every pathable cell costs `uniform_cost`,
+    # only jump points enter the heap and the cells in between are filled in afterwards.
+    # Other cells are left without distances, `DijkstraPathing` restarts before reuse
+
+    cdef:
+        INDEX_t i, jump_point, steps, n, num_successors
+        int status = 0
+        DIR_t k
+        DIR_t[8] successors
+        DTYPE_t d, alternative, estimate
+        INDEX_t* index = index_ptr[0]
+        DTYPE_t* priority = priority_ptr[0]
+        INDEX_t size = size_ptr[0]
+        INDEX_t[8] offsets = [-stride, stride, -1, 1, -stride - 1, -stride + 1, stride - 1, stride + 1]
+
+    for n in range(size):
+        priority[n] = distance[index[n]] + octile_heuristic(index[n], start, stride, uniform_cost)
+        bubble_up(index, priority, indirection, n)
+
+    while size > 0:
+
+        # pop minimum
+        i = index[0]
+        indirection[i] = NO_INDEX
+        size -= 1
+        if size > 0:
+            index[0] = index[size]
+            priority[0] = priority[size]
+            indirection[index[0]] = 0
+            bubble_down(index, priority, indirection, 0, size)
+        if i == start:
+            break
+        d = distance[i]
+
+        # jump along the pruned neighbour directions
+        num_successors = successor_directions(i, direction[i], cost, stride, successors)
+        for n in range(num_successors):
+            k = successors[n]
+            if k < 2:
+                jump_point = jump_straight(i, offsets[k], 1, start, cost, &steps)
+            elif k < 4:
+                jump_point = jump_straight(i, offsets[k], stride, start, cost, &steps)
+            else:
+                jump_point = jump_diagonal(i, OFFSET_X[k], OFFSET_Y[k], start, cost, stride, &steps)
+            if jump_point == NO_INDEX:
+                continue
+            alternative = jump_distance(d, steps, COST_DIRECTION[k] * uniform_cost)
+            if alternative < distance[jump_point]:
+                distance[jump_point] = alternative
+                direction[jump_point] = k
+                estimate = alternative + octile_heuristic(jump_point, start, stride, uniform_cost)
+
+                if indirection[jump_point] != NO_INDEX:
+                    # node already in heap, decrease key
+                    priority[indirection[jump_point]] = estimate
+                    bubble_up(index, priority, indirection, indirection[jump_point])
+
+                else:
+                    # dynamic resize
+                    if size >= capacity_ptr[0]:
+                        status = grow_heap(index_ptr, priority_ptr, capacity_ptr)
+                        index = index_ptr[0]
+                        priority = priority_ptr[0]
+                        if status != 0:
+                            size_ptr[0] = size
+                            return status
+                    # enqueue
+                    index[size] = jump_point
+                    priority[size] = estimate
+                    indirection[jump_point] = size
+                    bubble_up(index, priority, indirection, size)
+                    size += 1
+
+    size_ptr[0] = size
+
+    # walk back over each jump to its origin, pointing the skipped cells along the jump
+    # so the path can be followed cell by cell like a regular dijkstra result
+    i = start
+    if distance[i] == INFINITY:
+        return status
+    while direction[i] != NO_DIRECTION:
+        k = direction[i]
+        n = i - offsets[k]
+        steps = 1
+        while jump_distance(distance[n], steps, COST_DIRECTION[k] * uniform_cost) != distance[i]:
+            if is_blocked(cost, n):
+                return status
+            direction[n] = k
+            n -= offsets[k]
+            steps += 1
+        i = n
+    return status
+
+cdef bint has_uniform_cost(const DTYPE_t* cost, Py_ssize_t num_cells, DTYPE_t* min_cost) noexcept nogil:
+    # finds the smallest cost and whether all pathable cells share it
+    cdef Py_ssize_t k
+    cdef bint uniform = True
+    min_cost[0] = INFINITY
+    for k in range(num_cells):
+        if cost[k] == INFINITY:
+            continue
+        if cost[k] != min_cost[0]:
+            if min_cost[0] != INFINITY:
+                uniform = False
+            if cost[k] < min_cost[0]:
+                min_cost[0] = cost[k]
+    return uniform
+
+cdef inline bint ring_fits(DTYPE_t width, DTYPE_t max_step) noexcept nogil:
+    return max_step / width + 2 <= RING_LIMIT
+
+cdef DTYPE_t max_finite_cost(const DTYPE_t* cost, Py_ssize_t num_cells) noexcept nogil:
+    cdef Py_ssize_t k
+    cdef DTYPE_t max_cost = 0
+    for k in range(num_cells):
+        if cost[k] != INFINITY and cost[k] > max_cost:
+            max_cost = cost[k]
+    return max_cost
 
 # -----------------------------------------------------------------------------
 # Python Interface
@@ -173,60 +830,376 @@ cdef class DijkstraPathing:
     cdef INDEX_t capacity
     cdef DTYPE_t[:, ::1] cost
     cdef INDEX_t[:, ::1] indirection
+    cdef INDEX_t[::1] targets
+    cdef INDEX_t num_targets
     cdef INDEX_t size
     cdef INDEX_t stride
+    cdef readonly Py_ssize_t allocations
+    cdef bint bucketed
+    cdef bint prefer_buckets
+    cdef BucketQueue buckets
+    cdef bint stale
 
     def __cinit__(self,
                   const DTYPE_t[:, ::1] cost,
-                  const INDEX_t[:, ::1] targets):
+                  const INDEX_t[:, ::1] targets,
+                  str queue="heap"):
         cdef INDEX_t num_targets = targets.shape[0]
-        self.cost = np.pad(cost, 1, "constant", constant_values=INFINITY)
-        self.stride = self.cost.shape[1]
-        self.direction = np.full_like(self.cost, NO_DIRECTION, dtype=np.int8)
-        self.indirection = np.full_like(self.cost, NO_INDEX, dtype=np.int32)
-        self.distance = np.full_like(self.cost, INFINITY)
+        if queue not in ("heap", "bucket"):
+            raise ValueError(f"invalid queue: expected 'heap' or 'bucket', got {queue!r}")
+        self.allocations = 0
+        self.prefer_buckets = queue == "bucket"
+        if self.prefer_buckets:
+            if bucket_init(&self.buckets, 1.0) != 0:
+                raise MemoryError("Could not allocate heap memory")
+            self.allocations += self.buckets.allocations
         self.capacity = max(MIN_CAPACITY, 2 * num_targets)
         self.size = 0
-        self.index = <INDEX_t*>PyMem_Malloc(self.capacity * sizeof(INDEX_t))
-        self.priority = <DTYPE_t*>PyMem_Malloc(self.capacity * sizeof(DTYPE_t))
+        self.index = <INDEX_t*>PyMem_RawMalloc(self.capacity * sizeof(INDEX_t))
+        self.priority = <DTYPE_t*>PyMem_RawMalloc(self.capacity * sizeof(DTYPE_t))
         if not self.index or not self.priority:
             raise MemoryError("Could not allocate heap memory")
-        for k in range(num_targets):
-            self._add_target(self.stride * (targets[k, 0] + 1) + (targets[k, 1] + 1))
+        self.allocations += 2
+        self._allocate_grids(cost.shape[0] + 2, cost.shape[1] + 2)
+        self._reset(cost, targets)
 
-    cdef void _add_target(self, INDEX_t i):
-        cdef INDEX_t* indirection = &self.indirection[0,0]
+    cdef void _allocate_grids(self, Py_ssize_t rows, Py_ssize_t cols) except *:
+        self.cost = np.full((rows, cols), INFINITY, dtype=np.float32)
+        self.stride = self.cost.shape[1]
+        self.direction = np.empty_like(self.cost, dtype=np.int8)
+        self.indirection = np.empty_like(self.cost, dtype=np.int32)
+        self.distance = np.empty_like(self.cost)
+        self.allocations += 4
+
+    cdef void _reset(self, const DTYPE_t[:, ::1] cost, const INDEX_t[:, ::1] targets) except *:
+        # refill the existing buffers, the padding of `self.cost` is never overwritten
+        cdef Py_ssize_t k
+        self.cost[1:-1, 1:-1] = cost
+        if self.targets is None or targets.shape[0] > self.targets.shape[0]:
+            self.targets = np.empty(targets.shape[0], dtype=np.int32)
+            self.allocations += 1
+        self.num_targets = targets.shape[0]
+        for k in range(self.num_targets):
+            self.targets[k] = self.stride * (targets[k, 0] + 1) + (targets[k, 1] + 1)
+        self._restart()
+
+    cdef void _restart(self) except *:
+        # forget all search progress and queue the targets again, keeping costs and targets
+        cdef Py_ssize_t k
+        cdef Py_ssize_t num_cells = self.cost.shape[0] * self.cost.shape[1]
+        cdef DIR_t* direction = &self.direction[0, 0]
+        cdef INDEX_t* indirection = &self.indirection[0, 0]
+        cdef DTYPE_t* distance = &self.distance[0, 0]
+        cdef DTYPE_t min_cost, max_step
+        cdef int status = 0
+        cdef Py_ssize_t old_allocations = self.buckets.allocations
+        with nogil:
+            for k in range(num_cells):
+                direction[k] = NO_DIRECTION
+                indirection[k] = NO_INDEX
+                distance[k] = INFINITY
+            if self.prefer_buckets:
+                has_uniform_cost(&self.cost[0, 0], num_cells, &min_cost)
+                max_step = M_SQRT2 * max_finite_cost(&self.cost[0, 0], num_cells)
+                # costs spanning too many buckets are searched with the heap
+                self.bucketed = ring_fits(bucket_width(min_cost), max_step)
+                if self.bucketed:
+                    bucket_clear(&self.buckets, bucket_width(min_cost))
+                    status = bucket_reserve(&self.buckets, indirection, distance, max_step)
+        self.allocations += self.buckets.allocations - old_allocations
+        if status != 0:
+            raise MemoryError("Could not allocate heap memory")
+        self.size = 0
+        self.stale = False
+        for k in range(self.num_targets):
+            self._add_target(self.targets[k])
+
+    cdef inline void _refresh(self) except *:
+        # a goal-directed search leaves partial, non-dijkstra grids behind, start over
+        if self.stale:
+            self._restart()
+
+    cpdef void reset(self, object cost, object targets, bint checks_enabled=True) except *:
+        """
+
+        Reuse this object for a new cost grid and new targets.
+
+        The distance, pointer and heap buffers are kept, so resetting a grid of the
+        same shape does not allocate (other than converting inputs which are not
+        contiguous float32 / int32 arrays). A differently shaped grid reallocates.
+
+        Parameters
+        ----------
+        cost :
+            Cost grid. Entries must be positive. Set unpathable cells to infinity.
+        targets :
+            Target array of shape (*, 2) containing x and y coordinates of the target points.
+        checks_enabled :
+            Pass False to deactivate grid value and target coordinates checks. Defaults to True.
+
+        """
+        cdef const DTYPE_t[:, ::1] cost_array = np.ascontiguousarray(cost, dtype=np.float32)
+        cdef const INDEX_t[:, ::1] target_array = np.ascontiguousarray(targets, dtype=np.int32)
+        if checks_enabled:
+            _check_inputs(cost_array, target_array)
+        if cost_array.shape[0] + 2 != self.cost.shape[0] or cost_array.shape[1] + 2 != self.cost.shape[1]:
+            self._allocate_grids(cost_array.shape[0] + 2, cost_array.shape[1] + 2)
+        self._reset(cost_array, target_array)
+
+    @property
+    def nbytes(self):
+        """Total number of bytes held by the grids and the queue."""
+        return (
+            self.cost.nbytes
+            + self.direction.nbytes
+            + self.indirection.nbytes
+            + self.distance.nbytes
+            + self.targets.nbytes
+            + self.capacity * (sizeof(INDEX_t) + sizeof(DTYPE_t))
+            + self.buckets.num_buckets * sizeof(INDEX_t)
+            + self.buckets.pool_capacity * 2 * sizeof(INDEX_t)
+        )
+
+    @property
+    def distance_field(self):
+        """Read-only view of the settled distance grid, infinity where no target can be reached."""
+        self.settle()
+        field = np.asarray(self.distance)[1:-1, 1:-1]
+        field.flags.writeable = False
+        return field
+
+    @property
+    def direction_field(self):
+        """
+
+        Read-only view of the settled pointer grid.
+
+        Each entry is an index into the neighbour offsets `(-1, 0), (1, 0), (0, -1), (0, 1),
+        (-1, -1), (-1, 1), (1, -1), (1, 1)` of the step that reached the cell, so the next
+        cell towards the target is `cell - offset`. Targets and unreachable cells are -1.
+
+        """
+        self.settle()
+        field = np.asarray(self.direction)[1:-1, 1:-1]
+        field.flags.writeable = False
+        return field
+
+    cpdef void settle(self) except *:
+        """
+
+        Advance the heap until the distance and pointer grids are complete.
+
+        Queries settle only as much of the grid as they need, call this to pay the
+        whole cost up front, e.g. before handing the fields to many units.
+
+        """
+        # the padding never gets a finite distance, so it works as a start that is never settled
+        cdef INDEX_t never_settled = 0
+        cdef int status
+        self._refresh()
+        with nogil:
+            status = self._advance_heap_nogil(&never_settled, 1)
+        if status != 0:
+            raise MemoryError("Heap allocation failed in cy_dijkstra.")
+
+    cdef void _add_target(self, INDEX_t i) except *:
         cdef DTYPE_t* distance = &self.distance[0,0]
         cdef DTYPE_t* cost = &self.cost[0,0]
-        c = cost[i]
-        if c == INFINITY:
+        cdef DIR_t* direction = &self.direction[0,0]
+        cdef DTYPE_t c = cost[i]
+        if c == INFINITY or c >= distance[i]:
             return
+        distance[i] = c
+        direction[i] = NO_DIRECTION
+        self._enqueue(i, c)
+
+    cdef void _enqueue(self, INDEX_t i, DTYPE_t d) except *:
+        # insert `i` into the heap, or decrease its key if it is already queued
+        cdef INDEX_t* indirection = &self.indirection[0,0]
+        cdef Py_ssize_t old_allocations
+        if self.bucketed:
+            if indirection[i] == NO_INDEX:
+                self.size += 1
+            old_allocations = self.buckets.allocations
+            if bucket_push(&self.buckets, indirection, &self.distance[0,0], i, d) != 0:
+                raise MemoryError("Heap allocation failed in cy_dijkstra.")
+            self.allocations += self.buckets.allocations - old_allocations
+            return
+        if indirection[i] != NO_INDEX:
+            self.priority[indirection[i]] = d
+            bubble_up(self.index, self.priority, indirection, indirection[i])
+            return
+        if self.size >= self.capacity:
+            if grow_heap(&self.index, &self.priority, &self.capacity) != 0:
+                raise MemoryError("Heap allocation failed in cy_dijkstra.")
+            self.allocations += 2
         self.index[self.size] = i
-        self.priority[self.size] = c
+        self.priority[self.size] = d
         indirection[i] = self.size
-        distance[i] = c
         bubble_up(self.index, self.priority, indirection, self.size)
         self.size += 1
 
+    cdef void _dequeue(self, INDEX_t i):
+        cdef INDEX_t* indirection = &self.indirection[0,0]
+        if indirection[i] == NO_INDEX:
+            return
+        if self.bucketed:
+            # the stale entry is skipped when its bucket is popped
+            indirection[i] = NO_INDEX
+            self.size -= 1
+            return
+        heap_remove(self.index, self.priority, indirection, indirection[i], self.size)
+        self.size -= 1
+
+    cdef void _relax_from_neighbours(self, INDEX_t i) except *:
+        # recompute the distance of `i` from the current distances of its neighbours
+        cdef DTYPE_t* distance = &self.distance[0,0]
+        cdef DTYPE_t* cost = &self.cost[0,0]
+        cdef DIR_t* direction = &self.direction[0,0]
+        cdef DTYPE_t best = distance[i]
+        cdef DTYPE_t alternative
+        cdef DIR_t best_k = NO_DIRECTION
+        cdef INDEX_t k
+        cdef INDEX_t[8] offsets = [
+            -self.stride, self.stride, -1, 1,
+            -self.stride - 1, -self.stride + 1, self.stride - 1, self.stride + 1
+        ]
+        if cost[i] == INFINITY:
+            return
+        for k in range(8):
+            alternative = distance[i - offsets[k]] + COST_DIRECTION[k] * cost[i]
+            if alternative < best:
+                best = alternative
+                best_k = <DIR_t>k
+        if best_k != NO_DIRECTION:
+            distance[i] = best
+            direction[i] = best_k
+            self._enqueue(i, best)
+
     def __dealloc__(self):
-        PyMem_Free(self.index)
-        PyMem_Free(self.priority)
+        PyMem_RawFree(self.index)
+        PyMem_RawFree(self.priority)
+        bucket_free(&self.buckets)
+
+    cdef inline void _count_heap_growth(self, INDEX_t old_capacity) noexcept nogil:
+        while old_capacity < self.capacity:
+            old_capacity *= 2
+            self.allocations += 2
 
-    cdef void _advance_heap(self, INDEX_t start):
-        dijkstra_core(
+    cdef int _advance_heap_nogil(self, INDEX_t* starts, INDEX_t num_starts) noexcept nogil:
+        cdef INDEX_t old_capacity = self.capacity
+        cdef Py_ssize_t old_allocations = self.buckets.allocations
+        cdef int status
+        if self.bucketed:
+            status = dijkstra_core_buckets(
+                &self.buckets,
+                &self.indirection[0, 0],
+                &self.size,
+                starts,
+                num_starts,
+                &self.distance[0, 0],
+                &self.cost[0, 0],
+                &self.direction[0, 0],
+                self.stride
+            )
+            self.allocations += self.buckets.allocations - old_allocations
+            return status
+        status = dijkstra_core(
             &self.index,
             &self.priority,
             &self.capacity,
             &self.indirection[0, 0],
             &self.size,
-            start,
+            starts,
+            num_starts,
             &self.distance[0, 0],
             &self.cost[0, 0],
             &self.direction[0, 0],
             self.stride
         )
+        self._count_heap_growth(old_capacity)
+        return status
+
+    cdef void _advance_heap(self, INDEX_t start) except *:
+        self._refresh()
+        if self._advance_heap_nogil(&start, 1) != 0:
+            raise MemoryError("Heap allocation failed in cy_dijkstra.")
 
-    cpdef get_path(self, object source, int limit=0, int max_distance=1):
+    cdef list _astar_path(self, object source, int limit, int max_distance):
+        # one-shot goal-directed search, the heap is ordered by estimates afterwards and
+        # only part of the grid is settled, so the object is marked stale and the next
+        # lazy query starts over
+        cdef INDEX_t x0, y0
+        cdef int status
+        cdef INDEX_t old_capacity
+        cdef const DTYPE_t[:] source_array = np.asarray(source, dtype=np.float32)
+        cdef DTYPE_t min_cost
+        cdef bint uniform
+        self._refresh()
+        x0, y0 = self._find_starting_point(source_array[0], source_array[1], max_distance)
+        if not self._is_valid_start(x0, y0):
+            return [(x0 - 1, y0 - 1)]
+        if self.bucketed:
+            self._targets_to_heap()
+        old_capacity = self.capacity
+        self.stale = True
+        with nogil:
+            uniform = has_uniform_cost(&self.cost[0, 0], self.cost.shape[0] * self.cost.shape[1], &min_cost)
+            # on uniform grids jump point search skips the symmetric paths through open areas
+            if uniform:
+                status = jps_core(
+                    &self.index,
+                    &self.priority,
+                    &self.capacity,
+                    &self.indirection[0, 0],
+                    &self.size,
+                    x0 * self.stride + y0,
+                    min_cost,
+                    &self.distance[0, 0],
+                    &self.cost[0, 0],
+                    &self.direction[0, 0],
+                    self.stride
+                )
+            else:
+                status = astar_core(
+                    &self.index,
+                    &self.priority,
+                    &self.capacity,
+                    &self.indirection[0, 0],
+                    &self.size,
+                    x0 * self.stride + y0,
+                    min_cost,
+                    &self.distance[0, 0],
+                    &self.cost[0, 0],
+                    &self.direction[0, 0],
+                    self.stride
+                )
+            self._count_heap_growth(old_capacity)
+        if status != 0:
+            raise MemoryError("Heap allocation failed in cy_dijkstra.")
+        return self._follow_directions(x0, y0, limit)
+
+    cdef void _targets_to_heap(self) except *:
+        # the goal-directed searches run on the heap, move the queued targets over
+        cdef INDEX_t* indirection = &self.indirection[0, 0]
+        cdef INDEX_t k, i
+        cdef INDEX_t size = 0
+        bucket_clear(&self.buckets, self.buckets.width)
+        for k in range(self.num_targets):
+            i = self.targets[k]
+            if indirection[i] == NO_INDEX:
+                continue
+            if size >= self.capacity:
+                if grow_heap(&self.index, &self.priority, &self.capacity) != 0:
+                    raise MemoryError("Heap allocation failed in cy_dijkstra.")
+                self.allocations += 2
+            self.index[size] = i
+            self.priority[size] = self.distance[i // self.stride, i % self.stride]
+            indirection[i] = size
+            size += 1
+        self.size = size
+
+    cpdef get_path(self, object source, int limit=0, int max_distance=1, bint smooth=False):
         """
 
         Follow the path from a given source using the forward pointer grids.
@@ -239,6 +1212,10 @@ cdef class DijkstraPathing:
             Maximum length of the returned path. Defaults to 0 indicating no limit.
         max_distance :
             Size of the search region for a valid starting point. Defaults to 1.
+        smooth :
+            If True, only return the turning points of the path. Cells are skipped when
+            the straight line past them crosses no cell more expensive than the skipped
+            part of the path. `limit` applies to the path before smoothing. Defaults to False.
 
         Returns
         -------
@@ -246,12 +1223,28 @@ cdef class DijkstraPathing:
             The lowest cost path from source to any of the targets.
 
         """
-        cdef INDEX_t x0, y0
-        x0, y0 = self._find_starting_point(np.asarray(source, dtype=np.float32), max_distance=max_distance)
-        if x0 < 0 or y0 < 0 or x0 >= self.cost.shape[0] or y0 >= self.cost.shape[1] or self.cost[x0, y0] == INFINITY:
+        cdef INDEX_t x0, y0, k, length
+        cdef INDEX_t* cells
+        cdef const DTYPE_t[:] source_array = np.asarray(source, dtype=np.float32)
+        x0, y0 = self._find_starting_point(source_array[0], source_array[1], max_distance)
+        if not self._is_valid_start(x0, y0):
             return [(x0 - 1, y0 - 1)]
         self._advance_heap(x0 * self.stride + y0)
-        return self._follow_directions(x0, y0, limit)
+        if not smooth:
+            return self._follow_directions(x0, y0, limit)
+
+        if limit == 0:
+            limit = self.distance.size
+        length = self._write_path(x0 * self.stride + y0, limit, NULL)
+        cells = <INDEX_t*>PyMem_Malloc(2 * length * sizeof(INDEX_t))
+        if not cells:
+            raise MemoryError("Could not allocate path memory")
+        with nogil:
+            self._write_path(x0 * self.stride + y0, limit, cells)
+            length = self._pull_string(cells, length)
+        path = [(cells[2 * k], cells[2 * k + 1]) for k in range(length)]
+        PyMem_Free(cells)
+        return path
 
     cpdef DTYPE_t get_distance(self, object source, bint upper_bound=False):
         """
@@ -273,13 +1266,398 @@ cdef class DijkstraPathing:
 
         """
         cdef INDEX_t x0, y0
-        x0, y0 = self._find_starting_point(np.asarray(source, dtype=np.float32), max_distance=1)
-        if x0 < 0 or y0 < 0 or x0 >= self.cost.shape[0] or y0 >= self.cost.shape[1] or self.cost[x0, y0] == INFINITY:
+        cdef const DTYPE_t[:] source_array = np.asarray(source, dtype=np.float32)
+        self._refresh()
+        x0, y0 = self._find_starting_point(source_array[0], source_array[1], 1)
+        if not self._is_valid_start(x0, y0):
             return INFINITY
         if not upper_bound:
             self._advance_heap(x0 * self.stride + y0)
         return self.distance[x0, y0]
 
+    cpdef cnp.ndarray get_distances(self, object sources, bint upper_bound=False):
+        """
+
+        Get the pathing distances from many sources to the nearest target at once.
+
+        Parameters
+        ----------
+        sources :
+            Array of shape (*, 2) containing x and y coordinates of the start points.
+        upper_bound :
+            If False (default), compute exact distances by advancing the heap.
+            If True, return current distance estimates without advancing.
+
+        Returns
+        -------
+        np.ndarray :
+            Array of shape (*,) with the lowest cost from each source to any of the targets.
+
+        """
+        cdef const DTYPE_t[:, ::1] source_array = np.ascontiguousarray(sources, dtype=np.float32).reshape(-1, 2)
+        cdef INDEX_t num_sources = source_array.shape[0]
+        cdef cnp.ndarray[INDEX_t, ndim=1] starts = np.empty(num_sources, dtype=np.int32)
+        cdef cnp.ndarray[DTYPE_t, ndim=1] distances = np.empty(num_sources, dtype=np.float32)
+        cdef DTYPE_t* distance = &self.distance[0, 0]
+        cdef INDEX_t k
+        self._batch_advance(source_array, 1, <INDEX_t*>starts.data, upper_bound)
+        for k in range(num_sources):
+            distances[k] = INFINITY if starts[k] == NO_INDEX else distance[starts[k]]
+        return distances
+
+    cpdef tuple get_paths(self, object sources, int limit=0, int max_distance=1):
+        """
+
+        Follow the paths from many sources at once using the forward pointer grids.
+
+        Parameters
+        ----------
+        sources :
+            Array of shape (*, 2) containing x and y coordinates of the start points.
+        limit :
+            Maximum length of each returned path. Defaults to 0 indicating no limit.
+        max_distance :
+            Size of the search region for a valid starting point. Defaults to 1.
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray] :
+            Path cells of shape (*, 2) for all sources concatenated, and offsets of
+            shape (len(sources) + 1,) so that path `k` is `cells[offsets[k]:offsets[k + 1]]`.
+
+        """
+        cdef const DTYPE_t[:, ::1] source_array = np.ascontiguousarray(sources, dtype=np.float32).reshape(-1, 2)
+        cdef INDEX_t num_sources = source_array.shape[0]
+        cdef cnp.ndarray[INDEX_t, ndim=1] starts = np.empty(num_sources, dtype=np.int32)
+        cdef cnp.ndarray[cnp.int64_t, ndim=1] offsets = np.empty(num_sources + 1, dtype=np.int64)
+        cdef INDEX_t* start_ptr = <INDEX_t*>starts.data
+        cdef cnp.int64_t* offset_ptr = <cnp.int64_t*>offsets.data
+        cdef INDEX_t k
+        if limit == 0:
+            limit = self.distance.size
+        self._batch_advance(source_array, max_distance, start_ptr, False)
+
+        with nogil:
+            offset_ptr[0] = 0
+            for k in range(num_sources):
+                offset_ptr[k + 1] = offset_ptr[k] + self._write_path(start_ptr[k], limit, NULL)
+
+        cdef cnp.ndarray[INDEX_t, ndim=2] cells = np.empty((offsets[num_sources], 2), dtype=np.int32)
+        cdef INDEX_t* cell_ptr = <INDEX_t*>cells.data
+        cdef INDEX_t x0, y0
+        with nogil:
+            for k in range(num_sources):
+                if start_ptr[k] == NO_INDEX:
+                    # no valid start, mirror `get_path` and return the snapped point
+                    x0, y0 = self._find_starting_point(source_array[k, 0], source_array[k, 1], max_distance)
+                    cell_ptr[2 * offset_ptr[k]] = x0 - 1
+                    cell_ptr[2 * offset_ptr[k] + 1] = y0 - 1
+                else:
+                    self._write_path(start_ptr[k], limit, cell_ptr + 2 * offset_ptr[k])
+        return cells, offsets
+
+    cpdef cnp.ndarray next_waypoints(self, object positions, int lookahead=1, int max_distance=1):
+        """
+
+        Step many positions along the pointer grid at once.
+
+        Parameters
+        ----------
+        positions :
+            Array of shape (*, 2) containing x and y coordinates of the start points.
+        lookahead :
+            Number of cells to move along the path. Defaults to 1.
+        max_distance :
+            Size of the search region for a valid starting point. Defaults to 1.
+
+        Returns
+        -------
+        np.ndarray :
+            Array of shape (*, 2) with the cell `lookahead` steps along the path of each
+            position, or the target if it is closer. Invalid positions stay where they are.
+
+        """
+        cdef const DTYPE_t[:, ::1] source_array = np.ascontiguousarray(positions, dtype=np.float32).reshape(-1, 2)
+        cdef INDEX_t num_sources = source_array.shape[0]
+        cdef cnp.ndarray[INDEX_t, ndim=1] starts = np.empty(num_sources, dtype=np.int32)
+        cdef cnp.ndarray[INDEX_t, ndim=2] waypoints = np.empty((num_sources, 2), dtype=np.int32)
+        cdef INDEX_t* start_ptr = <INDEX_t*>starts.data
+        cdef INDEX_t* waypoint_ptr = <INDEX_t*>waypoints.data
+        cdef INDEX_t k, i, x0, y0
+        self._batch_advance(source_array, max_distance, start_ptr, False)
+        with nogil:
+            for k in range(num_sources):
+                if start_ptr[k] == NO_INDEX:
+                    x0, y0 = self._find_starting_point(source_array[k, 0], source_array[k, 1], max_distance)
+                else:
+                    i = self._step(start_ptr[k], lookahead)
+                    x0 = i // self.stride
+                    y0 = i % self.stride
+                waypoint_ptr[2 * k] = x0 - 1
+                waypoint_ptr[2 * k + 1] = y0 - 1
+        return waypoints
+
+    cdef inline INDEX_t _step(self, INDEX_t i, INDEX_t steps) noexcept nogil:
+        # follow the pointers from cell `i` for at most `steps` cells
+        cdef DIR_t* direction = &self.direction[0, 0]
+        cdef INDEX_t[8] offsets = [
+            -self.stride, self.stride, -1, 1,
+            -self.stride - 1, -self.stride + 1, self.stride - 1, self.stride + 1
+        ]
+        while steps > 0 and direction[i] != NO_DIRECTION:
+            i -= offsets[direction[i]]
+            steps -= 1
+        return i
+
+    cdef void _batch_advance(
+        self,
+        const DTYPE_t[:, ::1] sources,
+        int max_distance,
+        INDEX_t* starts,
+        bint upper_bound,
+    ) except *:
+        # resolve start cells (NO_INDEX if invalid) and settle all of them in one heap pass
+        cdef INDEX_t k, x0, y0
+        cdef INDEX_t num_valid = 0
+        cdef int status = 0
+        cdef INDEX_t* valid
+        self._refresh()
+        valid = <INDEX_t*>PyMem_Malloc(max(1, sources.shape[0]) * sizeof(INDEX_t))
+        if not valid:
+            raise MemoryError("Could not allocate start memory")
+        with nogil:
+            for k in range(sources.shape[0]):
+                x0, y0 = self._find_starting_point(sources[k, 0], sources[k, 1], max_distance)
+                if self._is_valid_start(x0, y0):
+                    starts[k] = x0 * self.stride + y0
+                    valid[num_valid] = starts[k]
+                    num_valid += 1
+                else:
+                    starts[k] = NO_INDEX
+            if not upper_bound:
+                status = self._advance_heap_nogil(valid, num_valid)
+        PyMem_Free(valid)
+        if status != 0:
+            raise MemoryError("Heap allocation failed in cy_dijkstra.")
+
+    cdef bint _line_of_sight(self, INDEX_t x0, INDEX_t y0, INDEX_t x1, INDEX_t y1, DTYPE_t max_cost) noexcept nogil:
+        # bresenham over the padded cost grid, every cell on the line must cost at most `max_cost`
+        cdef INDEX_t dx = abs(x1 - x0)
+        cdef INDEX_t dy = -abs(y1 - y0)
+        cdef INDEX_t sx = 1 if x0 < x1 else -1
+        cdef INDEX_t sy = 1 if y0 < y1 else -1
+        cdef INDEX_t error = dx + dy
+        cdef INDEX_t e2
+        while True:
+            if self.cost[x0 + 1, y0 + 1] > max_cost:
+                return False
+            if x0 == x1 and y0 == y1:
+                return True
+            e2 = 2 * error
+            if e2 >= dy:
+                error += dy
+                x0 += sx
+            if e2 <= dx:
+                error += dx
+                y0 += sy
+
+    cdef INDEX_t _pull_string(self, INDEX_t* cells, INDEX_t length) noexcept nogil:
+        # reduce the unpadded (x, y) pairs in `cells` to turning points in place. Only the
+        # corners of the path are tried as segment ends, a straight run between two
+        # corners is a bresenham line itself, so it always has line of sight
+        cdef INDEX_t j, k
+        cdef INDEX_t num_points = 1
+        cdef INDEX_t anchor = 0
+        cdef INDEX_t last_visible = 0
+        cdef INDEX_t anchor_x = cells[0]
+        cdef INDEX_t anchor_y = cells[1]
+        cdef DTYPE_t segment_cost = self.cost[anchor_x + 1, anchor_y + 1]
+        if length < 3:
+            return length
+        for j in range(1, length):
+            segment_cost = max(segment_cost, self.cost[cells[2 * j] + 1, cells[2 * j + 1] + 1])
+            if j < length - 1 and (
+                cells[2 * j] - cells[2 * (j - 1)] == cells[2 * (j + 1)] - cells[2 * j]
+                and cells[2 * j + 1] - cells[2 * (j - 1) + 1] == cells[2 * (j + 1) + 1] - cells[2 * j + 1]
+            ):
+                continue
+            if not self._line_of_sight(anchor_x, anchor_y, cells[2 * j], cells[2 * j + 1], segment_cost):
+                # the last visible corner is a turning point, start the next segment from there
+                anchor = last_visible
+                anchor_x = cells[2 * anchor]
+                anchor_y = cells[2 * anchor + 1]
+                cells[2 * num_points] = anchor_x
+                cells[2 * num_points + 1] = anchor_y
+                num_points += 1
+                segment_cost = self.cost[anchor_x + 1, anchor_y + 1]
+                for k in range(anchor + 1, j + 1):
+                    segment_cost = max(segment_cost, self.cost[cells[2 * k] + 1, cells[2 * k + 1] + 1])
+            last_visible = j
+        cells[2 * num_points] = cells[2 * (length - 1)]
+        cells[2 * num_points + 1] = cells[2 * (length - 1) + 1]
+        return num_points + 1
+
+    cdef INDEX_t _write_path(self, INDEX_t i, INDEX_t limit, INDEX_t* out) noexcept nogil:
+        # follow the pointers from cell `i`, writing unpadded coordinates to `out` if given
+        cdef INDEX_t length = 0
+        cdef INDEX_t x, y
+        cdef DIR_t k
+        if i == NO_INDEX:
+            return 1
+        x = i // self.stride
+        y = i % self.stride
+        while length < limit:
+            if out != NULL:
+                out[2 * length] = x - 1
+                out[2 * length + 1] = y - 1
+            length += 1
+            k = self.direction[x, y]
+            if k == NO_DIRECTION:
+                break
+            x -= OFFSET_X[k]
+            y -= OFFSET_Y[k]
+        return length
+
+    cpdef void update_cost(self, object cells, object values, bint checks_enabled=True) except *:
+        """
+
+        Change the cost of some cells in place and repair the distance and pointer grids.
+
+        Cells that became cheaper are requeued with their improved distance. Cells that
+        became more expensive invalidate the subtree of the pointer grid hanging off them,
+        which is then reseeded from its untouched neighbours. Only the affected region is
+        recomputed, the rest of the grids are kept as they are.
+
+        Parameters
+        ----------
+        cells :
+            Array of shape (*, 2) containing x and y coordinates of the changed cells.
+        values :
+            New cost for each cell, or a single cost for all of them. Set unpathable cells to infinity.
+        checks_enabled :
+            Pass False to deactivate cost value and cell coordinates checks. Defaults to True.
+
+        """
+        cdef const INDEX_t[:, ::1] cell_array = np.ascontiguousarray(cells, dtype=np.int32).reshape(-1, 2)
+        cdef INDEX_t num_cells = cell_array.shape[0]
+        cdef const DTYPE_t[::1] value_array = np.ascontiguousarray(
+            np.broadcast_to(np.asarray(values, dtype=np.float32), (num_cells,))
+        )
+        if checks_enabled:
+            if not np.greater(value_array, 0.0).all():
+                raise Exception("invalid cost: values must be positive")
+            if (
+                not np.greater_equal(cell_array, 0).all()
+                or not np.less(cell_array[:, 0], self.cost.shape[0] - 2).all()
+                or not np.less(cell_array[:, 1], self.cost.shape[1] - 2).all()
+            ):
+                raise Exception(f"invalid cell: coordinates out of bounds")
+        self._refresh()
+
+        cdef:
+            DTYPE_t* cost = &self.cost[0,0]
+            DTYPE_t* distance = &self.distance[0,0]
+            DIR_t* direction = &self.direction[0,0]
+            INDEX_t i, k, child
+            INDEX_t head = 0
+            INDEX_t tail = 0
+            INDEX_t capacity = max(MIN_CAPACITY, 8 * num_cells)
+            INDEX_t* queue = <INDEX_t*>PyMem_Malloc(capacity * sizeof(INDEX_t))
+            INDEX_t* new_queue
+            INDEX_t[8] offsets = [
+                -self.stride, self.stride, -1, 1,
+                -self.stride - 1, -self.stride + 1, self.stride - 1, self.stride + 1
+            ]
+        if not queue:
+            raise MemoryError("Could not allocate queue memory")
+
+        try:
+            # apply new costs, remember the cells that became more expensive
+            for k in range(num_cells):
+                i = self.stride * (cell_array[k, 0] + 1) + (cell_array[k, 1] + 1)
+                if value_array[k] > cost[i] and distance[i] != INFINITY:
+                    queue[tail] = i
+                    tail += 1
+                cost[i] = value_array[k]
+                if self.bucketed and value_array[k] < self.buckets.width:
+                    self._rebucket(value_array[k], M_SQRT2 * value_array[k])
+                elif self.bucketed and value_array[k] != INFINITY and M_SQRT2 * value_array[k] > self.buckets.max_step:
+                    self._rebucket(self.buckets.width, M_SQRT2 * value_array[k])
+
+            # invalidate everything whose path ran through a more expensive cell
+            while head < tail:
+                i = queue[head]
+                head += 1
+                if distance[i] == INFINITY:
+                    continue
+                distance[i] = INFINITY
+                direction[i] = NO_DIRECTION
+                self._dequeue(i)
+                for k in range(8):
+                    child = i + offsets[k]
+                    if direction[child] == k and distance[child] != INFINITY:
+                        if tail >= capacity:
+                            new_queue = <INDEX_t*>PyMem_Realloc(queue, 2 * capacity * sizeof(INDEX_t))
+                            if not new_queue:
+                                raise MemoryError("Could not allocate queue memory")
+                            queue = new_queue
+                            capacity *= 2
+                        queue[tail] = child
+                        tail += 1
+
+            # reseed targets, invalidated cells and cheaper cells
+            for k in range(self.num_targets):
+                self._add_target(self.targets[k])
+            for k in range(tail):
+                self._relax_from_neighbours(queue[k])
+            for k in range(num_cells):
+                self._relax_from_neighbours(self.stride * (cell_array[k, 0] + 1) + (cell_array[k, 1] + 1))
+        finally:
+            PyMem_Free(queue)
+
+    cdef void _rebucket(self, DTYPE_t width, DTYPE_t max_step) except *:
+        # a cheaper step than the bucket width breaks the bucket order and a longer one
+        # than the ring overflows it, requeue with a finer width or a larger ring
+        cdef Py_ssize_t old_allocations = self.buckets.allocations
+        cdef int status = 0
+        if not ring_fits(min(width, self.buckets.width), max(max_step, self.buckets.max_step)):
+            self._buckets_to_heap()
+            return
+        with nogil:
+            if width < self.buckets.width:
+                status = bucket_rebuild(&self.buckets, &self.indirection[0, 0], &self.distance[0, 0], width)
+            if status == 0:
+                status = bucket_reserve(&self.buckets, &self.indirection[0, 0], &self.distance[0, 0], max_step)
+        self.allocations += self.buckets.allocations - old_allocations
+        if status != 0:
+            raise MemoryError("Heap allocation failed in cy_dijkstra.")
+
+    cdef void _buckets_to_heap(self) except *:
+        # move the queued cells from the buckets to the heap, which has no range to outgrow
+        cdef INDEX_t* indirection = &self.indirection[0, 0]
+        cdef DTYPE_t* distance = &self.distance[0, 0]
+        cdef BucketQueue* q = &self.buckets
+        cdef INDEX_t r, slot, i
+        cdef list queued = []
+        for r in range(q.num_buckets):
+            slot = q.head[r]
+            while slot != NO_INDEX:
+                if indirection[q.cell[slot]] == r:
+                    queued.append(q.cell[slot])
+                slot = q.next[slot]
+        slot = q.overflow
+        while slot != NO_INDEX:
+            if indirection[q.cell[slot]] == IN_OVERFLOW:
+                queued.append(q.cell[slot])
+            slot = q.next[slot]
+        for i in queued:
+            indirection[i] = NO_INDEX
+        bucket_clear(q, q.width)
+        self.bucketed = False
+        self.size = 0
+        for i in queued:
+            self._enqueue(i, distance[i])
+
     cdef _follow_directions(self, INDEX_t x, INDEX_t y, INDEX_t limit):
         if limit == 0:
             limit = self.distance.size
@@ -293,10 +1671,17 @@ cdef class DijkstraPathing:
             y -= OFFSET_Y[k]
         return path
 
-    cdef (INDEX_t, INDEX_t) _find_starting_point(self, DTYPE_t[:] source, int max_distance):
+    cdef inline bint _is_valid_start(self, INDEX_t x0, INDEX_t y0) noexcept nogil:
+        return (
+            0 <= x0 < self.cost.shape[0]
+            and 0 <= y0 < self.cost.shape[1]
+            and self.cost[x0, y0] != INFINITY
+        )
+
+    cdef (INDEX_t, INDEX_t) _find_starting_point(self, DTYPE_t sx, DTYPE_t sy, int max_distance) noexcept nogil:
         # +1 for padding
-        cdef DTYPE_t fx0 = source[0] + 1
-        cdef DTYPE_t fy0 = source[1] + 1
+        cdef DTYPE_t fx0 = sx + 1
+        cdef DTYPE_t fy0 = sy + 1
         cdef INDEX_t x0 = <INDEX_t>round(fx0)
         cdef INDEX_t y0 = <INDEX_t>round(fy0)
         cdef INDEX_t x_min = x0
@@ -322,6 +1707,7 @@ cpdef DijkstraPathing cy_dijkstra(
     object cost,
     object targets,
     bint checks_enabled = True,
+    str queue = "heap",
 ):
     """
 
@@ -335,6 +1721,11 @@ cpdef DijkstraPathing cy_dijkstra(
         Target array of shape (*, 2) containing x and y coordinates of the target points.
     checks_enabled :
         Pass False to deactivate grid value and target coordinates checks. Defaults to True.
+    queue :
+        Priority queue used to order the search, "heap" or "bucket". The bucket queue
+        groups cells by distance in steps of the cheapest cell cost, which avoids the
+        heap's sift operations when costs span a small range. Costs spanning a range
+        too wide for its ring of buckets are searched with the heap instead. Defaults to "heap".
 
     Returns
     -------
@@ -345,12 +1736,111 @@ cpdef DijkstraPathing cy_dijkstra(
     cdef const DTYPE_t[:, ::1] cost_array = np.ascontiguousarray(cost, dtype=np.float32)
     cdef const INDEX_t[:, ::1] target_array = np.ascontiguousarray(targets, dtype=np.int32)
     if checks_enabled:
-        if not np.greater(cost_array, 0.0).all():
-            raise Exception("invalid cost: values must be positive")
-        if (
-            not np.greater_equal(targets, 0).all()
-            or not np.less(targets[:, 0], cost.shape[0]).all()
-            or not np.less(targets[:, 1], cost.shape[1]).all()
-        ):
-            raise Exception(f"invalid target: coordinates out of bounds")
-    return DijkstraPathing(cost_array, target_array)
+        _check_inputs(cost_array, target_array)
+    return DijkstraPathing(cost_array, target_array, queue)
+
+cpdef list cy_dijkstra_many(
+    object costs,
+    object targets_list,
+    int num_threads = 0,
+    bint checks_enabled = True,
+):
+    """
+
+    Run Dijkstras algorithm on several grids at once, settling them on parallel threads.
+
+    Parameters
+    ----------
+    costs :
+        Sequence of cost grids. Entries must be positive. Set unpathable cells to infinity.
+    targets_list :
+        Sequence of target arrays of shape (*, 2), one for each cost grid.
+    num_threads :
+        Number of threads to use. Defaults to 0 indicating one per CPU core.
+    checks_enabled :
+        Pass False to deactivate grid value and target coordinates checks. Defaults to True.
+
+    Returns
+    -------
+    list[DijkstraPathing] :
+        Fully settled pathfinding objects in the order of the cost grids.
+
+    """
+    if len(costs) != len(targets_list):
+        raise Exception("invalid input: costs and targets_list must have the same length")
+    cdef list fields = [
+        cy_dijkstra(cost, targets, checks_enabled) for cost, targets in zip(costs, targets_list)
+    ]
+    if num_threads <= 0:
+        num_threads = os.cpu_count() or 1
+    num_threads = min(num_threads, len(fields))
+    if num_threads <= 1:
+        for field in fields:
+            field.settle()
+    else:
+        # settle releases the GIL, so the fields are computed concurrently
+        with ThreadPoolExecutor(max_workers=num_threads) as executor:
+            for _ in executor.map(DijkstraPathing.settle, fields):
+                pass
+    return fields
+
+cpdef list cy_astar(
+    object cost,
+    object source,
+    object target,
+    int limit = 0,
+    int max_distance = 1,
+    bint checks_enabled = True,
+    DijkstraPathing workspace = None,
+):
+    """
+
+    Run A* on a grid, yielding the shortest path from a single source to a single target.
+
+    If every pathable cell has the same cost, jump point search is used instead,
+    which returns a path of the same cost while pushing far fewer cells on the heap.
+
+    Parameters
+    ----------
+    cost :
+        Cost grid. Entries must be positive. Set unpathable cells to infinity.
+    source :
+        Start point.
+    target :
+        x and y coordinates of the target point.
+    limit :
+        Maximum length of the returned path. Defaults to 0 indicating no limit.
+    max_distance :
+        Size of the search region for a valid starting point. Defaults to 1.
+    checks_enabled :
+        Pass False to deactivate grid value and target coordinates checks. Defaults to True.
+    workspace :
+        Optional DijkstraPathing object whose buffers are reused for the search
+        instead of allocating new ones. It is reset, so previous results are lost.
+        Later queries on it recompute the dijkstra fields for the new target.
+
+    Returns
+    -------
+    list[tuple[int, int]] :
+        The lowest cost path from source to the target.
+
+    """
+    cdef const DTYPE_t[:, ::1] cost_array = np.ascontiguousarray(cost, dtype=np.float32)
+    cdef const INDEX_t[:, ::1] target_array = np.ascontiguousarray(target, dtype=np.int32).reshape(1, 2)
+    if checks_enabled:
+        _check_inputs(cost_array, target_array)
+    if workspace is None:
+        workspace = DijkstraPathing(cost_array, target_array)
+    else:
+        workspace.reset(cost_array, target_array, False)
+    return workspace._astar_path(source, limit, max_distance)
+
+cdef void _check_inputs(const DTYPE_t[:, ::1] cost, const INDEX_t[:, ::1] targets) except *:
+    if not np.greater(cost, 0.0).all():
+        raise Exception("invalid cost: values must be positive")
+    if (
+        not np.greater_equal(targets, 0).all()
+        or not np.less(targets[:, 0], cost.shape[0]).all()
+        or not np.less(targets[:, 1], cost.shape[1]).all()
+    ):
+        raise Exception(f"invalid target: coordinates out of bounds")
@@ -0,0 +1,94 @@
+from typing import Optional, Union
+
+import numpy as np
+from sc2.position import Point2
+from sc2.unit import Unit
+from sc2.units import Units
+
+def cy_formation_slots(
+    anchor: Union[Point2, tuple[float, float]],
+    target: Union[Point2, tuple[float, float]],
+    num_slots: int,
+    shape: str = "concave",
+    spacing: float = 1.0,
+    width: int = 0,
+) -> np.ndarray:
+    """Lay out formation slots facing a target.
+
+    Slots are placed row by row, front row first, each row filled from the
+    middle outwards so a partial last row stays centered.
+
+    - "line": straight rows across the direction to the target.
+    - "concave": rows bent along circles around the target, so the wings
+      are as close to it as the middle.
+    - "arc": like concave, but each row takes as many slots as fit on the
+      half circle facing the anchor.
+
+    Example:
+    ```py
+    from cython_extensions import cy_formation_slots
+
+    slots = cy_formation_slots(
+        self.army.center, self.enemy_army.center, len(self.army), "line"
+    )
+    ```
+
+    Args:
+        anchor: Middle of the front row.
+        target: What the formation faces.
+        num_slots: How many slots to lay out.
+        shape: "line", "concave" or "arc".
+        spacing: Distance between neighbouring slots and rows.
+        width: Slots per row of line and concave formations. 0 makes them
+            about twice as wide as deep.
+
+    Returns:
+        (num_slots, 2) float64 array of slot positions.
+    """
+    ...
+
+def cy_formation(
+    units: Union[Units, list[Unit], np.ndarray],
+    target: Union[Point2, tuple[float, float]],
+    shape: str = "concave",
+    spacing: float = 1.0,
+    width: int = 0,
+    anchor: Optional[Union[Point2, tuple[float, float]]] = None,
+) -> Union[dict[int, tuple[float, float]], np.ndarray]:
+    """Move units into a formation facing a target.
+
+    Slots come from `cy_formation_slots`, by default centered on where the
+    units are. Then every unit gets its own slot. Up to 32 units get the
+    assignment with the least total travel. Larger groups are matched row
+    by row: units closest to the target take the front row, and within a
+    row units and slots are paired from one side to the other, so paths
+    don't cross.
+
+    Example:
+    ```py
+    from cython_extensions import cy_formation
+
+    target = self.enemy_army.center
+    for tag, position in cy_formation(self.army, target).items():
+        self.units.by_tag(tag).move(Point2(position))
+    ```
+
+    ```
+    200 units: 0.13 ms
+    200 positions: 0.06 ms
+    ```
+
+    Args:
+        units: Units, or an (N, 2) array of their positions.
+        target: What the formation faces.
+        shape: "line", "concave" or "arc".
+        spacing: Distance between neighbouring slots and rows.
+        width: Slots per row of line and concave formations. 0 makes them
+            about twice as wide as deep.
+        anchor: Middle of the front row. Centered on the units if not given.
+
+    Returns:
+        Position of each unit by tag, or with positions given, an (N, 2)
+        array of the position of each of them.
+    """
+    ...
@@ -0,0 +1,295 @@
+from cython cimport boundscheck, wraparound
+from libc.math cimport atan2, ceil, cos, floor, pi, sin, sqrt
+
+import numpy as np
+
+cimport numpy as cnp
+
+from scipy.optimize import linear_sum_assignment
+
+# exact assignment below this many units, the row sweep above
+cdef Py_ssize_t HUNGARIAN_MAX_UNITS = 32
+
+cdef enum Shape:
+    LINE = 0
+    CONCAVE = 1
+    ARC = 2
+
+SHAPES = {"line": LINE, "concave": CONCAVE, "arc": ARC}
+
+# -----------------------------------------------------------------------------
+# Slots
+# -----------------------------------------------------------------------------
+# Slots are laid out row by row away from the target, rows filled from the middle
+# outwards so a partial last row stays centered. Concave and arc rows are circles
+# around the target, spaced by arc length, so their wings bend towards it. Arc rows
+# are as wide as the half circle facing the anchor
+
+
+cdef inline double _lateral_offset(Py_ssize_t k) noexcept nogil:
+    # 0, 1, -1, 2, -2, ... for the k-th slot of a row
+    return (k + 1) // 2 if k % 2 else -(k // 2)
+
+
+cdef Py_ssize_t _row_capacity(Shape shape, double row_radius, double spacing, Py_ssize_t width) noexcept nogil:
+    if shape == ARC:
+        # as many as fit on the half circle facing the anchor
+        return 2 * <Py_ssize_t>floor(pi * row_radius / (2 * spacing)) + 1
+    return width
+
+
+@boundscheck(False)
+@wraparound(False)
+cdef void _layout_slots(
+    Shape shape,
+    double anchor_x,
+    double anchor_y,
+    double target_x,
+    double target_y,
+    double spacing,
+    Py_ssize_t width,
+    double[:, ::1] slots,
+    Py_ssize_t[::1] rows,
+) noexcept nogil:
+    cdef Py_ssize_t num_slots = slots.shape[0]
+    cdef Py_ssize_t i = 0
+    cdef Py_ssize_t row = 0
+    cdef Py_ssize_t k, capacity
+    cdef double dx = anchor_x - target_x
+    cdef double dy = anchor_y - target_y
+    cdef double distance = sqrt(dx * dx + dy * dy)
+    cdef double back_x, back_y, base_angle, row_radius, angle, lateral
+    if distance > 0:
+        back_x = dx / distance
+        back_y = dy / distance
+    else:
+        back_x = 1.0
+        back_y = 0.0
+    base_angle = atan2(back_y, back_x)
+    # a circle needs some radius to bend around
+    distance = max(distance, spacing)
+
+    while i < num_slots:
+        row_radius = distance + row * spacing
+        capacity = _row_capacity(shape, row_radius, spacing, width)
+        for k in range(min(capacity, num_slots - i)):
+            lateral = _lateral_offset(k) * spacing
+            if shape == LINE:
+                slots[i, 0] = anchor_x + back_x * row * spacing - back_y * lateral
+                slots[i, 1] = anchor_y + back_y * row * spacing + back_x * lateral
+            else:
+                angle = base_angle + lateral / row_radius
+                slots[i, 0] = target_x + row_radius * cos(angle)
+                slots[i, 1] = target_y + row_radius * sin(angle)
+            rows[i] = row
+            i += 1
+        row += 1
+
+
+cdef Shape _shape_of(str shape) except *:
+    if shape not in SHAPES:
+        raise ValueError(f"invalid shape: expected one of {sorted(SHAPES)}, got {shape!r}")
+    return SHAPES[shape]
+
+
+cdef Py_ssize_t _auto_width(Py_ssize_t num_slots, Py_ssize_t width) noexcept:
+    # about twice as wide as deep
+    if width > 0:
+        return width
+    return max(<Py_ssize_t>ceil(sqrt(2.0 * num_slots)), 1)
+
+
+cpdef cnp.ndarray cy_formation_slots(
+    (double, double) anchor,
+    (double, double) target,
+    Py_ssize_t num_slots,
+    str shape = "concave",
+    double spacing = 1.0,
+    Py_ssize_t width = 0,
+):
+    """
+
+    Lay out formation slots facing a target.
+
+    Parameters
+    ----------
+    anchor : (double, double)
+        Middle of the front row.
+    target : (double, double)
+        What the formation faces.
+    num_slots : Py_ssize_t
+        How many slots to lay out.
+    shape : str, optional
+        "line", "concave" or "arc". Defaults to "concave".
+    spacing : double, optional
+        Distance between neighbouring slots and rows. Defaults to 1.0.
+    width : Py_ssize_t, optional
+        Slots per row of line and concave formations, arc rows fill the half
+        circle facing the anchor. Defaults to 0 indicating about twice as wide
+        as deep.
+
+    Returns
+    -------
+    np.ndarray :
+        (num_slots, 2) float64 array of slot positions, front row first.
+
+    """
+    cdef Shape formation_shape = _shape_of(shape)
+    if num_slots < 0:
+        raise ValueError(f"num_slots must not be negative, got {num_slots}")
+    if spacing <= 0:
+        raise ValueError(f"spacing must be positive, got {spacing}")
+    cdef cnp.ndarray slots = np.empty((num_slots, 2), dtype=np.float64)
+    cdef Py_ssize_t[::1] rows = np.empty(num_slots, dtype=np.intp)
+    cdef double[:, ::1] slot_view = slots
+    width = _auto_width(num_slots, width)
+    with nogil:
+        _layout_slots(
+            formation_shape, anchor[0], anchor[1], target[0], target[1], spacing, width, slot_view, rows
+        )
+    return slots
+
+
+# -----------------------------------------------------------------------------
+# Slot assignment
+# -----------------------------------------------------------------------------
+
+
+cdef cnp.ndarray _row_sweep(
+    Shape shape, cnp.ndarray positions, cnp.ndarray slots, cnp.ndarray rows, (double, double) target,
+    (double, double) back,
+):
+    # Units closest to the target take the front rows, and within a row units and slots
+    # are matched from one side to the other, so paths don't cross. Rows are lines or
+    # circles around the target, measured by projection or by radius and angle
+    cdef cnp.ndarray offsets = positions - np.array(target)
+    cdef cnp.ndarray slot_offsets = slots - np.array(target)
+    if shape == LINE:
+        forward = offsets @ np.array(back)
+        lateral = offsets @ np.array((-back[1], back[0]))
+        slot_lateral = slot_offsets @ np.array((-back[1], back[0]))
+    else:
+        forward = np.hypot(offsets[:, 0], offsets[:, 1])
+        base_angle = np.arctan2(back[1], back[0])
+        lateral = np.angle(np.exp(1j * (np.arctan2(offsets[:, 1], offsets[:, 0]) - base_angle)))
+        slot_lateral = np.angle(np.exp(1j * (np.arctan2(slot_offsets[:, 1], slot_offsets[:, 0]) - base_angle)))
+    unit_rows = np.empty(len(positions), dtype=np.intp)
+    unit_rows[np.argsort(forward, kind="stable")] = rows
+    unit_order = np.lexsort((lateral, unit_rows))
+    slot_order = np.lexsort((slot_lateral, rows))
+    assignment = np.empty(len(positions), dtype=np.intp)
+    assignment[unit_order] = slot_order
+    return assignment
+
+
+cdef cnp.ndarray _assign_slots(
+    Shape shape, cnp.ndarray positions, cnp.ndarray slots, cnp.ndarray rows, (double, double) target,
+    (double, double) back,
+):
+    # slot index of each unit, with the least total travel for small groups
+    if len(positions) <= HUNGARIAN_MAX_UNITS:
+        distances = np.hypot(
+            positions[:, None, 0] - slots[None, :, 0], positions[:, None, 1] - slots[None, :, 1]
+        )
+        return linear_sum_assignment(distances)[1].astype(np.intp)
+    return _row_sweep(shape, positions, slots, rows, target, back)
+
+
+cpdef object cy_formation(
+    object units,
+    (double, double) target,
+    str shape = "concave",
+    double spacing = 1.0,
+    Py_ssize_t width = 0,
+    object anchor = None,
+):
+    """
+
+    Move units into a formation facing a target.
+
+    Parameters
+    ----------
+    units :
+        Units, or an (N, 2) array of positions.
+    target : (double, double)
+        What the formation faces.
+    shape : str, optional
+        "line", "concave" or "arc". Defaults to "concave".
+    spacing : double, optional
+        Distance between neighbouring slots and rows. Defaults to 1.0.
+    width : Py_ssize_t, optional
+        Slots per row of line and concave formations. Defaults to 0 indicating
+        about twice as wide as deep.
+    anchor : (double, double), optional
+        Middle of the front row. Defaults to None indicating the formation is
+        centered on the units.
+
+    Returns
+    -------
+    dict | np.ndarray :
+        Position of each unit by tag, or with positions given, an (N, 2) array of
+        the position of each of them.
+
+    """
+    cdef:
+        Shape formation_shape = _shape_of(shape)
+        bint from_array = isinstance(units, np.ndarray)
+        Py_ssize_t num_units = len(units)
+        cnp.ndarray positions
+        cnp.ndarray slots
+        cnp.ndarray rows
+        double[:, ::1] slot_view
+        Py_ssize_t[::1] row_view
+        double[:, ::1] position_view
+        Py_ssize_t i
+        double center_x, center_y, dx, dy, distance, depth, anchor_x, anchor_y
+        (double, double) back
+
+    if spacing <= 0:
+        raise ValueError(f"spacing must be positive, got {spacing}")
+    if from_array:
+        positions = np.ascontiguousarray(units, dtype=np.float64).reshape(-1, 2)
+    else:
+        positions = np.empty((num_units, 2), dtype=np.float64)
+        position_view = positions
+        for i in range(num_units):
+            position = units[i].position
+            position_view[i, 0] = position[0]
+            position_view[i, 1] = position[1]
+    if num_units == 0:
+        return positions if from_array else {}
+
+    center_x, center_y = positions.mean(axis=0)
+    dx = center_x - target[0]
+    dy = center_y - target[1]
+    distance = sqrt(dx * dx + dy * dy)
+    back = (dx / distance, dy / distance) if distance > 0 else (1.0, 0.0)
+    width = _auto_width(num_units, width)
+    if anchor is None:
+        # front row half the formation depth ahead of the units' center
+        if formation_shape == ARC:
+            # arc rows are wide enough to take most units in front
+            depth = 0.0
+        else:
+            depth = (ceil(num_units / <double>width) - 1) * spacing
+        anchor_x = target[0] + back[0] * max(distance - depth / 2, 0.0)
+        anchor_y = target[1] + back[1] * max(distance - depth / 2, 0.0)
+    else:
+        anchor_x, anchor_y = anchor
+        dx = anchor_x - target[0]
+        dy = anchor_y - target[1]
+        if dx or dy:
+            back = (dx / sqrt(dx * dx + dy * dy), dy / sqrt(dx * dx + dy * dy))
+
+    slots = np.empty((num_units, 2), dtype=np.float64)
+    rows = np.empty(num_units, dtype=np.intp)
+    slot_view = slots
+    row_view = rows
+    with nogil:
+        _layout_slots(
+            formation_shape, anchor_x, anchor_y, target[0], target[1], spacing, width, slot_view, row_view
+        )
+    placed = slots[_assign_slots(formation_shape, positions, slots, rows, target, back)]
+    if from_array:
+        return placed
+    return {unit.tag: (x, y) for unit, (x, y) in zip(units, placed.tolist())}
@@ -1,5 +1,6 @@
 from typing import Union
 
+import numpy as np
 from sc2.position import Point2
 
 def cy_angle_to(
@@ -247,3 +248,118 @@ def cy_translate_point_along_line(
         after translation.
     """
     ...
+
+def cy_distance_many(
+    from_positions: np.ndarray, to_positions: np.ndarray, out: np.ndarray
+) -> None:
+    """Distance from each of `from_positions` to the matching row of `to_positions`.
+
+    All array versions take float64 C contiguous arrays, write into `out`
+    without allocating, and release the GIL. A second argument with a single
+    row is used for every row of the first.
+
+    Example:
+    ```py
+    from cython_extensions import cy_distance_many
+
+    distances = np.empty(len(own_positions))
+    cy_distance_many(own_positions, np.array([self.start_location]), distances)
+    ```
+
+    Args:
+        from_positions: Array of shape (N, 2) of positions to measure from.
+        to_positions: Array of shape (N, 2) or (1, 2) of positions to measure to.
+        out: Array of shape (N,) the distances are written to.
+
+    """
+    ...
+
+def cy_distance_matrix(
+    positions: np.ndarray, other_positions: np.ndarray, out: np.ndarray
+) -> None:
+    """Distance between every pair of `positions` and `other_positions`.
+
+    Example:
+    ```py
+    from cython_extensions import cy_distance_matrix
+
+    distances = np.empty((len(own_positions), len(enemy_positions)))
+    cy_distance_matrix(own_positions, enemy_positions, distances)
+    ```
+
+    ```
+    200 x 150 positions:
+    72 µs
+    ```
+
+    Args:
+        positions: Array of shape (N, 2).
+        other_positions: Array of shape (M, 2).
+        out: Array of shape (N, M), out[i, j] is set to the distance between
+            positions[i] and other_positions[j].
+
+    """
+    ...
+
+def cy_angle_to_many(
+    from_positions: np.ndarray, to_positions: np.ndarray, out: np.ndarray
+) -> None:
+    """Angle from each of `from_positions` to the matching row of `to_positions`.
+
+    Angles are measured like `cy_angle_to`, but in double precision.
+
+    Args:
+        from_positions: Array of shape (N, 2) of positions to measure from.
+        to_positions: Array of shape (N, 2) or (1, 2) of positions to measure to.
+        out: Array of shape (N,) the angles in radians are written to.
+
+    """
+    ...
+
+def cy_angle_diff_many(a: np.ndarray, b: np.ndarray, out: np.ndarray) -> None:
+    """Absolute difference between each angle of `a` and the matching angle of `b`.
+
+    Args:
+        a: Array of shape (N,) of angles.
+        b: Array of shape (N,) or (1,) of angles.
+        out: Array of shape (N,) the differences are written to.
+
+    """
+    ...
+
+def cy_towards_many(
+    start_positions: np.ndarray,
+    target_positions: np.ndarray,
+    distance: float,
+    out: np.ndarray,
+) -> None:
+    """Move each of `start_positions` `distance` towards the matching target.
+
+    Gives the same positions as calling `cy_towards` for each row.
+
+    Example:
+    ```py
+    from cython_extensions import cy_towards_many
+
+    # kite every unit 3 away from the closest enemy
+    retreat = np.empty_like(own_positions)
+    cy_towards_many(own_positions, closest_enemy_positions, -3.0, retreat)
+    ```
+
+    ```
+    200 positions:
+    1.67 µs
+
+    cy_towards in a Python loop:
+    90 µs
+    ```
+
+    Args:
+        start_positions: Array of shape (N, 2) of positions to start from.
+        target_positions: Array of shape (N, 2) or (1, 2) of positions to go towards.
+        distance: How far to go, negative to move away.
+        out: Array of shape (N, 2) the new positions are written to. It may be
+            `start_positions` itself.
+
+    """
+    ...
@@ -1,3 +1,4 @@
+from cython cimport boundscheck, wraparound
 from libc.math cimport acos, atan2, fabs, pi, sqrt
 
 from math import cos, sin
@@ -216,3 +217,197 @@ cpdef (float, float) cy_translate_point_along_line((float, float) point, float a
 
     return (point[0] + x_offset, point[1] + y_offset)
 
+
+# -----------------------------------------------------------------------------
+# Array versions
+# -----------------------------------------------------------------------------
+# The *_many functions apply the scalar function above row by row and write into a
+# caller provided `out` array, so a whole army costs one call and no allocation.
+# A second argument with a single row is used for every row of the first
+
+
+cdef Py_ssize_t _row_step(const double[:, ::1] positions, const double[:, ::1] others, str name) except -1:
+    # 1 when `others` pairs up with `positions` row by row, 0 when its one row is shared
+    if others.shape[0] == positions.shape[0]:
+        return 1
+    if others.shape[0] == 1:
+        return 0
+    raise ValueError(f"{name} must have 1 or {positions.shape[0]} rows, got {others.shape[0]}")
+
+
+cdef int _check_out(Py_ssize_t out_rows, Py_ssize_t rows) except -1:
+    if out_rows != rows:
+        raise ValueError(f"out must have {rows} rows, got {out_rows}")
+    return 0
+
+
+@boundscheck(False)
+@wraparound(False)
+cpdef void cy_distance_many(
+    const double[:, ::1] from_positions, const double[:, ::1] to_positions, double[::1] out
+):
+    """
+
+    Distance from each of `from_positions` to the matching row of `to_positions`.
+
+    Parameters
+    ----------
+    from_positions :
+        Array of shape (N, 2) of positions to measure from.
+    to_positions :
+        Array of shape (N, 2) or (1, 2) of positions to measure to.
+    out :
+        Array of shape (N,) the distances are written to.
+
+    """
+    cdef Py_ssize_t i, j, step = _row_step(from_positions, to_positions, "to_positions")
+    _check_out(out.shape[0], from_positions.shape[0])
+    with nogil:
+        for i in range(from_positions.shape[0]):
+            j = i * step
+            out[i] = sqrt(
+                (from_positions[i, 0] - to_positions[j, 0]) ** 2 + (from_positions[i, 1] - to_positions[j, 1]) ** 2
+            )
+
+
+@boundscheck(False)
+@wraparound(False)
+cpdef void cy_distance_matrix(
+    const double[:, ::1] positions, const double[:, ::1] other_positions, double[:, ::1] out
+):
+    """
+
+    Distance between every pair of `positions` and `other_positions`.
+
+    Parameters
+    ----------
+    positions :
+        Array of shape (N, 2).
+    other_positions :
+        Array of shape (M, 2).
+    out :
+        Array of shape (N, M), out[i, j] is set to the distance between
+        positions[i] and other_positions[j].
+
+    """
+    cdef Py_ssize_t i, j
+    cdef double x, y
+    _check_out(out.shape[0], positions.shape[0])
+    if out.shape[1] != other_positions.shape[0]:
+        raise ValueError(f"out must have {other_positions.shape[0]} columns, got {out.shape[1]}")
+    with nogil:
+        for i in range(positions.shape[0]):
+            x = positions[i, 0]
+            y = positions[i, 1]
+            for j in range(other_positions.shape[0]):
+                out[i, j] = sqrt((x - other_positions[j, 0]) ** 2 + (y - other_positions[j, 1]) ** 2)
+
+
+@boundscheck(False)
+@wraparound(False)
+cpdef void cy_angle_to_many(
+    const double[:, ::1] from_positions, const double[:, ::1] to_positions, double[::1] out
+):
+    """
+
+    Angle from each of `from_positions` to the matching row of `to_positions`,
+    measured like `cy_angle_to`.
+
+    Parameters
+    ----------
+    from_positions :
+        Array of shape (N, 2) of positions to measure from.
+    to_positions :
+        Array of shape (N, 2) or (1, 2) of positions to measure to.
+    out :
+        Array of shape (N,) the angles in radians are written to.
+
+    """
+    cdef Py_ssize_t i, j, step = _row_step(from_positions, to_positions, "to_positions")
+    _check_out(out.shape[0], from_positions.shape[0])
+    with nogil:
+        for i in range(from_positions.shape[0]):
+            j = i * step
+            out[i] = atan2(to_positions[j, 0] - from_positions[i, 0], to_positions[j, 1] - from_positions[i, 1])
+
+
+@boundscheck(False)
+@wraparound(False)
+cpdef void cy_angle_diff_many(const double[::1] a, const double[::1] b, double[::1] out):
+    """
+
+    Absolute difference between each angle of `a` and the matching angle of `b`,
+    measured like `cy_angle_diff`.
+
+    Parameters
+    ----------
+    a :
+        Array of shape (N,) of angles.
+    b :
+        Array of shape (N,) or (1,) of angles.
+    out :
+        Array of shape (N,) the differences are written to.
+
+    """
+    cdef Py_ssize_t i
+    cdef double first, second
+    cdef Py_ssize_t step = 1 if b.shape[0] == a.shape[0] else 0
+    if step == 0 and b.shape[0] != 1:
+        raise ValueError(f"b must have 1 or {a.shape[0]} entries, got {b.shape[0]}")
+    _check_out(out.shape[0], a.shape[0])
+    with nogil:
+        for i in range(a.shape[0]):
+            first = a[i]
+            second = b[i * step]
+            if first < 0:
+                first += pi * 2
+            if second < 0:
+                second += pi * 2
+            out[i] = fabs(first - second)
+
+
+@boundscheck(False)
+@wraparound(False)
+cpdef void cy_towards_many(
+    const double[:, ::1] start_positions,
+    const double[:, ::1] target_positions,
+    double distance,
+    double[:, ::1] out,
+):
+    """
+
+    Move each of `start_positions` `distance` towards the matching row of
+    `target_positions`, like `cy_towards`.
+
+    Parameters
+    ----------
+    start_positions :
+        Array of shape (N, 2) of positions to start from.
+    target_positions :
+        Array of shape (N, 2) or (1, 2) of positions to go towards. Use a
+        negative distance to move away from them.
+    distance :
+        How far to go.
+    out :
+        Array of shape (N, 2) the new positions are written to. It may be
+        `start_positions` itself.
+
+    """
+    cdef Py_ssize_t i, j, step = _row_step(start_positions, target_positions, "target_positions")
+    cdef double start_x, start_y, vector_x, vector_y, magnitude
+    _check_out(out.shape[0], start_positions.shape[0])
+    with nogil:
+        for i in range(start_positions.shape[0]):
+            j = i * step
+            start_x = start_positions[i, 0]
+            start_y = start_positions[i, 1]
+            # same points, the target is returned as cy_towards does
+            if start_x == target_positions[j, 0] and start_y == target_positions[j, 1]:
+                out[i, 0] = start_x
+                out[i, 1] = start_y
+                continue
+            vector_x = target_positions[j, 0] - start_x
+            vector_y = target_positions[j, 1] - start_y
+            magnitude = sqrt(vector_x ** 2 + vector_y ** 2)
+            out[i, 0] = start_x + vector_x / magnitude * distance
+            out[i, 1] = start_y + vector_y / magnitude * distance
@@ -0,0 +1,112 @@
+import numpy as np
+
+class HierarchicalPathing:
+    """Abstract graph over a pathing grid for long distance path queries."""
+
+    cluster_size: int
+    cost: np.ndarray
+
+    @property
+    def num_nodes(self) -> int:
+        """Number of nodes in the abstract graph."""
+        ...
+
+    def get_path(
+        self, source: tuple[float, float], target: tuple[int, int], limit: int = 0
+    ) -> list[tuple[int, int]]:
+        """Find a path from source to target through the abstract graph.
+
+        The route is planned over the cluster entrances first, and only the first
+        `limit` cells are refined on the grid. This makes it cheap to ask for the next
+        few steps of a cross-map path every frame.
+
+        Example:
+        ```py
+        path = pathing.get_path(unit.position, bot.enemy_start_locations[0].rounded, limit=8)
+        unit.move(Point2(path[-1]))
+        ```
+
+        Args:
+            source: Start point.
+            target: x and y coordinates of the target point.
+            limit: Maximum length of the returned path. Defaults to 0 indicating no limit.
+
+        Returns:
+            A near-optimal path from source to target. If the target cannot be
+            reached only the source is returned.
+
+        """
+        ...
+
+    def get_distance(self, source: tuple[float, float], target: tuple[int, int]) -> float:
+        """Get the cost of the path `get_path` would return from source to target.
+
+        Args:
+            source: Start point.
+            target: x and y coordinates of the target point.
+
+        Returns:
+            The cost of the abstract path, or infinity if the target cannot be reached.
+
+        """
+        ...
+
+    def update_cost(
+        self, cells: np.ndarray, values: np.ndarray | float, checks_enabled: bool = True
+    ) -> None:
+        """Change the cost of some cells and rebuild only the clusters they affect.
+
+        Example:
+        ```py
+        # a building was placed, block its footprint
+        x, y = building.position.rounded
+        cells = np.array([(x + dx, y + dy) for dx in range(-1, 2) for dy in range(-1, 2)])
+        pathing.update_cost(cells, np.inf)
+        ```
+
+        Args:
+            cells: Array of shape (*, 2) containing x and y coordinates of the changed cells.
+            values: New cost for each cell, or a single cost for all of them.
+                Set unpathable cells to infinity.
+            checks_enabled: Pass False to deactivate cost value and cell coordinates checks.
+                Defaults to True.
+
+        """
+        ...
+
+def cy_hierarchical_pathing(
+    cost: np.ndarray, cluster_size: int = 16, checks_enabled: bool = True
+) -> HierarchicalPathing:
+    """Build a hierarchical (HPA*) abstraction of a pathing grid for long distance queries.
+
+    The grid is split into square clusters. Cells facing each other across a cluster
+    border become entrances, and the distances between the entrances of each
+    cluster are precomputed with `cy_dijkstra`. Queries then search the small
+    abstract graph and only refine the part of the path that is needed.
+
+    Paths are close to, but not always exactly, the shortest ones. Use `cy_astar`
+    or `cy_dijkstra` when exact paths matter more than speed.
+
+    Example:
+    ```py
+    from cython_extensions import cy_hierarchical_pathing
+
+    cost = np.where(bot.game_info.pathing_grid.data_numpy.T == 1, 1.0, np.inf)
+    pathing = cy_hierarchical_pathing(cost)
+
+    for unit in reinforcements:
+        path = pathing.get_path(unit.position, rally_point, limit=8)
+        unit.move(Point2(path[-1]))
+    ```
+
+    Args:
+        cost: Cost grid. Entries must be positive. Set unpathable cells to infinity.
+        cluster_size: Width and height of the square clusters the grid is split into.
+            Defaults to 16.
+        checks_enabled: Pass False to deactivate grid value checks. Defaults to True.
+
+    Returns:
+        Pathfinding object containing the abstract graph.
+
+    """
+    ...
@@ -0,0 +1,406 @@
+# cython: language_level=3
+# cython: boundscheck=False
+# cython: wraparound=False
+
+import heapq
+
+import numpy as np
+cimport numpy as cnp
+from numpy.math cimport INFINITY
+from libc.math cimport M_SQRT2, round
+
+from cython_extensions.dijkstra import cy_dijkstra
+
+# -----------------------------------------------------------------------------
+# Types & Constants
+# -----------------------------------------------------------------------------
+
+ctypedef cnp.float32_t DTYPE_t
+
+# entrances at least this wide get a transition at both ends instead of one in the middle
+cdef Py_ssize_t LONG_ENTRANCE = 6
+
+cdef inline Py_ssize_t _snap(DTYPE_t x) noexcept:
+    # the cell of a coordinate as `DijkstraPathing` finds it, rounding the padded
+    # coordinate half away from zero
+    cdef DTYPE_t padded = x + 1
+    return <Py_ssize_t>round(padded) - 1
+
+# -----------------------------------------------------------------------------
+# Python Interface
+# -----------------------------------------------------------------------------
+
+cdef class HierarchicalPathing:
+    # the grid is split into square clusters, pairs of cells facing each other across a
+    # cluster border form entrances, and the cells next to an entrance are the nodes
+    # of the abstract graph. Nodes of the same cluster are connected by the distances
+    # of a small `DijkstraPathing` per node which is kept around for path refinement
+    cdef readonly object cost
+    cdef readonly Py_ssize_t cluster_size
+    cdef Py_ssize_t num_cx, num_cy
+    cdef DTYPE_t min_cost
+    cdef dict borders
+    cdef list nodes
+    cdef list fields
+    cdef list intra
+    cdef dict inter
+    cdef tuple target
+    cdef object target_field
+
+    def __cinit__(self, object cost, Py_ssize_t cluster_size):
+        cdef Py_ssize_t c
+        self.cost = np.array(cost, dtype=np.float32)
+        self.cluster_size = cluster_size
+        self.num_cx = -(-self.cost.shape[0] // cluster_size)
+        self.num_cy = -(-self.cost.shape[1] // cluster_size)
+        self.min_cost = np.min(self.cost)
+        self.borders = {}
+        self.nodes = [[] for _ in range(self.num_cx * self.num_cy)]
+        self.fields = [{} for _ in range(self.num_cx * self.num_cy)]
+        self.intra = [{} for _ in range(self.num_cx * self.num_cy)]
+        self.inter = {}
+        self.target = None
+        self.target_field = None
+        for c in range(self.num_cx * self.num_cy):
+            for neighbour in self._lower_neighbours(c):
+                self.borders[c, neighbour] = self._find_entrances(c, neighbour)
+        for c in range(self.num_cx * self.num_cy):
+            self._build_cluster(c)
+        self._build_inter()
+
+    @property
+    def num_nodes(self):
+        """Number of nodes in the abstract graph."""
+        return sum(len(nodes) for nodes in self.nodes)
+
+    cdef inline Py_ssize_t _cluster_of(self, Py_ssize_t x, Py_ssize_t y):
+        return (x // self.cluster_size) * self.num_cy + y // self.cluster_size
+
+    cdef tuple _bounds(self, Py_ssize_t c):
+        cdef Py_ssize_t x0 = (c // self.num_cy) * self.cluster_size
+        cdef Py_ssize_t y0 = (c % self.num_cy) * self.cluster_size
+        return (
+            x0,
+            min(x0 + self.cluster_size, self.cost.shape[0]),
+            y0,
+            min(y0 + self.cluster_size, self.cost.shape[1]),
+        )
+
+    cdef list _lower_neighbours(self, Py_ssize_t c):
+        # neighbours below and to the right, so every border is visited once
+        cdef list neighbours = []
+        if c // self.num_cy + 1 < self.num_cx:
+            neighbours.append(c + self.num_cy)
+        if c % self.num_cy + 1 < self.num_cy:
+            neighbours.append(c + 1)
+        return neighbours
+
+    cdef list _borders_of(self, Py_ssize_t c):
+        cdef list keys = [(c, neighbour) for neighbour in self._lower_neighbours(c)]
+        if c // self.num_cy > 0:
+            keys.append((c - self.num_cy, c))
+        if c % self.num_cy > 0:
+            keys.append((c - 1, c))
+        return keys
+
+    cdef list _find_entrances(self, Py_ssize_t a, Py_ssize_t b):
+        # transitions as pairs of cells (cell in `a`, cell in `b`) across the border of `a` and `b`
+        cdef Py_ssize_t x0, x1, y0, y1, start, end, k
+        cdef list transitions = []
+        x0, x1, y0, y1 = self._bounds(a)
+        if b % self.num_cy != a % self.num_cy:
+            side_a = self.cost[x0:x1, y1 - 1]
+            side_b = self.cost[x0:x1, y1]
+            cells = [((x, y1 - 1), (x, y1)) for x in range(x0, x1)]
+        else:
+            side_a = self.cost[x1 - 1, y0:y1]
+            side_b = self.cost[x1, y0:y1]
+            cells = [((x1 - 1, y), (x1, y)) for y in range(y0, y1)]
+        free = np.isfinite(side_a) & np.isfinite(side_b)
+        k = 0
+        while k < len(cells):
+            if not free[k]:
+                k += 1
+                continue
+            start = k
+            while k < len(cells) and free[k]:
+                k += 1
+            end = k - 1
+            if end - start + 1 >= LONG_ENTRANCE:
+                transitions.append(cells[start])
+                transitions.append(cells[end])
+            else:
+                transitions.append(cells[(start + end) // 2])
+        return transitions
+
+    cdef void _build_cluster(self, Py_ssize_t c) except *:
+        cdef Py_ssize_t x0, x1, y0, y1, k, j
+        cdef dict fields = {}
+        cdef dict intra = {}
+        x0, x1, y0, y1 = self._bounds(c)
+        nodes = set()
+        for a, b in self._borders_of(c):
+            for transition in self.borders[a, b]:
+                nodes.add(transition[0] if a == c else transition[1])
+        nodes = sorted(nodes)
+        local = np.array(nodes, dtype=np.int32).reshape(-1, 2) - (x0, y0)
+        sub_cost = self.cost[x0:x1, y0:y1]
+        for node in nodes:
+            intra[node] = []
+        for k in range(len(nodes)):
+            # distances towards node k from every other node in the cluster
+            field = cy_dijkstra(sub_cost, local[k : k + 1], False)
+            distances = field.get_distances(local)
+            fields[nodes[k]] = field
+            for j in range(len(nodes)):
+                if j != k and distances[j] != INFINITY:
+                    intra[nodes[j]].append((nodes[k], distances[j] - self.cost[nodes[k]]))
+        self.nodes[c] = nodes
+        self.fields[c] = fields
+        self.intra[c] = intra
+
+    cdef void _build_inter(self) except *:
+        self.inter = {}
+        for transitions in self.borders.values():
+            for cell_a, cell_b in transitions:
+                self.inter.setdefault(cell_a, []).append((cell_b, self.cost[cell_a]))
+                self.inter.setdefault(cell_b, []).append((cell_a, self.cost[cell_b]))
+
+    cdef object _field_towards(self, tuple target):
+        # pathing inside the target cluster, cached as units usually share their target
+        cdef Py_ssize_t x0, x1, y0, y1
+        if self.target != target:
+            x0, x1, y0, y1 = self._bounds(self._cluster_of(target[0], target[1]))
+            self.target_field = cy_dijkstra(
+                self.cost[x0:x1, y0:y1], np.array([[target[0] - x0, target[1] - y0]]), False
+            )
+            self.target = target
+        return self.target_field
+
+    cdef inline DTYPE_t _heuristic(self, tuple a, tuple b):
+        cdef Py_ssize_t dx = abs(a[0] - b[0])
+        cdef Py_ssize_t dy = abs(a[1] - b[1])
+        if dx < dy:
+            dx, dy = dy, dx
+        return self.min_cost * (dx + (M_SQRT2 - 1.0) * dy)
+
+    cdef tuple _plan(self, tuple source, tuple target):
+        # A* over the abstract graph with the source and target temporarily inserted
+        cdef Py_ssize_t cs = self._cluster_of(source[0], source[1])
+        cdef Py_ssize_t ct = self._cluster_of(target[0], target[1])
+        cdef Py_ssize_t sx0, sx1, sy0, sy1, tx0, tx1, ty0, ty1
+        cdef DTYPE_t d, g
+        sx0, sx1, sy0, sy1 = self._bounds(cs)
+        tx0, tx1, ty0, ty1 = self._bounds(ct)
+        target_field = self._field_towards(target)
+
+        goal_edges = {}
+        if self.nodes[ct]:
+            local = np.array(self.nodes[ct], dtype=np.int32) - (tx0, ty0)
+            for node, d in zip(self.nodes[ct], target_field.get_distances(local)):
+                if d != INFINITY:
+                    goal_edges[node] = d - self.cost[target]
+
+        source_edges = list(self.inter.get(source, []))
+        for node, field in self.fields[cs].items():
+            d = field.get_distance((source[0] - sx0, source[1] - sy0))
+            if d != INFINITY and node != source:
+                source_edges.append((node, d - self.cost[node]))
+        if cs == ct:
+            d = target_field.get_distance((source[0] - tx0, source[1] - ty0))
+            if d != INFINITY:
+                source_edges.append((target, d - self.cost[target]))
+        if source in goal_edges:
+            source_edges.append((target, goal_edges[source]))
+
+        distance = {source: 0.0}
+        parent = {source: None}
+        queue = [(self._heuristic(source, target), source)]
+        while queue:
+            node = heapq.heappop(queue)[1]
+            if node == target:
+                break
+            g = distance[node]
+            if node == source:
+                edges = source_edges
+            else:
+                edges = self.intra[self._cluster_of(node[0], node[1])][node] + self.inter.get(node, [])
+                if node in goal_edges:
+                    edges = edges + [(target, goal_edges[node])]
+            for neighbour, d in edges:
+                if g + d < distance.get(neighbour, INFINITY):
+                    distance[neighbour] = g + d
+                    parent[neighbour] = node
+                    heapq.heappush(queue, (g + d + self._heuristic(neighbour, target), neighbour))
+
+        if target not in distance:
+            return INFINITY, []
+        plan = []
+        node = target
+        while node is not None:
+            plan.append(node)
+            node = parent[node]
+        plan.reverse()
+        return distance[target] + self.cost[target], plan
+
+    cdef tuple _check_query(self, object source, object target):
+        cdef tuple t = (int(target[0]), int(target[1]))
+        if not (0 <= t[0] < self.cost.shape[0] and 0 <= t[1] < self.cost.shape[1]):
+            raise Exception(f"invalid target: coordinates out of bounds")
+        return (_snap(source[0]), _snap(source[1])), t
+
+    cdef bint _is_valid(self, tuple cell):
+        return (
+            0 <= cell[0] < self.cost.shape[0]
+            and 0 <= cell[1] < self.cost.shape[1]
+            and self.cost[cell] != INFINITY
+        )
+
+    cpdef list get_path(self, object source, object target, int limit=0):
+        """
+
+        Find a path from source to target through the abstract graph.
+
+        Only the first `limit` cells are refined on the grid, each leg of the plan is
+        followed with `DijkstraPathing.get_path` of the cluster it lies in.
+
+        Parameters
+        ----------
+        source :
+            Start point.
+        target :
+            x and y coordinates of the target point.
+        limit :
+            Maximum length of the returned path. Defaults to 0 indicating no limit.
+
+        Returns
+        -------
+        list[tuple[int, int]] :
+            A near-optimal path from source to target. If the target cannot be reached
+            only the source is returned.
+
+        """
+        cdef Py_ssize_t x0, x1, y0, y1
+        source, target = self._check_query(source, target)
+        if not self._is_valid(source) or not self._is_valid(target):
+            return [source]
+        plan = self._plan(source, target)[1]
+        if not plan:
+            return [source]
+
+        path = [source]
+        for a, b in zip(plan, plan[1:]):
+            if limit and len(path) >= limit:
+                break
+            if self._cluster_of(a[0], a[1]) != self._cluster_of(b[0], b[1]):
+                # step across a cluster border
+                path.append(b)
+                continue
+            x0, x1, y0, y1 = self._bounds(self._cluster_of(b[0], b[1]))
+            field = self._field_towards(b) if b == target else self.fields[self._cluster_of(b[0], b[1])][b]
+            leg = field.get_path((a[0] - x0, a[1] - y0), limit - len(path) + 1 if limit else 0)
+            for x, y in leg[1:]:
+                path.append((x + x0, y + y0))
+        return path[:limit] if limit else path
+
+    cpdef DTYPE_t get_distance(self, object source, object target):
+        """
+
+        Get the cost of the path `get_path` would return from source to target.
+
+        Parameters
+        ----------
+        source :
+            Start point.
+        target :
+            x and y coordinates of the target point.
+
+        Returns
+        -------
+        float :
+            The cost of the abstract path, or infinity if the target cannot be reached.
+
+        """
+        source, target = self._check_query(source, target)
+        if not self._is_valid(source) or not self._is_valid(target):
+            return INFINITY
+        return self._plan(source, target)[0]
+
+    cpdef void update_cost(self, object cells, object values, bint checks_enabled=True) except *:
+        """
+
+        Change the cost of some cells and rebuild the clusters they affect.
+
+        A cluster is rebuilt when one of its cells changed, or when the entrances on
+        the border to a changed cluster moved. All other clusters are kept as they are.
+
+        Parameters
+        ----------
+        cells :
+            Array of shape (*, 2) containing x and y coordinates of the changed cells.
+        values :
+            New cost for each cell, or a single cost for all of them. Set unpathable cells to infinity.
+        checks_enabled :
+            Pass False to deactivate cost value and cell coordinates checks. Defaults to True.
+
+        """
+        cell_array = np.asarray(cells, dtype=np.intp).reshape(-1, 2)
+        value_array = np.broadcast_to(np.asarray(values, dtype=np.float32), (cell_array.shape[0],))
+        if checks_enabled:
+            if not np.greater(value_array, 0.0).all():
+                raise Exception("invalid cost: values must be positive")
+            if (
+                not np.greater_equal(cell_array, 0).all()
+                or not np.less(cell_array[:, 0], self.cost.shape[0]).all()
+                or not np.less(cell_array[:, 1], self.cost.shape[1]).all()
+            ):
+                raise Exception(f"invalid cell: coordinates out of bounds")
+        self.cost[cell_array[:, 0], cell_array[:, 1]] = value_array
+        self.min_cost = np.min(self.cost)
+        self.target = None
+        self.target_field = None
+
+        changed = {
+            self._cluster_of(x, y) for x, y in zip(cell_array[:, 0], cell_array[:, 1])
+        }
+        dirty = set(changed)
+        for c in changed:
+            for a, b in self._borders_of(c):
+                transitions = self._find_entrances(a, b)
+                if transitions != self.borders[a, b]:
+                    self.borders[a, b] = transitions
+                    dirty.add(b if a == c else a)
+        for c in dirty:
+            self._build_cluster(c)
+        self._build_inter()
+
+cpdef HierarchicalPathing cy_hierarchical_pathing(
+    object cost,
+    Py_ssize_t cluster_size = 16,
+    bint checks_enabled = True,
+):
+    """
+
+    Build a hierarchical (HPA*) abstraction of a pathing grid for long distance queries.
+
+    Parameters
+    ----------
+    cost :
+        Cost grid. Entries must be positive. Set unpathable cells to infinity.
+    cluster_size :
+        Width and height of the square clusters the grid is split into. Defaults to 16.
+    checks_enabled :
+        Pass False to deactivate grid value checks. Defaults to True.
+
+    Returns
+    -------
+    HierarchicalPathing :
+        Pathfinding object containing the abstract graph.
+
+    """
+    if checks_enabled:
+        if not np.greater(cost, 0.0).all():
+            raise Exception("invalid cost: values must be positive")
+        if cluster_size < 1:
+            raise Exception("invalid cluster_size: must be positive")
+    return HierarchicalPathing(cost, cluster_size)
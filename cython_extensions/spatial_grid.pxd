@@ -0,0 +1,49 @@
+cimport numpy as cnp
+
+# shared by the nearest neighbour searches of the spatial indices
+cdef inline bint closer(double d, Py_ssize_t i, double best_d, Py_ssize_t best_i) noexcept nogil:
+    # orders candidates by distance, ties by index so results do not depend on how points are stored
+    return d < best_d or (d == best_d and i < best_i)
+
+cdef inline Py_ssize_t insert_sorted(
+    Py_ssize_t* out, double* out_distance, Py_ssize_t count, Py_ssize_t k, Py_ssize_t i, double d
+) noexcept nogil:
+    # keeps the k closest candidates sorted in `out`, returns the new count
+    cdef Py_ssize_t j
+    if count == k:
+        if not closer(d, i, out_distance[k - 1], out[k - 1]):
+            return count
+        j = k - 1
+    else:
+        j = count
+        count += 1
+    while j > 0 and closer(d, i, out_distance[j - 1], out[j - 1]):
+        out[j] = out[j - 1]
+        out_distance[j] = out_distance[j - 1]
+        j -= 1
+    out[j] = i
+    out_distance[j] = d
+    return count
+
+cdef class SpatialGrid:
+    cdef readonly Py_ssize_t num_points
+    cdef readonly double cell_size
+    cdef Py_ssize_t nx, ny
+    cdef double x0, y0
+    cdef double max_radius
+    cdef double[::1] xs
+    cdef double[::1] ys
+    cdef double[::1] radii
+    # points of cell c are order[cell_start[c]:cell_start[c + 1]]
+    cdef Py_ssize_t[::1] cell_start
+    cdef Py_ssize_t[::1] order
+
+    cdef Py_ssize_t _cell_x(self, double x) noexcept nogil
+    cdef Py_ssize_t _cell_y(self, double y) noexcept nogil
+    cdef Py_ssize_t _radius_nogil(self, double x, double y, double distance, Py_ssize_t* out) noexcept nogil
+    cdef Py_ssize_t _k_nearest_nogil(
+        self, double x, double y, Py_ssize_t k, Py_ssize_t* out, double* out_distance
+    ) noexcept nogil
+    cpdef cnp.ndarray query_radius(self, (double, double) position, double distance)
+    cpdef Py_ssize_t query_nearest(self, (double, double) position)
+    cpdef cnp.ndarray query_k_nearest(self, (double, double) position, Py_ssize_t k)
@@ -0,0 +1,96 @@
+import numpy as np
+from sc2.position import Point2
+
+class SpatialGrid:
+    """Uniform grid index over a set of points."""
+
+    num_points: int
+    cell_size: float
+
+    def query_radius(
+        self, position: Point2 | tuple[float, float], distance: float
+    ) -> np.ndarray:
+        """Find all points within a distance of a position.
+
+        Example:
+        ```py
+        nearby = grid.query_radius(unit.position, 10.0)
+        nearby_enemies = [enemies[i] for i in nearby]
+        ```
+
+        Args:
+            position: Position to measure distance from.
+            distance: Points whose circle comes within this distance of `position` are returned.
+
+        Returns:
+            Sorted indices of the points in range.
+
+        """
+        ...
+
+    def query_nearest(self, position: Point2 | tuple[float, float]) -> int:
+        """Find the point closest to a position.
+
+        Args:
+            position: Position to measure distance from.
+
+        Returns:
+            Index of the closest point, or -1 if the grid is empty.
+
+        """
+        ...
+
+    def query_k_nearest(
+        self, position: Point2 | tuple[float, float], k: int
+    ) -> np.ndarray:
+        """Find the k points closest to a position.
+
+        Args:
+            position: Position to measure distance from.
+            k: Number of points to return.
+
+        Returns:
+            Indices of the min(k, len(grid)) closest points, closest first.
+            Ties are ordered by index.
+
+        """
+        ...
+
+def cy_spatial_grid(
+    positions: np.ndarray, radii: np.ndarray | float | None = None, cell_size: float = 0.0
+) -> SpatialGrid:
+    """Bucket points into a uniform grid for fast proximity queries.
+
+    `cy_closer_than`, `cy_closest_to` and friends scan every unit on each call.
+    Build the grid once per frame, and each query only looks at the cells
+    around the query position.
+
+    When radii are given, distances are measured to the edge of each circle.
+    `query_radius` then returns everything a circle of the given size touches, and
+    the nearest queries rank points by their edge distance.
+
+    Example:
+    ```py
+    from cython_extensions import cy_spatial_grid
+
+    enemies = self.enemy_units
+    grid = cy_spatial_grid(
+        np.array([u.position for u in enemies]), np.array([u.radius for u in enemies])
+    )
+    for unit in self.units:
+        in_range = grid.query_radius(unit.position, unit.ground_range + unit.radius)
+        closest = enemies[grid.query_nearest(unit.position)]
+    ```
+
+    Args:
+        positions: Array of shape (*, 2) containing x and y coordinates of the points.
+        radii: Radius of each point, or a single radius for all of them.
+            Defaults to None indicating points.
+        cell_size: Width and height of the grid cells. Defaults to 0 indicating
+            a size chosen from the density of the points.
+
+    Returns:
+        Grid index over the points.
+
+    """
+    ...
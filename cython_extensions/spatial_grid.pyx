@@ -0,0 +1,254 @@
+# cython: language_level=3
+# cython: boundscheck=False
+# cython: wraparound=False
+# cython: cdivision=True
+
+import numpy as np
+cimport numpy as cnp
+from libc.math cimport floor, sqrt
+
+# -----------------------------------------------------------------------------
+# Types & Constants
+# -----------------------------------------------------------------------------
+
+# with an automatic cell size, cells hold this many points on average
+cdef double POINTS_PER_CELL = 2.0
+cdef double MIN_CELL_SIZE = 0.5
+
+# -----------------------------------------------------------------------------
+# Python Interface
+# -----------------------------------------------------------------------------
+
+cdef class SpatialGrid:
+    # points are bucketed into square cells, stored cell by cell in `order`.
+    # Radius queries only visit the cells overlapping the query circle, nearest
+    # neighbour queries visit rings of cells around the query until no closer
+    # point can be left outside the visited square
+
+    def __cinit__(self, object positions, object radii, double cell_size):
+        cdef const double[:, :] position_array = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        cdef Py_ssize_t i, c
+        cdef double width, height
+        cdef Py_ssize_t[::1] fill
+
+        self.num_points = position_array.shape[0]
+        self.xs = np.ascontiguousarray(position_array[:, 0])
+        self.ys = np.ascontiguousarray(position_array[:, 1])
+        if radii is None:
+            self.radii = np.zeros(self.num_points, dtype=np.float64)
+        else:
+            self.radii = np.array(np.broadcast_to(np.asarray(radii, dtype=np.float64), (self.num_points,)))
+        if cell_size < 0:
+            raise ValueError(f"invalid cell_size: must not be negative, got {cell_size}")
+
+        if self.num_points == 0:
+            self.x0 = self.y0 = 0.0
+            width = height = 0.0
+            self.max_radius = 0.0
+        else:
+            self.x0 = np.min(self.xs)
+            self.y0 = np.min(self.ys)
+            width = np.max(self.xs) - self.x0
+            height = np.max(self.ys) - self.y0
+            self.max_radius = max(0.0, np.max(self.radii))
+        if cell_size == 0:
+            cell_size = sqrt(POINTS_PER_CELL * max(width, 1.0) * max(height, 1.0) / max(self.num_points, 1))
+            cell_size = max(cell_size, MIN_CELL_SIZE)
+        self.cell_size = cell_size
+        self.nx = <Py_ssize_t>floor(width / cell_size) + 1
+        self.ny = <Py_ssize_t>floor(height / cell_size) + 1
+
+        # counting sort of the points by cell
+        self.cell_start = np.zeros(self.nx * self.ny + 1, dtype=np.intp)
+        self.order = np.empty(self.num_points, dtype=np.intp)
+        fill = np.empty(self.nx * self.ny, dtype=np.intp)
+        with nogil:
+            for i in range(self.num_points):
+                c = self._cell_x(self.xs[i]) * self.ny + self._cell_y(self.ys[i])
+                self.cell_start[c + 1] += 1
+            for c in range(self.nx * self.ny):
+                self.cell_start[c + 1] += self.cell_start[c]
+                fill[c] = self.cell_start[c]
+            for i in range(self.num_points):
+                c = self._cell_x(self.xs[i]) * self.ny + self._cell_y(self.ys[i])
+                self.order[fill[c]] = i
+                fill[c] += 1
+
+    def __len__(self):
+        return self.num_points
+
+    cdef Py_ssize_t _cell_x(self, double x) noexcept nogil:
+        cdef double c = floor((x - self.x0) / self.cell_size)
+        if c < 0:
+            return 0
+        if c >= self.nx:
+            return self.nx - 1
+        return <Py_ssize_t>c
+
+    cdef Py_ssize_t _cell_y(self, double y) noexcept nogil:
+        cdef double c = floor((y - self.y0) / self.cell_size)
+        if c < 0:
+            return 0
+        if c >= self.ny:
+            return self.ny - 1
+        return <Py_ssize_t>c
+
+    cdef Py_ssize_t _radius_nogil(self, double x, double y, double distance, Py_ssize_t* out) noexcept nogil:
+        # writes the points within `distance` of (x, y) to `out` in cell order, returns their number
+        cdef double reach = distance + self.max_radius
+        cdef double dx, dy, limit
+        cdef Py_ssize_t i, j, k, p
+        cdef Py_ssize_t count = 0
+        if reach < 0:
+            return 0
+        for i in range(self._cell_x(x - reach), self._cell_x(x + reach) + 1):
+            for j in range(self._cell_y(y - reach), self._cell_y(y + reach) + 1):
+                for k in range(self.cell_start[i * self.ny + j], self.cell_start[i * self.ny + j + 1]):
+                    p = self.order[k]
+                    limit = distance + self.radii[p]
+                    if limit < 0:
+                        continue
+                    dx = self.xs[p] - x
+                    dy = self.ys[p] - y
+                    if dx * dx + dy * dy <= limit * limit:
+                        out[count] = p
+                        count += 1
+        return count
+
+    cdef Py_ssize_t _k_nearest_nogil(
+        self, double x, double y, Py_ssize_t k, Py_ssize_t* out, double* out_distance
+    ) noexcept nogil:
+        # writes the k points closest to (x, y) to `out`, closest first, returns their number
+        cdef Py_ssize_t cx = self._cell_x(x)
+        cdef Py_ssize_t cy = self._cell_y(y)
+        cdef Py_ssize_t last_ring = max(max(cx, self.nx - 1 - cx), max(cy, self.ny - 1 - cy))
+        cdef Py_ssize_t count = 0
+        cdef Py_ssize_t r, i, j, m, p, step
+        cdef double bound, d
+        if k <= 0:
+            return 0
+        for r in range(last_ring + 1):
+            for i in range(max(cx - r, 0), min(cx + r, self.nx - 1) + 1):
+                # inner columns only touch the ring at its top and bottom row
+                step = 1 if i == cx - r or i == cx + r else 2 * r
+                j = cy - r
+                while j <= cy + r:
+                    if 0 <= j < self.ny:
+                        for m in range(self.cell_start[i * self.ny + j], self.cell_start[i * self.ny + j + 1]):
+                            p = self.order[m]
+                            d = sqrt((self.xs[p] - x) ** 2 + (self.ys[p] - y) ** 2) - self.radii[p]
+                            count = insert_sorted(out, out_distance, count, k, p, d)
+                    j += max(step, 1)
+            if count == k:
+                # distance from the query to the outside of the visited square of cells
+                bound = min(
+                    min(x - (self.x0 + (cx - r) * self.cell_size), self.x0 + (cx + r + 1) * self.cell_size - x),
+                    min(y - (self.y0 + (cy - r) * self.cell_size), self.y0 + (cy + r + 1) * self.cell_size - y),
+                )
+                if out_distance[k - 1] < bound - self.max_radius:
+                    break
+        return count
+
+    cpdef cnp.ndarray query_radius(self, (double, double) position, double distance):
+        """
+
+        Find all points within a distance of a position.
+
+        Parameters
+        ----------
+        position :
+            Position to measure distance from.
+        distance :
+            Points whose circle comes within this distance of `position` are returned.
+
+        Returns
+        -------
+        np.ndarray :
+            Sorted indices of the points in range.
+
+        """
+        cdef cnp.ndarray result = np.empty(self.num_points, dtype=np.intp)
+        cdef Py_ssize_t[::1] out = result
+        cdef Py_ssize_t count
+        if self.num_points == 0:
+            return result
+        with nogil:
+            count = self._radius_nogil(position[0], position[1], distance, &out[0])
+        result = result[:count]
+        result.sort()
+        return result
+
+    cpdef Py_ssize_t query_nearest(self, (double, double) position):
+        """
+
+        Find the point closest to a position.
+
+        Parameters
+        ----------
+        position :
+            Position to measure distance from.
+
+        Returns
+        -------
+        int :
+            Index of the closest point, or -1 if the grid is empty.
+
+        """
+        cdef Py_ssize_t nearest = -1
+        cdef double distance
+        with nogil:
+            self._k_nearest_nogil(position[0], position[1], 1, &nearest, &distance)
+        return nearest
+
+    cpdef cnp.ndarray query_k_nearest(self, (double, double) position, Py_ssize_t k):
+        """
+
+        Find the k points closest to a position.
+
+        Parameters
+        ----------
+        position :
+            Position to measure distance from.
+        k :
+            Number of points to return.
+
+        Returns
+        -------
+        np.ndarray :
+            Indices of the min(k, len(grid)) closest points, closest first.
+
+        """
+        k = max(0, min(k, self.num_points))
+        cdef cnp.ndarray result = np.empty(k, dtype=np.intp)
+        cdef Py_ssize_t[::1] out = result
+        cdef double[::1] out_distance = np.empty(k, dtype=np.float64)
+        if k == 0:
+            return result
+        with nogil:
+            self._k_nearest_nogil(position[0], position[1], k, &out[0], &out_distance[0])
+        return result
+
+
+cpdef SpatialGrid cy_spatial_grid(object positions, object radii = None, double cell_size = 0.0):
+    """
+
+    Bucket points into a uniform grid for fast proximity queries.
+
+    Parameters
+    ----------
+    positions :
+        Array of shape (*, 2) containing x and y coordinates of the points.
+    radii :
+        Radius of each point, or a single radius for all of them. Distances are
+        measured to the edge of the circles. Defaults to None indicating points.
+    cell_size :
+        Width and height of the grid cells. Defaults to 0 indicating a size chosen
+        from the density of the points.
+
+    Returns
+    -------
+    SpatialGrid :
+        Grid index over the points.
+
+    """
+    return SpatialGrid(positions, radii, cell_size)
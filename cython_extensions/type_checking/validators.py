@@ -137,6 +137,12 @@ def _validate_cy_find_units_center_mass(args):
     _validate_number(args["distance"], "distance", allow_negative=False)
 
 
+def _validate_cy_find_units_center_masses(args):
+    _validate_units(args["units"], "units", allow_empty=True)
+    _validate_number(args["distance"], "distance", allow_negative=False)
+    _validate_number(args["k"], "k", allow_negative=False)
+
+
 def _validate_cy_in_attack_range(args):
     _validate_unit_with_attack(args["unit"])
     _validate_units(args["units"], "units", allow_empty=True)
@@ -144,6 +150,12 @@ def _validate_cy_in_attack_range(args):
     _validate_number(bonus_distance, "bonus_distance")
 
 
+def _validate_cy_attack_range_matrix(args):
+    _validate_units(args["units"], "units", allow_empty=True)
+    _validate_units(args["enemy_units"], "enemy_units", allow_empty=True)
+    _validate_number(args["bonus_distance"], "bonus_distance")
+
+
 def _validate_cy_sorted_by_distance_to(args):
     _validate_units(args["units"], "units", allow_empty=True)
     _validate_position(args["position"], "position")
@@ -151,6 +163,88 @@ def _validate_cy_sorted_by_distance_to(args):
     _validate_bool(reverse, "reverse")
 
 
+def _validate_cy_k_closest_to(args):
+    _validate_units(args["units"], "units", allow_empty=True)
+    _validate_position(args["position"], "position")
+    _validate_number(args["k"], "k", allow_negative=False)
+    _validate_bool(args["return_indices"], "return_indices")
+
+
+def _validate_cy_kd_tree(args):
+    _validate_numpy_array(args["positions"], "positions")
+
+
+def _validate_cy_all_closest_to(args):
+    _validate_units(args["units"], "units", allow_empty=True)
+    _validate_units(args["other_units"], "other_units", allow_empty=True)
+    if args["target_filter"] not in ("all", "ground", "air", "attackable"):
+        raise ValueError(
+            "target_filter must be 'all', 'ground', 'air' or 'attackable', "
+            f"got {args['target_filter']!r}"
+        )
+
+
+def _validate_positions_buffer(args):
+    """Validate the positions and optional radii of the cy_positions functions."""
+    positions = args["positions"]
+    _validate_numpy_array(positions, "positions", expected_dtype=np.float64)
+    if positions.ndim != 2 or positions.shape[1] != 2:
+        raise ValueError(f"positions must have shape (n, 2), got {positions.shape}")
+    if not positions.flags.c_contiguous:
+        raise ValueError("positions must be C contiguous")
+    radii = args.get("radii")
+    if radii is not None:
+        _validate_numpy_array(
+            radii, "radii", expected_dtype=np.float64, expected_shape=(len(positions),)
+        )
+
+
+def _validate_cy_positions_center(args):
+    _validate_positions_buffer(args)
+    if len(args["positions"]) == 0:
+        raise ValueError("positions cannot be empty")
+
+
+def _validate_cy_positions_closest_to(args):
+    _validate_position(args["position"], "position")
+    _validate_positions_buffer(args)
+
+
+def _validate_cy_positions_closer_than(args):
+    _validate_positions_buffer(args)
+    _validate_number(args["max_distance"], "max_distance", allow_negative=False)
+    _validate_position(args["position"], "position")
+
+
+def _validate_cy_positions_further_than(args):
+    _validate_positions_buffer(args)
+    _validate_number(args["min_distance"], "min_distance", allow_negative=False)
+    _validate_position(args["position"], "position")
+
+
+def _validate_cy_positions_sorted_by_distance_to(args):
+    _validate_positions_buffer(args)
+    _validate_position(args["position"], "position")
+    _validate_bool(args["reverse"], "reverse")
+
+
+def _validate_cy_positions_k_closest_to(args):
+    _validate_positions_buffer(args)
+    _validate_position(args["position"], "position")
+    _validate_number(args["k"], "k", allow_negative=False)
+
+
+def _validate_cy_positions_center_mass(args):
+    _validate_positions_buffer(args)
+    _validate_number(args["distance"], "distance", allow_negative=False)
+
+
+def _validate_cy_positions_center_masses(args):
+    _validate_positions_buffer(args)
+    _validate_number(args["distance"], "distance", allow_negative=False)
+    _validate_number(args["k"], "k", allow_negative=False)
+
+
 def _validate_cy_closer_than(args):
     _validate_units(args["units"], "units", allow_empty=True)
     _validate_position(args["position"], "position")
@@ -190,6 +284,52 @@ def _validate_cy_angle_diff(args):
     _validate_number(args["b"], "b")
 
 
+def _validate_float_buffer(array, param_name: str, ndim: int):
+    """Validate a float64 C contiguous array used by the array geometry functions."""
+    _validate_numpy_array(array, param_name, expected_dtype=np.float64)
+    if array.ndim != ndim or (ndim == 2 and array.shape[1] != 2):
+        expected = "(n, 2)" if ndim == 2 else "(n,)"
+        raise ValueError(f"{param_name} must have shape {expected}, got {array.shape}")
+    if not array.flags.c_contiguous:
+        raise ValueError(f"{param_name} must be C contiguous")
+
+
+def _validate_cy_distance_many(args):
+    _validate_float_buffer(args["from_positions"], "from_positions", 2)
+    _validate_float_buffer(args["to_positions"], "to_positions", 2)
+    _validate_float_buffer(args["out"], "out", 1)
+
+
+def _validate_cy_distance_matrix(args):
+    _validate_float_buffer(args["positions"], "positions", 2)
+    _validate_float_buffer(args["other_positions"], "other_positions", 2)
+    _validate_numpy_array(
+        args["out"],
+        "out",
+        expected_dtype=np.float64,
+        expected_shape=(len(args["positions"]), len(args["other_positions"])),
+    )
+    if not args["out"].flags.c_contiguous:
+        raise ValueError("out must be C contiguous")
+
+
+def _validate_cy_angle_to_many(args):
+    _validate_cy_distance_many(args)
+
+
+def _validate_cy_angle_diff_many(args):
+    _validate_float_buffer(args["a"], "a", 1)
+    _validate_float_buffer(args["b"], "b", 1)
+    _validate_float_buffer(args["out"], "out", 1)
+
+
+def _validate_cy_towards_many(args):
+    _validate_float_buffer(args["start_positions"], "start_positions", 2)
+    _validate_float_buffer(args["target_positions"], "target_positions", 2)
+    _validate_number(args["distance"], "distance")
+    _validate_float_buffer(args["out"], "out", 2)
+
+
 def _validate_cy_find_average_angle(args):
     _validate_position(args["start_point"], "start_point")
     _validate_position(args["reference_point"], "reference_point")
@@ -215,6 +355,23 @@ def _validate_cy_attack_ready(args):
         raise ValueError("unit must have weapon_cooldown attribute")
 
 
+def _validate_cy_attack_ready_many(args):
+    if not hasattr(args["bot"], "client"):
+        raise ValueError("bot must have a client attribute")
+    _validate_units(args["units"], "units", allow_empty=True)
+    _validate_units(args["targets"], "targets", allow_empty=True)
+    if len(args["targets"]) != len(args["units"]):
+        raise ValueError(
+            f"targets must have one entry per unit, got {len(args['targets'])} "
+            f"for {len(args['units'])} units"
+        )
+    snapshot = args["snapshot"]
+    if snapshot is not None and not hasattr(snapshot, "num_units"):
+        raise TypeError(
+            f"snapshot must be a UnitSnapshot, got {type(snapshot).__name__}"
+        )
+
+
 def _validate_cy_is_facing(args):
     _validate_unit(args["unit"], "unit")
     _validate_unit(args["other_unit"], "other_unit")
@@ -241,6 +398,30 @@ def _validate_cy_find_aoe_position(args):
     # Optional args: min_units (unsigned int), bonus_tags (set-like) are not strictly validated here.
 
 
+def _validate_cy_find_aoe_center(args):
+    _validate_number(args["effect_radius"], "effect_radius", allow_negative=False)
+    _validate_positions_buffer(args)
+    weights = args["weights"]
+    if weights is not None:
+        _validate_numpy_array(
+            weights,
+            "weights",
+            expected_dtype=np.float64,
+            expected_shape=(len(args["positions"]),),
+        )
+
+
+def _validate_cy_find_aoe_positions(args):
+    _validate_number(args["effect_radius"], "effect_radius", allow_negative=False)
+    _validate_units(args["targets"], "targets", allow_empty=True)
+    _validate_number(args["k"], "k", allow_negative=False)
+
+
+def _validate_cy_find_aoe_centers(args):
+    _validate_cy_find_aoe_center(args)
+    _validate_number(args["k"], "k", allow_negative=False)
+
+
 def _validate_cy_get_turn_speed(args):
     unit_type_int = args["unit_type_int"]
     # Validate it's an integer
@@ -446,3 +627,120 @@ def _validate_cy_dijkstra(args):
     _validate_grid(cost, "cost")
     _validate_grid(targets, "targets")
     # Optional: checks_enabled flag present in signature; validation not required for name alignment.
+    if args["queue"] not in ("heap", "bucket"):
+        raise ValueError(f"queue must be 'heap' or 'bucket', got {args['queue']!r}")
+
+
+def _validate_cy_dijkstra_many(args):
+    costs = args["costs"]
+    targets_list = args["targets_list"]
+
+    _validate_units(costs, "costs", allow_empty=True)
+    _validate_units(targets_list, "targets_list", allow_empty=True)
+    for cost in costs:
+        _validate_grid(cost, "cost")
+    for targets in targets_list:
+        _validate_grid(targets, "targets")
+    _validate_number(args["num_threads"], "num_threads", allow_negative=False)
+
+
+def _validate_cy_astar(args):
+    _validate_grid(args["cost"], "cost")
+    _validate_position(tuple(args["source"]), "source")
+    _validate_position(tuple(args["target"]), "target")
+
+
+def _validate_cy_hierarchical_pathing(args):
+    _validate_grid(args["cost"], "cost")
+    _validate_number(args["cluster_size"], "cluster_size", allow_negative=False)
+
+
+def _validate_snapshot_range(args):
+    """Validate the snapshot and index range shared by the snapshot functions."""
+    if not hasattr(args["snapshot"], "num_units"):
+        raise TypeError(
+            f"snapshot must be a UnitSnapshot, got {type(args['snapshot']).__name__}"
+        )
+    _validate_number(args["start"], "start", allow_negative=False)
+    _validate_number(args["stop"], "stop")
+
+
+def _validate_cy_unit_snapshot(args):
+    bot = args["bot"]
+    if not hasattr(bot, "all_units") or not hasattr(bot, "state"):
+        raise ValueError("bot must have all_units and state attributes")
+
+
+def _validate_cy_snapshot_closest_to(args):
+    _validate_snapshot_range(args)
+    _validate_position(args["position"], "position")
+
+
+def _validate_cy_snapshot_closer_than(args):
+    _validate_snapshot_range(args)
+    _validate_number(args["max_distance"], "max_distance", allow_negative=False)
+    _validate_position(args["position"], "position")
+
+
+def _validate_cy_snapshot_in_attack_range(args):
+    _validate_snapshot_range(args)
+    _validate_number(args["unit_index"], "unit_index", allow_negative=False)
+    _validate_number(args["bonus_distance"], "bonus_distance")
+
+
+def _validate_cy_snapshot_sorted_by_distance_to(args):
+    _validate_snapshot_range(args)
+    _validate_position(args["position"], "position")
+    _validate_bool(args["reverse"], "reverse")
+
+
+def _validate_cy_snapshot_pick_enemy_target(args):
+    _validate_snapshot_range(args)
+
+
+def _validate_cy_spatial_grid(args):
+    _validate_numpy_array(args["positions"], "positions")
+    _validate_number(args["cell_size"], "cell_size", allow_negative=False)
+
+
+def _validate_cy_fight_outcome(args):
+    _validate_units(args["own_units"], "own_units", allow_empty=True)
+    _validate_units(args["enemy_units"], "enemy_units", allow_empty=True)
+
+
+def _validate_cy_assign_targets(args):
+    _validate_units(args["attackers"], "attackers", allow_empty=True)
+    _validate_units(args["enemies"], "enemies", allow_empty=True)
+    in_range = args["in_range"]
+    if in_range is not None and (not isinstance(in_range, tuple) or len(in_range) != 2):
+        raise TypeError("in_range must be an (offsets, indices) tuple")
+
+
+def _validate_formation_shape(args):
+    shape = args["shape"]
+    if shape not in ("line", "concave", "arc"):
+        raise ValueError(f"shape must be 'line', 'concave' or 'arc', got {shape!r}")
+    _validate_number(args["spacing"], "spacing", allow_negative=False)
+    if args["spacing"] == 0:
+        raise ValueError("spacing must be positive")
+    _validate_number(args["width"], "width", allow_negative=False)
+
+
+def _validate_cy_formation_slots(args):
+    _validate_position(args["anchor"], "anchor")
+    _validate_position(args["target"], "target")
+    _validate_number(args["num_slots"], "num_slots", allow_negative=False)
+    _validate_formation_shape(args)
+
+
+def _validate_cy_formation(args):
+    units = args["units"]
+    if isinstance(units, np.ndarray):
+        if units.ndim != 2 or units.shape[1] != 2:
+            raise ValueError(f"units must have shape (n, 2), got {units.shape}")
+    else:
+        _validate_units(units, "units", allow_empty=True)
+    _validate_position(args["target"], "target")
+    if args["anchor"] is not None:
+        _validate_position(args["anchor"], "anchor")
+    _validate_formation_shape(args)
@@ -9,42 +9,78 @@ from typing import Callable, Optional
 
 from cython_extensions.type_checking.config import is_safe_mode_enabled
 from cython_extensions.type_checking.validators import (
+    _validate_cy_all_closest_to,
     _validate_cy_all_points_below_max_value,
     _validate_cy_all_points_have_value,
     _validate_cy_angle_diff,
+    _validate_cy_angle_diff_many,
     _validate_cy_angle_to,
+    _validate_cy_angle_to_many,
+    _validate_cy_assign_targets,
+    _validate_cy_astar,
+    _validate_cy_attack_range_matrix,
     _validate_cy_attack_ready,
+    _validate_cy_attack_ready_many,
     _validate_cy_can_place_structure,
     _validate_cy_center,
     _validate_cy_closer_than,
     _validate_cy_closest_to,
     _validate_cy_dijkstra,
+    _validate_cy_dijkstra_many,
+    _validate_cy_distance_many,
+    _validate_cy_distance_matrix,
     _validate_cy_distance_to,
     _validate_cy_distance_to_squared,
+    _validate_cy_fight_outcome,
+    _validate_cy_find_aoe_center,
+    _validate_cy_find_aoe_centers,
     _validate_cy_find_aoe_position,
+    _validate_cy_find_aoe_positions,
     _validate_cy_find_average_angle,
     _validate_cy_find_building_locations,
     _validate_cy_find_units_center_mass,
+    _validate_cy_find_units_center_masses,
     _validate_cy_flood_fill_grid,
+    _validate_cy_formation,
+    _validate_cy_formation_slots,
     _validate_cy_further_than,
     _validate_cy_get_angle_between_points,
     _validate_cy_get_bounding_box,
     _validate_cy_get_turn_speed,
     _validate_cy_has_creep,
+    _validate_cy_hierarchical_pathing,
     _validate_cy_in_attack_range,
     _validate_cy_in_pathing_grid_burny,
     _validate_cy_in_pathing_grid_ma,
     _validate_cy_is_facing,
+    _validate_cy_k_closest_to,
+    _validate_cy_kd_tree,
     _validate_cy_last_index_with_value,
     _validate_cy_pick_enemy_target,
     _validate_cy_point_below_value,
     _validate_cy_points_with_value,
+    _validate_cy_positions_center,
+    _validate_cy_positions_center_mass,
+    _validate_cy_positions_center_masses,
+    _validate_cy_positions_closer_than,
+    _validate_cy_positions_closest_to,
+    _validate_cy_positions_further_than,
+    _validate_cy_positions_k_closest_to,
+    _validate_cy_positions_sorted_by_distance_to,
     _validate_cy_pylon_matrix_covers,
     _validate_cy_range_vs_target,
+    _validate_cy_snapshot_closer_than,
+    _validate_cy_snapshot_closest_to,
+    _validate_cy_snapshot_in_attack_range,
+    _validate_cy_snapshot_pick_enemy_target,
+    _validate_cy_snapshot_sorted_by_distance_to,
     _validate_cy_sorted_by_distance_to,
+    _validate_cy_spatial_grid,
     _validate_cy_towards,
+    _validate_cy_towards_many,
     _validate_cy_translate_point_along_line,
     _validate_cy_unit_pending,
+    _validate_cy_unit_snapshot,
     _validate_cy_structure_pending,
     _validate_cy_structure_pending_ares,
     _validate_cy_upgrade_pending
@@ -93,14 +129,32 @@ from cython_extensions.combat_utils import (
     cy_adjust_moving_formation as _cy_adjust_moving_formation,
 )
 from cython_extensions.combat_utils import cy_attack_ready as _cy_attack_ready
+from cython_extensions.combat_utils import (
+    cy_attack_ready_many as _cy_attack_ready_many,
+)
+from cython_extensions.combat_utils import cy_find_aoe_center as _cy_find_aoe_center
+from cython_extensions.combat_utils import cy_find_aoe_centers as _cy_find_aoe_centers
 from cython_extensions.combat_utils import cy_find_aoe_position as _cy_find_aoe_position
+from cython_extensions.combat_utils import (
+    cy_find_aoe_positions as _cy_find_aoe_positions,
+)
 from cython_extensions.combat_utils import cy_get_turn_speed as _cy_get_turn_speed
 from cython_extensions.combat_utils import cy_is_facing as _cy_is_facing
 from cython_extensions.combat_utils import cy_pick_enemy_target as _cy_pick_enemy_target
 from cython_extensions.combat_utils import cy_range_vs_target as _cy_range_vs_target
 
+# Combat sim
+from cython_extensions.combat_sim import cy_assign_targets as _cy_assign_targets
+from cython_extensions.combat_sim import cy_fight_outcome as _cy_fight_outcome
+
 # Dijkstra
+from cython_extensions.dijkstra import cy_astar as _cy_astar
 from cython_extensions.dijkstra import cy_dijkstra as _cy_dijkstra
+from cython_extensions.dijkstra import cy_dijkstra_many as _cy_dijkstra_many
+
+# Formation
+from cython_extensions.formation import cy_formation as _cy_formation
+from cython_extensions.formation import cy_formation_slots as _cy_formation_slots
 
 # General utils
 from cython_extensions.general_utils import cy_has_creep as _cy_has_creep
@@ -120,7 +174,11 @@ from cython_extensions.general_utils import cy_upgrade_pending as _cy_upgrade_pe
 
 # Geometry
 from cython_extensions.geometry import cy_angle_diff as _cy_angle_diff
+from cython_extensions.geometry import cy_angle_diff_many as _cy_angle_diff_many
 from cython_extensions.geometry import cy_angle_to as _cy_angle_to
+from cython_extensions.geometry import cy_angle_to_many as _cy_angle_to_many
+from cython_extensions.geometry import cy_distance_many as _cy_distance_many
+from cython_extensions.geometry import cy_distance_matrix as _cy_distance_matrix
 from cython_extensions.geometry import cy_distance_to as _cy_distance_to
 from cython_extensions.geometry import cy_distance_to_squared as _cy_distance_to_squared
 from cython_extensions.geometry import cy_find_average_angle as _cy_find_average_angle
@@ -129,10 +187,16 @@ from cython_extensions.geometry import (
     cy_get_angle_between_points as _cy_get_angle_between_points,
 )
 from cython_extensions.geometry import cy_towards as _cy_towards
+from cython_extensions.geometry import cy_towards_many as _cy_towards_many
 from cython_extensions.geometry import (
     cy_translate_point_along_line as _cy_translate_point_along_line,
 )
 
+# Hierarchical pathing
+from cython_extensions.hierarchical_pathing import (
+    cy_hierarchical_pathing as _cy_hierarchical_pathing,
+)
+
 # Map analysis
 from cython_extensions.map_analysis import cy_flood_fill_grid as _cy_flood_fill_grid
 from cython_extensions.map_analysis import cy_get_bounding_box as _cy_get_bounding_box
@@ -158,16 +222,68 @@ from cython_extensions.placement_solver import (
     cy_find_building_locations as _cy_find_building_locations,
 )
 
+# Spatial grid
+from cython_extensions.spatial_grid import cy_spatial_grid as _cy_spatial_grid
+
+# Unit snapshot
+from cython_extensions.unit_snapshot import cy_unit_snapshot as _cy_unit_snapshot
+from cython_extensions.unit_snapshot import (
+    cy_snapshot_closer_than as _cy_snapshot_closer_than,
+)
+from cython_extensions.unit_snapshot import (
+    cy_snapshot_closest_to as _cy_snapshot_closest_to,
+)
+from cython_extensions.unit_snapshot import (
+    cy_snapshot_in_attack_range as _cy_snapshot_in_attack_range,
+)
+from cython_extensions.unit_snapshot import (
+    cy_snapshot_pick_enemy_target as _cy_snapshot_pick_enemy_target,
+)
+from cython_extensions.unit_snapshot import (
+    cy_snapshot_sorted_by_distance_to as _cy_snapshot_sorted_by_distance_to,
+)
+
 # Import all original Cython functions
 # Units utils
+from cython_extensions.units_utils import cy_all_closest_to as _cy_all_closest_to
+from cython_extensions.units_utils import (
+    cy_attack_range_matrix as _cy_attack_range_matrix,
+)
 from cython_extensions.units_utils import cy_center as _cy_center
 from cython_extensions.units_utils import cy_closer_than as _cy_closer_than
 from cython_extensions.units_utils import cy_closest_to as _cy_closest_to
 from cython_extensions.units_utils import (
     cy_find_units_center_mass as _cy_find_units_center_mass,
 )
+from cython_extensions.units_utils import (
+    cy_find_units_center_masses as _cy_find_units_center_masses,
+)
 from cython_extensions.units_utils import cy_further_than as _cy_further_than
 from cython_extensions.units_utils import cy_in_attack_range as _cy_in_attack_range
+from cython_extensions.units_utils import cy_k_closest_to as _cy_k_closest_to
+from cython_extensions.units_utils import cy_kd_tree as _cy_kd_tree
+from cython_extensions.units_utils import cy_positions_center as _cy_positions_center
+from cython_extensions.units_utils import (
+    cy_positions_closest_to as _cy_positions_closest_to,
+)
+from cython_extensions.units_utils import (
+    cy_positions_closer_than as _cy_positions_closer_than,
+)
+from cython_extensions.units_utils import (
+    cy_positions_further_than as _cy_positions_further_than,
+)
+from cython_extensions.units_utils import (
+    cy_positions_sorted_by_distance_to as _cy_positions_sorted_by_distance_to,
+)
+from cython_extensions.units_utils import (
+    cy_positions_k_closest_to as _cy_positions_k_closest_to,
+)
+from cython_extensions.units_utils import (
+    cy_positions_center_mass as _cy_positions_center_mass,
+)
+from cython_extensions.units_utils import (
+    cy_positions_center_masses as _cy_positions_center_masses,
+)
 from cython_extensions.units_utils import (
     cy_sorted_by_distance_to as _cy_sorted_by_distance_to,
 )
@@ -195,6 +311,12 @@ def cy_find_units_center_mass(units, distance: float):
     return _cy_find_units_center_mass(units, float(distance))
 
 
+@safe_wrapper(_validate_cy_find_units_center_masses)
+def cy_find_units_center_masses(units, distance: float, k: int):
+    """Type-safe wrapper for cy_find_units_center_masses."""
+    return _cy_find_units_center_masses(units, float(distance), k)
+
+
 @safe_wrapper(_validate_cy_in_attack_range)
 def cy_in_attack_range(unit, units, bonus_distance: float = 0.0):
     """Type-safe wrapper for cy_in_attack_range."""
@@ -207,6 +329,12 @@ def cy_sorted_by_distance_to(units, position, reverse: bool = False):
     return _cy_sorted_by_distance_to(units, position, reverse)
 
 
+@safe_wrapper(_validate_cy_k_closest_to)
+def cy_k_closest_to(units, position, k: int, return_indices: bool = False):
+    """Type-safe wrapper for cy_k_closest_to."""
+    return _cy_k_closest_to(units, position, k, return_indices)
+
+
 @safe_wrapper(_validate_cy_closer_than)
 def cy_closer_than(units, max_distance: float, position):
     """Type-safe wrapper for cy_closer_than."""
@@ -219,6 +347,72 @@ def cy_further_than(units, min_distance: float, position):
     return _cy_further_than(units, float(min_distance), position)
 
 
+@safe_wrapper(_validate_cy_kd_tree)
+def cy_kd_tree(positions):
+    """Type-safe wrapper for cy_kd_tree."""
+    return _cy_kd_tree(positions)
+
+
+@safe_wrapper(_validate_cy_all_closest_to)
+def cy_all_closest_to(units, other_units, target_filter="all"):
+    """Type-safe wrapper for cy_all_closest_to."""
+    return _cy_all_closest_to(units, other_units, target_filter)
+
+
+@safe_wrapper(_validate_cy_attack_range_matrix)
+def cy_attack_range_matrix(units, enemy_units, bonus_distance: float = 0.0):
+    """Type-safe wrapper for cy_attack_range_matrix."""
+    return _cy_attack_range_matrix(units, enemy_units, float(bonus_distance))
+
+
+@safe_wrapper(_validate_cy_positions_center)
+def cy_positions_center(positions):
+    """Type-safe wrapper for cy_positions_center."""
+    return _cy_positions_center(positions)
+
+
+@safe_wrapper(_validate_cy_positions_closest_to)
+def cy_positions_closest_to(position, positions, radii=None):
+    """Type-safe wrapper for cy_positions_closest_to."""
+    return _cy_positions_closest_to(position, positions, radii)
+
+
+@safe_wrapper(_validate_cy_positions_closer_than)
+def cy_positions_closer_than(positions, max_distance: float, position, radii=None):
+    """Type-safe wrapper for cy_positions_closer_than."""
+    return _cy_positions_closer_than(positions, float(max_distance), position, radii)
+
+
+@safe_wrapper(_validate_cy_positions_further_than)
+def cy_positions_further_than(positions, min_distance: float, position, radii=None):
+    """Type-safe wrapper for cy_positions_further_than."""
+    return _cy_positions_further_than(positions, float(min_distance), position, radii)
+
+
+@safe_wrapper(_validate_cy_positions_sorted_by_distance_to)
+def cy_positions_sorted_by_distance_to(positions, position, reverse: bool = False, radii=None):
+    """Type-safe wrapper for cy_positions_sorted_by_distance_to."""
+    return _cy_positions_sorted_by_distance_to(positions, position, reverse, radii)
+
+
+@safe_wrapper(_validate_cy_positions_k_closest_to)
+def cy_positions_k_closest_to(positions, position, k: int, radii=None):
+    """Type-safe wrapper for cy_positions_k_closest_to."""
+    return _cy_positions_k_closest_to(positions, position, k, radii)
+
+
+@safe_wrapper(_validate_cy_positions_center_mass)
+def cy_positions_center_mass(positions, distance: float):
+    """Type-safe wrapper for cy_positions_center_mass."""
+    return _cy_positions_center_mass(positions, float(distance))
+
+
+@safe_wrapper(_validate_cy_positions_center_masses)
+def cy_positions_center_masses(positions, distance: float, k: int):
+    """Type-safe wrapper for cy_positions_center_masses."""
+    return _cy_positions_center_masses(positions, float(distance), k)
+
+
 # ============================================================================
 # GEOMETRY WRAPPERS
 # ============================================================================
@@ -272,6 +466,36 @@ def cy_translate_point_along_line(point, a_value, distance: float):
     return _cy_translate_point_along_line(point, a_value, float(distance))
 
 
+@safe_wrapper(_validate_cy_distance_many)
+def cy_distance_many(from_positions, to_positions, out):
+    """Type-safe wrapper for cy_distance_many."""
+    return _cy_distance_many(from_positions, to_positions, out)
+
+
+@safe_wrapper(_validate_cy_distance_matrix)
+def cy_distance_matrix(positions, other_positions, out):
+    """Type-safe wrapper for cy_distance_matrix."""
+    return _cy_distance_matrix(positions, other_positions, out)
+
+
+@safe_wrapper(_validate_cy_angle_to_many)
+def cy_angle_to_many(from_positions, to_positions, out):
+    """Type-safe wrapper for cy_angle_to_many."""
+    return _cy_angle_to_many(from_positions, to_positions, out)
+
+
+@safe_wrapper(_validate_cy_angle_diff_many)
+def cy_angle_diff_many(a, b, out):
+    """Type-safe wrapper for cy_angle_diff_many."""
+    return _cy_angle_diff_many(a, b, out)
+
+
+@safe_wrapper(_validate_cy_towards_many)
+def cy_towards_many(start_positions, target_positions, distance: float, out):
+    """Type-safe wrapper for cy_towards_many."""
+    return _cy_towards_many(start_positions, target_positions, float(distance), out)
+
+
 # Pass-through functions that don't need validation yet
 cy_find_correct_line = _cy_find_correct_line
 
@@ -287,6 +511,12 @@ def cy_attack_ready(bot, unit, target):
     return _cy_attack_ready(bot, unit, target)
 
 
+@safe_wrapper(_validate_cy_attack_ready_many)
+def cy_attack_ready_many(bot, units, targets, snapshot=None):
+    """Type-safe wrapper for cy_attack_ready_many."""
+    return _cy_attack_ready_many(bot, units, targets, snapshot)
+
+
 @safe_wrapper(_validate_cy_is_facing)
 def cy_is_facing(unit, other_unit, angle_error: float = 0.3):
     """Type-safe wrapper for cy_is_facing."""
@@ -306,9 +536,39 @@ def cy_pick_enemy_target(enemies):
 
 
 @safe_wrapper(_validate_cy_find_aoe_position)
-def cy_find_aoe_position(effect_radius, targets, min_units: int = 1, bonus_tags=None):
+def cy_find_aoe_position(
+    effect_radius,
+    targets,
+    min_units: int = 1,
+    bonus_tags=None,
+    use_differential_evolution: bool = False,
+):
     """Type-safe wrapper for cy_find_aoe_position."""
-    return _cy_find_aoe_position(effect_radius, targets, min_units, bonus_tags)
+    return _cy_find_aoe_position(
+        effect_radius, targets, min_units, bonus_tags, use_differential_evolution
+    )
+
+
+@safe_wrapper(_validate_cy_find_aoe_center)
+def cy_find_aoe_center(effect_radius, positions, radii=None, weights=None):
+    """Type-safe wrapper for cy_find_aoe_center."""
+    return _cy_find_aoe_center(effect_radius, positions, radii, weights)
+
+
+@safe_wrapper(_validate_cy_find_aoe_positions)
+def cy_find_aoe_positions(
+    effect_radius, targets, k, min_units: int = 1, bonus_tags=None
+):
+    """Type-safe wrapper for cy_find_aoe_positions."""
+    return _cy_find_aoe_positions(effect_radius, targets, k, min_units, bonus_tags)
+
+
+@safe_wrapper(_validate_cy_find_aoe_centers)
+def cy_find_aoe_centers(
+    effect_radius, positions, k, radii=None, weights=None, min_hits: int = 1
+):
+    """Type-safe wrapper for cy_find_aoe_centers."""
+    return _cy_find_aoe_centers(effect_radius, positions, k, radii, weights, min_hits)
 
 
 @safe_wrapper(_validate_cy_get_turn_speed)
@@ -494,9 +754,123 @@ def cy_find_building_locations(
 
 
 @safe_wrapper(_validate_cy_dijkstra)
-def cy_dijkstra(cost, targets, checks_enabled=True):
+def cy_dijkstra(cost, targets, checks_enabled=True, queue="heap"):
     """Type-safe wrapper for cy_dijkstra."""
-    return _cy_dijkstra(cost, targets, checks_enabled)
+    return _cy_dijkstra(cost, targets, checks_enabled, queue)
+
+
+@safe_wrapper(_validate_cy_dijkstra_many)
+def cy_dijkstra_many(costs, targets_list, num_threads=0, checks_enabled=True):
+    """Type-safe wrapper for cy_dijkstra_many."""
+    return _cy_dijkstra_many(costs, targets_list, num_threads, checks_enabled)
+
+
+@safe_wrapper(_validate_cy_astar)
+def cy_astar(
+    cost, source, target, limit=0, max_distance=1, checks_enabled=True, workspace=None
+):
+    """Type-safe wrapper for cy_astar."""
+    return _cy_astar(
+        cost, source, target, limit, max_distance, checks_enabled, workspace
+    )
+
+
+@safe_wrapper(_validate_cy_hierarchical_pathing)
+def cy_hierarchical_pathing(cost, cluster_size=16, checks_enabled=True):
+    """Type-safe wrapper for cy_hierarchical_pathing."""
+    return _cy_hierarchical_pathing(cost, cluster_size, checks_enabled)
+
+
+# ============================================================================
+# UNIT SNAPSHOT WRAPPERS
+# ============================================================================
+
+
+@safe_wrapper(_validate_cy_unit_snapshot)
+def cy_unit_snapshot(bot):
+    """Type-safe wrapper for cy_unit_snapshot."""
+    return _cy_unit_snapshot(bot)
+
+
+@safe_wrapper(_validate_cy_snapshot_closest_to)
+def cy_snapshot_closest_to(snapshot, position, start=0, stop=-1):
+    """Type-safe wrapper for cy_snapshot_closest_to."""
+    return _cy_snapshot_closest_to(snapshot, position, start, stop)
+
+
+@safe_wrapper(_validate_cy_snapshot_closer_than)
+def cy_snapshot_closer_than(snapshot, max_distance, position, start=0, stop=-1):
+    """Type-safe wrapper for cy_snapshot_closer_than."""
+    return _cy_snapshot_closer_than(snapshot, max_distance, position, start, stop)
+
+
+@safe_wrapper(_validate_cy_snapshot_in_attack_range)
+def cy_snapshot_in_attack_range(
+    snapshot, unit_index, start=0, stop=-1, bonus_distance=0.0
+):
+    """Type-safe wrapper for cy_snapshot_in_attack_range."""
+    return _cy_snapshot_in_attack_range(
+        snapshot, unit_index, start, stop, bonus_distance
+    )
+
+
+@safe_wrapper(_validate_cy_snapshot_sorted_by_distance_to)
+def cy_snapshot_sorted_by_distance_to(
+    snapshot, position, start=0, stop=-1, reverse=False
+):
+    """Type-safe wrapper for cy_snapshot_sorted_by_distance_to."""
+    return _cy_snapshot_sorted_by_distance_to(snapshot, position, start, stop, reverse)
+
+
+@safe_wrapper(_validate_cy_snapshot_pick_enemy_target)
+def cy_snapshot_pick_enemy_target(snapshot, start=0, stop=-1):
+    """Type-safe wrapper for cy_snapshot_pick_enemy_target."""
+    return _cy_snapshot_pick_enemy_target(snapshot, start, stop)
+
+
+# ============================================================================
+# SPATIAL GRID WRAPPERS
+# ============================================================================
+
+
+@safe_wrapper(_validate_cy_spatial_grid)
+def cy_spatial_grid(positions, radii=None, cell_size=0.0):
+    """Type-safe wrapper for cy_spatial_grid."""
+    return _cy_spatial_grid(positions, radii, cell_size)
+
+
+# ============================================================================
+# COMBAT SIM WRAPPERS
+# ============================================================================
+
+
+@safe_wrapper(_validate_cy_fight_outcome)
+def cy_fight_outcome(own_units, enemy_units):
+    """Type-safe wrapper for cy_fight_outcome."""
+    return _cy_fight_outcome(own_units, enemy_units)
+
+
+@safe_wrapper(_validate_cy_assign_targets)
+def cy_assign_targets(attackers, enemies, in_range=None):
+    """Type-safe wrapper for cy_assign_targets."""
+    return _cy_assign_targets(attackers, enemies, in_range)
+
+
+# ============================================================================
+# FORMATION WRAPPERS
+# ============================================================================
+
+
+@safe_wrapper(_validate_cy_formation_slots)
+def cy_formation_slots(anchor, target, num_slots, shape="concave", spacing=1.0, width=0):
+    """Type-safe wrapper for cy_formation_slots."""
+    return _cy_formation_slots(anchor, target, num_slots, shape, spacing, width)
+
+
+@safe_wrapper(_validate_cy_formation)
+def cy_formation(units, target, shape="concave", spacing=1.0, width=0, anchor=None):
+    """Type-safe wrapper for cy_formation."""
+    return _cy_formation(units, target, shape, spacing, width, anchor)
 
 
 # ============================================================================
@@ -508,10 +882,23 @@ __all__ = [
     "cy_center",
     "cy_closest_to",
     "cy_find_units_center_mass",
+    "cy_find_units_center_masses",
     "cy_in_attack_range",
     "cy_sorted_by_distance_to",
+    "cy_k_closest_to",
     "cy_closer_than",
     "cy_further_than",
+    "cy_kd_tree",
+    "cy_all_closest_to",
+    "cy_attack_range_matrix",
+    "cy_positions_center",
+    "cy_positions_closest_to",
+    "cy_positions_closer_than",
+    "cy_positions_further_than",
+    "cy_positions_sorted_by_distance_to",
+    "cy_positions_k_closest_to",
+    "cy_positions_center_mass",
+    "cy_positions_center_masses",
     # Geometry
     "cy_distance_to",
     "cy_distance_to_squared",
@@ -522,10 +909,19 @@ __all__ = [
     "cy_find_correct_line",
     "cy_get_angle_between_points",
     "cy_translate_point_along_line",
+    "cy_distance_many",
+    "cy_distance_matrix",
+    "cy_angle_to_many",
+    "cy_angle_diff_many",
+    "cy_towards_many",
     # Combat utils
     "cy_adjust_moving_formation",
     "cy_attack_ready",
+    "cy_attack_ready_many",
     "cy_find_aoe_position",
+    "cy_find_aoe_center",
+    "cy_find_aoe_positions",
+    "cy_find_aoe_centers",
     "cy_get_turn_speed",
     "cy_is_facing",
     "cy_pick_enemy_target",
@@ -553,4 +949,23 @@ __all__ = [
     "cy_find_building_locations",
     # Dijkstra
     "cy_dijkstra",
+    "cy_dijkstra_many",
+    "cy_astar",
+    # Hierarchical pathing
+    "cy_hierarchical_pathing",
+    # Unit snapshot
+    "cy_unit_snapshot",
+    "cy_snapshot_closest_to",
+    "cy_snapshot_closer_than",
+    "cy_snapshot_in_attack_range",
+    "cy_snapshot_sorted_by_distance_to",
+    "cy_snapshot_pick_enemy_target",
+    # Spatial grid
+    "cy_spatial_grid",
+    # Combat sim
+    "cy_fight_outcome",
+    "cy_assign_targets",
+    # Formation
+    "cy_formation_slots",
+    "cy_formation",
 ]
@@ -0,0 +1,27 @@
+cdef enum:
+    FLAG_FLYING = 1
+    FLAG_CAN_ATTACK_GROUND = 2
+    FLAG_CAN_ATTACK_AIR = 4
+    FLAG_STRUCTURE = 8
+
+cdef class UnitSnapshot:
+    cdef readonly list units
+    cdef readonly Py_ssize_t num_units
+    cdef readonly unsigned int game_loop
+    # units are grouped by alliance (self, ally, neutral, enemy), group `a` spans offsets[a] to offsets[a + 1]
+    cdef Py_ssize_t[5] offsets
+
+    cdef unsigned long long[::1] tags
+    cdef unsigned int[::1] type_ids
+    cdef double[::1] xs
+    cdef double[::1] ys
+    cdef double[::1] radii
+    cdef double[::1] healths
+    cdef double[::1] shields
+    cdef double[::1] ground_ranges
+    cdef double[::1] air_ranges
+    cdef unsigned char[::1] flag_bits
+
+    cdef Py_ssize_t _range_stop(self, Py_ssize_t start, Py_ssize_t stop) except -1
+    cdef object _readonly(self, object view)
+    cpdef list get_units(self, object indices)
@@ -0,0 +1,261 @@
+import numpy as np
+from sc2.bot_ai import BotAI
+from sc2.position import Point2
+from sc2.unit import Unit
+
+class UnitSnapshot:
+    """Struct of arrays view of all units in one game loop.
+
+    Units are grouped by alliance, the index range of each group is available as
+    `own_range`, `ally_range`, `neutral_range` and `enemy_range`. All arrays are
+    read-only and indexed the same way as `units`.
+    """
+
+    units: list[Unit]
+    num_units: int
+    game_loop: int
+
+    @property
+    def own_range(self) -> tuple[int, int]:
+        """Index range (start, stop) of our own units."""
+        ...
+
+    @property
+    def ally_range(self) -> tuple[int, int]:
+        """Index range (start, stop) of allied units."""
+        ...
+
+    @property
+    def neutral_range(self) -> tuple[int, int]:
+        """Index range (start, stop) of neutral units, e.g. minerals and destructible rocks."""
+        ...
+
+    @property
+    def enemy_range(self) -> tuple[int, int]:
+        """Index range (start, stop) of enemy units."""
+        ...
+
+    @property
+    def tag(self) -> np.ndarray:
+        """Unit tags as uint64."""
+        ...
+
+    @property
+    def type_id(self) -> np.ndarray:
+        """Unit type ids as uint32."""
+        ...
+
+    @property
+    def x(self) -> np.ndarray:
+        """x coordinates."""
+        ...
+
+    @property
+    def y(self) -> np.ndarray:
+        """y coordinates."""
+        ...
+
+    @property
+    def radius(self) -> np.ndarray:
+        """Unit radii."""
+        ...
+
+    @property
+    def health(self) -> np.ndarray:
+        """Unit health."""
+        ...
+
+    @property
+    def shield(self) -> np.ndarray:
+        """Unit shields."""
+        ...
+
+    @property
+    def ground_range(self) -> np.ndarray:
+        """Ground weapon ranges, 0 for units without one."""
+        ...
+
+    @property
+    def air_range(self) -> np.ndarray:
+        """Air weapon ranges, 0 for units without one."""
+        ...
+
+    @property
+    def flags(self) -> np.ndarray:
+        """Unit flags as uint8.
+
+        Bit 1 is set for flying units, 2 if the unit can attack ground,
+        4 if it can attack air and 8 for structures.
+        """
+        ...
+
+    def get_units(self, indices) -> list[Unit]:
+        """Look up the python-sc2 units at some snapshot indices.
+
+        Args:
+            indices: Indices into the snapshot, as returned by the `cy_snapshot_*` functions.
+
+        Returns:
+            The units at `indices`, in the same order.
+
+        """
+        ...
+
+def cy_unit_snapshot(bot: BotAI) -> UnitSnapshot:
+    """Pack the units of the current game loop into contiguous arrays.
+
+    The `units_utils` and `combat_utils` functions read unit properties through
+    python-sc2 on every call. The snapshot reads them once, and the `cy_snapshot_*`
+    variants then work on index ranges of the arrays without touching python objects.
+    Ranges and flags are read once per unit type. The snapshot is stored on the bot,
+    calling this again during the same game loop returns the same object.
+
+    Example:
+    ```py
+    from cython_extensions import (
+        cy_snapshot_in_attack_range,
+        cy_snapshot_pick_enemy_target,
+        cy_unit_snapshot,
+    )
+
+    snapshot = cy_unit_snapshot(self)
+    start, stop = snapshot.own_range
+    for i in range(start, stop):
+        in_range = cy_snapshot_in_attack_range(snapshot, i, *snapshot.enemy_range)
+        if len(in_range) > 0:
+            snapshot.units[i].attack(snapshot.units[in_range[0]])
+
+    weakest = cy_snapshot_pick_enemy_target(snapshot, *snapshot.enemy_range)
+    ```
+
+    Args:
+        bot: Bot object, `bot.all_units` are packed.
+
+    Returns:
+        Struct of arrays view of all units.
+
+    """
+    ...
+
+def cy_snapshot_closest_to(
+    snapshot: UnitSnapshot,
+    position: Point2 | tuple[float, float],
+    start: int = 0,
+    stop: int = -1,
+) -> int:
+    """Snapshot version of `cy_closest_to`.
+
+    Example:
+    ```py
+    snapshot = cy_unit_snapshot(self)
+    index = cy_snapshot_closest_to(snapshot, self.start_location, *snapshot.enemy_range)
+    if index != -1:
+        closest_enemy = snapshot.units[index]
+    ```
+
+    Args:
+        snapshot: Units of this game loop.
+        position: Position to measure distance from.
+        start: First index of the searched range. Defaults to 0.
+        stop: End of the searched range. Defaults to -1 indicating the end of the snapshot.
+
+    Returns:
+        Index of the unit closest to `position`, or -1 if the range is empty.
+
+    """
+    ...
+
+def cy_snapshot_closer_than(
+    snapshot: UnitSnapshot,
+    max_distance: float,
+    position: Point2 | tuple[float, float],
+    start: int = 0,
+    stop: int = -1,
+) -> np.ndarray:
+    """Snapshot version of `cy_closer_than`.
+
+    Args:
+        snapshot: Units of this game loop.
+        max_distance: Units strictly closer than this are returned.
+        position: Position to measure distance from.
+        start: First index of the searched range. Defaults to 0.
+        stop: End of the searched range. Defaults to -1 indicating the end of the snapshot.
+
+    Returns:
+        Indices of the units closer than `max_distance` to `position`, in snapshot order.
+
+    """
+    ...
+
+def cy_snapshot_in_attack_range(
+    snapshot: UnitSnapshot,
+    unit_index: int,
+    start: int = 0,
+    stop: int = -1,
+    bonus_distance: float = 0.0,
+) -> np.ndarray:
+    """Snapshot version of `cy_in_attack_range`.
+
+    Unlike `cy_in_attack_range`, units missing from the static unit data are not
+    skipped, their flying state is taken from the game instead.
+
+    Example:
+    ```py
+    snapshot = cy_unit_snapshot(self)
+    start, stop = snapshot.own_range
+    for i in range(start, stop):
+        targets = snapshot.get_units(
+            cy_snapshot_in_attack_range(snapshot, i, *snapshot.enemy_range)
+        )
+    ```
+
+    Args:
+        snapshot: Units of this game loop.
+        unit_index: Index of the attacking unit.
+        start: First index of the searched range. Defaults to 0.
+        stop: End of the searched range. Defaults to -1 indicating the end of the snapshot.
+        bonus_distance: Extra distance added to the weapon ranges. Defaults to 0.
+
+    Returns:
+        Indices of the units the attacker can shoot, in snapshot order.
+
+    """
+    ...
+
+def cy_snapshot_sorted_by_distance_to(
+    snapshot: UnitSnapshot,
+    position: Point2 | tuple[float, float],
+    start: int = 0,
+    stop: int = -1,
+    reverse: bool = False,
+) -> np.ndarray:
+    """Snapshot version of `cy_sorted_by_distance_to`.
+
+    Args:
+        snapshot: Units of this game loop.
+        position: Position to measure distance from.
+        start: First index of the sorted range. Defaults to 0.
+        stop: End of the sorted range. Defaults to -1 indicating the end of the snapshot.
+        reverse: Sort from furthest to closest instead. Defaults to False.
+
+    Returns:
+        Indices of the units in the range ordered by distance. Ties keep snapshot order.
+
+    """
+    ...
+
+def cy_snapshot_pick_enemy_target(
+    snapshot: UnitSnapshot, start: int = 0, stop: int = -1
+) -> int:
+    """Snapshot version of `cy_pick_enemy_target`.
+
+    Args:
+        snapshot: Units of this game loop.
+        start: First index of the searched range. Defaults to 0.
+        stop: End of the searched range. Defaults to -1 indicating the end of the snapshot.
+
+    Returns:
+        Index of the unit with the lowest health plus shield, or -1 if the range is empty.
+
+    """
+    ...
@@ -0,0 +1,527 @@
+from cython cimport boundscheck, wraparound
+from libc.math cimport sqrt
+from libc.stdlib cimport calloc
+
+import numpy as np
+
+cimport numpy as cnp
+
+from sc2.ids.unit_typeid import UnitTypeId
+
+from cython_extensions.unit_data import UNIT_DATA
+
+UNIT_DATA_INT_KEYS = {k.value: v for k, v in UNIT_DATA.items()}
+
+# python-sc2 alliance values are 1 (self) to 4 (enemy)
+cdef Py_ssize_t NUM_ALLIANCES = 4
+# type_id_int == 4 is colossus, which can be shot by air weapons
+cdef unsigned int COLOSSUS = 4
+
+
+cdef struct SnapshotType:
+    bint known
+    double ground_range
+    double air_range
+    unsigned char flags
+    # types missing from the unit data read `is_flying` per unit
+    bint flying_per_unit
+
+
+cdef Py_ssize_t NUM_TYPE_IDS = max(u.value for u in UnitTypeId) + 1
+cdef SnapshotType* SNAPSHOT_TYPES = <SnapshotType*>calloc(NUM_TYPE_IDS, sizeof(SnapshotType))
+
+
+cdef void _read_snapshot_type(object unit, SnapshotType* snapshot_type) except *:
+    # python-sc2 accessors once per type, they special case some weapons
+    snapshot_type.ground_range = unit.ground_range
+    snapshot_type.air_range = unit.air_range
+    snapshot_type.flags = 0
+    if unit.can_attack_ground:
+        snapshot_type.flags |= FLAG_CAN_ATTACK_GROUND
+    if unit.can_attack_air:
+        snapshot_type.flags |= FLAG_CAN_ATTACK_AIR
+    if unit.is_structure:
+        snapshot_type.flags |= FLAG_STRUCTURE
+    # prefer the static unit data, the same source `cy_in_attack_range` uses
+    unit_data = UNIT_DATA_INT_KEYS.get(unit._proto.unit_type, None)
+    snapshot_type.flying_per_unit = unit_data is None
+    if unit_data and unit_data["flying"]:
+        snapshot_type.flags |= FLAG_FLYING
+    snapshot_type.known = True
+
+
+cdef SnapshotType* _snapshot_type(
+    object unit, unsigned int type_id, SnapshotType* scratch
+) except NULL:
+    # type ids newer than the installed python-sc2 are read into `scratch` every time
+    cdef SnapshotType* snapshot_type
+    if type_id >= NUM_TYPE_IDS or not SNAPSHOT_TYPES:
+        _read_snapshot_type(unit, scratch)
+        return scratch
+    snapshot_type = &SNAPSHOT_TYPES[type_id]
+    if not snapshot_type.known:
+        _read_snapshot_type(unit, snapshot_type)
+    return snapshot_type
+
+
+cdef class UnitSnapshot:
+    """
+
+    Struct of arrays view of all units in one game loop.
+
+    Units are stored grouped by alliance, see `own_range`, `ally_range`,
+    `neutral_range` and `enemy_range` for the index range of each group.
+
+    """
+
+    def __cinit__(self, object bot):
+        cdef:
+            Py_ssize_t i, a
+            list groups = [[] for a in range(NUM_ALLIANCES)]
+            object proto
+            object pos
+            unsigned int type_id
+            unsigned char flags
+            SnapshotType scratch
+            SnapshotType* snapshot_type
+
+        for unit in bot.all_units:
+            a = unit._proto.alliance - 1
+            groups[a if 0 <= a < NUM_ALLIANCES else NUM_ALLIANCES - 1].append(unit)
+
+        self.units = []
+        self.offsets[0] = 0
+        for a in range(NUM_ALLIANCES):
+            self.units.extend(groups[a])
+            self.offsets[a + 1] = len(self.units)
+        self.num_units = len(self.units)
+        self.game_loop = bot.state.game_loop
+
+        self.tags = np.empty(self.num_units, dtype=np.uint64)
+        self.type_ids = np.empty(self.num_units, dtype=np.uintc)
+        self.xs = np.empty(self.num_units, dtype=np.float64)
+        self.ys = np.empty(self.num_units, dtype=np.float64)
+        self.radii = np.empty(self.num_units, dtype=np.float64)
+        self.healths = np.empty(self.num_units, dtype=np.float64)
+        self.shields = np.empty(self.num_units, dtype=np.float64)
+        self.ground_ranges = np.empty(self.num_units, dtype=np.float64)
+        self.air_ranges = np.empty(self.num_units, dtype=np.float64)
+        self.flag_bits = np.empty(self.num_units, dtype=np.uint8)
+
+        for i in range(self.num_units):
+            unit = self.units[i]
+            proto = unit._proto
+            pos = proto.pos
+            type_id = proto.unit_type
+            snapshot_type = _snapshot_type(unit, type_id, &scratch)
+            self.tags[i] = proto.tag
+            self.type_ids[i] = type_id
+            self.xs[i] = pos.x
+            self.ys[i] = pos.y
+            self.radii[i] = proto.radius
+            self.healths[i] = proto.health
+            self.shields[i] = proto.shield
+            self.ground_ranges[i] = snapshot_type.ground_range
+            self.air_ranges[i] = snapshot_type.air_range
+            flags = snapshot_type.flags
+            if snapshot_type.flying_per_unit and unit.is_flying:
+                flags |= FLAG_FLYING
+            self.flag_bits[i] = flags
+
+    def __len__(self):
+        return self.num_units
+
+    cdef Py_ssize_t _range_stop(self, Py_ssize_t start, Py_ssize_t stop) except -1:
+        if stop < 0:
+            stop = self.num_units
+        if not 0 <= start <= stop <= self.num_units:
+            raise ValueError(
+                f"invalid range: expected 0 <= start <= stop <= {self.num_units}, got {start} and {stop}"
+            )
+        return stop
+
+    cdef object _readonly(self, object view):
+        array = np.asarray(view)
+        array.flags.writeable = False
+        return array
+
+    @property
+    def own_range(self):
+        """Index range (start, stop) of our own units."""
+        return self.offsets[0], self.offsets[1]
+
+    @property
+    def ally_range(self):
+        """Index range (start, stop) of allied units."""
+        return self.offsets[1], self.offsets[2]
+
+    @property
+    def neutral_range(self):
+        """Index range (start, stop) of neutral units, e.g. minerals and destructible rocks."""
+        return self.offsets[2], self.offsets[3]
+
+    @property
+    def enemy_range(self):
+        """Index range (start, stop) of enemy units."""
+        return self.offsets[3], self.offsets[4]
+
+    @property
+    def tag(self):
+        """Read-only array of unit tags."""
+        return self._readonly(self.tags)
+
+    @property
+    def type_id(self):
+        """Read-only array of unit type ids."""
+        return self._readonly(self.type_ids)
+
+    @property
+    def x(self):
+        """Read-only array of x coordinates."""
+        return self._readonly(self.xs)
+
+    @property
+    def y(self):
+        """Read-only array of y coordinates."""
+        return self._readonly(self.ys)
+
+    @property
+    def radius(self):
+        """Read-only array of unit radii."""
+        return self._readonly(self.radii)
+
+    @property
+    def health(self):
+        """Read-only array of unit health."""
+        return self._readonly(self.healths)
+
+    @property
+    def shield(self):
+        """Read-only array of unit shields."""
+        return self._readonly(self.shields)
+
+    @property
+    def ground_range(self):
+        """Read-only array of ground weapon ranges, 0 for units without one."""
+        return self._readonly(self.ground_ranges)
+
+    @property
+    def air_range(self):
+        """Read-only array of air weapon ranges, 0 for units without one."""
+        return self._readonly(self.air_ranges)
+
+    @property
+    def flags(self):
+        """
+
+        Read-only array of unit flags.
+
+        Bit 1 is set for flying units, 2 if the unit can attack ground,
+        4 if it can attack air and 8 for structures.
+
+        """
+        return self._readonly(self.flag_bits)
+
+    cpdef list get_units(self, object indices):
+        """
+
+        Look up the python-sc2 units at some snapshot indices.
+
+        Parameters
+        ----------
+        indices :
+            Indices into the snapshot, as returned by the `cy_snapshot_*` functions.
+
+        Returns
+        -------
+        list[Unit] :
+            The units at `indices`, in the same order.
+
+        """
+        cdef list units = self.units
+        return [units[i] for i in indices]
+
+
+cpdef UnitSnapshot cy_unit_snapshot(object bot):
+    """
+
+    Pack the units of the current game loop into contiguous arrays.
+
+    The snapshot is stored on the bot, calling this again during the same game
+    loop returns the same object without reading the units again.
+
+    Parameters
+    ----------
+    bot :
+        Bot object, `bot.all_units` are packed.
+
+    Returns
+    -------
+    UnitSnapshot :
+        Struct of arrays view of all units.
+
+    """
+    cdef UnitSnapshot snapshot = getattr(bot, "_cy_unit_snapshot", None)
+    if snapshot is None or snapshot.game_loop != bot.state.game_loop:
+        snapshot = UnitSnapshot(bot)
+        bot._cy_unit_snapshot = snapshot
+    return snapshot
+
+
+@boundscheck(False)
+@wraparound(False)
+cpdef Py_ssize_t cy_snapshot_closest_to(
+    UnitSnapshot snapshot,
+    (double, double) position,
+    Py_ssize_t start = 0,
+    Py_ssize_t stop = -1,
+) except -2:
+    """
+
+    Snapshot version of `cy_closest_to`.
+
+    Parameters
+    ----------
+    snapshot :
+        Units of this game loop.
+    position :
+        Position to measure distance from.
+    start :
+        First index of the searched range. Defaults to 0.
+    stop :
+        End of the searched range. Defaults to -1 indicating the end of the snapshot.
+
+    Returns
+    -------
+    int :
+        Index of the unit closest to `position`, or -1 if the range is empty.
+
+    """
+    stop = snapshot._range_stop(start, stop)
+    cdef:
+        Py_ssize_t i
+        Py_ssize_t closest = start if start < stop else -1
+        double closest_dist = 999999.9
+        double dx, dy, dist
+
+    with nogil:
+        for i in range(start, stop):
+            dx = snapshot.xs[i] - position[0]
+            dy = snapshot.ys[i] - position[1]
+            dist = dx * dx + dy * dy
+            if dist < closest_dist:
+                closest_dist = dist
+                closest = i
+    return closest
+
+
+@boundscheck(False)
+@wraparound(False)
+cpdef cnp.ndarray cy_snapshot_closer_than(
+    UnitSnapshot snapshot,
+    double max_distance,
+    (double, double) position,
+    Py_ssize_t start = 0,
+    Py_ssize_t stop = -1,
+):
+    """
+
+    Snapshot version of `cy_closer_than`.
+
+    Parameters
+    ----------
+    snapshot :
+        Units of this game loop.
+    max_distance :
+        Units strictly closer than this are returned.
+    position :
+        Position to measure distance from.
+    start :
+        First index of the searched range. Defaults to 0.
+    stop :
+        End of the searched range. Defaults to -1 indicating the end of the snapshot.
+
+    Returns
+    -------
+    np.ndarray :
+        Indices of the units closer than `max_distance` to `position`, in snapshot order.
+
+    """
+    stop = snapshot._range_stop(start, stop)
+    cdef:
+        Py_ssize_t i
+        Py_ssize_t num_found = 0
+        double max_distance_sq = max_distance * max_distance
+        double dx, dy
+        cnp.ndarray result = np.empty(stop - start, dtype=np.intp)
+        Py_ssize_t[::1] found = result
+
+    with nogil:
+        for i in range(start, stop):
+            dx = snapshot.xs[i] - position[0]
+            dy = snapshot.ys[i] - position[1]
+            if dx * dx + dy * dy < max_distance_sq:
+                found[num_found] = i
+                num_found += 1
+    return result[:num_found]
+
+
+@boundscheck(False)
+@wraparound(False)
+cpdef cnp.ndarray cy_snapshot_in_attack_range(
+    UnitSnapshot snapshot,
+    Py_ssize_t unit_index,
+    Py_ssize_t start = 0,
+    Py_ssize_t stop = -1,
+    double bonus_distance = 0.0,
+):
+    """
+
+    Snapshot version of `cy_in_attack_range`.
+
+    Unlike `cy_in_attack_range`, units missing from the static unit data are not
+    skipped, their flying state is taken from the game instead.
+
+    Parameters
+    ----------
+    snapshot :
+        Units of this game loop.
+    unit_index :
+        Index of the attacking unit.
+    start :
+        First index of the searched range. Defaults to 0.
+    stop :
+        End of the searched range. Defaults to -1 indicating the end of the snapshot.
+    bonus_distance :
+        Extra distance added to the weapon ranges. Defaults to 0.
+
+    Returns
+    -------
+    np.ndarray :
+        Indices of the units the attacker can shoot, in snapshot order.
+
+    """
+    stop = snapshot._range_stop(start, stop)
+    if not 0 <= unit_index < snapshot.num_units:
+        raise ValueError(f"invalid unit_index: expected 0 <= unit_index < {snapshot.num_units}, got {unit_index}")
+    cdef:
+        Py_ssize_t i
+        Py_ssize_t num_found = 0
+        unsigned char flags = snapshot.flag_bits[unit_index]
+        bint can_shoot_air = flags & FLAG_CAN_ATTACK_AIR
+        bint can_shoot_ground = flags & FLAG_CAN_ATTACK_GROUND
+        bint other_unit_flying
+        double x = snapshot.xs[unit_index]
+        double y = snapshot.ys[unit_index]
+        double air_reach = snapshot.air_ranges[unit_index] + snapshot.radii[unit_index] + bonus_distance
+        double ground_reach = snapshot.ground_ranges[unit_index] + snapshot.radii[unit_index] + bonus_distance
+        double dist
+        cnp.ndarray result = np.empty(stop - start, dtype=np.intp)
+        Py_ssize_t[::1] found = result
+
+    if not can_shoot_air and not can_shoot_ground:
+        return result[:0]
+
+    with nogil:
+        for i in range(start, stop):
+            other_unit_flying = snapshot.flag_bits[i] & FLAG_FLYING
+            dist = sqrt((snapshot.xs[i] - x) ** 2 + (snapshot.ys[i] - y) ** 2)
+            if can_shoot_air and (other_unit_flying or snapshot.type_ids[i] == COLOSSUS):
+                if dist <= air_reach + snapshot.radii[i]:
+                    found[num_found] = i
+                    num_found += 1
+                    continue
+            if can_shoot_ground and not other_unit_flying:
+                if dist <= ground_reach + snapshot.radii[i]:
+                    found[num_found] = i
+                    num_found += 1
+    return result[:num_found]
+
+
+@boundscheck(False)
+@wraparound(False)
+cpdef cnp.ndarray cy_snapshot_sorted_by_distance_to(
+    UnitSnapshot snapshot,
+    (double, double) position,
+    Py_ssize_t start = 0,
+    Py_ssize_t stop = -1,
+    bint reverse = False,
+):
+    """
+
+    Snapshot version of `cy_sorted_by_distance_to`.
+
+    Parameters
+    ----------
+    snapshot :
+        Units of this game loop.
+    position :
+        Position to measure distance from.
+    start :
+        First index of the sorted range. Defaults to 0.
+    stop :
+        End of the sorted range. Defaults to -1 indicating the end of the snapshot.
+    reverse :
+        Sort from furthest to closest instead. Defaults to False.
+
+    Returns
+    -------
+    np.ndarray :
+        Indices of the units in the range ordered by distance. Ties keep snapshot order.
+
+    """
+    stop = snapshot._range_stop(start, stop)
+    cdef:
+        Py_ssize_t i
+        double sign = -1.0 if reverse else 1.0
+        cnp.ndarray distances = np.empty(stop - start, dtype=np.float64)
+        double[::1] distance_view = distances
+
+    with nogil:
+        for i in range(start, stop):
+            distance_view[i - start] = sign * (
+                (snapshot.xs[i] - position[0]) ** 2 + (snapshot.ys[i] - position[1]) ** 2
+            )
+    return distances.argsort(kind="stable") + start
+
+
+@boundscheck(False)
+@wraparound(False)
+cpdef Py_ssize_t cy_snapshot_pick_enemy_target(
+    UnitSnapshot snapshot,
+    Py_ssize_t start = 0,
+    Py_ssize_t stop = -1,
+) except -2:
+    """
+
+    Snapshot version of `cy_pick_enemy_target`.
+
+    Parameters
+    ----------
+    snapshot :
+        Units of this game loop.
+    start :
+        First index of the searched range. Defaults to 0.
+    stop :
+        End of the searched range. Defaults to -1 indicating the end of the snapshot.
+
+    Returns
+    -------
+    int :
+        Index of the unit with the lowest health plus shield, or -1 if the range is empty.
+
+    """
+    stop = snapshot._range_stop(start, stop)
+    cdef:
+        Py_ssize_t i
+        Py_ssize_t returned_index = start if start < stop else -1
+        double lowest_health = 999.9
+        double total_health
+
+    with nogil:
+        for i in range(start, stop):
+            total_health = snapshot.healths[i] + snapshot.shields[i]
+            if total_health < lowest_health:
+                lowest_health = total_health
+                returned_index = i
+    return returned_index
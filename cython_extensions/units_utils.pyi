@@ -1,4 +1,6 @@
-from typing import Union
+from typing import Optional, Union
+
+import numpy as np
 
 from sc2.position import Point2
 from sc2.unit import Unit
@@ -81,11 +83,14 @@ def cy_find_units_center_mass(
     center_mass, num_units = cy_find_units_center_mass(self.units, 10.0)
     ```
 
-    ```
-    47.8 ms ± 674 µs per loop (mean ± std. dev. of 7 runs, 10 loops each)
+    Units are bucketed into a grid of cells about `distance` wide, so each unit
+    only counts the units in the cells around it rather than all of them.
 
-    python alternative:
-    322 ms ± 5.2 ms per loop (mean ± std. dev. of 7 runs, 1 loop each)
+    ```
+    200 units spread over a map, distance 6:
+    262 µs
+    previous all pairs scan:
+    6.83 ms
     ```
 
     Parameters:
@@ -94,6 +99,35 @@ def cy_find_units_center_mass(
 
     Returns:
         The center mass, and how many units are within `distance` of the center mass.
+        Of equally dense units, the first one in `units` is the center mass.
+    """
+    ...
+
+def cy_find_units_center_masses(
+    units: Union[Units, list[Unit]], distance: float, k: int
+) -> list[tuple[tuple[float, float], int]]:
+    """Given some units, find the center masses of up to k separate clumps.
+
+    Counts the units around every unit like `cy_find_units_center_mass`, then
+    picks the densest units in turn, skipping any within `distance` of a center
+    already picked.
+
+    Example:
+    ```py
+    from cython_functions import cy_find_units_center_masses
+
+    for center_mass, num_units in cy_find_units_center_masses(self.enemy_units, 6.0, 3):
+        ...
+    ```
+
+    Parameters:
+        units: Collection of units we want to check.
+        distance: The distance to check from each center mass.
+        k: Maximum number of center masses to return.
+
+    Returns:
+        Center masses and how many units are within `distance` of them, densest
+        first. The first entry matches `cy_find_units_center_mass`.
     """
     ...
 
@@ -163,6 +197,44 @@ def cy_sorted_by_distance_to(
 
     """
 
+def cy_k_closest_to(
+    units: Union[Units, list[Unit]],
+    position: Union[Point2, tuple[float, float]],
+    k: int,
+    return_indices: bool = False,
+) -> tuple[Union[list[Unit], np.ndarray], np.ndarray]:
+    """Find the k units closest to `position`.
+
+    When only the nearest few units are needed, this avoids sorting and
+    building a list of every unit like `cy_sorted_by_distance_to` does.
+
+    Example:
+    ```py
+    from cython_extensions import cy_k_closest_to
+    from sc2.unit import Unit
+
+    closest: list[Unit]
+    closest, distances = cy_k_closest_to(self.enemy_units, self.start_location, 5)
+    ```
+
+    ```
+    k=5 of 200 units:
+    cy_k_closest_to: 16.1 µs
+    cy_sorted_by_distance_to: 50.6 µs
+    ```
+
+    Parameters:
+        units: Units we want to check.
+        position: Position to measure distance from.
+        k: Number of units to return.
+        return_indices: Return indices into `units` instead of the units.
+
+    Returns:
+        The min(k, len(units)) closest units, or their indices, and their
+        distances, closest first. Ties are ordered by index.
+
+    """
+
 def cy_closer_than(
     units: Union[Units, list[Unit]],
     max_distance: float,
@@ -228,3 +300,322 @@ def cy_further_than(
         Units further than `min_distance` to `position`.
 
     """
+
+class KDTree:
+    """Array backed 2D kd-tree over a set of points."""
+
+    num_points: int
+
+    def knn(self, points: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """Find the k nearest tree points of many query points.
+
+        Example:
+        ```py
+        tree = cy_kd_tree(np.array([u.position for u in self.enemy_units]))
+        indices, distances = tree.knn(np.array([u.position for u in self.units]), 3)
+        ```
+
+        Parameters:
+            points: Array of shape (*, 2) containing x and y coordinates of the query points.
+            k: Number of neighbours per query point.
+        Returns:
+            Indices and distances of shape (len(points), k), closest first and ties by
+            index. Missing neighbours when k exceeds the tree size are -1 and infinity.
+
+        """
+        ...
+
+    def within(
+        self, points: np.ndarray, r: float
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Find the tree points within a distance of many query points.
+
+        Example:
+        ```py
+        offsets, indices, distances = tree.within(own_positions, 6.0)
+        for i, unit in enumerate(self.units):
+            nearby = indices[offsets[i] : offsets[i + 1]]
+        ```
+
+        Parameters:
+            points: Array of shape (*, 2) containing x and y coordinates of the query points.
+            r: Points at most this far from a query point are returned.
+        Returns:
+            Offsets of shape (len(points) + 1,), indices and distances. The neighbours
+            of query point i are indices[offsets[i]:offsets[i + 1]], sorted by index.
+
+        """
+        ...
+
+def cy_kd_tree(positions: np.ndarray) -> KDTree:
+    """Build a 2D kd-tree over some positions for batched neighbour queries.
+
+    The tree adapts to the point density, so a clump of zerglings next to a few
+    scattered buildings costs the same to query as evenly spread units. Queries are
+    batched, one call answers all query points without returning to Python.
+
+    Example:
+    ```py
+    from cython_extensions import cy_kd_tree
+
+    enemies = self.enemy_units
+    tree = cy_kd_tree(np.array([u.position for u in enemies]))
+    indices, distances = tree.knn(np.array([u.position for u in self.units]), 1)
+    closest = [enemies[i] for i in indices[:, 0]]
+    ```
+
+    ```
+    200 points, 80 of them in one clump:
+    build: 24 µs
+    knn for all 200 points with k=5: 58 µs
+    ```
+
+    Parameters:
+        positions: Array of shape (*, 2) containing x and y coordinates of the points.
+    Returns:
+        Tree over the points.
+
+    """
+    ...
+
+def cy_all_closest_to(
+    units: Union[Units, list[Unit], np.ndarray],
+    other_units: Union[Units, list[Unit], np.ndarray],
+    target_filter: str = "all",
+) -> tuple[np.ndarray, np.ndarray]:
+    """Find the closest of `other_units` for each of `units` in one call.
+
+    Replaces looping `cy_closest_to(unit.position, enemies)` over our units.
+    Targets are scanned in cache sized blocks without the GIL, so the cost of
+    the Python calls and attribute lookups is only paid once per unit.
+
+    Example:
+    ```py
+    from cython_extensions import cy_all_closest_to
+
+    enemies = self.enemy_units
+    indices, distances = cy_all_closest_to(self.units, enemies, "attackable")
+    for unit, index in zip(self.units, indices):
+        if index != -1:
+            unit.attack(enemies[index])
+    ```
+
+    ```
+    60 own units against 80 enemies:
+    cy_all_closest_to: 155 µs
+    cy_closest_to in a loop: 1.05 ms
+    ```
+
+    Parameters:
+        units: Units, or an array of shape (*, 2) of positions, to find targets for.
+        other_units: Units, or an array of shape (*, 2) of positions, to pick targets from.
+        target_filter: "all" to consider every target, "ground" or "air" to only
+            consider targets on that layer, or "attackable" to only consider targets
+            each unit can attack. Every filter but "all" needs units, not positions.
+    Returns:
+        Index into `other_units` and distance of the closest target of each unit,
+        -1 and infinity when there is none. Ties go to the lowest index.
+
+    """
+    ...
+
+def cy_attack_range_matrix(
+    units: Union[Units, list[Unit]],
+    enemy_units: Union[Units, list[Unit]],
+    bonus_distance: float = 0.0,
+) -> tuple[tuple[np.ndarray, np.ndarray], tuple[np.ndarray, np.ndarray]]:
+    """Find which enemies each unit can shoot at, and which units each enemy can.
+
+    Gives the same answer as calling `cy_in_attack_range` for every unit of both
+    armies. Target layers come from a table indexed by type id instead of a
+    dict lookup per pair, and a grid over the targets means each attacker only
+    checks the targets around it.
+
+    Example:
+    ```py
+    from cython_extensions import cy_attack_range_matrix
+
+    enemies = self.enemy_units
+    (offsets, indices), (enemy_offsets, enemy_indices) = cy_attack_range_matrix(
+        self.units, enemies
+    )
+    for i, unit in enumerate(self.units):
+        targets = [enemies[j] for j in indices[offsets[i] : offsets[i + 1]]]
+    ```
+
+    ```
+    100 units against 100 enemies:
+    757 µs
+
+    cy_in_attack_range for every unit of both armies:
+    10.8 ms
+    ```
+
+    Parameters:
+        units: Our units.
+        enemy_units: Enemy units.
+        bonus_distance: Additional distance to consider.
+
+    Returns:
+        Offsets and indices for each direction. Unit i can shoot at
+        enemy_units[indices[offsets[i]:offsets[i + 1]]], sorted by index, and the
+        second pair does the same for each enemy against `units`.
+
+    """
+    ...
+
+# The cy_positions_* functions answer the same queries as the functions above
+# over a float64 array of shape (*, 2) instead of units. The array is read in
+# place, so it must be C contiguous, and indices are returned instead of units.
+# With `radii`, distances are measured to the edge of each circle.
+
+def cy_positions_center(positions: np.ndarray) -> tuple[float, float]:
+    """Find the central position of `positions`.
+
+    Parameters:
+        positions: Array of shape (*, 2) of positions.
+
+    Returns:
+        The mean position.
+
+    """
+    ...
+
+def cy_positions_closest_to(
+    position: Union[Point2, tuple[float, float]],
+    positions: np.ndarray,
+    radii: Optional[np.ndarray] = None,
+) -> int:
+    """Find the index of the position closest to `position`.
+
+    Example:
+    ```py
+    from cython_extensions import cy_positions_closest_to
+
+    closest: int = cy_positions_closest_to(self.start_location, enemy_positions)
+    ```
+
+    ```
+    200 positions:
+    2.15 µs
+
+    cy_closest_to with 200 units:
+    41.1 µs
+    ```
+
+    Parameters:
+        position: Position to measure distance from.
+        positions: Array of shape (*, 2) of positions to check.
+        radii: Radius of each position. Defaults to None indicating points.
+
+    Returns:
+        Index of the closest position, or -1 if there are none.
+
+    """
+    ...
+
+def cy_positions_closer_than(
+    positions: np.ndarray,
+    max_distance: float,
+    position: Union[Point2, tuple[float, float]],
+    radii: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Find all positions closer than `max_distance` to `position`.
+
+    Parameters:
+        positions: Array of shape (*, 2) of positions to check.
+        max_distance: Maximum distance to consider.
+        position: Position to measure distance from.
+        radii: Radius of each position. Defaults to None indicating points.
+    Returns:
+        Sorted indices of the positions closer than `max_distance`.
+
+    """
+    ...
+
+def cy_positions_further_than(
+    positions: np.ndarray,
+    min_distance: float,
+    position: Union[Point2, tuple[float, float]],
+    radii: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Find all positions further than `min_distance` from `position`.
+
+    Parameters:
+        positions: Array of shape (*, 2) of positions to check.
+        min_distance: Minimum distance to consider.
+        position: Position to measure distance from.
+        radii: Radius of each position. Defaults to None indicating points.
+    Returns:
+        Sorted indices of the positions further than `min_distance`.
+
+    """
+    ...
+
+def cy_positions_sorted_by_distance_to(
+    positions: np.ndarray,
+    position: Union[Point2, tuple[float, float]],
+    reverse: bool = False,
+    radii: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Sort positions by distance to `position`.
+
+    Parameters:
+        positions: Array of shape (*, 2) of positions to sort.
+        position: Sort by distance to this position.
+        reverse: Sort furthest first.
+        radii: Radius of each position. Defaults to None indicating points.
+    Returns:
+        Indices of the positions sorted by distance, ties by index.
+
+    """
+    ...
+
+def cy_positions_k_closest_to(
+    positions: np.ndarray,
+    position: Union[Point2, tuple[float, float]],
+    k: int,
+    radii: Optional[np.ndarray] = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Find the k positions closest to `position`.
+
+    Parameters:
+        positions: Array of shape (*, 2) of positions to check.
+        position: Position to measure distance from.
+        k: Number of positions to return.
+        radii: Radius of each position. Defaults to None indicating points.
+    Returns:
+        Indices and distances of the min(k, len(positions)) closest positions,
+        closest first. Ties are ordered by index.
+
+    """
+    ...
+
+def cy_positions_center_mass(positions: np.ndarray, distance: float) -> tuple[int, int]:
+    """Find the position with the most other positions within `distance`.
+
+    Parameters:
+        positions: Array of shape (*, 2) of positions to check.
+        distance: The distance to check from the center mass.
+    Returns:
+        Index of the center mass, or -1 if there is none, and how many
+        positions are within `distance` of it.
+
+    """
+    ...
+
+def cy_positions_center_masses(
+    positions: np.ndarray, distance: float, k: int
+) -> list[tuple[int, int]]:
+    """Find up to k center masses of separate clumps of positions.
+
+    Parameters:
+        positions: Array of shape (*, 2) of positions to check.
+        distance: The distance to check from each center mass.
+        k: Maximum number of center masses to return.
+    Returns:
+        Indices of the center masses and how many positions are within
+        `distance` of them, densest first.
+
+    """
+    ...
@@ -1,4 +1,6 @@
+from cpython.mem cimport PyMem_RawFree, PyMem_RawMalloc, PyMem_RawRealloc
 from cython cimport boundscheck, wraparound
+from libc.math cimport INFINITY, sqrt
 
 import numpy as np
 
@@ -7,8 +9,15 @@ from cython_extensions.unit_data import UNIT_DATA
 
 cimport numpy as cnp
 
+from cython_extensions.spatial_grid cimport SpatialGrid, insert_sorted
+
 UNIT_DATA_INT_KEYS = {k.value: v for k, v in UNIT_DATA.items()}
 
+# with tiny distances the center mass grid would need more cells than this per unit
+cdef double CENTER_MASS_CELLS_PER_UNIT = 4.0
+# kd-tree nodes with at most this many points are scanned instead of split
+cdef Py_ssize_t KD_LEAF_SIZE = 8
+
 
 @boundscheck(False)
 @wraparound(False)
@@ -70,32 +79,111 @@ cpdef object cy_closest_to((float, float) position, object units):
 
 @boundscheck(False)
 @wraparound(False)
-cpdef tuple cy_find_units_center_mass(units, double distance):
+cdef cnp.ndarray _neighbour_counts(const double[:, :] positions, double distance):
+    # number of positions strictly closer than `distance` to each position, itself included.
+    # Positions are bucketed into cells of about `distance`, so each position only
+    # visits the cells its circle overlaps
     cdef:
-        unsigned int max_units_found = 0
-        (double, double) center_position
+        Py_ssize_t num_units = positions.shape[0]
+        Py_ssize_t i, j, m, p, c_x, c_y
         double distance_check = distance * distance
-        list positions = [u.position for u in units]
-        (double, double) pos_1, pos_2
-        unsigned int units_found
-        unsigned int num_units = len(positions)
-        double dist_sq
-        Py_ssize_t i, j
+        double x, y, cell_size
+        cnp.ndarray counts = np.zeros(num_units, dtype=np.intp)
+        Py_ssize_t[::1] count_view = counts
+        SpatialGrid grid
 
-    for i in range(num_units):
-        units_found = 0
-        pos_1 = positions[i]
-        for j in range(num_units):
-            pos_2 = positions[j]
-            dist_sq = cy_distance_to_squared(pos_1, pos_2)
-            if dist_sq < distance_check:
-                units_found += 1
+    if num_units == 0 or distance <= 0:
+        return counts
+    # tiny distances would need more cells than there are units, so cap the cell count
+    cell_size = max(
+        distance,
+        sqrt(
+            max(np.ptp(np.asarray(positions[:, 0])), 1.0) * max(np.ptp(np.asarray(positions[:, 1])), 1.0)
+            / (CENTER_MASS_CELLS_PER_UNIT * num_units)
+        ),
+    )
+    grid = SpatialGrid(positions, None, cell_size)
+    with nogil:
+        for i in range(num_units):
+            x = positions[i, 0]
+            y = positions[i, 1]
+            for c_x in range(grid._cell_x(x - distance), grid._cell_x(x + distance) + 1):
+                for c_y in range(grid._cell_y(y - distance), grid._cell_y(y + distance) + 1):
+                    j = c_x * grid.ny + c_y
+                    for m in range(grid.cell_start[j], grid.cell_start[j + 1]):
+                        p = grid.order[m]
+                        if (x - positions[p, 0]) ** 2 + (y - positions[p, 1]) ** 2 < distance_check:
+                            count_view[i] += 1
+    return counts
+
+
+cpdef tuple cy_find_units_center_mass(units, double distance):
+    cdef:
+        const double[:, :] positions = _positions_of(units)
+        cnp.ndarray counts = _neighbour_counts(positions, distance)
+        # argmax keeps the first of equally dense units, as a full scan would
+        Py_ssize_t best = np.argmax(counts) if len(counts) else 0
+
+    if len(counts) == 0 or counts[best] == 0:
+        return (0.0, 0.0), 0
+    return (positions[best, 0], positions[best, 1]), int(counts[best])
+
+
+@boundscheck(False)
+@wraparound(False)
+cpdef list cy_find_units_center_masses(units, double distance, Py_ssize_t k):
+    """
+
+    Find up to k center masses of separate clumps of units.
+
+    Parameters
+    ----------
+    units :
+        Collection of units we want to check.
+    distance :
+        The distance to check from each center mass.
+    k :
+        Maximum number of center masses to return.
+
+    Returns
+    -------
+    list[tuple[tuple[float, float], int]] :
+        Center masses and how many units are within `distance` of them, densest
+        first. Each center is at least `distance` from the centers before it.
+
+    """
+    cdef:
+        const double[:, :] positions = _positions_of(units)
+        cnp.ndarray counts = _neighbour_counts(positions, distance)
+
+    return [
+        ((positions[i, 0], positions[i, 1]), int(counts[i]))
+        for i in _separate_densest(positions, counts, distance, k)
+    ]
+
+
+@boundscheck(False)
+@wraparound(False)
+cdef list _separate_densest(const double[:, :] positions, cnp.ndarray counts, double distance, Py_ssize_t k):
+    # indices of up to k densest positions, each at least `distance` from those before it
+    cdef:
+        Py_ssize_t i, j
+        double distance_check = distance * distance
+        list chosen = []
 
-        if units_found > max_units_found:
-            max_units_found = units_found
-            center_position = pos_1
+    if k < 0:
+        raise ValueError(f"invalid k: must not be negative, got {k}")
+    # stable sort keeps the first of equally dense units first
+    for i in np.argsort(-counts, kind="stable"):
+        if len(chosen) == k or counts[i] == 0:
+            break
+        for j in chosen:
+            if (positions[i, 0] - positions[j, 0]) ** 2 + (positions[i, 1] - positions[j, 1]) ** 2 < distance_check:
+                break
+        else:
+            chosen.append(i)
+    return chosen
 
-    return center_position, max_units_found
 
 @boundscheck(False)
 @wraparound(False)
@@ -106,7 +194,8 @@ cpdef list cy_in_attack_range(object unit, object units, double bonus_distance =
     cdef:
         unsigned int x, len_units, type_id_int
         double dist, air_range, ground_range, radius, other_u_radius
-        (float, float) unit_pos, other_unit_pos
+        # double like `cy_attack_range_matrix`, so both agree at the range edge
+        (double, double) unit_pos, other_unit_pos
         bint other_unit_flying, can_shoot_air, can_shoot_ground
         list returned_units
 
@@ -159,6 +248,62 @@ cpdef list cy_sorted_by_distance_to(object units, (float, float) position, bint
     return [units[j] for j in indices]
 
 
+@boundscheck(False)
+@wraparound(False)
+cpdef tuple cy_k_closest_to(object units, (double, double) position, Py_ssize_t k, bint return_indices = False):
+    """
+
+    Find the k units closest to a position without sorting all of them.
+
+    Parameters
+    ----------
+    units :
+        Units we want to check.
+    position :
+        Position to measure distance from.
+    k :
+        Number of units to return.
+    return_indices :
+        Return indices into `units` instead of the units themselves.
+
+    Returns
+    -------
+    tuple[list | np.ndarray, np.ndarray] :
+        The min(k, len(units)) closest units, or their indices, and their distances,
+        closest first. Ties are ordered by index.
+
+    """
+    cdef:
+        Py_ssize_t num_units = len(units)
+        Py_ssize_t i, count = 0
+        (double, double) pos
+        cnp.ndarray indices, distances
+        Py_ssize_t[::1] index_view
+        double[::1] distance_view
+
+    if k < 0:
+        raise ValueError(f"invalid k: must not be negative, got {k}")
+    k = min(k, num_units)
+    indices = np.empty(k, dtype=np.intp)
+    distances = np.empty(k, dtype=np.float64)
+    if k > 0:
+        index_view = indices
+        distance_view = distances
+        # a bounded insertion into the k best seen so far, most units are rejected
+        # after one comparison against the current k-th distance
+        for i in range(num_units):
+            pos = units[i].position
+            count = insert_sorted(
+                &index_view[0], &distance_view[0], count, k, i,
+                (pos[0] - position[0]) ** 2 + (pos[1] - position[1]) ** 2
+            )
+        for i in range(k):
+            distance_view[i] = sqrt(distance_view[i])
+    if return_indices:
+        return indices, distances
+    return [units[i] for i in indices], distances
+
+
 
 @boundscheck(False)
 @wraparound(False)
@@ -200,3 +345,839 @@ cpdef (list) cy_further_than(object units, double min_distance, (float, float) p
     return returned_units
 
 
+cdef struct NeighbourBuffer:
+    Py_ssize_t* index
+    double* distance
+    Py_ssize_t size
+    Py_ssize_t capacity
+
+
+cdef int buffer_push(NeighbourBuffer* buffer, Py_ssize_t i, double d) noexcept nogil:
+    cdef Py_ssize_t* new_index
+    cdef double* new_distance
+    if buffer.size >= buffer.capacity:
+        new_index = <Py_ssize_t*>PyMem_RawRealloc(buffer.index, 2 * buffer.capacity * sizeof(Py_ssize_t))
+        if not new_index:
+            return -1
+        buffer.index = new_index
+        new_distance = <double*>PyMem_RawRealloc(buffer.distance, 2 * buffer.capacity * sizeof(double))
+        if not new_distance:
+            return -1
+        buffer.distance = new_distance
+        buffer.capacity *= 2
+    buffer.index[buffer.size] = i
+    buffer.distance[buffer.size] = d
+    buffer.size += 1
+    return 0
+
+
+@boundscheck(False)
+@wraparound(False)
+cdef void select_nth(Py_ssize_t* index, const double* coord, Py_ssize_t lo, Py_ssize_t hi, Py_ssize_t nth) noexcept nogil:
+    # reorder index[lo:hi] so index[nth] holds the nth smallest coordinate, with no larger
+    # coordinate before and no smaller one after it. Three way partitions keep duplicates cheap
+    cdef Py_ssize_t lt, gt, i, tmp
+    cdef double a, b, c, pivot, value
+    while hi - lo > 1:
+        a = coord[index[lo]]
+        b = coord[index[(lo + hi) // 2]]
+        c = coord[index[hi - 1]]
+        pivot = max(min(a, b), min(max(a, b), c))
+        lt = lo
+        i = lo
+        gt = hi
+        while i < gt:
+            value = coord[index[i]]
+            if value < pivot:
+                tmp = index[lt]; index[lt] = index[i]; index[i] = tmp
+                lt += 1
+                i += 1
+            elif value > pivot:
+                gt -= 1
+                tmp = index[gt]; index[gt] = index[i]; index[i] = tmp
+            else:
+                i += 1
+        if nth < lt:
+            hi = lt
+        elif nth >= gt:
+            lo = gt
+        else:
+            return
+
+
+cdef class KDTree:
+    # implicit balanced tree over the point slots: the node covering slots lo:hi splits at
+    # its median slot m = (lo + hi) // 2 along split_dim[m], slots before m are not above
+    # the split and slots after m are not below it. Coordinates are stored in slot order
+    cdef readonly Py_ssize_t num_points
+    cdef double[::1] xs
+    cdef double[::1] ys
+    cdef Py_ssize_t[::1] index
+    cdef unsigned char[::1] split_dim
+
+    def __cinit__(self, object positions):
+        cdef const double[:, :] position_array = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        self.num_points = position_array.shape[0]
+        self.xs = np.ascontiguousarray(position_array[:, 0])
+        self.ys = np.ascontiguousarray(position_array[:, 1])
+        self.index = np.arange(self.num_points, dtype=np.intp)
+        self.split_dim = np.zeros(self.num_points, dtype=np.uint8)
+        if self.num_points > 0:
+            with nogil:
+                self._build(0, self.num_points)
+        self.xs = np.ascontiguousarray(np.asarray(self.xs)[self.index])
+        self.ys = np.ascontiguousarray(np.asarray(self.ys)[self.index])
+
+    def __len__(self):
+        return self.num_points
+
+    @boundscheck(False)
+    @wraparound(False)
+    cdef void _build(self, Py_ssize_t lo, Py_ssize_t hi) noexcept nogil:
+        cdef Py_ssize_t m, s
+        cdef double x, y
+        cdef double x_min = INFINITY, x_max = -INFINITY, y_min = INFINITY, y_max = -INFINITY
+        cdef unsigned char dim
+        if hi - lo <= KD_LEAF_SIZE:
+            return
+        # split along the wider side of the bounding box
+        for s in range(lo, hi):
+            x = self.xs[self.index[s]]
+            y = self.ys[self.index[s]]
+            x_min = min(x_min, x)
+            x_max = max(x_max, x)
+            y_min = min(y_min, y)
+            y_max = max(y_max, y)
+        dim = 0 if x_max - x_min >= y_max - y_min else 1
+        m = (lo + hi) // 2
+        select_nth(&self.index[0], &self.xs[0] if dim == 0 else &self.ys[0], lo, hi, m)
+        self.split_dim[m] = dim
+        self._build(lo, m)
+        self._build(m + 1, hi)
+
+    @boundscheck(False)
+    @wraparound(False)
+    cdef Py_ssize_t _knn(
+        self, Py_ssize_t lo, Py_ssize_t hi, double x, double y,
+        Py_ssize_t k, Py_ssize_t* out, double* out_distance, Py_ssize_t count
+    ) noexcept nogil:
+        # squared distances are kept in `out_distance`
+        cdef Py_ssize_t m, s
+        cdef double diff
+        if hi - lo <= KD_LEAF_SIZE:
+            for s in range(lo, hi):
+                count = insert_sorted(
+                    out, out_distance, count, k, self.index[s], (self.xs[s] - x) ** 2 + (self.ys[s] - y) ** 2
+                )
+            return count
+        m = (lo + hi) // 2
+        diff = x - self.xs[m] if self.split_dim[m] == 0 else y - self.ys[m]
+        if diff < 0:
+            count = self._knn(lo, m, x, y, k, out, out_distance, count)
+        else:
+            count = self._knn(m + 1, hi, x, y, k, out, out_distance, count)
+        count = insert_sorted(
+            out, out_distance, count, k, self.index[m], (self.xs[m] - x) ** 2 + (self.ys[m] - y) ** 2
+        )
+        # the far side can only hold a point as close as the split plane
+        if count < k or diff * diff <= out_distance[k - 1]:
+            if diff < 0:
+                count = self._knn(m + 1, hi, x, y, k, out, out_distance, count)
+            else:
+                count = self._knn(lo, m, x, y, k, out, out_distance, count)
+        return count
+
+    @boundscheck(False)
+    @wraparound(False)
+    cdef int _within(
+        self, Py_ssize_t lo, Py_ssize_t hi, double x, double y, double r2, NeighbourBuffer* buffer
+    ) noexcept nogil:
+        # squared distances are pushed to `buffer`
+        cdef Py_ssize_t m, s
+        cdef double diff, d
+        if hi - lo <= KD_LEAF_SIZE:
+            for s in range(lo, hi):
+                d = (self.xs[s] - x) ** 2 + (self.ys[s] - y) ** 2
+                if d <= r2 and buffer_push(buffer, self.index[s], d) != 0:
+                    return -1
+            return 0
+        m = (lo + hi) // 2
+        diff = x - self.xs[m] if self.split_dim[m] == 0 else y - self.ys[m]
+        d = (self.xs[m] - x) ** 2 + (self.ys[m] - y) ** 2
+        if d <= r2 and buffer_push(buffer, self.index[m], d) != 0:
+            return -1
+        if (diff <= 0 or diff * diff <= r2) and self._within(lo, m, x, y, r2, buffer) != 0:
+            return -1
+        if (diff >= 0 or diff * diff <= r2) and self._within(m + 1, hi, x, y, r2, buffer) != 0:
+            return -1
+        return 0
+
+    @boundscheck(False)
+    @wraparound(False)
+    cpdef tuple knn(self, object points, Py_ssize_t k):
+        """
+
+        Find the k nearest tree points of many query points.
+
+        Parameters
+        ----------
+        points :
+            Array of shape (*, 2) containing x and y coordinates of the query points.
+        k :
+            Number of neighbours per query point.
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray] :
+            Indices and distances of shape (len(points), k), closest first and ties by
+            index. Missing neighbours when k exceeds the tree size are -1 and infinity.
+
+        """
+        cdef const double[:, :] query = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        cdef Py_ssize_t num_queries = query.shape[0]
+        cdef Py_ssize_t i, j, count
+        if k < 0:
+            raise ValueError(f"invalid k: must not be negative, got {k}")
+        cdef cnp.ndarray indices = np.full((num_queries, k), -1, dtype=np.intp)
+        cdef cnp.ndarray distances = np.full((num_queries, k), INFINITY, dtype=np.float64)
+        cdef Py_ssize_t[:, ::1] index_view = indices
+        cdef double[:, ::1] distance_view = distances
+        cdef Py_ssize_t num_found = min(k, self.num_points)
+        if num_found == 0:
+            return indices, distances
+        with nogil:
+            for i in range(num_queries):
+                count = self._knn(
+                    0, self.num_points, query[i, 0], query[i, 1],
+                    num_found, &index_view[i, 0], &distance_view[i, 0], 0
+                )
+                for j in range(count):
+                    distance_view[i, j] = sqrt(distance_view[i, j])
+        return indices, distances
+
+    @boundscheck(False)
+    @wraparound(False)
+    cpdef tuple within(self, object points, double r):
+        """
+
+        Find the tree points within a distance of many query points.
+
+        Parameters
+        ----------
+        points :
+            Array of shape (*, 2) containing x and y coordinates of the query points.
+        r :
+            Points at most this far from a query point are returned.
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray, np.ndarray] :
+            Offsets of shape (len(points) + 1,), indices and distances. The neighbours of
+            query point i are indices[offsets[i]:offsets[i + 1]], sorted by index.
+
+        """
+        cdef const double[:, :] query = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        cdef Py_ssize_t num_queries = query.shape[0]
+        cdef Py_ssize_t i
+        cdef int status = 0
+        cdef cnp.ndarray offsets = np.zeros(num_queries + 1, dtype=np.intp)
+        cdef Py_ssize_t[::1] offset_view = offsets
+        cdef NeighbourBuffer buffer
+        buffer.size = 0
+        buffer.capacity = max(KD_LEAF_SIZE, num_queries)
+        buffer.index = <Py_ssize_t*>PyMem_RawMalloc(buffer.capacity * sizeof(Py_ssize_t))
+        buffer.distance = <double*>PyMem_RawMalloc(buffer.capacity * sizeof(double))
+        try:
+            if not buffer.index or not buffer.distance:
+                raise MemoryError("Could not allocate neighbour memory")
+            with nogil:
+                for i in range(num_queries):
+                    if r >= 0 and self.num_points > 0:
+                        status = self._within(0, self.num_points, query[i, 0], query[i, 1], r * r, &buffer)
+                        if status != 0:
+                            break
+                    offset_view[i + 1] = buffer.size
+            if status != 0:
+                raise MemoryError("Could not allocate neighbour memory")
+            indices = np.array(<Py_ssize_t[:buffer.size]>buffer.index) if buffer.size else np.empty(0, dtype=np.intp)
+            distances = np.sqrt(np.array(<double[:buffer.size]>buffer.distance)) if buffer.size else np.empty(0)
+        finally:
+            PyMem_RawFree(buffer.index)
+            PyMem_RawFree(buffer.distance)
+        order = np.argsort(np.repeat(np.arange(num_queries), np.diff(offsets)) * self.num_points + indices)
+        return offsets, indices[order], distances[order]
+
+
+cpdef KDTree cy_kd_tree(object positions):
+    """
+
+    Build a 2D kd-tree over some positions for batched neighbour queries.
+
+    Parameters
+    ----------
+    positions :
+        Array of shape (*, 2) containing x and y coordinates of the points.
+
+    Returns
+    -------
+    KDTree :
+        Array backed tree over the points.
+
+    """
+    return KDTree(positions)
+
+
+# targets are scanned in blocks of this many so their coordinates stay in cache
+cdef Py_ssize_t NEAREST_BLOCK_SIZE = 256
+
+# layers a target can be attacked on, and layers a unit may pick targets from
+cdef enum:
+    LAYER_GROUND = 1
+    LAYER_AIR = 2
+    LAYER_ALL = 3
+
+
+cdef object _positions_of(object units):
+    if isinstance(units, np.ndarray):
+        return np.asarray(units, dtype=np.float64).reshape(-1, 2)
+    return np.array([u.position for u in units], dtype=np.float64).reshape(-1, 2)
+
+
+cdef unsigned char _target_layers(object unit):
+    # read `is_flying` rather than UNIT_DATA so lifted structures count as air
+    # unit_type == 4 is colossus, which can be hit by both
+    if unit._proto.unit_type == 4:
+        return LAYER_ALL
+    if unit.is_flying:
+        return LAYER_AIR
+    return LAYER_GROUND
+
+
+@boundscheck(False)
+@wraparound(False)
+cpdef tuple cy_all_closest_to(object units, object other_units, str target_filter = "all"):
+    """
+
+    Find the closest of `other_units` for each of `units` in one pass.
+
+    Parameters
+    ----------
+    units :
+        Units, or an array of shape (*, 2) of positions, to find targets for.
+    other_units :
+        Units, or an array of shape (*, 2) of positions, to pick the targets from.
+    target_filter :
+        "all" to consider every target, "ground" or "air" to only consider targets on
+        that layer, or "attackable" to only consider targets each unit can attack.
+        Every filter but "all" needs units rather than positions.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray] :
+        Index into `other_units` and distance of the closest target of each unit,
+        -1 and infinity when there is none. Ties go to the lowest index.
+
+    """
+    cdef:
+        Py_ssize_t num_units, num_targets, i, j, block_start, block_stop, best_j
+        double x, y, d, best_d
+        unsigned char mask
+        const double[:, :] positions = _positions_of(units)
+        const double[:, :] target_positions = _positions_of(other_units)
+        const double[::1] xs, ys, target_xs, target_ys
+        unsigned char[::1] unit_masks, target_layers
+        cnp.ndarray indices, distances
+        Py_ssize_t[::1] index_view
+        double[::1] distance_view
+
+    if target_filter not in ("all", "ground", "air", "attackable"):
+        raise ValueError(
+            f"invalid target_filter: expected 'all', 'ground', 'air' or 'attackable', got '{target_filter}'"
+        )
+    num_units = positions.shape[0]
+    num_targets = target_positions.shape[0]
+    xs = np.ascontiguousarray(positions[:, 0])
+    ys = np.ascontiguousarray(positions[:, 1])
+    target_xs = np.ascontiguousarray(target_positions[:, 0])
+    target_ys = np.ascontiguousarray(target_positions[:, 1])
+
+    if target_filter == "all":
+        unit_masks = np.full(num_units, LAYER_ALL, dtype=np.uint8)
+        target_layers = np.full(num_targets, LAYER_ALL, dtype=np.uint8)
+    else:
+        if isinstance(other_units, np.ndarray) or (target_filter == "attackable" and isinstance(units, np.ndarray)):
+            raise ValueError(f"target_filter '{target_filter}' needs units, not positions")
+        target_layers = np.array([_target_layers(u) for u in other_units], dtype=np.uint8)
+        if target_filter == "attackable":
+            unit_masks = np.array(
+                [LAYER_GROUND * u.can_attack_ground + LAYER_AIR * u.can_attack_air for u in units], dtype=np.uint8
+            )
+        else:
+            unit_masks = np.full(num_units, LAYER_GROUND if target_filter == "ground" else LAYER_AIR, dtype=np.uint8)
+
+    indices = np.full(num_units, -1, dtype=np.intp)
+    distances = np.full(num_units, INFINITY, dtype=np.float64)
+    index_view = indices
+    distance_view = distances
+    with nogil:
+        block_start = 0
+        while block_start < num_targets:
+            block_stop = min(block_start + NEAREST_BLOCK_SIZE, num_targets)
+            for i in range(num_units):
+                x = xs[i]
+                y = ys[i]
+                mask = unit_masks[i]
+                best_d = distance_view[i]
+                best_j = index_view[i]
+                for j in range(block_start, block_stop):
+                    if target_layers[j] & mask:
+                        d = (target_xs[j] - x) ** 2 + (target_ys[j] - y) ** 2
+                        if d < best_d:
+                            best_d = d
+                            best_j = j
+                distance_view[i] = best_d
+                index_view[i] = best_j
+            block_start = block_stop
+        for i in range(num_units):
+            distance_view[i] = sqrt(distance_view[i])
+    return indices, distances
+
+
+cdef unsigned char[::1] _layers_by_type():
+    # layers each known unit type can be hit on, indexed by type id. Unknown types
+    # are never hit, and type id 4 is colossus, which is hit by both
+    cdef unsigned char[::1] layers = np.zeros(max(UNIT_DATA_INT_KEYS) + 1, dtype=np.uint8)
+    for type_id_int, unit_data in UNIT_DATA_INT_KEYS.items():
+        layers[type_id_int] = LAYER_AIR if unit_data["flying"] else LAYER_GROUND
+    layers[4] = LAYER_ALL
+    return layers
+
+cdef unsigned char[::1] TARGET_LAYERS_BY_TYPE = _layers_by_type()
+
+
+@boundscheck(False)
+@wraparound(False)
+cdef tuple _in_attack_range_csr(object attackers, object targets, double bonus_distance):
+    # which targets each attacker can hit, as offsets and indices like KDTree.within
+    cdef:
+        Py_ssize_t num_attackers = len(attackers)
+        Py_ssize_t num_targets = len(targets)
+        Py_ssize_t i, m, p, count
+        int status = 0
+        double x, y, reach, dist
+        const double[:, :] positions = _positions_of(attackers)
+        const double[:, :] target_positions = _positions_of(targets)
+        const double[::1] radii = np.array([u.radius for u in attackers], dtype=np.float64)
+        const double[::1] target_radii = np.array([u.radius for u in targets], dtype=np.float64)
+        const double[::1] air_ranges = np.array([u.air_range for u in attackers], dtype=np.float64)
+        const double[::1] ground_ranges = np.array([u.ground_range for u in attackers], dtype=np.float64)
+        unsigned char[::1] masks = np.array(
+            [
+                LAYER_GROUND * u.can_attack_ground + LAYER_AIR * u.can_attack_air if u.can_attack else 0
+                for u in attackers
+            ],
+            dtype=np.uint8,
+        )
+        cnp.ndarray type_ids = np.array([u._proto.unit_type for u in targets], dtype=np.intp)
+        const unsigned char[::1] target_layers = np.where(
+            type_ids < TARGET_LAYERS_BY_TYPE.shape[0],
+            np.asarray(TARGET_LAYERS_BY_TYPE)[np.minimum(type_ids, TARGET_LAYERS_BY_TYPE.shape[0] - 1)],
+            0,
+        ).astype(np.uint8)
+        SpatialGrid grid = SpatialGrid(target_positions, target_radii, 0.0)
+        Py_ssize_t[::1] candidates = np.empty(max(num_targets, 1), dtype=np.intp)
+        cnp.ndarray offsets = np.zeros(num_attackers + 1, dtype=np.intp)
+        Py_ssize_t[::1] offset_view = offsets
+        NeighbourBuffer buffer
+
+    buffer.size = 0
+    buffer.capacity = max(KD_LEAF_SIZE, num_attackers)
+    buffer.index = <Py_ssize_t*>PyMem_RawMalloc(buffer.capacity * sizeof(Py_ssize_t))
+    buffer.distance = <double*>PyMem_RawMalloc(buffer.capacity * sizeof(double))
+    try:
+        if not buffer.index or not buffer.distance:
+            raise MemoryError("Could not allocate neighbour memory")
+        with nogil:
+            for i in range(num_attackers):
+                if masks[i] and num_targets:
+                    x = positions[i, 0]
+                    y = positions[i, 1]
+                    reach = max(
+                        air_ranges[i] if masks[i] & LAYER_AIR else 0.0,
+                        ground_ranges[i] if masks[i] & LAYER_GROUND else 0.0,
+                    )
+                    # a little slack so the grid never drops a target exactly at the edge
+                    count = grid._radius_nogil(x, y, reach + radii[i] + bonus_distance + 1e-6, &candidates[0])
+                    for m in range(count):
+                        p = candidates[m]
+                        dist = sqrt((x - target_positions[p, 0]) ** 2 + (y - target_positions[p, 1]) ** 2)
+                        if (
+                            masks[i] & target_layers[p] & LAYER_AIR
+                            and dist <= air_ranges[i] + radii[i] + target_radii[p] + bonus_distance
+                        ) or (
+                            masks[i] & target_layers[p] & LAYER_GROUND
+                            and dist <= ground_ranges[i] + radii[i] + target_radii[p] + bonus_distance
+                        ):
+                            status = buffer_push(&buffer, p, dist)
+                            if status != 0:
+                                break
+                    if status != 0:
+                        break
+                offset_view[i + 1] = buffer.size
+        if status != 0:
+            raise MemoryError("Could not allocate neighbour memory")
+        indices = np.array(<Py_ssize_t[:buffer.size]>buffer.index) if buffer.size else np.empty(0, dtype=np.intp)
+    finally:
+        PyMem_RawFree(buffer.index)
+        PyMem_RawFree(buffer.distance)
+    # the grid reports targets cell by cell, sort each attacker's targets by index
+    indices = indices[np.argsort(np.repeat(np.arange(num_attackers), np.diff(offsets)) * num_targets + indices)]
+    return offsets, indices
+
+
+cpdef tuple cy_attack_range_matrix(object units, object enemy_units, double bonus_distance = 0.0):
+    """
+
+    Find which enemies each unit can attack, and which units each enemy can attack.
+
+    Parameters
+    ----------
+    units :
+        Our units.
+    enemy_units :
+        Enemy units.
+    bonus_distance :
+        Extra distance added to every range, as in `cy_in_attack_range`.
+
+    Returns
+    -------
+    tuple[tuple[np.ndarray, np.ndarray], tuple[np.ndarray, np.ndarray]] :
+        Offsets and indices for each direction. Unit i can attack
+        enemy_units[indices[offsets[i]:offsets[i + 1]]], sorted by index, and the
+        second pair does the same for each enemy against `units`.
+
+    """
+    return (
+        _in_attack_range_csr(units, enemy_units, bonus_distance),
+        _in_attack_range_csr(enemy_units, units, bonus_distance),
+    )
+
+
+# -----------------------------------------------------------------------------
+# Position array variants
+# -----------------------------------------------------------------------------
+# Same queries as above over a (N, 2) float64 positions buffer, for callers that
+# already keep positions in arrays. They return indices instead of units, and with
+# `radii` distances are measured to the edge of each circle as in SpatialGrid
+
+
+cdef const double[::1] _radii_or_zeros(object radii, Py_ssize_t num_positions):
+    if radii is None:
+        return np.zeros(num_positions, dtype=np.float64)
+    cdef const double[::1] radius_view = radii
+    if radius_view.shape[0] != num_positions:
+        raise ValueError(f"radii must have one entry per position, got {radius_view.shape[0]} for {num_positions}")
+    return radius_view
+
+
+@boundscheck(False)
+@wraparound(False)
+cpdef (double, double) cy_positions_center(const double[:, ::1] positions):
+    """
+
+    Returns the central position of all positions.
+
+    """
+    cdef:
+        Py_ssize_t num_positions = positions.shape[0]
+        Py_ssize_t i
+        double sum_x = 0.0, sum_y = 0.0
+
+    if num_positions == 0:
+        raise ValueError("positions cannot be empty")
+    with nogil:
+        for i in range(num_positions):
+            sum_x += positions[i, 0]
+            sum_y += positions[i, 1]
+    return sum_x / num_positions, sum_y / num_positions
+
+
+@boundscheck(False)
+@wraparound(False)
+cpdef Py_ssize_t cy_positions_closest_to(
+    (double, double) position, const double[:, ::1] positions, object radii = None
+):
+    """
+
+    Find the position closest to `position`.
+
+    Parameters
+    ----------
+    position :
+        Position to measure distance from.
+    positions :
+        Array of shape (*, 2) of positions to check.
+    radii :
+        Radius of each position. Defaults to None indicating points.
+
+    Returns
+    -------
+    int :
+        Index of the closest position, or -1 if there are none. Ties go to the
+        lowest index.
+
+    """
+    cdef:
+        Py_ssize_t num_positions = positions.shape[0]
+        const double[::1] radius_view = _radii_or_zeros(radii, num_positions)
+        bint has_radii = radii is not None
+        Py_ssize_t i, closest = -1
+        double d, closest_d = INFINITY
+
+    with nogil:
+        for i in range(num_positions):
+            d = (positions[i, 0] - position[0]) ** 2 + (positions[i, 1] - position[1]) ** 2
+            if has_radii:
+                d = sqrt(d) - radius_view[i]
+            if d < closest_d:
+                closest_d = d
+                closest = i
+    return closest
+
+
+@boundscheck(False)
+@wraparound(False)
+cdef cnp.ndarray _positions_within(
+    (double, double) position, const double[:, ::1] positions, object radii, double distance, bint closer
+):
+    # indices strictly closer than, or strictly further than, `distance`
+    cdef:
+        Py_ssize_t num_positions = positions.shape[0]
+        const double[::1] radius_view = _radii_or_zeros(radii, num_positions)
+        Py_ssize_t i, count = 0
+        double d, reach
+        cnp.ndarray result = np.empty(num_positions, dtype=np.intp)
+        Py_ssize_t[::1] out = result
+
+    with nogil:
+        for i in range(num_positions):
+            d = (positions[i, 0] - position[0]) ** 2 + (positions[i, 1] - position[1]) ** 2
+            reach = distance + radius_view[i]
+            if closer and reach > 0 and d < reach * reach or not closer and (reach < 0 or d > reach * reach):
+                out[count] = i
+                count += 1
+    return result[:count]
+
+
+cpdef cnp.ndarray cy_positions_closer_than(
+    const double[:, ::1] positions, double max_distance, (double, double) position, object radii = None
+):
+    """
+
+    Find all positions closer than `max_distance` to `position`.
+
+    Parameters
+    ----------
+    positions :
+        Array of shape (*, 2) of positions to check.
+    max_distance :
+        Maximum distance to consider.
+    position :
+        Position to measure distance from.
+    radii :
+        Radius of each position. Defaults to None indicating points.
+
+    Returns
+    -------
+    np.ndarray :
+        Sorted indices of the positions closer than `max_distance`.
+
+    """
+    return _positions_within(position, positions, radii, max_distance, True)
+
+
+cpdef cnp.ndarray cy_positions_further_than(
+    const double[:, ::1] positions, double min_distance, (double, double) position, object radii = None
+):
+    """
+
+    Find all positions further than `min_distance` from `position`.
+
+    Parameters
+    ----------
+    positions :
+        Array of shape (*, 2) of positions to check.
+    min_distance :
+        Minimum distance to consider.
+    position :
+        Position to measure distance from.
+    radii :
+        Radius of each position. Defaults to None indicating points.
+
+    Returns
+    -------
+    np.ndarray :
+        Sorted indices of the positions further than `min_distance`.
+
+    """
+    return _positions_within(position, positions, radii, min_distance, False)
+
+
+@boundscheck(False)
+@wraparound(False)
+cdef cnp.ndarray _distance_keys((double, double) position, const double[:, ::1] positions, object radii):
+    # squared distances for points, edge distances with radii. Both sort the same way
+    cdef:
+        Py_ssize_t num_positions = positions.shape[0]
+        const double[::1] radius_view = _radii_or_zeros(radii, num_positions)
+        bint has_radii = radii is not None
+        Py_ssize_t i
+        cnp.ndarray keys = np.empty(num_positions, dtype=np.float64)
+        double[::1] key_view = keys
+
+    with nogil:
+        for i in range(num_positions):
+            key_view[i] = (positions[i, 0] - position[0]) ** 2 + (positions[i, 1] - position[1]) ** 2
+            if has_radii:
+                key_view[i] = sqrt(key_view[i]) - radius_view[i]
+    return keys
+
+
+cpdef cnp.ndarray cy_positions_sorted_by_distance_to(
+    const double[:, ::1] positions, (double, double) position, bint reverse = False, object radii = None
+):
+    """
+
+    Sort positions by distance to `position`.
+
+    Parameters
+    ----------
+    positions :
+        Array of shape (*, 2) of positions to sort.
+    position :
+        Sort by distance to this position.
+    reverse :
+        Sort furthest first.
+    radii :
+        Radius of each position. Defaults to None indicating points.
+
+    Returns
+    -------
+    np.ndarray :
+        Indices of the positions sorted by distance, ties by index.
+
+    """
+    cdef cnp.ndarray keys = _distance_keys(position, positions, radii)
+    return np.argsort(-keys if reverse else keys, kind="stable")
+
+
+@boundscheck(False)
+@wraparound(False)
+cpdef tuple cy_positions_k_closest_to(
+    const double[:, ::1] positions, (double, double) position, Py_ssize_t k, object radii = None
+):
+    """
+
+    Find the k positions closest to `position` without sorting all of them.
+
+    Parameters
+    ----------
+    positions :
+        Array of shape (*, 2) of positions to check.
+    position :
+        Position to measure distance from.
+    k :
+        Number of positions to return.
+    radii :
+        Radius of each position. Defaults to None indicating points.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray] :
+        Indices and distances of the min(k, len(positions)) closest positions,
+        closest first. Ties are ordered by index.
+
+    """
+    cdef:
+        Py_ssize_t num_positions = positions.shape[0]
+        const double[::1] radius_view = _radii_or_zeros(radii, num_positions)
+        bint has_radii = radii is not None
+        Py_ssize_t i, count = 0
+        double d
+        cnp.ndarray indices, distances
+        Py_ssize_t[::1] index_view
+        double[::1] distance_view
+
+    if k < 0:
+        raise ValueError(f"invalid k: must not be negative, got {k}")
+    k = min(k, num_positions)
+    indices = np.empty(k, dtype=np.intp)
+    distances = np.empty(k, dtype=np.float64)
+    if k == 0:
+        return indices, distances
+    index_view = indices
+    distance_view = distances
+    with nogil:
+        for i in range(num_positions):
+            d = (positions[i, 0] - position[0]) ** 2 + (positions[i, 1] - position[1]) ** 2
+            if has_radii:
+                d = sqrt(d) - radius_view[i]
+            count = insert_sorted(&index_view[0], &distance_view[0], count, k, i, d)
+        if not has_radii:
+            for i in range(k):
+                distance_view[i] = sqrt(distance_view[i])
+    return indices, distances
+
+
+cpdef tuple cy_positions_center_mass(const double[:, ::1] positions, double distance):
+    """
+
+    Find the position with the most other positions within `distance`.
+
+    Parameters
+    ----------
+    positions :
+        Array of shape (*, 2) of positions to check.
+    distance :
+        The distance to check from the center mass.
+
+    Returns
+    -------
+    tuple[int, int] :
+        Index of the center mass, or -1 if there is none, and how many positions
+        are within `distance` of it. Of equally dense positions the first wins.
+
+    """
+    cdef:
+        cnp.ndarray counts = _neighbour_counts(positions, distance)
+        Py_ssize_t best = np.argmax(counts) if len(counts) else 0
+
+    if len(counts) == 0 or counts[best] == 0:
+        return -1, 0
+    return best, int(counts[best])
+
+
+cpdef list cy_positions_center_masses(const double[:, ::1] positions, double distance, Py_ssize_t k):
+    """
+
+    Find up to k center masses of separate clumps of positions.
+
+    Parameters
+    ----------
+    positions :
+        Array of shape (*, 2) of positions to check.
+    distance :
+        The distance to check from each center mass.
+    k :
+        Maximum number of center masses to return.
+
+    Returns
+    -------
+    list[tuple[int, int]] :
+        Indices of the center masses and how many positions are within `distance`
+        of them, densest first. Each center is at least `distance` from the
+        centers before it.
+
+    """
+    cdef cnp.ndarray counts = _neighbour_counts(positions, distance)
+    return [(i, int(counts[i])) for i in _separate_densest(positions, counts, distance, k)]
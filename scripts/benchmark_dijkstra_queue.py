@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark the priority queues available to `cy_dijkstra` on the maps in `tests/combat_data`.
+
+For every map a fully settled distance field is computed from the enemy main,
+once on the plain pathing grid and once on a grid with added influence around
+the map center, with both the binary heap and the bucket queue. The script also
+checks that both queues produce the same distances.
+
+Run:
+    python scripts/benchmark_dijkstra_queue.py [repeats]
+
+`repeats` defaults to 20, the best time of all repeats is reported.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT), str(ROOT / "tests")]
+
+from cython_extensions import cy_dijkstra  # noqa: E402
+from load_bot_from_pickle import get_map_specific_bot  # noqa: E402
+
+QUEUES = ("heap", "bucket")
+
+
+def build_grids(bot) -> dict[str, np.ndarray]:
+    pathable = bot.game_info.pathing_grid.data_numpy.T == 1
+    grid = np.where(pathable, 1.0, np.inf).astype(np.float32)
+
+    # a smooth bump of extra cost, similar to an influence map around an army
+    x, y = np.indices(grid.shape)
+    cx, cy = np.array(grid.shape) / 2
+    influence = 1.0 + 2.0 * np.exp(-((x - cx) ** 2 + (y - cy) ** 2) / (2 * 20.0**2))
+    return {"uniform": grid, "influence": np.where(pathable, influence, np.inf).astype(np.float32)}
+
+
+def find_target(grid: np.ndarray, main: np.ndarray) -> np.ndarray:
+    # the main base itself is not pathable and units leave small islands on the grid,
+    # start from the closest pathable cell that reaches most of the map
+    pathable = np.argwhere(np.isfinite(grid))
+    for cell in pathable[np.argsort(((pathable - main) ** 2).sum(axis=1))]:
+        pathing = cy_dijkstra(grid, cell[None])
+        if 2 * np.isfinite(pathing.distance_field).sum() > len(pathable):
+            return cell[None]
+    raise ValueError("no pathable cell reaches most of the map")
+
+
+def settle_time(grid: np.ndarray, targets: np.ndarray, queue: str, repeats: int) -> tuple[float, np.ndarray]:
+    best = np.inf
+    field = None
+    for _ in range(repeats):
+        pathing = cy_dijkstra(grid, targets, queue=queue)
+        start = time.perf_counter()
+        pathing.settle()
+        best = min(best, time.perf_counter() - start)
+        field = pathing.distance_field
+    return best, field
+
+
+def main() -> None:
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    maps = sorted((ROOT / "tests" / "combat_data").glob("*.xz"))
+    print(f"{'map':<20} {'grid':<10} " + " ".join(f"{q + ' (ms)':>12}" for q in QUEUES) + f" {'speedup':>8}")
+    for map_path in maps:
+        bot = get_map_specific_bot(map_path)
+        grids = build_grids(bot)
+        target = find_target(grids["uniform"], np.array(bot.enemy_start_locations[0]))
+        for name, grid in grids.items():
+            times = {}
+            fields = {}
+            for queue in QUEUES:
+                times[queue], fields[queue] = settle_time(grid, target, queue, repeats)
+            if not np.allclose(fields["heap"], fields["bucket"], rtol=1e-5):
+                raise AssertionError(f"distance fields differ on {map_path.stem} ({name})")
+            print(
+                f"{map_path.stem:<20} {name:<10} "
+                + " ".join(f"{1000 * times[q]:>12.3f}" for q in QUEUES)
+                + f" {times['heap'] / times['bucket']:>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+from math import inf
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from sc2.bot_ai import BotAI
+from sc2.ids.unit_typeid import UnitTypeId
+from sc2.unit import Unit
+
+from cython_extensions import cy_assign_targets, cy_fight_outcome
+
+pytest_plugins = ("pytest_asyncio",)
+
+MAPS: list[Path] = [
+    map_path
+    for map_path in (Path(__file__).parent / "combat_data").iterdir()
+    if map_path.suffix == ".xz"
+]
+
+
+@pytest.mark.parametrize("bot", MAPS, indirect=True)
+class TestCombatSim:
+    scenarios = [(map_path.name, {"map_path": map_path}) for map_path in MAPS]
+
+    def test_two_against_one(self, bot: BotAI, event_loop):
+        # arrange, all units on one spot so everyone fights from the start
+        zergling: Unit = bot.units(UnitTypeId.ZERGLING).first
+
+        # act
+        winner, value_left, enemy_value_left, duration = cy_fight_outcome(
+            [zergling, zergling], [zergling]
+        )
+
+        # assert, the single zergling only gets halfway through its first target
+        assert winner == 1
+        assert value_left == pytest.approx(2 * 0.5)
+        assert enemy_value_left == 0.0
+        assert duration == pytest.approx(zergling.health / (2 * zergling.ground_dps) / 1.4)
+
+    def test_mirror_match(self, bot: BotAI, event_loop):
+        units: list[Unit] = list(bot.units(UnitTypeId.ZERGLING))
+
+        winner, value_left, enemy_value_left, duration = cy_fight_outcome(units, units)
+
+        assert winner == 0
+        assert value_left == enemy_value_left == 0.0
+        assert 0.0 < duration < inf
+
+    def test_cannot_win(self, bot: BotAI, event_loop):
+        # zerglings can't shoot up and overlords have no weapon
+        zerglings: list[Unit] = list(bot.units(UnitTypeId.ZERGLING))
+        overlords: list[Unit] = list(bot.enemy_units(UnitTypeId.OVERLORD))
+
+        winner, value_left, enemy_value_left, duration = cy_fight_outcome(
+            zerglings, overlords
+        )
+
+        assert winner == 0
+        assert value_left > 0.0 and enemy_value_left > 0.0
+        assert duration == inf
+
+    def test_outnumbered(self, bot: BotAI, event_loop):
+        army: list[Unit] = [u for u in bot.units if u.can_attack]
+
+        assert cy_fight_outcome(army, army[: len(army) // 4])[0] == 1
+        assert cy_fight_outcome(army[: len(army) // 4], army)[0] == -1
+
+    def test_no_enemies(self, bot: BotAI, event_loop):
+        army: list[Unit] = list(bot.units)
+
+        winner, value_left, enemy_value_left, duration = cy_fight_outcome(army, [])
+
+        assert winner == 1
+        assert enemy_value_left == 0.0
+        assert duration == 0.0
+        assert cy_fight_outcome([], []) == (0, 0.0, 0.0, 0.0)
+
+    def test_assign_targets_spreads_fire(self, bot: BotAI, event_loop):
+        # arrange, every stalker kills a zergling in one shot
+        stalker: Unit = bot.units(UnitTypeId.STALKER).first
+        zergling: Unit = bot.enemy_units(UnitTypeId.ZERGLING).first
+        assert stalker.calculate_damage_vs_target(zergling)[0] >= zergling.health
+        offsets = np.arange(5, dtype=np.intp) * 3
+        indices = np.tile(np.arange(3, dtype=np.intp), 4)
+
+        # act
+        targets = cy_assign_targets([stalker] * 4, [zergling] * 3, (offsets, indices))
+
+        # assert, one stalker per zergling, the spare one shoots anyway
+        assert targets.tolist() == [0, 1, 2, 0]
+
+    def test_assign_targets_fractional_damage(self, bot: BotAI, event_loop):
+        # arrange, a tenth of an attack upgrade makes the damage fractional and the target
+        # has exactly three shots of health. Summed in double the shots reach it, taken off
+        # one by one they leave a sliver, the kill must still use only the three attackers
+        zergling: Unit = bot.enemy_units(UnitTypeId.ZERGLING).first
+        weapon = zergling._weapons[0]
+        damage = weapon.attacks * (weapon.damage + 0.1 - zergling._type_data._proto.armor)
+        health = damage + damage + damage
+        assert health - damage - damage - damage > 0
+
+        def copy(unit: Unit, **fields) -> SimpleNamespace:
+            proto = unit._proto
+            values = {
+                name: getattr(proto, name)
+                for name in (
+                    "unit_type", "health", "shield", "pos", "radius", "attack_upgrade_level",
+                    "armor_upgrade_level", "shield_upgrade_level", "is_flying",
+                )
+            }
+            values.update(fields)
+            return SimpleNamespace(_proto=SimpleNamespace(**values), _type_data=unit._type_data)
+
+        attacker = copy(zergling, attack_upgrade_level=0.1)
+        target = copy(zergling, health=health, shield=0.0, armor_upgrade_level=0)
+        offsets = np.array([0, 1, 2, 3, 5], dtype=np.intp)
+        indices = np.array([0, 0, 0, 0, 1], dtype=np.intp)
+
+        # act
+        targets = cy_assign_targets([attacker] * 4, [target, copy(zergling)], (offsets, indices))
+
+        # assert, the spare attacker leaves the sliver alone
+        assert targets.tolist() == [0, 0, 0, 1]
+
+    def test_assign_targets_in_range(self, bot: BotAI, event_loop):
+        attackers: list[Unit] = list(bot.units)
+        enemies: list[Unit] = list(bot.enemy_units)
+        rng = np.random.default_rng(3)
+        rows = [
+            np.sort(rng.choice(len(enemies), 5, replace=False))
+            if i % 3
+            else np.empty(0, dtype=np.intp)
+            for i in range(len(attackers))
+        ]
+        offsets = np.concatenate(([0], np.cumsum([len(row) for row in rows])))
+        indices = np.concatenate(rows).astype(np.intp)
+
+        targets = cy_assign_targets(attackers, enemies, (offsets, indices))
+
+        for i, target in enumerate(targets):
+            row = indices[offsets[i] : offsets[i + 1]]
+            if len(row) == 0:
+                assert target == -1
+            else:
+                assert target in row
+        # the armies are far apart in the test data
+        assert np.all(cy_assign_targets(attackers, enemies) == -1)
+
+    def test_assign_targets_invalid_relation(self, bot: BotAI, event_loop):
+        attackers: list[Unit] = list(bot.units)[:2]
+        with pytest.raises(ValueError):
+            cy_assign_targets(attackers, [], (np.array([0, 1, 1]), np.array([0])))
+
+    @pytest.mark.parametrize(
+        "offsets, indices",
+        [
+            # the same enemy twice, or many times, in one row
+            ([0, 2, 3], [1, 1, 0]),
+            ([0, 200000, 200000], [0] * 200000),
+            # rows running backwards
+            ([0, 3, 2], [0, 1]),
+            ([1, 2, 3], [0, 1, 0]),
+        ],
+    )
+    def test_assign_targets_invalid_edges(self, bot: BotAI, event_loop, offsets, indices):
+        attackers: list[Unit] = list(bot.units)[:2]
+        enemies: list[Unit] = list(bot.enemy_units)[:2]
+        with pytest.raises(ValueError):
+            cy_assign_targets(
+                attackers, enemies, (np.array(offsets, dtype=np.intp), np.array(indices, dtype=np.intp))
+            )
@@ -1,12 +1,23 @@
 from pathlib import Path
 
+import numpy as np
 import pytest
 from sc2.bot_ai import BotAI
 from sc2.ids.unit_typeid import UnitTypeId
 from sc2.unit import Unit
 from sc2.units import Units
 
-from cython_extensions import cy_attack_ready, cy_is_facing, cy_range_vs_target
+from cython_extensions import (
+    cy_attack_ready,
+    cy_attack_ready_many,
+    cy_find_aoe_center,
+    cy_find_aoe_centers,
+    cy_find_aoe_position,
+    cy_find_aoe_positions,
+    cy_is_facing,
+    cy_range_vs_target,
+    cy_unit_snapshot,
+)
 
 pytest_plugins = ("pytest_asyncio",)
 
@@ -76,3 +87,255 @@ class TestCombatUtils:
         for unit in ground_ranged_units:
             # act and assert
             assert cy_attack_ready(bot, unit, in_range_target)
+
+    def test_attack_ready_many(self, bot: BotAI, event_loop):
+        # arrange
+        units: list[Unit] = list(bot.units)
+        targets: list[Unit] = [
+            bot.enemy_units[i % len(bot.enemy_units)] for i in range(len(units))
+        ]
+        targets[0] = bot.townhalls[0]
+        expected: list[bool] = [
+            cy_attack_ready(bot, unit, target) for unit, target in zip(units, targets)
+        ]
+
+        # act
+        ready: np.ndarray = cy_attack_ready_many(bot, units, targets)
+
+        # assert
+        assert ready.dtype == bool
+        assert ready.tolist() == expected
+
+    def test_attack_ready_many_snapshot(self, bot: BotAI, event_loop):
+        # arrange
+        snapshot = cy_unit_snapshot(bot)
+        # snapshot flags follow the static unit data, which disagrees with
+        # `is_flying` for a few types, so only pick targets where both agree
+        candidates: list[int] = [
+            i
+            for i, unit in enumerate(snapshot.units)
+            if bool(snapshot.flags[i] & 1) == unit.is_flying
+        ]
+        units: list[Unit] = list(bot.units)
+        target_indices = np.array(
+            [candidates[i % len(candidates)] for i in range(len(units))],
+            dtype=np.intp,
+        )
+        expected: list[bool] = [
+            cy_attack_ready(bot, unit, snapshot.units[i])
+            for unit, i in zip(units, target_indices)
+        ]
+
+        # act
+        ready: np.ndarray = cy_attack_ready_many(bot, units, target_indices, snapshot)
+
+        # assert
+        assert ready.tolist() == expected
+
+    def test_attack_ready_many_length_mismatch(self, bot: BotAI, event_loop):
+        with pytest.raises(ValueError):
+            cy_attack_ready_many(bot, list(bot.units), [])
+
+    def test_find_aoe_position(self, bot: BotAI, event_loop):
+        # arrange
+        enemies: list[Unit] = list(bot.enemy_units)
+        positions = np.array([u.position for u in enemies], dtype=np.float64)
+        radii = np.array([u.radius for u in enemies], dtype=np.float64)
+
+        def num_hits(center) -> int:
+            distances = np.hypot(*(positions - center).T)
+            return int(np.sum(distances <= 1.5 + radii + 1e-6))
+
+        # act
+        position = cy_find_aoe_position(1.5, enemies)
+        de_position = cy_find_aoe_position(1.5, enemies, use_differential_evolution=True)
+
+        # assert
+        assert position is not None
+        assert num_hits(position) >= num_hits(de_position)
+        assert np.array_equal(position, cy_find_aoe_position(1.5, enemies))
+        assert cy_find_aoe_position(1.5, enemies, min_units=len(enemies) + 1) is None
+
+    def test_find_aoe_positions(self, bot: BotAI, event_loop):
+        # arrange
+        enemies: list[Unit] = list(bot.enemy_units)
+        positions = np.array([u.position for u in enemies], dtype=np.float64)
+        radii = np.array([u.radius for u in enemies], dtype=np.float64)
+
+        # act
+        aoe_positions = cy_find_aoe_positions(1.5, enemies, 3)
+
+        # assert
+        assert 0 < len(aoe_positions) <= 3
+        assert np.array_equal(aoe_positions[0], cy_find_aoe_position(1.5, enemies))
+        hit_before = np.zeros(len(enemies), dtype=bool)
+        for position in aoe_positions:
+            hit = np.hypot(*(positions - position).T) <= 1.5 + radii + 1e-6
+            assert np.any(hit & ~hit_before)
+            hit_before |= hit
+
+
+class TestFindAoeCenters:
+    def test_two_clusters(self):
+        positions = np.array(
+            [[0.0, 0.0], [0.5, 0.0], [0.0, 0.5], [10.0, 10.0], [10.5, 10.0]],
+            dtype=np.float64,
+        )
+
+        centers, num_hits = cy_find_aoe_centers(1.0, positions, 3)
+
+        # the third effect would only hit targets that are already hit
+        assert num_hits.tolist() == [3, 2]
+        assert np.hypot(*(centers[0] - (0.0, 0.0))) < 1.0
+        assert np.hypot(*(centers[1] - (10.0, 10.0))) < 1.0
+
+    def test_weights_and_min_hits(self):
+        positions = np.array(
+            [[0.0, 0.0], [0.5, 0.0], [10.0, 10.0], [20.0, 20.0]], dtype=np.float64
+        )
+        weights = np.array([1.0, 1.0, 3.0, 1.0], dtype=np.float64)
+
+        centers, num_hits = cy_find_aoe_centers(1.0, positions, 4, None, weights)
+        assert num_hits.tolist() == [1, 2, 1]
+        assert tuple(centers[0]) == (10.0, 10.0)
+        # the caller's weights are left alone
+        assert weights.tolist() == [1.0, 1.0, 3.0, 1.0]
+
+        centers, num_hits = cy_find_aoe_centers(1.0, positions, 4, None, weights, 2)
+        assert num_hits.tolist() == [2]
+
+    def test_matches_repeated_single_placement(self):
+        rng = np.random.default_rng(11)
+        for _ in range(20):
+            positions = rng.uniform(0.0, 15.0, (40, 2))
+            radii = rng.uniform(0.2, 1.0, 40)
+            weights = np.ones(40, dtype=np.float64)
+
+            centers, num_hits = cy_find_aoe_centers(1.5, positions, 4, radii)
+
+            for center, count in zip(centers, num_hits):
+                _, best = cy_find_aoe_center(1.5, positions, radii, weights)
+                assert count == best
+                hit = np.hypot(*(positions - center).T) <= 1.5 + radii + 1e-6
+                assert np.sum(hit & (weights > 0)) == count
+                weights[hit] = 0.0
+
+    def test_empty(self):
+        centers, num_hits = cy_find_aoe_centers(
+            1.0, np.empty((0, 2), dtype=np.float64), 2
+        )
+        assert centers.shape == (0, 2)
+        assert len(num_hits) == 0
+
+
+class AoeTarget:
+    def __init__(self, tag, position):
+        self.tag = tag
+        self.position = position
+        self.radius = 0.5
+
+
+class TestAoeBonusTags:
+    # three targets at the origin, two bonus targets far away
+    targets = [
+        AoeTarget(1, (0.0, 0.0)),
+        AoeTarget(2, (0.5, 0.0)),
+        AoeTarget(3, (0.0, 0.5)),
+        AoeTarget(4, (10.0, 10.0)),
+        AoeTarget(5, (10.5, 10.0)),
+    ]
+
+    def test_bonus_targets_move_the_position(self):
+        position = cy_find_aoe_position(1.0, self.targets)
+        bonus_position = cy_find_aoe_position(1.0, self.targets, bonus_tags={4, 5})
+
+        assert np.hypot(*position) < 1.0
+        assert np.hypot(*(bonus_position - (10.0, 10.0))) < 1.5
+
+    def test_bonus_targets_move_the_positions(self):
+        positions = cy_find_aoe_positions(1.0, self.targets, 2)
+        bonus_positions = cy_find_aoe_positions(1.0, self.targets, 2, bonus_tags={4, 5})
+
+        assert np.hypot(*positions[0]) < 1.0
+        assert np.hypot(*(bonus_positions[0] - (10.0, 10.0))) < 1.5
+        # the bonus pair outweighs three targets, but min_units counts units
+        (three_units,) = cy_find_aoe_positions(1.0, self.targets, 2, 3, {4, 5})
+        assert np.hypot(*three_units) < 1.0
+
+
+    def test_min_units_counts_units_before_bonus(self):
+        # the bonus pair weighs more, but only the three plain units meet min_units
+        targets = [
+            AoeTarget(1, (0.0, 0.0)),
+            AoeTarget(2, (0.1, 0.0)),
+            AoeTarget(3, (20.0, 20.0)),
+            AoeTarget(4, (20.1, 20.0)),
+            AoeTarget(5, (20.0, 20.1)),
+        ]
+
+        position = cy_find_aoe_position(1.0, targets, 3, {1, 2})
+        (positions,) = cy_find_aoe_positions(1.0, targets, 1, 3, {1, 2})
+
+        assert position is not None
+        assert np.hypot(*(position - (20.0, 20.0))) < 1.0
+        assert np.array_equal(position, positions)
+        assert np.hypot(*cy_find_aoe_position(1.0, targets, 2, {1, 2})) < 1.0
+
+class TestFindAoeCenter:
+    def test_hits_the_cluster(self):
+        positions = np.array(
+            [[0.0, 0.0], [1.0, 0.0], [0.0, 1.0], [10.0, 10.0]], dtype=np.float64
+        )
+
+        center, num_hits = cy_find_aoe_center(1.0, positions)
+
+        assert num_hits == 3
+        assert np.all(np.hypot(*(positions[:3] - center).T) <= 1.0)
+
+    def test_needs_the_circle_intersection(self):
+        # only the two intersection points hit all three targets
+        positions = np.array([[0.0, 0.0], [2.0, 0.0], [1.0, 1.5]], dtype=np.float64)
+
+        center, num_hits = cy_find_aoe_center(1.1, positions)
+
+        assert num_hits == 3
+        assert np.all(np.hypot(*(positions - center).T) <= 1.1 + 1e-6)
+
+    def test_radii_and_weights(self):
+        positions = np.array([[0.0, 0.0], [5.0, 0.0], [5.5, 0.0]], dtype=np.float64)
+        radii = np.array([0.0, 0.0, 0.0], dtype=np.float64)
+        weights = np.array([3.0, 1.0, 1.0], dtype=np.float64)
+
+        center, num_hits = cy_find_aoe_center(0.5, positions, radii, weights)
+        assert num_hits == 1
+        assert center == (0.0, 0.0)
+
+        radii[0] = 2.0
+        center, num_hits = cy_find_aoe_center(2.0, positions, radii)
+        assert num_hits == 3
+
+        weights[0] = 0.0
+        center, num_hits = cy_find_aoe_center(0.5, positions, None, weights)
+        assert num_hits == 2
+
+    def test_matches_sampled_best(self):
+        rng = np.random.default_rng(7)
+        xs = np.linspace(-3.0, 13.0, 161)
+        samples = np.stack(np.meshgrid(xs, xs), axis=-1).reshape(-1, 2)
+        for _ in range(20):
+            positions = rng.uniform(0.0, 10.0, (25, 2))
+            radii = rng.uniform(0.2, 1.0, 25)
+
+            center, num_hits = cy_find_aoe_center(1.5, positions, radii)
+
+            distances = np.hypot(
+                samples[:, None, 0] - positions[None, :, 0],
+                samples[:, None, 1] - positions[None, :, 1],
+            )
+            assert num_hits >= np.max(np.sum(distances <= 1.5 + radii, axis=1))
+            assert num_hits == np.sum(
+                np.hypot(*(positions - center).T) <= 1.5 + radii + 1e-6
+            )
+
+    def test_empty(self):
+        assert cy_find_aoe_center(1.0, np.empty((0, 2), dtype=np.float64)) == (None, 0)
@@ -5,7 +5,7 @@ import pytest
 from numpy.testing import assert_equal
 from sc2.bot_ai import BotAI
 
-from cython_extensions import cy_dijkstra
+from cython_extensions import cy_astar, cy_dijkstra, cy_dijkstra_many
 
 pytest_plugins = ("pytest_asyncio",)
 
@@ -16,6 +16,15 @@ MAPS: list[Path] = [
 ]
 
 
+def path_cost(cost: np.ndarray, path: list[tuple[int, int]]) -> float:
+    """Cost of a path in the convention used by `DijkstraPathing.get_distance`."""
+    total = cost[path[-1]]
+    for a, b in zip(path, path[1:]):
+        step = np.sqrt(2) if a[0] != b[0] and a[1] != b[1] else 1.0
+        total += step * cost[a]
+    return total
+
+
 class TestDijkstraGeneric:
 
     def test_raises_on_nonpositive_entries(self):
@@ -120,3 +129,416 @@ class TestDijkstra:
         # after heap advance, upper bound should match settled distance
         assert np.isfinite(actual)
         assert_equal(estimate, actual)
+
+    def test_update_cost(self):
+        """test that in place cost updates give the same distances as a fresh run."""
+        rng = np.random.default_rng(42)
+        cost = rng.uniform(1.0, 4.0, (24, 24))
+        cost[rng.random(cost.shape) < 0.2] = np.inf
+        cost[0, 0] = 1.0
+        targets = np.array([[0, 0]])
+        pathing = cy_dijkstra(cost, targets)
+        # settle part of the grid first so the update has to deal with a partial state
+        pathing.get_distance((12, 12))
+
+        for _ in range(5):
+            cells = rng.integers(1, 24, (6, 2))
+            values = rng.uniform(0.5, 8.0, 6)
+            values[:2] = np.inf
+            pathing.update_cost(cells, values)
+            cost[cells[:, 0], cells[:, 1]] = values
+
+            expected = cy_dijkstra(cost, targets)
+            for x, y in np.argwhere(np.isfinite(cost)):
+                assert pathing.get_distance((x, y)) == pytest.approx(expected.get_distance((x, y)), rel=1e-5)
+
+    def test_update_cost_reroutes_path(self):
+        """test that paths avoid a newly blocked cell and use a newly opened one."""
+        x = np.inf
+        cost = np.array([
+            [1, 1, 1, 1, 1],
+            [1, x, x, x, 1],
+            [1, x, x, x, 1],
+            [1, 1, 1, 1, 1],
+        ])
+        pathing = cy_dijkstra(cost, np.array([[0, 4]]))
+        assert_equal(pathing.get_path((0, 0)), [(0, 0), (0, 1), (0, 2), (0, 3), (0, 4)])
+
+        pathing.update_cost(np.array([[0, 2]]), np.inf)
+        assert_equal(pathing.get_path((0, 0)), [(0, 0), (1, 0), (2, 0), (3, 1), (3, 2), (3, 3), (2, 4), (1, 4), (0, 4)])
+
+        pathing.update_cost(np.array([[1, 1], [1, 2], [1, 3]]), 1.0)
+        path = pathing.get_path((0, 0))
+        assert len(path) == 5
+        assert (0, 2) not in path
+
+    def test_update_cost_raises_on_invalid_input(self):
+        pathing = cy_dijkstra(np.ones((3, 3)), np.array([[1, 1]]))
+        with pytest.raises(Exception):
+            pathing.update_cost(np.array([[0, 0]]), -1.0)
+        with pytest.raises(Exception):
+            pathing.update_cost(np.array([[3, 0]]), 1.0)
+
+    def test_batch_queries_match_single_queries(self):
+        rng = np.random.default_rng(7)
+        cost = rng.uniform(1.0, 3.0, (20, 30))
+        cost[rng.random(cost.shape) < 0.25] = np.inf
+        targets = np.argwhere(np.isfinite(cost))[:2]
+        # include sources outside the grid and on walls
+        sources = rng.uniform(-2.0, 32.0, (40, 2))
+
+        batch = cy_dijkstra(cost, targets)
+        single = cy_dijkstra(cost, targets)
+
+        distances = batch.get_distances(sources)
+        assert distances.shape == (len(sources),)
+        for source, distance in zip(sources, distances):
+            assert_equal(distance, single.get_distance(tuple(source)))
+
+        cells, offsets = batch.get_paths(sources, limit=6, max_distance=2)
+        assert offsets.shape == (len(sources) + 1,)
+        for k, source in enumerate(sources):
+            expected = single.get_path(tuple(source), limit=6, max_distance=2)
+            assert_equal([tuple(c) for c in cells[offsets[k] : offsets[k + 1]]], expected)
+
+    def test_batch_distances_upper_bound(self):
+        pathing = cy_dijkstra(np.ones((3, 3)), np.array([[2, 2]]))
+        sources = np.array([[0, 0], [1, 1]])
+        assert np.isinf(pathing.get_distances(sources, upper_bound=True)).all()
+        settled = pathing.get_distances(sources)
+        assert_equal(pathing.get_distances(sources, upper_bound=True), settled)
+
+    def test_reset_matches_new_pathing(self):
+        rng = np.random.default_rng(3)
+        cost = rng.uniform(1.0, 3.0, (20, 30))
+        pathing = cy_dijkstra(cost, np.array([[0, 0]]))
+        pathing.get_distance((19, 29))
+        for _ in range(10):
+            cost = rng.uniform(1.0, 3.0, (20, 30))
+            cost[rng.random(cost.shape) < 0.25] = np.inf
+            targets = np.argwhere(np.isfinite(cost))[:3]
+            sources = rng.integers(0, 20, (15, 2))
+            pathing.reset(cost, targets)
+            expected = cy_dijkstra(cost, targets)
+            assert_equal(pathing.get_distances(sources), expected.get_distances(sources))
+
+    def test_reset_reuses_buffers(self):
+        cost = np.ones((40, 40))
+        pathing = cy_dijkstra(cost, np.array([[0, 0], [39, 39]]))
+        pathing.get_distance((20, 20))
+        allocations, nbytes = pathing.allocations, pathing.nbytes
+        for k in range(5):
+            pathing.reset(cost, np.array([[k, k]]))
+            pathing.get_distance((39, 0))
+        assert pathing.allocations == allocations
+        assert pathing.nbytes == nbytes
+
+        pathing.reset(np.ones((10, 10)), np.array([[0, 0]]))
+        assert pathing.allocations > allocations
+        assert pathing.get_distance((9, 9)) == pytest.approx(1 + 9 * np.sqrt(2))
+
+    def test_reset_raises_on_invalid_input(self):
+        pathing = cy_dijkstra(np.ones((3, 3)), np.array([[1, 1]]))
+        with pytest.raises(Exception):
+            pathing.reset(-np.ones((3, 3)), np.array([[1, 1]]))
+        with pytest.raises(Exception):
+            pathing.reset(np.ones((3, 3)), np.array([[3, 1]]))
+
+    def test_fields_are_settled_readonly_views(self):
+        x = np.inf
+        cost = np.array([
+            [1, 1, 1, 2, 1],
+            [1, x, x, x, 1],
+            [1, x, x, x, 1],
+        ])
+        pathing = cy_dijkstra(cost, np.array([[2, 4]]))
+        distance = pathing.distance_field
+        direction = pathing.direction_field
+        assert distance.shape == direction.shape == cost.shape
+        assert not distance.flags.writeable and not direction.flags.writeable
+        with pytest.raises(ValueError):
+            distance[0, 0] = 0.0
+
+        expected = cy_dijkstra(cost, np.array([[2, 4]]))
+        for source in np.argwhere(np.isfinite(cost)):
+            assert distance[tuple(source)] == expected.get_distance(tuple(source))
+        assert np.isinf(distance[1, 1])
+        assert direction[2, 4] == -1 and direction[1, 1] == -1
+
+        # the views follow later changes of the grids
+        before = distance.copy()
+        pathing.update_cost(np.array([[0, 3]]), 1.0)
+        assert_equal(pathing.distance_field, distance)
+        assert distance[0, 0] == pytest.approx(before[0, 0] - np.sqrt(2))
+
+    def test_direction_field_points_along_path(self):
+        offsets = np.array([(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1)])
+        rng = np.random.default_rng(9)
+        cost = rng.uniform(1.0, 3.0, (15, 25))
+        pathing = cy_dijkstra(cost, np.array([[7, 20]]))
+        direction = pathing.direction_field
+        path = pathing.get_path((14, 0))
+        for cell, next_cell in zip(path, path[1:]):
+            assert_equal(np.subtract(cell, offsets[direction[cell]]), next_cell)
+
+    def test_next_waypoints_match_paths(self):
+        rng = np.random.default_rng(4)
+        cost = rng.uniform(1.0, 3.0, (20, 30))
+        cost[rng.random(cost.shape) < 0.25] = np.inf
+        targets = np.argwhere(np.isfinite(cost))[:2]
+        positions = rng.uniform(-2.0, 32.0, (50, 2))
+        pathing = cy_dijkstra(cost, targets)
+        for lookahead in (0, 1, 5, 100):
+            waypoints = pathing.next_waypoints(positions, lookahead)
+            assert waypoints.shape == (len(positions), 2)
+            for position, waypoint in zip(positions, waypoints):
+                path = pathing.get_path(tuple(position), limit=lookahead + 1)
+                assert_equal(waypoint, path[-1])
+
+    def test_smooth_path_open_field(self):
+        cost = np.ones((10, 30))
+        pathing = cy_dijkstra(cost, np.array([[9, 29]]))
+        assert_equal(pathing.get_path((0, 0), smooth=True), [(0, 0), (9, 29)])
+
+    def test_smooth_path_keeps_corners(self):
+        x = np.inf
+        cost = np.array([
+            [1, 1, 1, 1, 1],
+            [1, x, x, x, 1],
+            [1, x, x, x, 1],
+            [1, x, x, x, 1],
+            [1, 1, 1, 1, 1],
+        ])
+        pathing = cy_dijkstra(cost, np.array([[0, 4]]))
+        path = pathing.get_path((4, 0))
+        smooth = pathing.get_path((4, 0), smooth=True)
+        assert smooth[0] == path[0] and smooth[-1] == path[-1]
+        assert 2 < len(smooth) < len(path)
+        assert all(cell in path for cell in smooth)
+
+    def test_smooth_path_avoids_expensive_cells(self):
+        # the straight line crosses a more expensive cell than the path around it
+        cost = np.ones((3, 9))
+        cost[0, 3:6] = 5.0
+        cost[1, 4] = 5.0
+        pathing = cy_dijkstra(cost, np.array([[0, 8]]))
+        smooth = pathing.get_path((0, 0), smooth=True)
+        assert len(smooth) > 2
+        for a, b in zip(smooth, smooth[1:]):
+            assert cost[a] == 1.0 and cost[b] == 1.0
+
+    def test_smooth_path_limit(self):
+        cost = np.ones((10, 10))
+        cost[2:, 5] = np.inf
+        pathing = cy_dijkstra(cost, np.array([[9, 9]]))
+        path = pathing.get_path((9, 0), limit=4)
+        smooth = pathing.get_path((9, 0), limit=4, smooth=True)
+        assert_equal(smooth, [path[0], path[-1]])
+
+
+class TestBucketQueue:
+
+    def test_raises_on_unknown_queue(self):
+        with pytest.raises(ValueError):
+            cy_dijkstra(np.ones((3, 3)), np.array([[0, 0]]), queue="fibonacci")
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_heap(self, seed):
+        rng = np.random.default_rng(seed)
+        cost = rng.choice([0.5, 1.0, 1.5, 4.0], size=(30, 25))
+        cost[rng.random(cost.shape) < 0.2] = np.inf
+        targets = np.argwhere(np.isfinite(cost))[:3]
+        heap = cy_dijkstra(cost, targets)
+        bucket = cy_dijkstra(cost, targets, queue="bucket")
+        # lazy queries before the grid is settled
+        for x, y in np.argwhere(np.isfinite(cost))[::7]:
+            assert bucket.get_distance((x, y)) == pytest.approx(heap.get_distance((x, y)), rel=1e-5)
+            assert path_cost(cost, bucket.get_path((x, y))) == pytest.approx(heap.get_distance((x, y)), rel=1e-5)
+        np.testing.assert_allclose(bucket.distance_field, heap.distance_field, rtol=1e-5)
+
+    def test_update_cost_matches_heap(self):
+        rng = np.random.default_rng(3)
+        cost = rng.uniform(1.0, 4.0, (24, 24))
+        cost[0, 0] = 1.0
+        targets = np.array([[0, 0]])
+        heap = cy_dijkstra(cost, targets)
+        bucket = cy_dijkstra(cost, targets, queue="bucket")
+        bucket.get_distance((12, 12))
+        for _ in range(5):
+            cells = rng.integers(1, 24, (6, 2))
+            # cheaper than any cost so far, the queue has to be rebuilt with finer buckets
+            values = rng.choice([0.25, 2.0, np.inf], 6)
+            heap.update_cost(cells, values)
+            bucket.update_cost(cells, values)
+            np.testing.assert_allclose(bucket.distance_field, heap.distance_field, rtol=1e-5)
+
+    def test_wide_cost_range_matches_heap(self):
+        # a distance of about 1e9 buckets, the queue must not grow with it
+        rng = np.random.default_rng(4)
+        cost = np.full((60, 60), 1e4)
+        cost[rng.random(cost.shape) < 0.1] = 1e-3
+        targets = np.array([[0, 0]])
+        heap = cy_dijkstra(cost, targets)
+        bucket = cy_dijkstra(cost, targets, queue="bucket")
+        np.testing.assert_allclose(bucket.distance_field, heap.distance_field, rtol=1e-5)
+        assert bucket.nbytes < 4 * heap.nbytes
+
+    @pytest.mark.parametrize("value", [40.0, 1e5])
+    def test_update_cost_beyond_ring_matches_heap(self, value):
+        # requeued cells far past the ring wait in the overflow list, and costs too
+        # wide for any ring move the queue to the heap
+        rng = np.random.default_rng(9)
+        cost = rng.uniform(1.0, 2.0, (40, 40))
+        targets = np.array([[0, 0]])
+        heap = cy_dijkstra(cost, targets)
+        bucket = cy_dijkstra(cost, targets, queue="bucket")
+        bucket.get_distance((10, 10))
+        heap.get_distance((10, 10))
+        for _ in range(4):
+            cells = rng.integers(0, 40, (30, 2))
+            values = rng.choice([0.5, 1.5, value], 30)
+            heap.update_cost(cells, values)
+            bucket.update_cost(cells, values)
+            for x, y in rng.integers(0, 40, (10, 2)):
+                assert bucket.get_distance((x, y)) == pytest.approx(heap.get_distance((x, y)), rel=1e-5)
+        np.testing.assert_allclose(bucket.distance_field, heap.distance_field, rtol=1e-5)
+
+    def test_reset_keeps_queue(self):
+        cost = np.ones((10, 10))
+        pathing = cy_dijkstra(cost, np.array([[0, 0]]), queue="bucket")
+        pathing.reset(2 * cost, np.array([[9, 9]]))
+        expected = cy_dijkstra(2 * cost, np.array([[9, 9]]))
+        assert_equal(pathing.distance_field, expected.distance_field)
+
+
+class TestDijkstraMany:
+
+    @pytest.mark.parametrize("num_threads", [0, 1, 3])
+    def test_matches_single_fields(self, num_threads):
+        rng = np.random.default_rng(8)
+        costs = [rng.uniform(1.0, 3.0, (30, 20 + k)) for k in range(5)]
+        for cost in costs:
+            cost[rng.random(cost.shape) < 0.2] = np.inf
+        targets_list = [rng.integers(0, 20, (k + 1, 2)) for k in range(5)]
+        fields = cy_dijkstra_many(costs, targets_list, num_threads)
+        assert len(fields) == len(costs)
+        for field, cost, targets in zip(fields, costs, targets_list):
+            expected = cy_dijkstra(cost, targets)
+            assert_equal(field.distance_field, expected.distance_field)
+            assert_equal(field.direction_field, expected.direction_field)
+
+    def test_empty(self):
+        assert cy_dijkstra_many([], []) == []
+
+    def test_raises_on_invalid_input(self):
+        with pytest.raises(Exception):
+            cy_dijkstra_many([np.ones((3, 3))], [])
+        with pytest.raises(Exception):
+            cy_dijkstra_many([np.ones((3, 3))], [np.array([[3, 0]])])
+
+
+class TestAStar:
+
+    def test_maze(self):
+        x = np.inf
+        cost = np.array([
+            [1, 1, 1, 2, 1],
+            [1, x, x, x, 1],
+            [1, x, x, x, 1],
+            [1, x, x, x, 1],
+            [1, 1, 1, 1, 1],
+        ])
+        assert_equal(
+            cy_astar(cost, (0, 0), (4, 4)),
+            [(0, 0), (1, 0), (2, 0), (3, 0), (4, 1), (4, 2), (4, 3), (4, 4)],
+        )
+        assert_equal(cy_astar(cost, (0, 0), (4, 4), limit=3), [(0, 0), (1, 0), (2, 0)])
+
+    def test_unreachable_target(self):
+        cost = np.array([[1, np.inf, 1], [1, np.inf, 1], [1, np.inf, 1]])
+        assert_equal(cy_astar(cost, (0, 0), (1, 2)), [(0, 0)])
+
+    def test_raises_on_target_out_of_bounds(self):
+        with pytest.raises(Exception):
+            cy_astar(np.ones((3, 3)), (0, 0), (3, 1))
+
+    def test_matches_dijkstra_distance(self):
+        rng = np.random.default_rng(11)
+        for _ in range(20):
+            cost = rng.uniform(0.5, 3.0, (30, 30))
+            cost[rng.random(cost.shape) < 0.25] = np.inf
+            valid = np.argwhere(np.isfinite(cost))
+            source, target = valid[rng.choice(len(valid), 2, replace=False)]
+            expected = cy_dijkstra(cost, target[None]).get_distance(tuple(source))
+            path = cy_astar(cost, tuple(source), target)
+            if np.isinf(expected):
+                assert_equal(path, [tuple(source)])
+            else:
+                assert path[0] == tuple(source) and path[-1] == tuple(target)
+                assert path_cost(cost, path) == pytest.approx(expected, rel=1e-5)
+
+    def test_uniform_cost_matches_dijkstra_distance(self):
+        # grids with a single finite cost are searched with jump point search
+        rng = np.random.default_rng(13)
+        for _ in range(200):
+            shape = rng.integers(2, 40, 2)
+            cost = np.full(shape, rng.choice([1.0, 2.5]))
+            cost[rng.random(cost.shape) < rng.uniform(0.0, 0.5)] = np.inf
+            valid = np.argwhere(np.isfinite(cost))
+            if len(valid) < 2:
+                continue
+            source, target = valid[rng.choice(len(valid), 2, replace=False)]
+            expected = cy_dijkstra(cost, target[None]).get_distance(tuple(source))
+            path = cy_astar(cost, tuple(source), target)
+            if np.isinf(expected):
+                assert_equal(path, [tuple(source)])
+            else:
+                assert path[0] == tuple(source) and path[-1] == tuple(target)
+                steps = np.abs(np.diff(path, axis=0)).max(axis=1)
+                assert_equal(steps, 1)
+                assert np.isfinite([cost[cell] for cell in path]).all()
+                assert path_cost(cost, path) == pytest.approx(expected, rel=1e-5)
+
+    def test_workspace_is_reused(self):
+        rng = np.random.default_rng(5)
+        cost = rng.uniform(0.5, 3.0, (30, 30))
+        workspace = cy_dijkstra(cost, np.array([[0, 0]]))
+        expected = cy_astar(cost, (0, 0), (29, 29))
+        assert_equal(cy_astar(cost, (0, 0), (29, 29), workspace=workspace), expected)
+        allocations = workspace.allocations
+        for _ in range(3):
+            assert_equal(cy_astar(cost, (0, 0), (29, 29), workspace=workspace), expected)
+        assert workspace.allocations == allocations
+
+    @pytest.mark.parametrize("queue", ["heap", "bucket"])
+    def test_workspace_queries_after_astar(self, queue):
+        rng = np.random.default_rng(6)
+        cost = rng.uniform(0.5, 3.0, (30, 30))
+        workspace = cy_dijkstra(cost, np.array([[0, 0]]), queue=queue)
+        workspace.settle()
+
+        path = cy_astar(cost, (0, 0), (29, 29), workspace=workspace)
+
+        # the search only settles part of the grid, queries start over from the new target
+        expected = cy_dijkstra(cost, np.array([[29, 29]]))
+        assert path_cost(cost, path) == pytest.approx(expected.get_distance((0, 0)), rel=1e-5)
+        assert workspace.get_distance((3, 27)) == expected.get_distance((3, 27))
+        assert_equal(workspace.get_path((25, 2)), expected.get_path((25, 2)))
+        assert_equal(workspace.distance_field, expected.distance_field)
+
+    @pytest.mark.parametrize("queue", ["heap", "bucket"])
+    def test_workspace_queries_after_jump_point_search(self, queue):
+        rng = np.random.default_rng(7)
+        cost = np.ones((30, 30))
+        cost[rng.random(cost.shape) < 0.2] = np.inf
+        cost[0, 0] = cost[29, 29] = 1.0
+        workspace = cy_dijkstra(cost, np.array([[0, 0]]), queue=queue)
+
+        cy_astar(cost, (0, 0), (29, 29), workspace=workspace)
+
+        # only jump points and the returned path got distances, queries start over
+        expected = cy_dijkstra(cost, np.array([[29, 29]]), queue=queue)
+        assert_equal(workspace.distance_field, expected.distance_field)
+        assert_equal(workspace.direction_field, expected.direction_field)
+        for source in np.argwhere(np.isfinite(cost))[::37]:
+            assert workspace.get_distance(tuple(source)) == expected.get_distance(tuple(source))
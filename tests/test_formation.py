@@ -0,0 +1,101 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose
+from scipy.optimize import linear_sum_assignment
+
+from cython_extensions import cy_formation, cy_formation_slots
+
+
+def travel(start, end):
+    return np.hypot(*(end - start).T).sum()
+
+
+class TestFormationSlots:
+
+    def test_line(self):
+        slots = cy_formation_slots((10.0, 0.0), (0.0, 0.0), 5, "line", 1.0, 3)
+
+        # middle out, then the next row behind
+        assert_allclose(slots, [[10, 0], [10, 1], [10, -1], [11, 0], [11, 1]])
+
+    @pytest.mark.parametrize("shape", ["concave", "arc"])
+    def test_rows_bend_around_target(self, shape):
+        slots = cy_formation_slots((10.0, 0.0), (0.0, 0.0), 30, shape, 1.0, 0)
+        distances = np.hypot(slots[:, 0], slots[:, 1])
+
+        assert_allclose(distances[0], 10.0)
+        assert_allclose(distances - 10.0, np.round(distances - 10.0), atol=1e-9)
+        # neighbours in a row are spacing apart along the circle
+        assert_allclose(np.diff(np.arctan2(slots[1:5:2, 1], slots[1:5:2, 0])) * 10.0, 1.0)
+
+    def test_arc_rows_fill_half_circle(self):
+        slots = cy_formation_slots((2.0, 0.0), (0.0, 0.0), 7, "arc", 1.0, 0)
+        distances = np.hypot(slots[:, 0], slots[:, 1])
+
+        # 2 * floor(pi) + 1 slots fit in the first row
+        assert_allclose(distances, 2.0)
+        assert (slots[:, 0] >= -1e-9).all()
+
+    def test_no_overlap(self):
+        slots = cy_formation_slots((5.0, 5.0), (20.0, 30.0), 200, "concave", 1.0, 0)
+
+        assert len(np.unique(slots.round(6), axis=0)) == 200
+
+    def test_invalid_shape(self):
+        with pytest.raises(ValueError):
+            cy_formation_slots((0.0, 0.0), (1.0, 0.0), 3, "wedge", 1.0, 0)
+
+
+class TestFormation:
+
+    @pytest.mark.parametrize("shape", ["line", "concave", "arc"])
+    def test_small_groups_travel_least(self, shape):
+        rng = np.random.default_rng(0)
+        positions = rng.uniform(20, 30, (20, 2))
+
+        placed = cy_formation(positions, (0.0, 0.0), shape)
+
+        distances = np.hypot(
+            positions[:, None, 0] - placed[None, :, 0], positions[:, None, 1] - placed[None, :, 1]
+        )
+        rows, columns = linear_sum_assignment(distances)
+        assert travel(positions, placed) == pytest.approx(distances[rows, columns].sum())
+
+    @pytest.mark.parametrize("shape", ["line", "concave", "arc"])
+    def test_large_groups_get_every_slot(self, shape):
+        rng = np.random.default_rng(1)
+        positions = rng.uniform(20, 30, (200, 2))
+
+        placed = cy_formation(positions, (0.0, 0.0), shape, 1.0, 0, (15.0, 15.0))
+
+        slots = cy_formation_slots((15.0, 15.0), (0.0, 0.0), 200, shape, 1.0, 0)
+        assert len(np.unique(placed.round(6), axis=0)) == 200
+        assert_allclose(np.sort(placed.round(6), axis=0), np.sort(slots.round(6), axis=0))
+
+    @pytest.mark.parametrize("shape", ["line", "concave", "arc"])
+    def test_large_groups_in_formation_stay(self, shape):
+        rng = np.random.default_rng(2)
+        slots = cy_formation_slots((15.0, 15.0), (0.0, 0.0), 200, shape, 1.0, 0)
+        positions = slots[rng.permutation(200)]
+
+        placed = cy_formation(positions, (0.0, 0.0), shape, 1.0, 0, (15.0, 15.0))
+
+        assert_allclose(placed, positions)
+
+    def test_centered_on_units(self):
+        positions = np.array([[10.0, -1.0], [10.0, 0.0], [10.0, 1.0], [11.0, 0.0]])
+
+        placed = cy_formation(positions, (0.0, 0.0), "line", 1.0, 2)
+
+        assert_allclose(placed.mean(axis=0), positions.mean(axis=0), atol=0.5)
+
+    def test_anchor(self):
+        positions = np.array([[10.0, 0.0], [10.0, 1.0]])
+
+        placed = cy_formation(positions, (0.0, 0.0), "line", 1.0, 0, (5.0, 0.0))
+
+        assert_allclose(placed, [[5.0, 0.0], [5.0, 1.0]])
+
+    def test_empty(self):
+        assert cy_formation([], (0.0, 0.0)) == {}
+        assert cy_formation(np.empty((0, 2)), (0.0, 0.0)).shape == (0, 2)
@@ -1,15 +1,22 @@
 from pathlib import Path
 
+import numpy as np
 import pytest
 from sc2.bot_ai import BotAI
 from sc2.position import Point2
 from sc2.unit import Unit
 
 from cython_extensions import (
+    cy_angle_diff,
+    cy_angle_diff_many,
     cy_angle_to,
+    cy_angle_to_many,
+    cy_distance_many,
+    cy_distance_matrix,
     cy_distance_to,
     cy_distance_to_squared,
     cy_towards,
+    cy_towards_many,
 )
 
 pytest_plugins = ("pytest_asyncio",)
@@ -98,3 +105,58 @@ class TestGeometry:
         assert cy_towards(
             enemy_one.position, enemy_two.position, -17.5
         ) == enemy_one.position.towards(enemy_two.position, -17.5)
+
+
+class TestGeometryMany:
+    rng = np.random.default_rng(0)
+    starts = np.round(rng.uniform(0, 100, (50, 2)) * 4) / 4
+    targets = np.round(rng.uniform(0, 100, (50, 2)) * 4) / 4
+    targets[7] = starts[7]
+
+    @pytest.mark.parametrize("rows", [50, 1])
+    def test_towards_many_matches_scalar(self, rows):
+        out = np.empty_like(self.starts)
+        cy_towards_many(self.starts, self.targets[:rows], -2.5, out)
+        for i, start in enumerate(self.starts):
+            target = self.targets[i if rows > 1 else 0]
+            assert tuple(out[i]) == cy_towards(tuple(start), tuple(target), -2.5)
+
+    def test_towards_many_in_place(self):
+        positions = self.starts.copy()
+        cy_towards_many(positions, self.targets, 3.0, positions)
+        expected = np.empty_like(self.starts)
+        cy_towards_many(self.starts, self.targets, 3.0, expected)
+        np.testing.assert_array_equal(positions, expected)
+
+    def test_distance_and_angle_many(self):
+        out = np.empty(50)
+        cy_distance_many(self.starts, self.targets, out)
+        np.testing.assert_allclose(
+            out, [cy_distance_to(p, q) for p, q in zip(self.starts, self.targets)]
+        )
+        cy_angle_to_many(self.starts, self.targets, out)
+        np.testing.assert_allclose(
+            out,
+            [cy_angle_to(p, q) for p, q in zip(self.starts, self.targets)],
+            atol=1e-5,
+        )
+        angles = out.copy()
+        cy_angle_diff_many(angles, angles[::-1].copy(), out)
+        np.testing.assert_allclose(
+            out, [cy_angle_diff(a, b) for a, b in zip(angles, angles[::-1])]
+        )
+
+    def test_distance_matrix(self):
+        out = np.empty((50, 20))
+        cy_distance_matrix(self.starts, self.targets[:20], out)
+        expected = np.hypot(
+            self.starts[:, None, 0] - self.targets[None, :20, 0],
+            self.starts[:, None, 1] - self.targets[None, :20, 1],
+        )
+        np.testing.assert_allclose(out, expected)
+
+    def test_raises_on_mismatched_rows(self):
+        with pytest.raises(ValueError):
+            cy_distance_many(self.starts, self.targets[:3], np.empty(50))
+        with pytest.raises(ValueError):
+            cy_towards_many(self.starts, self.targets, 1.0, np.empty((10, 2)))
@@ -0,0 +1,116 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_equal
+
+from cython_extensions import cy_dijkstra, cy_hierarchical_pathing
+
+
+def path_cost(cost: np.ndarray, path: list[tuple[int, int]]) -> float:
+    """Cost of a path in the convention used by `DijkstraPathing.get_distance`."""
+    total = cost[path[-1]]
+    for a, b in zip(path, path[1:]):
+        step = np.sqrt(2) if a[0] != b[0] and a[1] != b[1] else 1.0
+        total += step * cost[a]
+    return total
+
+
+def assert_valid_path(cost, path, source, target):
+    assert path[0] == source and path[-1] == target
+    assert_equal(np.abs(np.diff(path, axis=0)).max(axis=1), 1)
+    assert np.isfinite([cost[cell] for cell in path]).all()
+
+
+class TestHierarchicalPathing:
+
+    def test_raises_on_nonpositive_entries(self):
+        cost = np.ones((8, 8))
+        cost[1, 1] = 0
+        with pytest.raises(Exception):
+            cy_hierarchical_pathing(cost)
+
+    def test_raises_on_target_out_of_bounds(self):
+        pathing = cy_hierarchical_pathing(np.ones((8, 8)), 4)
+        with pytest.raises(Exception):
+            pathing.get_path((0, 0), (8, 0))
+
+    def test_path_through_clusters(self):
+        # two rooms connected by a single gap in the wall
+        cost = np.ones((20, 20))
+        cost[10, :] = np.inf
+        cost[10, 17] = 1.0
+        pathing = cy_hierarchical_pathing(cost, 5)
+        path = pathing.get_path((2, 2), (18, 3))
+        assert_valid_path(cost, path, (2, 2), (18, 3))
+        assert (10, 17) in path
+        assert path_cost(cost, path) == pytest.approx(pathing.get_distance((2, 2), (18, 3)))
+
+    def test_limit_refines_prefix(self):
+        cost = np.ones((30, 30))
+        cost[5:25, 15] = np.inf
+        pathing = cy_hierarchical_pathing(cost, 8)
+        full = pathing.get_path((15, 2), (15, 28))
+        assert_equal(pathing.get_path((15, 2), (15, 28), limit=4), full[:4])
+
+    def test_half_coordinates_snap_like_dijkstra(self):
+        # 2.5 rounds half away from zero to the free cell, not to even onto the wall
+        cost = np.ones((12, 12))
+        cost[2, 2] = np.inf
+        pathing = cy_hierarchical_pathing(cost, 4)
+        expected = cy_dijkstra(cost, np.array([[9, 9]])).get_path((2.5, 2.5), max_distance=0)
+        path = pathing.get_path((2.5, 2.5), (9, 9))
+        assert path[0] == expected[0] == (3, 3)
+        assert_valid_path(cost, path, (3, 3), (9, 9))
+        assert path_cost(cost, path) == pytest.approx(pathing.get_distance((2.5, 2.5), (9, 9)))
+
+    def test_unreachable_target(self):
+        cost = np.ones((12, 12))
+        cost[:, 6] = np.inf
+        pathing = cy_hierarchical_pathing(cost, 4)
+        assert_equal(pathing.get_path((0, 0), (0, 11)), [(0, 0)])
+        assert np.isinf(pathing.get_distance((0, 0), (0, 11)))
+
+    def test_close_to_optimal(self):
+        rng = np.random.default_rng(2)
+        for _ in range(20):
+            cost = rng.uniform(1.0, 2.0, (40, 40))
+            cost[rng.random(cost.shape) < 0.1] = np.inf
+            pathing = cy_hierarchical_pathing(cost, 8)
+            valid = np.argwhere(np.isfinite(cost))
+            for _ in range(5):
+                source, target = map(tuple, valid[rng.choice(len(valid), 2)].tolist())
+                optimal = cy_dijkstra(cost, np.array([target])).get_distance(source)
+                path = pathing.get_path(source, target)
+                if np.isinf(optimal) or path == [source]:
+                    continue
+                assert_valid_path(cost, path, source, target)
+                assert optimal <= path_cost(cost, path) + 1e-3 < 2 * optimal
+
+    def test_update_cost_rebuilds_clusters(self):
+        cost = np.ones((20, 20))
+        cost[10, :] = np.inf
+        cost[10, 2] = 1.0
+        cost[10, 17] = 1.0
+        pathing = cy_hierarchical_pathing(cost, 5)
+        assert (10, 2) in pathing.get_path((8, 0), (12, 0))
+
+        # close the near gap, the path has to go around through the far one
+        pathing.update_cost(np.array([[10, 2]]), np.inf)
+        path = pathing.get_path((8, 0), (12, 0))
+        assert (10, 17) in path
+        cost[10, 2] = np.inf
+        assert_valid_path(cost, path, (8, 0), (12, 0))
+
+        # close the other one as well
+        pathing.update_cost(np.array([[10, 17]]), np.inf)
+        assert_equal(pathing.get_path((8, 0), (12, 0)), [(8, 0)])
+
+        # and reopen
+        pathing.update_cost(np.array([[10, 2], [10, 17]]), 1.0)
+        assert (10, 2) in pathing.get_path((8, 0), (12, 0))
+
+    def test_update_cost_raises_on_invalid_input(self):
+        pathing = cy_hierarchical_pathing(np.ones((8, 8)), 4)
+        with pytest.raises(Exception):
+            pathing.update_cost(np.array([[0, 0]]), -1.0)
+        with pytest.raises(Exception):
+            pathing.update_cost(np.array([[8, 0]]), 1.0)
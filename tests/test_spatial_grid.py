@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_equal
+
+from cython_extensions import cy_spatial_grid
+
+
+def edge_distances(points, radii, position):
+    return np.hypot(points[:, 0] - position[0], points[:, 1] - position[1]) - radii
+
+
+class TestSpatialGrid:
+
+    @pytest.mark.parametrize("cell_size", [0.0, 0.7, 5.0, 100.0])
+    def test_query_radius_matches_brute_force(self, cell_size):
+        rng = np.random.default_rng(0)
+        points = rng.uniform(0, 100, (300, 2))
+        radii = rng.uniform(0.0, 1.5, 300)
+        grid = cy_spatial_grid(points, radii, cell_size)
+        for _ in range(50):
+            position = tuple(rng.uniform(-10, 110, 2))
+            distance = rng.uniform(0, 20)
+            expected = np.flatnonzero(edge_distances(points, radii, position) <= distance)
+            assert_equal(grid.query_radius(position, distance), expected)
+
+    @pytest.mark.parametrize("cell_size", [0.0, 0.7, 5.0, 100.0])
+    def test_k_nearest_matches_brute_force(self, cell_size):
+        rng = np.random.default_rng(1)
+        # integer positions produce ties, which are ordered by index
+        points = np.round(rng.uniform(0, 60, (200, 2)))
+        radii = np.zeros(200)
+        grid = cy_spatial_grid(points, None, cell_size)
+        for _ in range(50):
+            position = tuple(rng.uniform(-10, 70, 2))
+            distances = edge_distances(points, radii, position)
+            expected = np.lexsort((np.arange(200), distances))
+            for k in (1, 3, 10):
+                assert_equal(grid.query_k_nearest(position, k), expected[:k])
+            assert grid.query_nearest(position) == expected[0]
+
+    def test_nearest_uses_radii(self):
+        points = np.array([[0.0, 0.0], [3.0, 0.0]])
+        grid = cy_spatial_grid(points, np.array([0.5, 2.0]))
+        assert grid.query_nearest((1.0, 0.0)) == 1
+        assert_equal(grid.query_radius((-1.0, 0.0), 0.5), [0])
+
+    def test_empty(self):
+        grid = cy_spatial_grid(np.empty((0, 2)))
+        assert len(grid) == 0
+        assert grid.query_nearest((1.0, 1.0)) == -1
+        assert len(grid.query_radius((1.0, 1.0), 5.0)) == 0
+        assert len(grid.query_k_nearest((1.0, 1.0), 3)) == 0
+
+    def test_k_larger_than_points(self):
+        grid = cy_spatial_grid(np.array([[0.0, 0.0], [1.0, 1.0]]))
+        assert_equal(grid.query_k_nearest((0.9, 0.9), 5), [1, 0])
+
+    def test_raises_on_negative_cell_size(self):
+        with pytest.raises(ValueError):
+            cy_spatial_grid(np.zeros((3, 2)), None, -1.0)
@@ -0,0 +1,121 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from sc2.bot_ai import BotAI
+
+from cython_extensions import (
+    cy_closer_than,
+    cy_closest_to,
+    cy_in_attack_range,
+    cy_pick_enemy_target,
+    cy_snapshot_closer_than,
+    cy_snapshot_closest_to,
+    cy_snapshot_in_attack_range,
+    cy_snapshot_pick_enemy_target,
+    cy_snapshot_sorted_by_distance_to,
+    cy_unit_snapshot,
+)
+
+pytest_plugins = ("pytest_asyncio",)
+
+MAPS: list[Path] = [
+    map_path
+    for map_path in (Path(__file__).parent / "combat_data").iterdir()
+    if map_path.suffix == ".xz"
+]
+
+
+@pytest.mark.parametrize("bot", MAPS, indirect=True)
+class TestUnitSnapshot:
+    def test_packs_all_units(self, bot: BotAI, event_loop):
+        snapshot = cy_unit_snapshot(bot)
+        assert cy_unit_snapshot(bot) is snapshot
+        assert len(snapshot) == len(bot.all_units)
+        assert snapshot.game_loop == bot.state.game_loop
+
+        own = snapshot.get_units(range(*snapshot.own_range))
+        enemy = snapshot.get_units(range(*snapshot.enemy_range))
+        assert {u.tag for u in own} == (bot.units | bot.structures).tags
+        assert {u.tag for u in enemy} == (bot.enemy_units | bot.enemy_structures).tags
+
+        for i, unit in enumerate(snapshot.units[:50]):
+            assert snapshot.tag[i] == unit.tag
+            assert snapshot.type_id[i] == unit.type_id.value
+            assert (snapshot.x[i], snapshot.y[i]) == unit.position
+            assert snapshot.radius[i] == unit.radius
+            assert snapshot.health[i] + snapshot.shield[i] == unit.health + unit.shield
+            assert bool(snapshot.flags[i] & 8) == unit.is_structure
+
+        # ranges and attack flags come from a table per unit type
+        for i, unit in enumerate(snapshot.units):
+            assert snapshot.ground_range[i] == unit.ground_range
+            assert snapshot.air_range[i] == unit.air_range
+            assert bool(snapshot.flags[i] & 2) == unit.can_attack_ground
+            assert bool(snapshot.flags[i] & 4) == unit.can_attack_air
+
+        with pytest.raises(ValueError):
+            snapshot.x[0] = 0.0
+
+    def test_cached_per_bot_and_game_loop(self, bot: BotAI, event_loop):
+        snapshot = cy_unit_snapshot(bot)
+
+        class OtherBot:
+            all_units = bot.all_units[:1]
+            state = bot.state
+
+        assert len(cy_unit_snapshot(OtherBot())) == 1
+        assert cy_unit_snapshot(bot) is snapshot
+
+        game_loop = bot.state.game_loop
+        bot.state.game_loop = game_loop + 1
+        try:
+            assert cy_unit_snapshot(bot) is not snapshot
+            assert cy_unit_snapshot(bot).game_loop == game_loop + 1
+        finally:
+            bot.state.game_loop = game_loop
+
+    def test_matches_units_utils(self, bot: BotAI, event_loop):
+        snapshot = cy_unit_snapshot(bot)
+        enemy_range = snapshot.enemy_range
+        enemies = snapshot.get_units(range(*enemy_range))
+        position = bot.game_info.map_center
+
+        index = cy_snapshot_closest_to(snapshot, position, *enemy_range)
+        assert snapshot.units[index].tag == cy_closest_to(position, enemies).tag
+
+        closer = snapshot.get_units(cy_snapshot_closer_than(snapshot, 20.0, position, *enemy_range))
+        assert [u.tag for u in closer] == [u.tag for u in cy_closer_than(enemies, 20.0, position)]
+
+        for i in range(snapshot.own_range[0], min(snapshot.own_range[1], 40)):
+            in_range = cy_snapshot_in_attack_range(snapshot, i, *enemy_range, bonus_distance=3.0)
+            expected = cy_in_attack_range(snapshot.units[i], enemies, 3.0)
+            assert {u.tag for u in snapshot.get_units(in_range)} == {u.tag for u in expected}
+
+        index = cy_snapshot_pick_enemy_target(snapshot, *enemy_range)
+        assert snapshot.units[index].tag == cy_pick_enemy_target(enemies).tag
+
+    def test_sorted_by_distance_to(self, bot: BotAI, event_loop):
+        snapshot = cy_unit_snapshot(bot)
+        position = bot.game_info.map_center
+        start, stop = snapshot.enemy_range
+        order = cy_snapshot_sorted_by_distance_to(snapshot, position, start, stop)
+        assert sorted(order.tolist()) == list(range(start, stop))
+        distances = np.hypot(snapshot.x[order] - position.x, snapshot.y[order] - position.y)
+        assert np.all(np.diff(distances) >= 0)
+
+        reverse = cy_snapshot_sorted_by_distance_to(snapshot, position, start, stop, True)
+        distances = np.hypot(snapshot.x[reverse] - position.x, snapshot.y[reverse] - position.y)
+        assert np.all(np.diff(distances) <= 0)
+
+    def test_ranges(self, bot: BotAI, event_loop):
+        snapshot = cy_unit_snapshot(bot)
+        assert cy_snapshot_closest_to(snapshot, (0.0, 0.0), 5, 5) == -1
+        assert cy_snapshot_pick_enemy_target(snapshot, 5, 5) == -1
+        assert len(cy_snapshot_closer_than(snapshot, 1000.0, (0.0, 0.0))) == len(snapshot)
+        with pytest.raises(ValueError):
+            cy_snapshot_closest_to(snapshot, (0.0, 0.0), 10, 5)
+        with pytest.raises(ValueError):
+            cy_snapshot_closer_than(snapshot, 1.0, (0.0, 0.0), 0, len(snapshot) + 1)
+        with pytest.raises(ValueError):
+            cy_snapshot_in_attack_range(snapshot, len(snapshot))
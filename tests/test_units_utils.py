@@ -1,16 +1,32 @@
 from pathlib import Path
 
+import numpy as np
 import pytest
+from numpy.testing import assert_allclose, assert_equal
 from sc2.bot_ai import BotAI
+from sc2.ids.unit_typeid import UnitTypeId as UnitID
 from sc2.unit import Unit
 
 from cython_extensions import (
+    cy_all_closest_to,
+    cy_attack_range_matrix,
     cy_center,
     cy_closer_than,
     cy_closest_to,
     cy_find_units_center_mass,
+    cy_find_units_center_masses,
     cy_further_than,
     cy_in_attack_range,
+    cy_k_closest_to,
+    cy_kd_tree,
+    cy_positions_center,
+    cy_positions_center_mass,
+    cy_positions_center_masses,
+    cy_positions_closer_than,
+    cy_positions_closest_to,
+    cy_positions_further_than,
+    cy_positions_k_closest_to,
+    cy_positions_sorted_by_distance_to,
     cy_sorted_by_distance_to,
 )
 
@@ -104,6 +120,36 @@ class TestUnitsUtils:
         # Larger distance should include more or equal units
         assert num_units_large >= num_units_small
 
+    @pytest.mark.parametrize("distance", [0.5, 6.0, 500.0])
+    def test_cy_find_units_center_mass_matches_brute_force(
+        self, bot: BotAI, event_loop, distance
+    ):
+        units = bot.enemy_units
+        positions = [u.position for u in units]
+        counts = [
+            sum(
+                (p[0] - q[0]) ** 2 + (p[1] - q[1]) ** 2 < distance * distance
+                for q in positions
+            )
+            for p in positions
+        ]
+        best = counts.index(max(counts))
+        center_pos, num_units = cy_find_units_center_mass(units, distance)
+        assert num_units == counts[best]
+        assert center_pos == (positions[best][0], positions[best][1])
+
+    def test_cy_find_units_center_masses(self, bot: BotAI, event_loop):
+        units = bot.all_units
+        distance = 6.0
+        centers = cy_find_units_center_masses(units, distance, 5)
+        assert 0 < len(centers) <= 5
+        assert centers[0] == cy_find_units_center_mass(units, distance)
+        counts = [num_units for _, num_units in centers]
+        assert counts == sorted(counts, reverse=True)
+        for i, (center, _) in enumerate(centers):
+            for other, _ in centers[:i]:
+                assert (center[0] - other[0]) ** 2 + (center[1] - other[1]) ** 2 >= distance**2
+
     def test_cy_in_attack_range(self, bot: BotAI, event_loop):
         """Test cy_in_attack_range function correctly identifies units in attack range."""
         # Find a unit that can attack
@@ -247,3 +293,241 @@ class TestUnitsUtils:
         units_list = list(units)
         far_units_list = cy_further_than(units_list, min_distance, test_position)
         assert len(far_units_list) == len(far_units)
+
+    def test_cy_kd_tree_knn_matches_cy_closest_to(self, bot: BotAI, event_loop):
+        units = bot.all_units
+        tree = cy_kd_tree(np.array([u.position for u in units]))
+        queries = [tuple(bot.game_info.map_center), tuple(units[0].position)]
+        indices, _ = tree.knn(np.array(queries), 1)
+        for query, index in zip(queries, indices[:, 0]):
+            assert units[index].distance_to(query) == pytest.approx(
+                cy_closest_to(query, units).distance_to(query)
+            )
+
+    @pytest.mark.parametrize("k", [0, 1, 5, 100000])
+    def test_cy_k_closest_to(self, bot: BotAI, event_loop, k):
+        units = bot.all_units
+        position = bot.game_info.map_center
+        expected = sorted(
+            units, key=lambda u: (u.position - position).x ** 2 + (u.position - position).y ** 2
+        )[:k]
+        closest, distances = cy_k_closest_to(units, position, k)
+        assert [u.tag for u in closest] == [u.tag for u in expected]
+        assert_allclose(distances, [u.distance_to(position) for u in expected])
+        indices, _ = cy_k_closest_to(units, position, k, True)
+        assert [units[i].tag for i in indices] == [u.tag for u in expected]
+
+    @pytest.mark.parametrize("bonus_distance", [0.0, 70.0])
+    def test_cy_attack_range_matrix(self, bot: BotAI, event_loop, bonus_distance):
+        units = bot.units
+        enemies = bot.enemy_units | bot.enemy_structures
+        for (offsets, indices), attackers, targets in zip(
+            cy_attack_range_matrix(units, enemies, bonus_distance),
+            (units, enemies),
+            (enemies, units),
+        ):
+            target_index = {u.tag: i for i, u in enumerate(targets)}
+            for i, attacker in enumerate(attackers):
+                expected = sorted(
+                    target_index[u.tag]
+                    for u in cy_in_attack_range(attacker, targets, bonus_distance)
+                )
+                assert list(indices[offsets[i] : offsets[i + 1]]) == expected
+
+    def test_cy_all_closest_to(self, bot: BotAI, event_loop):
+        units = bot.units
+        enemies = bot.all_enemy_units
+        indices, distances = cy_all_closest_to(units, enemies)
+        for unit, index, distance in zip(units, indices, distances):
+            expected = min(e.distance_to(unit.position) for e in enemies)
+            assert distance == pytest.approx(expected)
+            assert enemies[index].distance_to(unit.position) == pytest.approx(expected)
+
+    @pytest.mark.parametrize("target_filter", ["ground", "air", "attackable"])
+    def test_cy_all_closest_to_filters(self, bot: BotAI, event_loop, target_filter):
+        units = bot.units
+        enemies = bot.all_enemy_units
+        indices, distances = cy_all_closest_to(units, enemies, target_filter)
+        for unit, index, distance in zip(units, indices, distances):
+            if target_filter == "ground":
+                candidates = [e for e in enemies if not e.is_flying or e.type_id == UnitID.COLOSSUS]
+            elif target_filter == "air":
+                candidates = [e for e in enemies if e.is_flying or e.type_id == UnitID.COLOSSUS]
+            else:
+                candidates = [
+                    e
+                    for e in enemies
+                    if (unit.can_attack_air and (e.is_flying or e.type_id == UnitID.COLOSSUS))
+                    or (unit.can_attack_ground and not e.is_flying)
+                ]
+            if not candidates:
+                assert index == -1 and distance == np.inf
+            else:
+                assert distance == pytest.approx(min(e.distance_to(unit.position) for e in candidates))
+                assert enemies[index] in candidates
+
+    def test_cy_positions_variants_match_units(self, bot: BotAI, event_loop):
+        units = bot.all_units
+        positions = np.array([u.position for u in units])
+        position = bot.game_info.map_center
+        tags = [u.tag for u in units]
+
+        assert_allclose(cy_positions_center(positions), cy_center(units))
+        assert (
+            units[cy_positions_closest_to(position, positions)].tag
+            == cy_closest_to(position, units).tag
+        )
+        for distance in (5.0, 40.0):
+            assert [tags[i] for i in cy_positions_closer_than(positions, distance, position)] == [
+                u.tag for u in cy_closer_than(units, distance, position)
+            ]
+            assert [
+                tags[i] for i in cy_positions_further_than(positions, distance, position)
+            ] == [u.tag for u in cy_further_than(units, distance, position)]
+        indices, distances = cy_positions_k_closest_to(positions, position, 6)
+        expected_indices, expected_distances = cy_k_closest_to(units, position, 6, True)
+        assert_equal(indices, expected_indices)
+        assert_allclose(distances, expected_distances)
+        sorted_indices = cy_positions_sorted_by_distance_to(positions, position)
+        assert_equal(sorted_indices[:6], expected_indices)
+
+        index, num_units = cy_positions_center_mass(positions, 6.0)
+        center, expected_num_units = cy_find_units_center_mass(units, 6.0)
+        assert num_units == expected_num_units
+        assert tuple(positions[index]) == center
+        assert [
+            (tuple(positions[i]), n) for i, n in cy_positions_center_masses(positions, 6.0, 3)
+        ] == cy_find_units_center_masses(units, 6.0, 3)
+
+
+def brute_force_distances(points: np.ndarray, query: np.ndarray) -> np.ndarray:
+    return np.hypot(
+        points[None, :, 0] - query[:, None, 0], points[None, :, 1] - query[:, None, 1]
+    )
+
+
+class TestAllClosestTo:
+    def test_matches_brute_force(self):
+        rng = np.random.default_rng(0)
+        # more targets than one block, rounded to produce ties
+        units = np.round(rng.uniform(0, 100, (150, 2)))
+        others = np.round(rng.uniform(0, 100, (700, 2)))
+        distances = brute_force_distances(others, units)
+        indices, closest = cy_all_closest_to(units, others)
+        assert_equal(indices, distances.argmin(axis=1))
+        assert_allclose(closest, distances.min(axis=1))
+
+    def test_empty(self):
+        indices, distances = cy_all_closest_to(np.array([[1.0, 1.0]]), np.empty((0, 2)))
+        assert_equal(indices, [-1])
+        assert_equal(distances, [np.inf])
+        indices, _ = cy_all_closest_to(np.empty((0, 2)), np.array([[1.0, 1.0]]))
+        assert len(indices) == 0
+
+    def test_raises_on_filter_with_positions(self):
+        with pytest.raises(ValueError):
+            cy_all_closest_to(np.zeros((2, 2)), np.zeros((2, 2)), "ground")
+        with pytest.raises(ValueError):
+            cy_all_closest_to(np.zeros((2, 2)), np.zeros((2, 2)), "everything")
+
+
+class TestPositionsRadii:
+    def test_radii_measure_to_edges(self):
+        rng = np.random.default_rng(0)
+        positions = np.round(rng.uniform(0, 30, (80, 2)))
+        radii = rng.uniform(0, 1.5, 80)
+        position = (12.5, 17.0)
+        edge = np.hypot(positions[:, 0] - 12.5, positions[:, 1] - 17.0) - radii
+        order = np.lexsort((np.arange(80), edge))
+        assert cy_positions_closest_to(position, positions, radii) == order[0]
+        assert_equal(cy_positions_closer_than(positions, 6.0, position, radii), np.flatnonzero(edge < 6.0))
+        assert_equal(
+            cy_positions_further_than(positions, 6.0, position, radii), np.flatnonzero(edge > 6.0)
+        )
+        assert_equal(cy_positions_sorted_by_distance_to(positions, position, False, radii), order)
+        indices, distances = cy_positions_k_closest_to(positions, position, 5, radii)
+        assert_equal(indices, order[:5])
+        assert_allclose(distances, edge[order[:5]])
+
+    def test_raises_on_non_contiguous_positions(self):
+        with pytest.raises(ValueError):
+            cy_positions_closest_to((0.0, 0.0), np.zeros((4, 4))[:, :2])
+
+
+class RangeUnit:
+    # just what the range checks read, with positions that float32 can't hold
+    def __init__(self, tag, unit_type, position, radius, ground_range=0.0):
+        self.tag = tag
+        self._proto = type("Proto", (), {"unit_type": unit_type.value})()
+        self.position = position
+        self.radius = radius
+        self.ground_range = ground_range
+        self.air_range = 0.0
+        self.can_attack = ground_range > 0
+        self.can_attack_ground = ground_range > 0
+        self.can_attack_air = False
+
+
+class TestAttackRangeBoundary:
+    def test_matrix_matches_in_attack_range(self):
+        attacker = RangeUnit(0, UnitID.MARINE, (10.1, 20.3), 0.375, 5.0)
+        reach = 5.0 + 0.375 + 0.375
+        targets = [
+            RangeUnit(i + 1, UnitID.ZERGLING, (10.1 + (reach + offset) * dx, 20.3 + (reach + offset) * dy), 0.375)
+            for i, (offset, (dx, dy)) in enumerate(
+                (offset, direction)
+                for offset in (-1e-7, -1e-12, 0.0, 1e-12, 1e-7)
+                for direction in ((1.0, 0.0), (0.6, 0.8), (-0.8, 0.6), (0.0, -1.0))
+            )
+        ]
+        (offsets, indices), _ = cy_attack_range_matrix([attacker], targets)
+        expected = [u.tag - 1 for u in cy_in_attack_range(attacker, targets)]
+        assert list(indices[offsets[0] : offsets[1]]) == sorted(expected)
+        # clearly inside and clearly outside are decided the same way as before
+        assert {0, 1, 2, 3} <= set(expected) and not {16, 17, 18, 19} & set(expected)
+
+
+class TestKDTree:
+    @pytest.mark.parametrize("seed", range(4))
+    def test_knn_matches_brute_force(self, seed):
+        rng = np.random.default_rng(seed)
+        # a dense clump next to scattered points, rounded to produce ties
+        points = np.round(
+            np.concatenate([rng.normal(40, 1.5, (80, 2)), rng.uniform(0, 150, (60, 2))]), 1
+        )
+        query = rng.uniform(-10, 160, (40, 2))
+        distances = brute_force_distances(points, query)
+        for k in (1, 4, 12):
+            indices, knn_distances = cy_kd_tree(points).knn(query, k)
+            for i in range(len(query)):
+                expected = np.lexsort((np.arange(len(points)), distances[i]))[:k]
+                assert_equal(indices[i], expected)
+                assert_allclose(knn_distances[i], distances[i, expected])
+
+    @pytest.mark.parametrize("seed", range(4))
+    def test_within_matches_brute_force(self, seed):
+        rng = np.random.default_rng(seed)
+        points = np.concatenate([rng.normal(40, 1.5, (80, 2)), rng.uniform(0, 150, (60, 2))])
+        query = rng.uniform(-10, 160, (40, 2))
+        distances = brute_force_distances(points, query)
+        offsets, indices, within_distances = cy_kd_tree(points).within(query, 8.0)
+        assert len(offsets) == len(query) + 1
+        for i in range(len(query)):
+            expected = np.flatnonzero(distances[i] <= 8.0)
+            assert_equal(indices[offsets[i] : offsets[i + 1]], expected)
+            assert_allclose(within_distances[offsets[i] : offsets[i + 1]], distances[i, expected])
+
+    def test_k_larger_than_tree(self):
+        indices, distances = cy_kd_tree(np.array([[0.0, 0.0], [2.0, 0.0]])).knn(
+            np.array([[1.5, 0.0]]), 3
+        )
+        assert_equal(indices, [[1, 0, -1]])
+        assert_allclose(distances, [[0.5, 1.5, np.inf]])
+
+    def test_empty(self):
+        tree = cy_kd_tree(np.empty((0, 2)))
+        indices, _ = tree.knn(np.array([[1.0, 1.0]]), 2)
+        assert_equal(indices, [[-1, -1]])
+        offsets, indices, _ = tree.within(np.array([[1.0, 1.0]]), 5.0)
+        assert_equal(offsets, [0, 0])
+        assert len(indices) == 0
@@ -54,8 +54,14 @@ def test_all_wrapper_functions_callable():
             return 2
 
     class MockProto:
-        def __init__(self, unit_type: int):
+        def __init__(self, unit_type: int, x: float, y: float):
             self.unit_type = unit_type
+            self.alliance = 1
+            self.pos = MockPosition(x, y)
+            self.radius = 0.5
+            self.health = 100.0
+            self.shield = 0.0
+            self.tag = 1
 
     class MockUnit:
         def __init__(self, x=1.0, y=2.0, unit_type=50):
@@ -63,7 +69,7 @@ def test_all_wrapper_functions_callable():
             self.can_attack = False
             self.weapon_cooldown = 0.0
             self.radius = 0.5
-            self._proto = MockProto(unit_type)
+            self._proto = MockProto(unit_type, x, y)
             # for in_attack_range logic
             self.can_attack_air = False
             self.can_attack_ground = False
@@ -72,6 +78,9 @@ def test_all_wrapper_functions_callable():
             self.facing = 0.5
             self.health = 100.0
             self.shield = 0.0
+            self.tag = 1
+            self.is_flying = False
+            self.is_structure = False
 
     unit = MockUnit()
     units = [unit]
@@ -81,8 +90,21 @@ def test_all_wrapper_functions_callable():
     ce.cy_center(units)
     ce.cy_closest_to(pos, units)
     ce.cy_find_units_center_mass(units, 5.0)
+    ce.cy_find_units_center_masses(units, 5.0, 2)
     ce.cy_in_attack_range(unit, [], 0.0)  # empty units to skip attack validation
     ce.cy_sorted_by_distance_to([], pos, False)
+    ce.cy_k_closest_to(units, pos, 1, False)
+    ce.cy_kd_tree(f64_grid)
+    ce.cy_all_closest_to(units, units, "attackable")
+    ce.cy_attack_range_matrix(units, units, 0.0)
+    ce.cy_positions_center(f64_grid)
+    ce.cy_positions_closest_to(pos, f64_grid, None)
+    ce.cy_positions_closer_than(f64_grid, 5.0, pos, None)
+    ce.cy_positions_further_than(f64_grid, 5.0, pos, None)
+    ce.cy_positions_sorted_by_distance_to(f64_grid, pos, False, None)
+    ce.cy_positions_k_closest_to(f64_grid, pos, 1, None)
+    ce.cy_positions_center_mass(f64_grid, 5.0)
+    ce.cy_positions_center_masses(f64_grid, 5.0, 2)
 
     # Geometry
     ce.cy_distance_to(pos, pos)
@@ -94,11 +116,21 @@ def test_all_wrapper_functions_callable():
     ce.cy_get_angle_between_points((1.0, 0.0), (2.0, 1.0))
     ce.cy_translate_point_along_line(pos, 1.0, 2.0)
     ce.cy_find_correct_line([pos, (2.0, 2.0)], (1.5, 1.5))
+    f64_out = np.empty(2, dtype=np.float64)
+    ce.cy_distance_many(f64_grid, f64_grid, f64_out)
+    ce.cy_distance_matrix(f64_grid, f64_grid, np.empty((2, 2), dtype=np.float64))
+    ce.cy_angle_to_many(f64_grid, f64_grid, f64_out)
+    ce.cy_angle_diff_many(f64_out, f64_out, np.empty(2, dtype=np.float64))
+    ce.cy_towards_many(f64_grid, f64_grid, 1.0, np.empty((2, 2), dtype=np.float64))
 
     # Combat utils
     ce.cy_adjust_moving_formation(units, pos, [], 1.0, 0.5)
     ce.cy_attack_ready("bot", unit, unit)
     ce.cy_find_aoe_position(1.0, units, 1, set())
+    ce.cy_find_aoe_position(1.0, units, 1, set(), False)
+    ce.cy_find_aoe_center(1.0, f64_grid, None, np.ones(2, dtype=np.float64))
+    ce.cy_find_aoe_positions(1.0, units, 2, 1, set())
+    ce.cy_find_aoe_centers(1.0, f64_grid, 2, None, None, 1)
     ce.cy_get_turn_speed(unit, 50)  # Marine unit type ID
     ce.cy_is_facing(unit, unit, 0.3)
     ce.cy_pick_enemy_target([unit])
@@ -129,4 +161,44 @@ def test_all_wrapper_functions_callable():
     )
 
     # Dijkstra
-    ce.cy_dijkstra(f64_grid, np.array([[0, 0]], dtype=np.intp), True)
+    pathing = ce.cy_dijkstra(f64_grid, np.array([[0, 0]], dtype=np.intp), True, "heap")
+    ce.cy_dijkstra_many([f64_grid], [np.array([[0, 0]], dtype=np.intp)], 1, True)
+    ce.cy_astar(f64_grid, pos, (0, 0), 0, 1, True)
+    ce.cy_astar(f64_grid, pos, (0, 0), 0, 1, True, pathing)
+
+    # Hierarchical pathing
+    ce.cy_hierarchical_pathing(f64_grid, 16, True)
+
+    # Unit snapshot
+    class MockState:
+        game_loop = 0
+
+    class MockClient:
+        game_step = 8
+
+    class MockBot:
+        # snapshot types are cached per process, NOTAUNIT keeps the mock out of real types
+        all_units = [MockUnit(unit_type=0)]
+        state = MockState()
+        client = MockClient()
+
+    snapshot = ce.cy_unit_snapshot(MockBot())
+    ce.cy_snapshot_closest_to(snapshot, pos, 0, -1)
+    ce.cy_snapshot_closer_than(snapshot, 5.0, pos, 0, -1)
+    ce.cy_snapshot_in_attack_range(snapshot, 0, 0, -1, 0.0)
+    ce.cy_snapshot_sorted_by_distance_to(snapshot, pos, 0, -1, False)
+    ce.cy_snapshot_pick_enemy_target(snapshot, 0, -1)
+    ce.cy_attack_ready_many(MockBot(), units, units, None)
+    ce.cy_attack_ready_many(MockBot(), units, np.array([0]), snapshot)
+
+    # Spatial grid
+    ce.cy_spatial_grid(f64_grid, None, 0.0)
+
+    # Combat sim
+    ce.cy_fight_outcome([], [])
+    ce.cy_assign_targets([], [], None)
+
+    # Formation
+    ce.cy_formation_slots(pos, (3.0, 4.0), 2, "concave", 1.0, 0)
+    ce.cy_formation(units, (3.0, 4.0), "line", 1.0, 0, None)
+    ce.cy_formation(f64_grid, (3.0, 4.0), "arc", 1.0, 0, pos)